@@ -38,6 +38,7 @@ from pygfa.exceptions import (
     InvalidCompressionError,
     FileFormatError,
     DictionaryTrainingError,
+    FrozenGraphError,
 )
 
 __version__ = "2.0.0"
@@ -71,4 +72,5 @@ __all__ = [
     "InvalidCompressionError",
     "FileFormatError",
     "DictionaryTrainingError",
+    "FrozenGraphError",
 ]
@@ -6,17 +6,20 @@ algorithms for multigraphs)
 The same documentation for networkx is valid using this algorithms."""
 
 from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 
 import networkx as nx
+import numpy as np
 
-__all__ = ["all_simple_paths"]
+__all__ = ["all_simple_paths", "all_bidirected_paths"]
 
 
 def all_simple_paths(  # noqa: PLR0913
     gfa_,
     source: str,
     target: str,
-    selector: Callable[..., Iterable[tuple[str, str]]],
+    selector: Callable[..., Iterable[tuple[str, str]]] | None = None,
     edges: bool = False,
     keys: bool = True,
     cutoff: int | None = None,
@@ -29,15 +32,23 @@ def all_simple_paths(  # noqa: PLR0913
         to consider, the selector MUST give back two values at least and
         three values considering the keys. So the selector must be a
         similar networkx edges selectors (at least in behavior).
+        By default the links leaving an oriented segment
+        (`GFA.handle_edges`): the paths are then oriented walks between
+        handles (see `GFA.handle_index`), `source` and `target` being
+        handles too.
     :param edges: If True return the edges key that connect each pair of nodes
         in the simple path, each data is given in the format
         `(node_to, edge_that_connect_previous_to_node_to)`, so
         source node and target node will be in the form `(node, None)`.
     :param args: Optional arguments to supply to selector.
     """
-    if source not in gfa_:
+    nodes = gfa_
+    if selector is None:
+        selector = gfa_.handle_edges
+        nodes = gfa_.handle_index()
+    if source not in nodes:
         raise nx.NetworkXError(f"source node {source} not in graph")
-    if target not in gfa_:
+    if target not in nodes:
         raise nx.NetworkXError(f"target node {target} not in graph")
     if cutoff is None:
         cutoff = len(gfa_.nodes()) - 1
@@ -58,26 +69,27 @@ def _all_simple_paths_multigraph(
 ) -> Iterator[list[str]]:
     if cutoff < 1:
         return
-    visited = [source]
+    # An insertion ordered dict: the path so far, with O(1) lookups
+    visited = dict.fromkeys([source])
     stack = [(v for u, v in selector(source))]
     while stack:
         children = stack[-1]
         child = next(children, None)
         if child is None:
             stack.pop()
-            visited.pop()
+            visited.popitem()
         elif len(visited) < cutoff:
             if child == target:
                 yield [*visited, target]
             elif child not in visited:
-                visited.append(child)
+                visited[child] = None
                 stack.append((v for u, v in selector(child)))
         else:
-            count = ([child, *list(children)]).count(target)
+            count = sum(1 for v in chain([child], children) if v == target)
             for _i in range(count):
                 yield [*visited, target]
             stack.pop()
-            visited.pop()
+            visited.popitem()
 
 
 def _all_simple_paths_edges_multigraph(
@@ -133,5 +145,204 @@ def _all_simple_paths_edges_multigraph(
                 path.pop()
 
 
+def all_bidirected_paths(  # noqa: PLR0913
+    gfa_,
+    source: int,
+    target: int,
+    cutoff: int | None = None,
+    max_length: int | None = None,
+    edges: bool = False,
+    workers: int | None = None,
+) -> Iterator[list[int]] | Iterator[list[tuple[int, int, str]]]:
+    """Return all the oriented walks from a handle to another that visit
+    every segment at most once.
+
+    Unlike `all_simple_paths` with a custom selector, the walks follow
+    the bidirected adjacency of `GFA.handle_index` directly: a walk
+    entering a segment in some orientation leaves it by the links of
+    that orientation only, and a segment visited in one orientation
+    can't be visited again in the other one, the target included: there
+    is no walk from a handle to itself or to its reverse. The visited segments are
+    kept in a bitset, and the successors read from the CSR arrays of
+    the index, so that every expansion takes constant time.
+
+    With `workers` greater than 1, the first levels of the search are
+    expanded by the calling process until there are a few prefixes
+    per worker, then the walks extending each prefix are enumerated by
+    a pool of worker processes. The walks are returned in the same
+    order in both cases.
+
+    :param source: The handle of the first oriented segment, see
+        `GFA.handle`.
+    :param target: The handle of the last oriented segment.
+    :param cutoff: The maximum number of links of a walk.
+    :param max_length: The maximum length of a walk, in base pairs: the
+        sum of the lengths of its segments (see `GFA.handle_lengths`),
+        source and target included, overlaps not subtracted.
+    :param edges: If True return the links of each walk as
+        ``(handle, successor, edge key)`` tuples instead of its handles.
+    :param workers: Number of worker processes.
+    """
+    index = gfa_.handle_index()
+    if source not in index:
+        raise nx.NetworkXError(f"source node {source} not in graph")
+    if target not in index:
+        raise nx.NetworkXError(f"target node {target} not in graph")
+    if cutoff is None:
+        cutoff = len(index.names) - 1
+    lengths = gfa_.handle_lengths() if max_length is not None else None
+    if max_length is None:
+        max_length = -1
+    adjacency = (index.indptr, index.targets, index.edges)
+    if workers is not None and workers > 1:
+        walks = _parallel_walks(adjacency, lengths, source, target, cutoff, max_length, workers)
+    else:
+        length = int(lengths[source >> 1]) if lengths is not None else 0
+        walks = _walks(adjacency, lengths, [source], [], length, target, cutoff, max_length)
+    if not edges:
+        return (handles for handles, _links in walks)
+    edge_keys = index.edge_keys
+    return ([(u, v, edge_keys[link]) for u, v, link in zip(handles, handles[1:], links)] for handles, links in walks)
+
+
+def _walks(  # noqa: PLR0913
+    adjacency: tuple[np.ndarray, np.ndarray, np.ndarray],
+    lengths: np.ndarray | None,
+    handles: list[int],
+    links: list[int],
+    length: int,
+    target: int,
+    cutoff: int,
+    max_length: int,
+) -> Iterator[tuple[list[int], list[int]]]:
+    """Yield the ``(handles, edge numbers)`` of the walks extending a
+    prefix up to the target, see `all_bidirected_paths`.
+
+    :param adjacency: The ``indptr``, ``targets`` and ``edges`` arrays
+        of a `HandleIndex`.
+    :param lengths: The segment lengths, None without length cutoff.
+    :param handles: The handles of the prefix, source included.
+    :param links: The edge numbers of the links of the prefix.
+    :param length: The length of the prefix.
+    :param max_length: The maximum length of a walk, -1 for no limit.
+    """
+    indptr, targets, edge_numbers = adjacency
+    visited = bytearray(len(indptr) // 2)
+    for handle in handles:
+        visited[handle >> 1] = 1
+    handles, links = list(handles), list(links)
+
+    def children(handle: int) -> Iterator[tuple[int, int]]:
+        start, end = indptr[handle : handle + 2].tolist()
+        return zip(targets[start:end].tolist(), edge_numbers[start:end].tolist())
+
+    if len(handles) > cutoff:
+        return
+    stack = [children(handles[-1])]
+    path_lengths = [length]
+    bottom = len(handles)
+    while stack:
+        child, link = next(stack[-1], (None, None))
+        if child is None:
+            stack.pop()
+            path_lengths.pop()
+            if len(handles) > bottom:
+                visited[handles.pop() >> 1] = 0
+                links.pop()
+            continue
+        if max_length >= 0:
+            child_length = path_lengths[-1] + int(lengths[child >> 1])
+            if child_length > max_length:
+                continue
+        else:
+            child_length = 0
+        if visited[child >> 1]:
+            continue
+        if child == target:
+            yield [*handles, child], [*links, link]
+        elif len(handles) < cutoff:
+            visited[child >> 1] = 1
+            handles.append(child)
+            links.append(link)
+            path_lengths.append(child_length)
+            stack.append(children(child))
+
+
+_WORKER_GRAPH: tuple = ()
+
+
+def _init_walks_worker(adjacency: tuple[np.ndarray, np.ndarray, np.ndarray], lengths: np.ndarray | None) -> None:
+    """Keep the graph arrays in a worker process, sent once per worker."""
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = (adjacency, lengths)
+
+
+def _prefix_walks(prefix: tuple) -> list[tuple[list[int], list[int]]]:
+    """Return the walks extending a prefix, in a worker process."""
+    adjacency, lengths = _WORKER_GRAPH
+    return list(_walks(adjacency, lengths, *prefix))
+
+
+def _parallel_walks(  # noqa: PLR0913
+    adjacency: tuple[np.ndarray, np.ndarray, np.ndarray],
+    lengths: np.ndarray | None,
+    source: int,
+    target: int,
+    cutoff: int,
+    max_length: int,
+    workers: int,
+) -> Iterator[tuple[list[int], list[int]]]:
+    """Enumerate the walks of `all_bidirected_paths` in a process pool.
+
+    The search tree is expanded one level at a time, in depth first
+    order, until it has ``4 * workers`` open prefixes: the walks found
+    meanwhile and the prefixes are kept in order, so that the walks
+    come out in the order of the serial search.
+    """
+    indptr, targets, edge_numbers = adjacency
+    length = int(lengths[source >> 1]) if lengths is not None else 0
+    # Walks found (prefix False) and prefixes to extend (prefix True)
+    frontier: list[tuple[bool, list[int], list[int], int]] = [(True, [source], [], length)]
+    while 0 < sum(1 for is_prefix, *_ in frontier if is_prefix) < 4 * workers:
+        expanded = []
+        for is_prefix, handles, links, length in frontier:
+            if not is_prefix:
+                expanded.append((is_prefix, handles, links, length))
+                continue
+            if len(handles) > cutoff:
+                continue
+            visited = {handle >> 1 for handle in handles}
+            start, end = indptr[handles[-1] : handles[-1] + 2].tolist()
+            for child, link in zip(targets[start:end].tolist(), edge_numbers[start:end].tolist()):
+                child_length = length + int(lengths[child >> 1]) if lengths is not None else 0
+                if 0 <= max_length < child_length:
+                    continue
+                if child >> 1 in visited:
+                    continue
+                if child == target:
+                    expanded.append((False, [*handles, child], [*links, link], child_length))
+                elif len(handles) < cutoff:
+                    expanded.append((True, [*handles, child], [*links, link], child_length))
+        frontier = expanded
+    prefixes = [
+        (handles, links, length, target, cutoff, max_length)
+        for is_prefix, handles, links, length in frontier
+        if is_prefix
+    ]
+    if not prefixes:
+        for _is_prefix, handles, links, _length in frontier:
+            yield handles, links
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_walks_worker, initargs=(adjacency, lengths)
+    ) as pool:
+        results = pool.map(_prefix_walks, prefixes)
+        for is_prefix, handles, links, _length in frontier:
+            if is_prefix:
+                yield from next(results)
+            else:
+                yield handles, links
+
+
 if __name__ == "__main__":  # pragma: no cover
     pass
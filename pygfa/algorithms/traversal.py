@@ -6,7 +6,7 @@ if TYPE_CHECKING:
 
 def dfs_edges(
     gfa_,
-    selector: Callable[..., Iterable[tuple[str, str]]],
+    selector: Callable[..., Iterable[tuple[str, str]]] | None = None,
     source: str | None = None,
     keys: bool = False,
     **args,
@@ -14,10 +14,17 @@ def dfs_edges(
     """Custom dfs_edges to select custom edges
     while traversing.
 
+    :param selector: The edges to follow from a node. By default the
+        links leaving an oriented segment (`GFA.handle_edges`): the
+        search then traverses handles (see `GFA.handle_index`), `source`
+        being a handle too.
     :param keys: If set return the keys of the edges of the dfs tree."""
+    handles = selector is None
+    if handles:
+        selector = gfa_.handle_edges
     if source is None:
         # produce edges for all components
-        nodes = gfa_.nodes()
+        nodes = range(len(gfa_.handle_index())) if handles else gfa_.nodes()
     else:
         # produce edges for components with source
         nodes = [source]
@@ -23,6 +23,10 @@ SECTION_ID_WALKS = 5
 # upstream bgfa-spec. Older readers reject it as an unknown section, so the
 # writer omits the block entirely when no element carries opt fields.
 SECTION_ID_OPT_FIELDS = 6
+# pygfa-specific extension superseding SECTION_ID_OPT_FIELDS: the optional
+# fields stored by tag, one typed column per tag (see pygfa.gfa.tags). Files
+# holding a SECTION_ID_OPT_FIELDS block are still read.
+SECTION_ID_OPT_COLUMNS = 7
 
 INTEGER_ENCODING_NONE = IntegerEncoding.NONE
 INTEGER_ENCODING_VARINT = IntegerEncoding.VARINT
@@ -6,6 +6,9 @@ import csv
 import time
 import struct
 from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import numpy as np
 
 from pygfa.bgfa._codec_utils import parse_opt_fields, unpack_bits_lsb
 from pygfa.bgfa._constants import (
@@ -33,6 +36,7 @@ from pygfa.bgfa._constants import (
     INTEGER_ENCODING_BYTE_PACKED,
     INTEGER_ENCODING_MASKED_VBYTE,
     SECTION_ID_LINKS,
+    SECTION_ID_OPT_COLUMNS,
     SECTION_ID_OPT_FIELDS,
     SECTION_ID_PATHS,
     SECTION_ID_SEGMENTS,
@@ -118,6 +122,7 @@ from pygfa.encoding.string_encoding import (
 )
 from pygfa.exceptions import InvalidEncodingError
 from pygfa.gfa import GFA
+from pygfa.gfa.tags import TagColumn, TagRegistry
 
 # =============================================================================
 # Integer Decoders
@@ -272,6 +277,60 @@ def _get_string_decoder(str_code: int) -> Callable:
 # =============================================================================
 
 
+def _opt_fields_column(tags: TagRegistry, count: int) -> list[dict | None]:
+    """Return the optional fields of `count` elements, None for elements without any."""
+    column: list[dict | None] = tags.rows()[:count]
+    column.extend([None] * (count - len(column)))
+    return column
+
+
+def _decode_text(value: bytes) -> str:
+    try:
+        return value.decode("ascii")
+    except UnicodeDecodeError:
+        return value.decode("latin-1")
+
+
+class LinkColumns(NamedTuple):
+    """The decoded links of a BGFA file, one list per field.
+
+    :param from_nodes: The source segment names.
+    :param to_nodes: The target segment names.
+    :param from_reverse: The source orientation bits (1 for "-").
+    :param to_reverse: The target orientation bits (1 for "-").
+    :param alignments: The CIGAR strings, `*` if missing.
+    """
+
+    from_nodes: list[str]
+    to_nodes: list[str]
+    from_reverse: list[int]
+    to_reverse: list[int]
+    alignments: list[str]
+
+
+class DecodedBGFA(NamedTuple):
+    """The content of a BGFA file, decoded but not yet added to a graph.
+
+    :param header: The parsed file header.
+    :param segment_names: The segment names, in segment order.
+    :param sequences: The segment sequences, `*` if missing.
+    :param links: The link columns.
+    :param paths: The path dictionaries.
+    :param walks: The walk dictionaries.
+    :param segment_tags: The optional fields of the segments.
+    :param link_tags: The optional fields of the links.
+    """
+
+    header: dict[str, Any]
+    segment_names: list[str]
+    sequences: list[str]
+    links: LinkColumns
+    paths: list[dict]
+    walks: list[dict]
+    segment_tags: TagRegistry
+    link_tags: TagRegistry
+
+
 class ReaderBGFA:
     """BGFA file reader."""
 
@@ -310,6 +369,18 @@ class ReaderBGFA:
         }
 
     def _parse_segments_block(self, data: bytes, start_offset: int) -> tuple[dict, list[str], int]:
+        names, sequences, bytes_consumed = self._decode_segments_block(data, start_offset)
+        segments = {
+            i: {"name": names[i] if i < len(names) else f"s{i}", "sequence": seq} for i, seq in enumerate(sequences)
+        }
+        return segments, names, bytes_consumed
+
+    def _decode_segments_block(self, data: bytes, start_offset: int) -> tuple[list[str], list[str], int]:
+        """Decode a segments block into ``(names, sequences, bytes consumed)``.
+
+        Missing sequences are replaced by `*`, there is one sequence per
+        record even if fewer names were decoded.
+        """
         offset = start_offset + 1
 
         record_num = struct.unpack_from("<H", data, offset)[0]
@@ -352,9 +423,8 @@ class ReaderBGFA:
         str_dec_str = _get_string_decoder(comp_str & 0xFF)
         seqs_bytes = str_dec_str(seqs_payload, record_num, int_dec_str)
 
-        segments = {}
+        sequences = []
         for i in range(record_num):
-            name = names[i] if i < len(names) else f"s{i}"
             if i < len(seqs_bytes) and seqs_bytes[i]:
                 try:
                     seq = seqs_bytes[i].decode("ascii")
@@ -362,12 +432,10 @@ class ReaderBGFA:
                     seq = seqs_bytes[i].decode("latin-1")
             else:
                 seq = "*"
-            if not seq:
-                seq = "*"
-            segments[i] = {"name": name, "sequence": seq}
+            sequences.append(seq)
 
         bytes_consumed = (offset + clen_names + clen_str) - start_offset
-        return segments, names, bytes_consumed
+        return names, sequences, bytes_consumed
 
     def _parse_opt_fields_block(self, data: bytes, start_offset: int) -> tuple[int, int, list[str], int]:
         """Parse an optional-fields block.
@@ -407,7 +475,92 @@ class ReaderBGFA:
         bytes_consumed = (offset + clen) - start_offset
         return num_segments, num_links, opt_strings, bytes_consumed
 
+    def _parse_opt_columns_block(self, data: bytes, start_offset: int) -> tuple[TagRegistry, TagRegistry, int]:
+        """Parse an optional-fields block storing the fields by tag.
+
+        Returns ``(segment_tags, link_tags, bytes_consumed)``, the optional
+        fields of the segments (in segment order) and of the links (in link
+        order).
+        """
+        offset = start_offset + 1
+        comp, num_segments, num_links, clen, _values = struct.unpack_from("<HQQQQ", data, offset)
+        offset += 34
+        payload = memoryview(data)[offset : offset + clen]
+        segment_tags, consumed = self._decode_tag_registry(payload, 0, num_segments, comp)
+        link_tags, _ = self._decode_tag_registry(payload, consumed, num_links, comp)
+        bytes_consumed = (offset + clen) - start_offset
+        return segment_tags, link_tags, bytes_consumed
+
+    def _decode_strings(self, payload: memoryview, offset: int, compression_code: int) -> tuple[list[str], int]:
+        """Decode a string list written by `_encode_strings`, returning it and the next offset."""
+        count, clen = struct.unpack_from("<QQ", payload, offset)
+        offset += 16
+        if not count:
+            return [], offset + clen
+        strings = self._decompress_string_list(bytes(payload[offset : offset + clen]), compression_code, count)
+        return [_decode_text(value) for value in strings], offset + clen
+
+    def _decode_tag_registry(
+        self, payload: memoryview, offset: int, count: int, compression_code: int
+    ) -> tuple[TagRegistry, int]:
+        """Decode the optional fields of `count` elements written by `_encode_tag_registry`.
+
+        :returns: The registry and the offset following it.
+        """
+        columns: dict[str, TagColumn] = {}
+        (num_columns,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        for _ in range(num_columns):
+            (tag_length,) = struct.unpack_from("<H", payload, offset)
+            offset += 2
+            tag = str(payload[offset : offset + tag_length], "ascii")
+            tag_type = chr(payload[offset + tag_length])
+            width = payload[offset + tag_length + 1]
+            offset += tag_length + 2
+            n_bytes = (count + 7) // 8
+            mask = np.unpackbits(
+                np.frombuffer(payload, dtype=np.uint8, count=n_bytes, offset=offset), count=count, bitorder="little"
+            ).view(bool)
+            offset += n_bytes
+            strings: list[str] = []
+            if tag_type == "Z":
+                strings, offset = self._decode_strings(payload, offset, compression_code)
+                dtype, stored = f"<u{width}", np.int32
+            elif tag_type == "i":
+                dtype, stored = f"<i{width}", np.int64
+            elif tag_type == "f":
+                dtype, stored = f"<f{width}", np.float64
+            else:
+                raise ValueError(f"Unknown optional field type: {tag_type!r}")
+            n_values = int(mask.sum())
+            values = np.zeros(count, dtype=stored)
+            values[mask] = np.frombuffer(payload, dtype=dtype, count=n_values, offset=offset)
+            offset += n_values * np.dtype(dtype).itemsize
+            columns[tag] = TagColumn(tag, tag_type, values, np.packbits(mask), strings)
+        (num_raw,) = struct.unpack_from("<Q", payload, offset)
+        offset += 8
+        indices = np.frombuffer(payload, dtype="<u8", count=num_raw, offset=offset).tolist()
+        offset += 8 * num_raw
+        rows, offset = self._decode_strings(payload, offset, compression_code)
+        raw = {i: parse_opt_fields(row) for i, row in zip(indices, rows)}
+        return TagRegistry(count, columns, raw), offset
+
     def _parse_links_block(self, data: bytes, start_offset: int) -> tuple[list[dict], int]:
+        columns, bytes_consumed = self._decode_links_block(data, start_offset)
+        links = [
+            {
+                "from_node": from_name,
+                "to_node": to_name,
+                "from_orn": "-" if from_reverse else "+",
+                "to_orn": "-" if to_reverse else "+",
+                "alignment": alignment,
+            }
+            for from_name, to_name, from_reverse, to_reverse, alignment in zip(*columns)
+        ]
+        return links, bytes_consumed
+
+    def _decode_links_block(self, data: bytes, start_offset: int) -> tuple[LinkColumns, int]:
+        """Decode a links block into columns, with the segment names of `_segment_names`."""
         offset = start_offset + 1
 
         record_num = struct.unpack_from("<H", data, offset)[0]
@@ -442,28 +595,25 @@ class ReaderBGFA:
             comp_cigars, cigar_payload, record_num, get_integer_decoder(comp_cigars)
         )
 
-        links = []
-        for i in range(record_num):
-            from_idx = from_ids[i] - 1
-            to_idx = to_ids[i] - 1
-
-            from_name = self._segment_names[from_idx] if 0 <= from_idx < len(self._segment_names) else f"s{from_ids[i]}"
-            to_name = self._segment_names[to_idx] if 0 <= to_idx < len(self._segment_names) else f"s{to_ids[i]}"
-
-            links.append(
-                {
-                    "from_node": from_name,
-                    "to_node": to_name,
-                    "from_orn": "-" if f_orns[i] else "+",
-                    "to_orn": "-" if t_orns[i] else "+",
-                    "alignment": (
-                        cigars_bytes[i].decode("ascii") if i < len(cigars_bytes) and cigars_bytes[i] else "*"
-                    ),
-                }
-            )
+        names = self._segment_names
+        n_names = len(names)
+
+        def segment_name(seg_id: int) -> str:
+            return names[seg_id - 1] if 0 < seg_id <= n_names else f"s{seg_id}"
+
+        columns = LinkColumns(
+            [segment_name(seg_id) for seg_id in from_ids[:record_num]],
+            [segment_name(seg_id) for seg_id in to_ids[:record_num]],
+            list(f_orns[:record_num]),
+            list(t_orns[:record_num]),
+            [
+                cigars_bytes[i].decode("ascii") if i < len(cigars_bytes) and cigars_bytes[i] else "*"
+                for i in range(record_num)
+            ],
+        )
 
         bytes_consumed = (offset + clen_fromto + clen_cigars) - start_offset
-        return links, bytes_consumed
+        return columns, bytes_consumed
 
     def _decode_walk(
         self, walk_data: bytes, record_num: int, walk_compression: int, int_decoder: Callable, segment_names: list[str]
@@ -754,10 +904,32 @@ class ReaderBGFA:
         debug: bool = False,
         logfile: str = None,
         skip_payloads: bool = False,
+        trusted: bool = False,
     ) -> GFA:
+        """Read a BGFA file and return the corresponding GFA graph.
+
+        The file is decoded into columns by `_decode_bgfa`, which are then
+        added to a new graph by `_materialise`.
+
+        :param file_path: Path to the BGFA file.
+        :param skip_payloads: If set, skip every block, only the header
+            is read.
+        :param trusted: If set, the decoded values are added without
+            being validated again, for files written by `to_bgfa`.
+        :returns: A new GFA graph.
+        """
         with open(file_path, "rb") as f:
             data = f.read()
+        return self._materialise(self._decode_bgfa(data, skip_payloads=skip_payloads), trusted=trusted)
+
+    def _decode_bgfa(self, data: bytes, skip_payloads: bool = False) -> DecodedBGFA:
+        """Decode the blocks of a BGFA file.
 
+        :param data: The content of the file.
+        :param skip_payloads: If set, skip every block.
+        :returns: The decoded content.
+        :raises ValueError: If the file is truncated.
+        """
         if len(data) < 8:
             raise ValueError("BGFA file is too short")
 
@@ -768,121 +940,116 @@ class ReaderBGFA:
         offset = header["header_size"]
 
         self._segment_names = []
-        segments = {}
-        links = []
+        segment_names: list[str] = []
+        sequences: list[str] = []
+        links = LinkColumns([], [], [], [], [])
         all_paths = []
         all_walks = []
-        opt_fields_data = None
+        segment_tags = link_tags = TagRegistry()
 
         while offset < len(data):
             section_id = data[offset]
 
-            if section_id == SECTION_ID_OPT_FIELDS:
-                if skip_payloads:
-                    try:
-                        _, consumed = self._skip_block(data, offset)
-                    except ValueError:
-                        break
-                    offset += consumed
-                else:
-                    opt_fields_data = self._parse_opt_fields_block(data, offset)
-                    offset += opt_fields_data[3]
+            if skip_payloads and section_id in (
+                SECTION_ID_OPT_FIELDS,
+                SECTION_ID_OPT_COLUMNS,
+                SECTION_ID_SEGMENTS,
+                SECTION_ID_LINKS,
+                SECTION_ID_PATHS,
+                SECTION_ID_WALKS,
+            ):
+                try:
+                    _, consumed = self._skip_block(data, offset)
+                except ValueError:
+                    break
+                offset += consumed
+
+            elif section_id == SECTION_ID_OPT_FIELDS:
+                num_segment_opts, num_link_opts, opt_strings, consumed = self._parse_opt_fields_block(data, offset)
+                segment_tags = TagRegistry.from_rows(map(parse_opt_fields, opt_strings[:num_segment_opts]))
+                link_tags = TagRegistry.from_rows(
+                    map(parse_opt_fields, opt_strings[num_segment_opts : num_segment_opts + num_link_opts])
+                )
+                offset += consumed
+
+            elif section_id == SECTION_ID_OPT_COLUMNS:
+                segment_tags, link_tags, consumed = self._parse_opt_columns_block(data, offset)
+                offset += consumed
 
             elif section_id == SECTION_ID_SEGMENTS:
-                if skip_payloads:
-                    try:
-                        _, consumed = self._skip_block(data, offset)
-                    except ValueError:
-                        break
-                    offset += consumed
-                else:
-                    segs, names, consumed = self._parse_segments_block(data, offset)
-                    self._segment_names = names
-                    segments.update(segs)
-                    offset += consumed
+                names, block_sequences, consumed = self._decode_segments_block(data, offset)
+                self._segment_names = names
+                # Records are numbered from 0 in every block, a later block
+                # replaces the records of the previous ones
+                count = len(block_sequences)
+                segment_names[:count] = [names[i] if i < len(names) else f"s{i}" for i in range(count)]
+                sequences[:count] = block_sequences
+                offset += consumed
 
             elif section_id == SECTION_ID_LINKS:
-                if skip_payloads:
-                    try:
-                        _, consumed = self._skip_block(data, offset)
-                    except ValueError:
-                        break
-                    offset += consumed
-                else:
-                    lnks, consumed = self._parse_links_block(data, offset)
-                    links.extend(lnks)
-                    offset += consumed
+                columns, consumed = self._decode_links_block(data, offset)
+                for column, values in zip(links, columns):
+                    column.extend(values)
+                offset += consumed
 
             elif section_id == SECTION_ID_PATHS:
-                if skip_payloads:
-                    try:
-                        _, consumed = self._skip_block(data, offset)
-                    except ValueError:
-                        break
-                    offset += consumed
-                else:
-                    paths_data, consumed = self._parse_paths_blocks(data, offset, self._segment_names)
-                    all_paths.extend(paths_data)
-                    offset += consumed
+                paths_data, consumed = self._parse_paths_blocks(data, offset, self._segment_names)
+                all_paths.extend(paths_data)
+                offset += consumed
 
             elif section_id == SECTION_ID_WALKS:
-                if skip_payloads:
-                    try:
-                        _, consumed = self._skip_block(data, offset)
-                    except ValueError:
-                        break
-                    offset += consumed
-                else:
-                    walks_data, consumed = self._parse_walks_blocks(data, offset, self._segment_names)
-                    all_walks.extend(walks_data)
-                    offset += consumed
+                walks_data, consumed = self._parse_walks_blocks(data, offset, self._segment_names)
+                all_walks.extend(walks_data)
+                offset += consumed
 
             else:
                 logger.warning(f"Unknown section ID: {section_id}")
                 break
 
-        from pygfa.graph_element.node import Node
-        from pygfa.graph_element.edge import Edge
-
-        gfa = GFA()
+        return DecodedBGFA(
+            header,
+            segment_names,
+            sequences,
+            links,
+            all_paths,
+            all_walks,
+            segment_tags,
+            link_tags,
+        )
 
-        gfa._header_info = {"version": header["version"], "header_text": header["header_text"]}
+    def _materialise(self, decoded: DecodedBGFA, trusted: bool = False) -> GFA:
+        """Add decoded BGFA content to a new graph.
 
-        if not skip_payloads:
-            seg_opt_strings = []
-            link_opt_strings = []
-            if opt_fields_data is not None:
-                num_segments, num_links, opt_strings, _ = opt_fields_data
-                seg_opt_strings = opt_strings[:num_segments]
-                link_opt_strings = opt_strings[num_segments : num_segments + num_links]
-
-            for sid, seg_data in segments.items():
-                name = seg_data.get("name", f"s{sid}")
-                seq = seg_data.get("sequence", "*")
-                opts = parse_opt_fields(seg_opt_strings[sid]) if sid < len(seg_opt_strings) else {}
-                gfa.add_node(Node(name, seq, opt_fields=opts))
-
-            for i, link in enumerate(links):
-                opts = parse_opt_fields(link_opt_strings[i]) if i < len(link_opt_strings) else {}
-                edge = Edge(
-                    edge_id=None,
-                    from_node=link["from_node"],
-                    from_orientation=link["from_orn"],
-                    to_node=link["to_node"],
-                    to_orientation=link["to_orn"],
-                    from_positions=(None, None),
-                    to_positions=(None, None),
-                    alignment=link["alignment"],
-                    opt_fields=opts,
-                )
-                gfa.add_edge(edge)
+        The columns are handed over to the bulk methods of the graph
+        (`add_nodes_from`, `add_edges_from`, ...). Optional fields are
+        parsed only for the elements that have some.
 
-            for path_data in all_paths:
-                gfa.add_path(path_data)
-
-            for walk_data in all_walks:
-                gfa.add_walk(walk_data)
+        :param decoded: The content returned by `_decode_bgfa`.
+        :param trusted: If set, skip the validation of the values.
+        :returns: A new GFA graph.
+        """
+        header = decoded.header
+        gfa = GFA()
+        gfa._header_info = {"version": header["version"], "header_text": header["header_text"]}
 
+        gfa.add_nodes_from(
+            decoded.segment_names,
+            decoded.sequences,
+            opt_fields=_opt_fields_column(decoded.segment_tags, len(decoded.segment_names)),
+            trusted=trusted,
+        )
+        links = decoded.links
+        gfa.add_edges_from(
+            links.from_nodes,
+            np.asarray(links.from_reverse, dtype=bool),
+            links.to_nodes,
+            np.asarray(links.to_reverse, dtype=bool),
+            alignments=links.alignments,
+            opt_fields=_opt_fields_column(decoded.link_tags, len(links.from_nodes)),
+            trusted=trusted,
+        )
+        gfa.add_paths_from(decoded.paths, trusted=trusted)
+        gfa.add_walks_from(decoded.walks, trusted=trusted)
         return gfa
 
     def _skip_block(self, data: bytes, start_offset: int) -> tuple[None, int]:
@@ -943,6 +1110,16 @@ class ReaderBGFA:
                     offset += 8
                     compressed_len += clen
 
+            elif section_id == SECTION_ID_OPT_COLUMNS:
+                if len(data) < offset + 8 + 8 + 8 + 8:
+                    raise ValueError("BGFA file is too short")
+                # offset already advanced past comp by the generic prologue
+                offset += 8  # num_segments
+                offset += 8  # num_links
+                compressed_len = struct.unpack_from("<Q", data, offset)[0]
+                offset += 8
+                offset += 8
+
             elif section_id == SECTION_ID_OPT_FIELDS:
                 if len(data) < offset + 2 + 2 + 8 + 8:
                     raise ValueError("BGFA file is too short")
@@ -1393,6 +1570,17 @@ def measure_bgfa(
             )
             offset += consumed
 
+        elif section_id == SECTION_ID_OPT_COLUMNS:
+            # Columnar optional-fields block: fixed 35-byte header + payload.
+            # Not part of the per-field compression stats, so just skip it.
+            opt_offset = offset + 1 + 2 + 8 + 8
+            clen = struct.unpack_from("<Q", data, opt_offset)[0]
+            opt_offset += 8
+            opt_offset += 8  # number of values
+            if opt_offset + clen > len(data):
+                break
+            offset = opt_offset + clen
+
         elif section_id == SECTION_ID_OPT_FIELDS:
             # Optional-fields block: fixed 23-byte header + compressed payload.
             # Not part of the per-field compression stats, so just skip it.
@@ -12,6 +12,7 @@ from pygfa.bgfa._constants import (
     CIGAR_DECOMPOSITION_NUM_OPS_LENGTHS_OPS,
     CIGAR_DECOMPOSITION_STRING,
     SECTION_ID_LINKS,
+    SECTION_ID_OPT_COLUMNS,
     SECTION_ID_OPT_FIELDS,
     SECTION_ID_PATHS,
     SECTION_ID_SEGMENTS,
@@ -598,6 +599,51 @@ def validate_bgfa(input_file: str, verbose: bool = False, debug: bool = False) -
             consumed = sub_offset - offset
             offset += consumed
 
+        elif section_id == SECTION_ID_OPT_COLUMNS:
+            block_result["section_type"] = "opt_columns"
+            opt_offset = offset + 1
+
+            field_names = ["comp", "num_segments", "num_links", "clen", "num_values"]
+            fmt_chars = ["<H", "<Q", "<Q", "<Q", "<Q"]
+            sizes = [2, 8, 8, 8, 8]
+
+            parsed = {}
+            for fn, fc, sz in zip(field_names, fmt_chars, sizes):
+                try:
+                    val = struct.unpack_from(fc, data, opt_offset)[0]
+                except struct.error:
+                    val = 0
+                    block_result["fields"][fn] = {"value": 0, "correct": False, "error": "Truncated"}
+                    result["valid"] = False
+                parsed[fn] = val
+                opt_offset += sz
+
+            for fn in ["comp", "num_segments", "num_links", "clen"]:
+                if fn not in block_result["fields"]:
+                    block_result["fields"][fn] = {"value": parsed[fn], "correct": True}
+
+            # The values are counted once decoded
+            try:
+                segment_tags, link_tags, consumed = reader._parse_opt_columns_block(data, offset)
+                rows = segment_tags.rows() + link_tags.rows()
+                actual = sum(len(row) for row in rows if row)
+                correct = actual == parsed["num_values"]
+                field_result = {"value": parsed["num_values"], "actual": actual, "correct": correct}
+                if not correct:
+                    field_result["message"] = (
+                        f"opt_columns value count mismatch: expected {parsed['num_values']}, got {actual}"
+                    )
+                    result["valid"] = False
+                block_result["fields"]["num_values"] = field_result
+                block_result["decompressed"] = rows
+            except Exception as e:
+                block_result["fields"]["num_values"] = {"value": parsed["num_values"], "correct": False}
+                block_result["decompressed"] = {"error": str(e)}
+                result["valid"] = False
+                consumed = (opt_offset + parsed["clen"]) - offset
+
+            offset += consumed
+
         elif section_id == SECTION_ID_OPT_FIELDS:
             block_result["section_type"] = "opt_fields"
             opt_offset = offset + 1
@@ -1098,6 +1144,38 @@ def dump_bgfa(file_path: str, text_format: bool = False) -> None:
 
             offset += consumed
 
+        elif section_id == SECTION_ID_OPT_COLUMNS:
+            block_result["section_type"] = "opt_columns"
+
+            try:
+                comp, num_segments, num_links, clen, num_values = struct.unpack_from("<HQQQQ", data, offset + 1)
+            except struct.error:
+                block_result["error"] = "Truncated opt-columns block header"
+                result["blocks"].append(block_result)
+                break
+            opt_offset = offset + 1 + 34
+
+            block_result["fields"] = {
+                "opt_fields_compression_code": {
+                    "value": f"0x{comp:04X}",
+                    "description": _describe_compression_code(comp),
+                },
+                "num_segments": {"value": num_segments},
+                "num_links": {"value": num_links},
+                "opt_columns_length_bytes": validate_field(clen, len(data) - opt_offset, "opt_columns_length"),
+                "num_values": {"value": num_values},
+            }
+            try:
+                segment_tags, link_tags, _ = reader._parse_opt_columns_block(data, offset)
+                block_result["segment_tags"] = segment_tags.tags()
+                block_result["link_tags"] = link_tags.tags()
+            except Exception as e:
+                block_result["error"] = f"Error decoding opt-columns block: {e}"
+
+            result["blocks"].append(block_result)
+
+            offset = opt_offset + clen
+
         elif section_id == SECTION_ID_OPT_FIELDS:
             block_result["section_type"] = "opt_fields"
 
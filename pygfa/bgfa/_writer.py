@@ -5,6 +5,8 @@ from __future__ import annotations
 import io
 import struct
 
+import numpy as np
+
 from pygfa.bgfa._codec_utils import pack_bits_lsb, serialize_opt_fields
 from pygfa.encoding.integer_list_encoding import compress_integer_list_uints_delta
 from pygfa.bgfa._constants import (
@@ -16,7 +18,7 @@ from pygfa.bgfa._constants import (
     DEFAULT_BLOCK_SIZE,
     INTEGER_ENCODING_VARINT,
     SECTION_ID_LINKS,
-    SECTION_ID_OPT_FIELDS,
+    SECTION_ID_OPT_COLUMNS,
     SECTION_ID_PATHS,
     SECTION_ID_SEGMENTS,
     SECTION_ID_WALKS,
@@ -47,6 +49,9 @@ from pygfa.encoding.enums import IntegerEncoding, StringEncoding, make_compressi
 from pygfa.encoding.heuristic import select_string_encoding
 from pygfa.exceptions import GFAError
 from pygfa.gfa import GFA
+from pygfa.gfa.sequences import PackedSequence, SequenceStore
+from pygfa.gfa.steps import OrientedSteps
+from pygfa.gfa.tags import TagRegistry
 
 # =============================================================================
 # String Compression Helper
@@ -81,6 +86,91 @@ def _compress_string_for_bgfa(string_list: list[str], compression_code: int) ->
     return compress_string_list(string_list, int_encoder, method, first_byte_strategy=int_encoding)
 
 
+def _encode_strings(strings: list[str], compression_code: int) -> bytes:
+    """Encode a string list as its length and its compressed payload."""
+    payload = _compress_string_for_bgfa(strings, compression_code) if strings else b""
+    return struct.pack("<QQ", len(strings), len(payload)) + payload
+
+
+def _encode_tag_registry(registry: TagRegistry, compression_code: int) -> tuple[bytes, int]:
+    """Encode the optional fields of a sequence of elements, by tag.
+
+    Layout (integers are little-endian)::
+
+        column count (H)
+        for each column:
+            tag length (H), tag, type (1 byte: i, f or Z), value width (B)
+            presence bitmap (1 bit per element, LSB first)
+            i: values of the elements having the tag, signed integers of
+               the smallest width holding them
+            f: float64 values of the elements having the tag
+            Z: distinct strings (see `_encode_strings`), then the code of
+               the elements having the tag, unsigned integers of the
+               smallest width holding them
+        fields of the elements not stored in the columns:
+            element count (Q), uint64 element indices,
+            tab-joined ``TAG:TYPE:VALUE`` strings (see `_encode_strings`)
+
+    Strings are compressed with `compression_code`.
+
+    :returns: The payload and the number of values it holds.
+    """
+    parts = [struct.pack("<H", len(registry.columns))]
+    n_values = 0
+    for tag, column in registry.columns.items():
+        encoded_tag = tag.encode("ascii")
+        mask = column.mask()
+        values = column.values[mask]
+        if column.type == "Z":
+            dtype = np.min_scalar_type(max(len(column.strings) - 1, 0))
+        elif column.type == "i" and len(values):
+            # Negative bounds make min_scalar_type return signed types
+            low, high = min(int(values.min()), -1), -int(values.max()) - 1
+            dtype = np.promote_types(np.min_scalar_type(low), np.min_scalar_type(high))
+        else:
+            dtype = np.dtype("<f8" if column.type == "f" else "<i1")
+        dtype = dtype.newbyteorder("<")
+        parts.append(struct.pack("<H", len(encoded_tag)) + encoded_tag + column.type.encode("ascii"))
+        parts.append(struct.pack("<B", dtype.itemsize))
+        parts.append(np.packbits(mask, bitorder="little").tobytes())
+        if column.type == "Z":
+            parts.append(_encode_strings(column.strings, compression_code))
+        parts.append(values.astype(dtype).tobytes())
+        n_values += len(values)
+    raw = sorted(registry.raw.items())
+    parts.append(struct.pack("<Q", len(raw)))
+    parts.append(np.array([i for i, _ in raw], dtype="<u8").tobytes())
+    parts.append(_encode_strings([serialize_opt_fields(row) for _, row in raw], compression_code))
+    n_values += sum(len(row) for _, row in raw)
+    return b"".join(parts), n_values
+
+
+def _stored_steps(record: dict, field: str) -> OrientedSteps | None:
+    """Return the integer-encoded steps of a stored path or walk, if any.
+
+    The value is read with `dict.get` so that it is not resolved to the
+    list or string view.
+    """
+    value = dict.get(record, field)
+    return value if isinstance(value, OrientedSteps) else None
+
+
+def _packed_run(values: list) -> tuple[SequenceStore, int] | None:
+    """Return the store and first index of consecutive packed sequences.
+
+    :param values: The raw `sequence` attributes of a segments block.
+    :returns: ``(store, start)`` if the values are the sequences `start`,
+        `start + 1`, ... of a single `SequenceStore`, None otherwise.
+    """
+    if not values or not isinstance(values[0], PackedSequence):
+        return None
+    store, start = values[0].store, values[0].index
+    for offset, value in enumerate(values):
+        if not isinstance(value, PackedSequence) or value.store is not store or value.index != start + offset:
+            return None
+    return store, start
+
+
 def _parse_walk_string(walk_str: str) -> list[tuple[str, str]]:
     """Parse a GFA walk string into (segment_name, orientation) pairs.
 
@@ -183,6 +273,23 @@ class BGFAWriter:
                 else:
                     self._comp_options[k] = v
         self._segment_map = {}
+        # Segment names of the graph steps and their ids in _segment_map
+        self._step_ids: tuple[list[str], np.ndarray] | None = None
+
+    def _step_columns(self, steps: OrientedSteps, with_names: bool) -> tuple[list[int], list[str], list[int]]:
+        """Return the segment ids, names and orientation bits of encoded steps.
+
+        The segment ids are the ones of `_segment_map`, -1 for segments
+        that are not nodes of the graph. Names are only returned if
+        `with_names` is set.
+        """
+        names = steps.names
+        if self._step_ids is None or self._step_ids[0] is not names or len(self._step_ids[1]) < len(names):
+            table = np.array([self._segment_map.get(name, -1) for name in names], dtype=np.int64)
+            self._step_ids = (names, table)
+        seg_ids = self._step_ids[1][steps.ids].tolist()
+        step_names = [names[i] for i in steps.ids.tolist()] if with_names else []
+        return seg_ids, step_names, steps.orientations().astype(np.uint8).tolist()
 
     def _write_header(self, buf: io.BytesIO) -> None:
         logger.debug("BGFAWriter._write_header() -> entry")
@@ -210,18 +317,30 @@ class BGFAWriter:
         nodes_data = dict(self._gfa.nodes(data=True))
 
         names = [name for name, sid in chunk]
-        seqs = []
-        for name, sid in chunk:
-            s = nodes_data[name].get("sequence", "*")
-            if s is None or s == "":
-                s = "*"
-            seqs.append(s)
-
+        payload_names = _compress_string_for_bgfa(names, names_enc)
         logger.debug("BGFAWriter._write_segments_block() -> segment names=%s", names)
-        logger.debug("BGFAWriter._write_segments_block() -> sequences=%s", seqs)
 
-        payload_names = _compress_string_for_bgfa(names, names_enc)
-        payload_seqs = _compress_string_for_bgfa(seqs, seqs_enc)
+        # Sequences packed by GFA.pack_sequences are copied as they are
+        run = None
+        if seqs_enc & 0xFF == STRING_ENCODING_2BIT_DNA:
+            run = _packed_run([dict.get(nodes_data[name], "sequence") for name in names])
+        if run is not None:
+            store, start = run
+            lengths = store.lengths(start, start + len(chunk))
+            payload_seqs = get_integer_encoder(seqs_enc)(lengths.tolist()) + store.to_2bit_dna(
+                start, start + len(chunk)
+            )
+            seqs_length = int(lengths.sum())
+        else:
+            seqs = []
+            for name, sid in chunk:
+                s = nodes_data[name].get("sequence", "*")
+                if s is None or s == "":
+                    s = "*"
+                seqs.append(s)
+            logger.debug("BGFAWriter._write_segments_block() -> sequences=%s", seqs)
+            payload_seqs = _compress_string_for_bgfa(seqs, seqs_enc)
+            seqs_length = sum(len(s) if s != "*" else 0 for s in seqs)
 
         payload = payload_names + payload_seqs
 
@@ -232,7 +351,7 @@ class BGFAWriter:
         buf.write(struct.pack("<Q", sum(len(n) for n in names)))
         buf.write(struct.pack("<H", seqs_enc))
         buf.write(struct.pack("<Q", len(payload_seqs)))
-        buf.write(struct.pack("<Q", sum(len(s) if s != "*" else 0 for s in seqs)))
+        buf.write(struct.pack("<Q", seqs_length))
         buf.write(payload)
         logger.debug("BGFAWriter._write_segments_block() -> exit, payload_size=%d", len(payload))
 
@@ -316,24 +435,33 @@ class BGFAWriter:
         all_orientations = []
         all_cigars = []
 
+        with_names = (walk_enc >> 24) & 0xFF == WALK_DECOMPOSITION_ORIENTATION_STRID
         for pd in chunk:
             pn = pd.get("path_name", "")
             path_names.append(pn)
 
-            segments = pd.get("segments", [])
-            all_walk_lengths.append(len(segments))
-            for seg in segments:
-                if len(seg) < 2:
-                    all_seg_ids.append(0)
-                    all_seg_names.append("")
-                    all_orientations.append(0)
-                    continue
-                name = seg[:-1]
-                orientation = seg[-1]
-                seg_id = self._segment_map.get(name, 0)
-                all_seg_ids.append(seg_id)
-                all_seg_names.append(name)
-                all_orientations.append(0 if orientation == "+" else 1)
+            steps = _stored_steps(pd, "segments")
+            if steps is not None:
+                all_walk_lengths.append(len(steps))
+                seg_ids, seg_names, orientations = self._step_columns(steps, with_names)
+                all_seg_ids.extend(0 if seg_id < 0 else seg_id for seg_id in seg_ids)
+                all_seg_names.extend(seg_names)
+                all_orientations.extend(orientations)
+            else:
+                segments = pd.get("segments", [])
+                all_walk_lengths.append(len(segments))
+                for seg in segments:
+                    if len(seg) < 2:
+                        all_seg_ids.append(0)
+                        all_seg_names.append("")
+                        all_orientations.append(0)
+                        continue
+                    name = seg[:-1]
+                    orientation = seg[-1]
+                    seg_id = self._segment_map.get(name, 0)
+                    all_seg_ids.append(seg_id)
+                    all_seg_names.append(name)
+                    all_orientations.append(0 if orientation == "+" else 1)
 
             overlaps = pd.get("overlaps", [])
             if isinstance(overlaps, list) and overlaps:
@@ -432,6 +560,7 @@ class BGFAWriter:
         all_seg_names = []
         all_orientations = []
 
+        with_names = (comp_walks >> 24) & 0xFF == WALK_DECOMPOSITION_ORIENTATION_STRID
         for wd in chunk:
             sample_ids.append(wd.get("sample_id", ""))
             hap_indices.append(int(wd.get("hapindex", 0)))
@@ -441,6 +570,18 @@ class BGFAWriter:
             starts.append(0 if start is None else int(start))
             ends.append(0 if end is None else int(end))
 
+            steps = _stored_steps(wd, "walk")
+            if steps is not None:
+                seg_ids, seg_names, orientations = self._step_columns(steps, with_names)
+                if -1 in seg_ids:
+                    name = steps.names[steps.ids[seg_ids.index(-1)]]
+                    raise GFAError(f"Walk references unknown segment '{name}'")
+                all_walk_lengths.append(len(steps))
+                all_seg_ids.extend(seg_ids)
+                all_seg_names.extend(seg_names)
+                all_orientations.extend(orientations)
+                continue
+
             segments = _parse_walk_string(wd.get("walk", ""))
             all_walk_lengths.append(len(segments))
             for name, orientation in segments:
@@ -503,16 +644,15 @@ class BGFAWriter:
     def _write_opt_fields_block(self, buf: io.BytesIO, names: list[str], edges: list, enc: int) -> None:
         """Write a block holding optional fields for segments and links.
 
-        The payload is a list of tab-joined ``TAG:TYPE:VALUE`` strings, one per
-        segment (in segment order) followed by one per link (in link order).
+        The fields are stored by tag, as in a `TagRegistry`: the payload
+        holds the columns of the segments (in segment order) followed by
+        the ones of the links (in link order), see `_encode_tag_registry`.
         """
         nodes_data = dict(self._gfa.nodes(data=True))
         seg_reserved = {"nid", "sequence", "slen"}
-        seg_opts = []
-        for name in names:
-            data = nodes_data.get(name, {})
-            opts = {k: v for k, v in data.items() if k not in seg_reserved}
-            seg_opts.append(serialize_opt_fields(opts))
+        seg_tags = TagRegistry.from_rows(
+            {k: v for k, v in nodes_data.get(name, {}).items() if k not in seg_reserved} for name in names
+        )
 
         link_reserved = {
             "eid",
@@ -528,29 +668,29 @@ class BGFAWriter:
             "from_segment_end",
             "to_segment_end",
         }
-        link_opts = []
-        for _u, _v, _k, d in edges:
-            opts = {k2: v2 for k2, v2 in d.items() if k2 not in link_reserved}
-            link_opts.append(serialize_opt_fields(opts))
+        link_tags = TagRegistry.from_rows(
+            ({k2: v2 for k2, v2 in d.items() if k2 not in link_reserved} for _u, _v, _k, d in edges), len(edges)
+        )
 
-        all_opts = seg_opts + link_opts
-        if not any(all_opts):
+        if not seg_tags.tags() and not link_tags.tags():
             logger.debug("BGFAWriter._write_opt_fields_block() -> no opt fields, skipping block")
             return
 
-        payload = _compress_string_for_bgfa(all_opts, enc)
+        seg_payload, seg_values = _encode_tag_registry(seg_tags, enc)
+        link_payload, link_values = _encode_tag_registry(link_tags, enc)
+        payload = seg_payload + link_payload
 
-        buf.write(struct.pack("<B", SECTION_ID_OPT_FIELDS))
-        buf.write(struct.pack("<H", len(seg_opts)))
-        buf.write(struct.pack("<H", len(link_opts)))
+        buf.write(struct.pack("<B", SECTION_ID_OPT_COLUMNS))
         buf.write(struct.pack("<H", enc))
+        buf.write(struct.pack("<Q", len(seg_tags)))
+        buf.write(struct.pack("<Q", len(link_tags)))
         buf.write(struct.pack("<Q", len(payload)))
-        buf.write(struct.pack("<Q", sum(len(s) for s in all_opts)))
+        buf.write(struct.pack("<Q", seg_values + link_values))
         buf.write(payload)
         logger.debug(
-            "BGFAWriter._write_opt_fields_block() -> exit, seg_opts=%d, link_opts=%d, payload_size=%d",
-            len(seg_opts),
-            len(link_opts),
+            "BGFAWriter._write_opt_fields_block() -> exit, seg_tags=%d, link_tags=%d, payload_size=%d",
+            len(seg_tags.columns),
+            len(link_tags.columns),
             len(payload),
         )
 
@@ -84,6 +84,12 @@ class DictionaryTrainingError(GFAError):
     pass
 
 
+class FrozenGraphError(GFAError):
+    """Raised when modifying a graph with a read-only (frozen) backend."""
+
+    pass
+
+
 __all__ = [
     "GFAError",
     "InvalidNodeError",
@@ -98,4 +104,5 @@ __all__ = [
     "InvalidCompressionError",
     "FileFormatError",
     "DictionaryTrainingError",
+    "FrozenGraphError",
 ]
@@ -28,7 +28,7 @@ from pygfa.exceptions import (  # noqa: F401
     InvalidElementError,
 )
 
-__all__ = ["GFA", "Element", "BaseGFA"]
+__all__ = ["GFA", "GFAView", "Element", "BaseGFA"]
 
 
 class GFA(GFAElementsMixin, GFAQueryMixin, GFAParserMixin):
@@ -81,3 +81,7 @@ class GFA(GFAElementsMixin, GFAQueryMixin, GFAParserMixin):
             return check_overlap(self, dir_path, filename)
         else:
             return check_overlap(self, "", None)
+
+
+# The view module subclasses GFA
+from pygfa.gfa.view import GFAView  # noqa: E402
@@ -10,11 +10,15 @@ from __future__ import annotations
 import copy
 import logging
 import re
+from multiprocessing import shared_memory
 from typing import Any
 
 import networkx as nx
 
 from pygfa.exceptions import InvalidElementError, InvalidSearchParameters
+from pygfa.gfa import snapshot
+from pygfa.gfa.frozen import CSRGraph, EdgeEndsView
+from pygfa.gfa.traversals import TraversalIndex
 from pygfa.graph_element import edge as ge
 from pygfa.graph_element import node
 from pygfa.graph_element import subgraph as sg
@@ -66,15 +70,30 @@ class BaseGFA:
 
         self._graph = nx.MultiGraph(base_graph)
         self._subgraphs: dict[str, Any] = {}
+        # Integer ids of the segment names used by paths and walks
         self._segment_map: dict[str, int] = {}
+        self._segment_names: list[str] = []
         self._paths: dict[str, Any] = {}
         self._walks: dict[str, Any] = {}
         self._header_info: dict[str, Any] = {}
+        # End nodes of every edge by edge key, see _rebuild_edge_index
+        self._edge_index: dict[str, tuple[str, str]] | EdgeEndsView = {}
         self._next_virtual_id: int = 0 if base_graph is None else self._find_max_virtual_id()
+        if base_graph is not None:
+            self._rebuild_edge_index()
+        # Incremented by every change of the elements, see _touch
+        self._version = 0
+        # Search indexes and query columns by element type and attribute,
+        # built for _indexes_version, see GFAQueryMixin._cached
+        self._indexes: dict[tuple, Any] = {}
+        self._indexes_version = 0
+        # Built on first use then kept up to date, see traversal_index
+        self._traversals: TraversalIndex | None = None
 
         # Initialize segment map from base_graph if provided
         if base_graph is not None and hasattr(base_graph, "_segment_map"):
-            self._segment_map = base_graph._segment_map.copy()
+            self._segment_names = sorted(base_graph._segment_map, key=base_graph._segment_map.get)
+            self._segment_map = {name: i for i, name in enumerate(self._segment_names)}
         if base_graph is not None and hasattr(base_graph, "_header_info"):
             self._header_info = base_graph._header_info.copy()
 
@@ -87,13 +106,7 @@ class BaseGFA:
         try:
             if self._graph.has_node(id_):
                 return True
-            edge_keys = (
-                key
-                for from_node in self._graph.adj
-                for to_node in self._graph.adj[from_node]
-                for key in self._graph.adj[from_node][to_node]
-            )
-            if id_ in edge_keys:
+            if self._get_edge_end_nodes(id_) != (None, None):
                 return True
             if id_ in self._subgraphs:
                 return True
@@ -151,8 +164,169 @@ class BaseGFA:
         self._subgraphs.clear()
         self._paths.clear()
         self._walks.clear()
-        self._segment_map.clear()
+        # Stored steps keep a reference to the names list, a new one is
+        # started instead of clearing it
+        self._segment_map = {}
+        self._segment_names = []
         self._header_info.clear()
+        self._edge_index.clear()
+        self._traversals = None
+        self._touch()
+
+    def _touch(self) -> None:
+        """Record a change of the nodes, edges or subgraphs of the graph.
+
+        Called by the methods adding or removing elements, it makes the
+        search indexes be rebuilt. Code changing the networkx graph or
+        the attribute dictionaries directly has to call it too, through
+        `invalidate_indexes`.
+        """
+        self._version += 1
+
+    def _rebuild_edge_index(self) -> None:
+        """Index the end nodes of every edge of the graph by edge key.
+
+        The index is kept up to date by `add_edge`, `remove_edge`,
+        `remove_edges`, `remove_node` and `clear`, it has to be rebuilt
+        only after adding edges directly to the networkx graph.
+        """
+        self._edge_index = {key: (from_node, to_node) for from_node, to_node, key in self._graph.edges(keys=True)}
+
+    @property
+    def is_frozen(self) -> bool:
+        """True if the graph is stored in a read-only `CSRGraph`."""
+        return isinstance(self._graph, CSRGraph)
+
+    def freeze(self) -> BaseGFA:
+        """Return a read-only copy of the graph backed by NumPy arrays.
+
+        Nodes and edges are stored in a `CSRGraph` (dense integer node
+        ids, CSR adjacency, orientation bitsets, columnar sequences and
+        alignments) instead of networkx dictionaries, at a fraction of
+        the memory. Queries and the algorithms in `pygfa.algorithms` work
+        unchanged, adding or removing nodes and edges raises
+        `FrozenGraphError`.
+
+        :returns: A new graph of the same class, or the graph itself
+            if it is already frozen.
+        """
+        if self.is_frozen:
+            return self
+        frozen = self._new_graph()
+        frozen._graph = CSRGraph(self._graph)
+        frozen._subgraphs = dict(self._subgraphs)
+        frozen._segment_map = dict(self._segment_map)
+        frozen._segment_names = list(self._segment_names)
+        frozen._paths = dict(self._paths)
+        frozen._walks = dict(self._walks)
+        frozen._header_info = dict(self._header_info)
+        frozen._edge_index = dict(self._edge_index)
+        frozen._next_virtual_id = self._next_virtual_id
+        return frozen
+
+    def _new_graph(self) -> BaseGFA:
+        """Return a new empty graph of the class of this one, for copies."""
+        return self.__class__()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        if self.is_frozen:
+            # Derived from the CSR columns and the segment names when
+            # loaded, rebuilding them is faster than unpickling them
+            del state["_edge_index"]
+            del state["_segment_map"]
+        # Rebuilt when needed
+        state.pop("_indexes", None)
+        state.pop("_traversals", None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_version", 0)
+        self._indexes = {}
+        self._indexes_version = self._version
+        self._traversals = None
+        if "_edge_index" not in state:
+            self._edge_index = EdgeEndsView(self._graph)
+            self._segment_map = dict(zip(self._segment_names, range(len(self._segment_names))))
+
+    def save_snapshot(self, path: str) -> None:
+        """Save a binary snapshot of the graph, reloaded by `load_snapshot`.
+
+        The graph is frozen (see `freeze`) and dumped as it is stored in
+        memory: names, sequence and alignment buffers, CSR adjacency,
+        path and walk step arrays, optional fields. Nothing has to be
+        parsed or decoded when the snapshot is loaded.
+
+        :param path: The snapshot file.
+        """
+        snapshot.save_snapshot(self.freeze(), path)
+
+    @classmethod
+    def load_snapshot(cls, path: str, mmap: bool = True) -> BaseGFA:
+        """Load a graph saved by `save_snapshot`.
+
+        Snapshots are pickles tied to the pygfa version that wrote them:
+        only load the ones you wrote.
+
+        :param path: The snapshot file.
+        :param mmap: If set, the arrays of the graph are read-only views
+            of the memory-mapped file instead of being read at once.
+        :returns: The frozen graph.
+        :raises FileFormatError: If the file is not a snapshot.
+        :raises InvalidElementError: If the snapshot holds a graph that
+            is not an instance of this class.
+        """
+        graph = snapshot.load_snapshot(path, use_mmap=mmap)
+        if not isinstance(graph, cls):
+            raise InvalidElementError(f"The snapshot graph is a {type(graph).__name__}, not a {cls.__name__}.")
+        return graph
+
+    def to_shared_memory(self, name: str | None = None) -> shared_memory.SharedMemory:
+        """Publish a read-only snapshot of the graph in shared memory.
+
+        The graph is frozen (see `freeze`) and its arrays (CSR adjacency,
+        edge columns, sequences, alignments, path and walk steps) are
+        copied once into a `multiprocessing.shared_memory` block, that
+        worker processes attach with `attach_shared` without copying them.
+
+        :param name: The name of the block (default: a random name).
+        :returns: The shared memory block, pass its ``name`` to the
+            workers. The caller has to ``close()`` and ``unlink()`` it
+            once they are done.
+        """
+        return snapshot.to_shared_memory(self.freeze(), name)
+
+    @classmethod
+    def attach_shared(cls, name: str) -> BaseGFA:
+        """Attach a graph published by `to_shared_memory`.
+
+        Only the Python part of the snapshot (node names, edge keys,
+        optional fields, ...) is unpickled, the arrays are read-only
+        views of the shared block. The graph is frozen and can be read
+        concurrently.
+
+        :param name: The name of the shared memory block.
+        :returns: The frozen graph.
+        :raises InvalidElementError: If the block holds a graph that is
+            not an instance of this class.
+        """
+        graph = snapshot.attach_shared(name)
+        if not isinstance(graph, cls):
+            raise InvalidElementError(f"The shared graph is a {type(graph).__name__}, not a {cls.__name__}.")
+        return graph
+
+    def _segment_id(self, name: str) -> int:
+        """Return the integer id of a segment name used by paths and walks.
+
+        :param name: The segment name.
+        :returns: The id of the name, a new one if the name is unknown.
+        """
+        seg_id = self._segment_map.get(name)
+        if seg_id is None:
+            seg_id = self._segment_map[name] = len(self._segment_names)
+            self._segment_names.append(name)
+        return seg_id
 
     def _get_virtual_id(self, increment: bool = True) -> int:
         """Return the next virtual id value available.
@@ -237,9 +411,10 @@ class BaseGFA:
         :param edge_key: The edge key to look up.
         :returns: Tuple of (from_node, to_node) or (None, None) if not found.
         """
-        for from_node, to_node, key in self.edges_iter(keys=True):
-            if key == edge_key:
-                return from_node, to_node
+        end_nodes = self._edge_index.get(edge_key)
+        # Edges removed directly from the networkx graph leave stale entries
+        if end_nodes is not None and self._graph.has_edge(*end_nodes, edge_key):
+            return end_nodes
         return None, None
 
     def get(self, key: str) -> Any | None:
@@ -0,0 +1,126 @@
+"""
+Parallel, chunked parsing of plain text GFA files.
+
+A plain ``.gfa`` file is split into byte ranges whose boundaries fall
+right after a newline, so that every range holds whole lines. Each range
+is parsed in a worker process by the fast parser of
+:mod:`pygfa.gfa.records` into per-record-type batches, and the batches
+are applied to the graph by the parent process in file order. Applying
+the records in file order keeps virtual id assignment, and therefore the
+resulting graph, identical to the serial loader.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from pygfa.gfa.records import HeaderRecord, parse_record
+
+# Batch key of the lines the fast parser rejects, they are parsed with
+# the Lark grammar by the parent process.
+RAW_BATCH = "?"
+
+
+class ChunkBatches(NamedTuple):
+    """The parsed content of a byte range of a GFA file.
+
+    :param order: One batch key per parsed line, in file order.
+    :param batches: Records (or ``(line_num, line)`` pairs for the
+        ``RAW_BATCH`` key) grouped by record type.
+    :param line_count: Number of lines in the chunk, used to compute
+        absolute line numbers for the following chunks.
+    """
+
+    order: str
+    batches: dict[str, list[Any]]
+    line_count: int
+
+
+def chunk_offsets(filepath: str, n_chunks: int) -> list[tuple[int, int]]:
+    """Split a file into at most `n_chunks` byte ranges of whole lines.
+
+    :param filepath: Path to an uncompressed file.
+    :param n_chunks: The requested number of ranges.
+    :returns: A list of ``(start, end)`` byte offsets covering the file.
+    """
+    size = os.path.getsize(filepath)
+    boundaries = [0]
+    with open(filepath, "rb") as f:
+        for i in range(1, n_chunks):
+            position = size * i // n_chunks
+            if position <= boundaries[-1]:
+                continue
+            # Move the boundary past the end of the current line
+            f.seek(position - 1)
+            f.readline()
+            position = f.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def parse_chunk(filepath: str, start: int, end: int, include: frozenset[str] | None = None) -> ChunkBatches:
+    """Parse the lines of a byte range of a GFA file.
+
+    :param filepath: Path to an uncompressed GFA file.
+    :param start: Offset of the first byte, at the start of a line.
+    :param end: Offset past the last byte, at the start of a line or at
+        the end of the file.
+    :param include: Record type letters to parse, other lines are
+        skipped (default: all record types).
+    :returns: The records of the range, grouped by record type.
+    """
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode()
+
+    lines = data.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    order: list[str] = []
+    batches: dict[str, list[Any]] = {}
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if include is not None and line[0] not in include:
+            continue
+        record = parse_record(line)
+        if isinstance(record, HeaderRecord):
+            continue
+        if record is None:
+            key = RAW_BATCH
+            item: Any = (i + 1, line)
+        else:
+            key = line[0]
+            item = record
+        order.append(key)
+        batches.setdefault(key, []).append(item)
+    return ChunkBatches("".join(order), batches, len(lines))
+
+
+def parse_file_chunks(filepath: str, workers: int, include: frozenset[str] | None = None):
+    """Parse a plain GFA file in a pool of worker processes.
+
+    :param filepath: Path to an uncompressed GFA file.
+    :param workers: The number of worker processes.
+    :param include: Record type letters to parse (default: all).
+    :returns: An iterator over the `ChunkBatches` of the file, in file order.
+    """
+    # More chunks than workers, so that a slow chunk doesn't stall the pool
+    offsets = chunk_offsets(filepath, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            parse_chunk,
+            [filepath] * len(offsets),
+            [start for start, _ in offsets],
+            [end for _, end in offsets],
+            [include] * len(offsets),
+        )
+
+
+__all__ = ["ChunkBatches", "chunk_offsets", "parse_chunk", "parse_file_chunks"]
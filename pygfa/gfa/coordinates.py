@@ -0,0 +1,135 @@
+"""
+Base-pair coordinates along paths and walks.
+
+A `CoordinateIndex` holds the prefix sums of the step lengths of a path
+or a walk: the start and the end of every step in the coordinates of
+the sequence it spells, so that a position is translated to a step with
+a binary search (`numpy.searchsorted`) instead of a walk along the
+steps.
+
+Coordinates are 0-based, intervals half-open. A walk starts at its
+``seq_start``, a path at 0. Consecutive path steps share the bases of
+their overlap (the length the CIGAR spans on the first segment): a
+position in an overlap is given to the later step.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Operations of an overlap CIGAR consuming the bases of the first (second) segment
+_CIGAR_PATTERN = re.compile(r"(\d+)([MIDNSHP=X])")
+_FIRST_SEGMENT_OPERATIONS = frozenset("MDN=X")
+_SECOND_SEGMENT_OPERATIONS = frozenset("MIS=X")
+
+
+def overlap_length(cigar: object, second: bool = False) -> int:
+    """Return the number of bases of the first segment an overlap spans.
+
+    :param cigar: The overlap CIGAR, e.g. "10M2D"; "*" or anything that
+        is not a CIGAR string counts as no overlap.
+    :param second: If set, return the number of bases of the second
+        segment instead.
+    :returns: The overlap length.
+    """
+    if not isinstance(cigar, str):
+        return 0
+    operations = _SECOND_SEGMENT_OPERATIONS if second else _FIRST_SEGMENT_OPERATIONS
+    return sum(int(length) for length, op in _CIGAR_PATTERN.findall(cigar) if op in operations)
+
+
+class CoordinateIndex:
+    """The coordinates of the steps of a path or a walk.
+
+    :param ids: The segment id of each step.
+    :param reverse: The orientation of each step (True for "-").
+    :param lengths: The length of every segment, by segment id.
+    :param overlaps: The overlap CIGAR between each pair of consecutive
+        steps, ignored unless there is one per pair.
+    :param origin: The coordinate of the first base.
+    """
+
+    __slots__ = ("ids", "reverse", "starts", "ends", "origin")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        reverse: np.ndarray,
+        lengths: np.ndarray,
+        overlaps: Sequence[object] | None = None,
+        origin: int = 0,
+    ):
+        self.ids = ids
+        self.reverse = reverse
+        self.origin = origin
+        step_lengths = lengths[ids].astype(np.int64)
+        advance = step_lengths[:-1]
+        if overlaps is not None and len(ids) and len(overlaps) == len(ids) - 1:
+            spans = np.fromiter(map(overlap_length, overlaps), dtype=np.int64, count=len(overlaps))
+            # No step may end before the previous one does
+            spans = np.minimum(spans, np.minimum(step_lengths[:-1], step_lengths[1:]))
+            advance = advance - spans
+        self.starts = np.zeros(len(ids), dtype=np.int64)
+        np.cumsum(advance, out=self.starts[1:])
+        self.starts += origin
+        self.ends = self.starts + step_lengths
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def end(self) -> int:
+        """The coordinate after the last base."""
+        return int(self.ends[-1]) if len(self.ends) else self.origin
+
+    def locate(self, positions: Iterable[int] | int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the steps holding some positions.
+
+        :param positions: The positions.
+        :returns: Two arrays: the index of the step holding each
+            position, and the offset of the position from the start of
+            the step, along the path or the walk. Both are -1 for the
+            positions out of it.
+        """
+        if not isinstance(positions, np.ndarray):
+            positions = list(positions) if isinstance(positions, Iterable) else [positions]
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1)
+        if not len(self.ids):
+            missing = np.full(len(positions), -1, dtype=np.int64)
+            return missing, missing.copy()
+        steps = np.searchsorted(self.starts, positions, "right") - 1
+        safe = np.maximum(steps, 0)
+        found = (steps >= 0) & (positions < self.ends[safe])
+        return np.where(found, steps, -1), np.where(found, positions - self.starts[safe], -1)
+
+    def segment_offsets(self, steps: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Return offsets along steps as offsets on the segment sequences.
+
+        :param steps: Step indices, as returned by `locate`.
+        :param offsets: Offsets from the start of the steps.
+        :returns: The offsets on the forward strand of the segments, -1
+            where `steps` is.
+        """
+        if not len(self.ids):
+            return np.full(len(steps), -1, dtype=np.int64)
+        safe = np.maximum(steps, 0)
+        lengths = self.ends[safe] - self.starts[safe]
+        forward = np.where(self.reverse[safe], lengths - 1 - offsets, offsets)
+        return np.where(steps >= 0, forward, -1)
+
+    def step_range(self, start: int, end: int) -> tuple[int, int]:
+        """Return the steps overlapping an interval.
+
+        :param start: The first position of the interval.
+        :param end: The position after the last one.
+        :returns: The ``(first, stop)`` range of step indices.
+        """
+        first = int(np.searchsorted(self.ends, start, "right"))
+        stop = int(np.searchsorted(self.starts, end, "left"))
+        return first, max(first, stop)
+
+
+__all__ = ["CoordinateIndex", "overlap_length"]
@@ -9,16 +9,20 @@ from __future__ import annotations
 
 import copy
 import logging
-from typing import Any
+from typing import Any, Iterable, Sequence
 
 import networkx as nx
+import numpy as np
 
-from pygfa.exceptions import GFAError
+from pygfa.exceptions import FrozenGraphError, GFAError
 from pygfa.graph_element import edge as ge
 from pygfa.graph_element import node
 from pygfa.graph_element import subgraph as sg
 from pygfa.graph_element.parser import containment, link, path, segment
-from pygfa.gfa.base import BaseGFA
+from pygfa.gfa.base import BaseGFA, Element
+from pygfa.gfa.lazy import LazyAttrDict
+from pygfa.gfa.sequences import PackedSequence, SequenceStore
+from pygfa.gfa.steps import encode_path_segments, encode_walk
 from pygfa.graph_operations.compression import (
     compression_graph_by_edges,
     compression_graph_by_nodes,
@@ -26,6 +30,68 @@ from pygfa.graph_operations.compression import (
 
 GRAPH_LOGGER = logging.getLogger(__name__)
 
+ORIENTATIONS = ("+", "-")
+
+# Bytes allowed in a segment sequence other than `*`, see fv.GFA1_SEQUENCE
+_SEQUENCE_BYTES = np.zeros(256, dtype=bool)
+_SEQUENCE_BYTES[list(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz=.")] = True
+
+
+def _check_columns(error: type[Exception], **columns: Sequence | None) -> int:
+    """Return the common length of the given columns, ignoring None ones.
+
+    :raises error: If the columns have different lengths.
+    """
+    lengths = {name: len(column) for name, column in columns.items() if column is not None}
+    if len(set(lengths.values())) > 1:
+        raise error(f"Columns of different lengths: {lengths}")
+    return next(iter(lengths.values()), 0)
+
+
+def _orientation_column(orientations: Sequence) -> list:
+    """Return an orientation column as `+`/`-` strings.
+
+    :param orientations: `+`/`-` strings, or a NumPy array of booleans
+        or integers (non-zero for `-`).
+    """
+    if isinstance(orientations, np.ndarray) and orientations.dtype.kind in "biu":
+        return np.where(orientations != 0, "-", "+").tolist()
+    return list(orientations)
+
+
+def _validate_nodes(names: list, sequences: list, lengths: list | None) -> None:
+    """Check the node columns in one pass per column, see `node.Node`.
+
+    :raises InvalidNodeError: If a column holds an invalid value.
+    """
+    if not all(type(name) is str for name in names) or "*" in names:
+        raise node.InvalidNodeError("A Node has always a defined id of type string, different from '*'.")
+    if not all(type(sequence) is str for sequence in sequences):
+        raise node.InvalidNodeError("A sequence must be of type string.")
+    known = [sequence for sequence in sequences if sequence != "*"]
+    try:
+        data = np.frombuffer("".join(known).encode("ascii"), dtype=np.uint8)
+        valid = _SEQUENCE_BYTES[data].all() and all(known)
+    except UnicodeEncodeError:
+        valid = False
+    if not valid:
+        raise node.InvalidNodeError("A sequence must be either '*' for unknown or a valid GFA1 sequence.")
+    if lengths is not None and not all(
+        length is None or (isinstance(length, int) and length >= 0) for length in lengths
+    ):
+        raise node.InvalidNodeError("Sequence length must be a number >= 0.")
+
+
+def _validate_edges(from_nodes: list, from_orns: list, to_nodes: list, to_orns: list) -> None:
+    """Check the edge columns in one pass per column, see `edge.Edge`.
+
+    :raises InvalidEdgeError: If a column holds an invalid value.
+    """
+    if not all(from_nodes) or not all(to_nodes):
+        raise ge.InvalidEdgeError("from_node and to_node cannot be empty")
+    if not set(from_orns) <= set(ORIENTATIONS) or not set(to_orns) <= set(ORIENTATIONS):
+        raise ge.InvalidEdgeError("Orientations must be '+' or '-'")
+
 
 class GFAElementsMixin(BaseGFA):
     """Mixin class providing graph element operations.
@@ -97,9 +163,51 @@ class GFAElementsMixin(BaseGFA):
             slen=new_node.sequence_length,
             **new_node.opt_fields,
         )
+        self._touch()
         logger.debug(f"add_node(): Node {new_node.node_id} added successfully")
         return True
 
+    def add_nodes_from(
+        self,
+        names: Sequence[str],
+        sequences: Sequence[str],
+        lengths: Sequence[int | None] | None = None,
+        opt_fields: Sequence[dict[str, Any] | None] | None = None,
+        trusted: bool = False,
+    ) -> None:
+        """Add nodes given as columns, in a single networkx call.
+
+        The nodes get the attributes `add_node` sets, without building a
+        `Node` for each of them. The columns are validated as a whole
+        before anything is added, unless `trusted` is set.
+
+        :param names: The node ids.
+        :param sequences: The sequences, `*` for unknown.
+        :param lengths: The sequence lengths (default: None for all).
+        :param opt_fields: The optional fields of each node, None for none.
+        :param trusted: If set, skip the validation, for values already
+            checked by a parser.
+        :raises InvalidNodeError: If a column holds an invalid value or
+            if the columns have different lengths.
+        """
+        count = _check_columns(
+            node.InvalidNodeError, names=names, sequences=sequences, lengths=lengths, opt_fields=opt_fields
+        )
+        names = list(names)
+        sequences = list(sequences)
+        if not trusted:
+            _validate_nodes(names, sequences, None if lengths is None else list(lengths))
+        if lengths is None:
+            lengths = [None] * count
+        if opt_fields is None:
+            opt_fields = [None] * count
+        self._graph.add_nodes_from(
+            (name, {"nid": name, "sequence": sequence, "slen": length, **(opts or {})})
+            for name, sequence, length, opts in zip(names, sequences, lengths, opt_fields)
+        )
+        self._touch()
+        GRAPH_LOGGER.debug("add_nodes_from(): %d nodes added", count)
+
     def remove_node(self, nid: str) -> None:
         """Remove a node with nid as its node id.
 
@@ -109,10 +217,14 @@ class GFAElementsMixin(BaseGFA):
         :param nid: The id belonging to the node to delete.
         :raises InvalidNodeError: If `nid` doesn't point to any node.
         """
+        edge_keys = [key for _u, _v, key in self._graph.edges(nid, keys=True)] if self._graph.has_node(nid) else []
         try:
             self._graph.remove_node(nid)
-        except Exception as err:
+        except nx.NetworkXError as err:
             raise node.InvalidNodeError(f"{nid} doesn't point to any node in the graph.") from err
+        for key in edge_keys:
+            self._edge_index.pop(key, None)
+        self._touch()
 
     def nodes(self, data: bool = False, with_sequence: bool = False, identifier: str | None = None) -> Any:
         """Return a list of the nodes in the graph.
@@ -134,6 +246,42 @@ class GFAElementsMixin(BaseGFA):
 
         return self._graph.nodes(data=data)
 
+    def pack_sequences(self) -> SequenceStore:
+        """Move the segment sequences into a 2-bit packed `SequenceStore`.
+
+        The sequences of all the nodes are concatenated, in node order, in
+        a NumPy buffer holding four bases per byte, and each node keeps a
+        `PackedSequence` placeholder that is decoded whenever its
+        `sequence` attribute is read. Non-ACGT bases and lowercase runs
+        are recorded by the store, so sequences are restored exactly.
+        Nodes without a sequence (`*`) are left as they are, as well as
+        nodes added afterwards.
+
+        BGFA export copies the packed bases of the store instead of
+        encoding the sequences again, when sequences use the 2-bit
+        DNA encoding.
+
+        :returns: The new store.
+        :raises FrozenGraphError: If the graph is frozen.
+        """
+        if self.is_frozen:
+            raise FrozenGraphError("The graph is frozen, its sequences are already stored in a column.")
+        node_data = self._graph._node
+        names = [
+            name
+            for name, data in node_data.items()
+            if isinstance(data.get("sequence"), str) and data["sequence"] not in ("", "*")
+        ]
+        store = SequenceStore.from_sequences(node_data[name]["sequence"] for name in names)
+        self._graph.node_attr_dict_factory = LazyAttrDict
+        for index, name in enumerate(names):
+            data = node_data[name]
+            if not isinstance(data, LazyAttrDict):
+                data = node_data[name] = LazyAttrDict(data)
+            dict.__setitem__(data, "sequence", PackedSequence(store, index))
+        GRAPH_LOGGER.debug("pack_sequences(): %d sequences packed in %d bytes", len(store), store.nbytes)
+        return store
+
     # =========================================================================
     # Edge Operations
     # =========================================================================
@@ -214,8 +362,121 @@ class GFAElementsMixin(BaseGFA):
             to_segment_end=new_edge.to_orientation,
             **new_edge.opt_fields,
         )
+        self._edge_index[key] = (new_edge.from_node, new_edge.to_node)
+        self._touch()
         logger.debug("add_edge(): Edge %s added successfully", key)
 
+    def add_edges_from(
+        self,
+        from_nodes: Sequence[str],
+        from_orns: Sequence,
+        to_nodes: Sequence[str],
+        to_orns: Sequence,
+        alignments: Sequence[str] | None = None,
+        edge_ids: Sequence[str | None] | None = None,
+        opt_fields: Sequence[dict[str, Any] | None] | None = None,
+        trusted: bool = False,
+    ) -> None:
+        """Add edges given as columns, in a single networkx call.
+
+        The edges get the attributes `add_edge` sets, without building an
+        `Edge` for each of them, and edges without id (None or `*`) get
+        virtual ids in the order given. The columns are validated as a
+        whole before anything is added, unless `trusted` is set.
+
+        :param from_nodes: The source node ids.
+        :param from_orns: The source orientations, `+`/`-` strings or a
+            NumPy array of booleans or integers (non-zero for `-`).
+        :param to_nodes: The target node ids.
+        :param to_orns: The target orientations, as `from_orns`.
+        :param alignments: The alignments (default: `*` for all).
+        :param edge_ids: The edge ids (default: virtual ids for all).
+        :param opt_fields: The optional fields of each edge, None for none.
+        :param trusted: If set, skip the validation, for values already
+            checked by a parser.
+        :raises InvalidEdgeError: If a column holds an invalid value or
+            if the columns have different lengths.
+        :raises FrozenGraphError: If the graph is frozen.
+        """
+        if self.is_frozen:
+            raise FrozenGraphError("The graph is frozen, nodes and edges cannot be added or removed.")
+        count = _check_columns(
+            ge.InvalidEdgeError,
+            from_nodes=from_nodes,
+            from_orns=from_orns,
+            to_nodes=to_nodes,
+            to_orns=to_orns,
+            alignments=alignments,
+            edge_ids=edge_ids,
+            opt_fields=opt_fields,
+        )
+        from_orns = _orientation_column(from_orns)
+        to_orns = _orientation_column(to_orns)
+        if not trusted:
+            _validate_edges(list(from_nodes), from_orns, list(to_nodes), to_orns)
+        if alignments is None:
+            alignments = ["*"] * count
+        if edge_ids is None:
+            edge_ids = [None] * count
+        if opt_fields is None:
+            opt_fields = [None] * count
+        keys = [
+            f"virtual_{self._get_virtual_id()}" if edge_id is None or edge_id == "*" else edge_id
+            for edge_id in edge_ids
+        ]
+        self._insert_edges(
+            (
+                from_node,
+                to_node,
+                key,
+                {
+                    "eid": key,
+                    "from_node": from_node,
+                    "from_orn": from_orn,
+                    "to_node": to_node,
+                    "to_orn": to_orn,
+                    "from_positions": (None, None),
+                    "to_positions": (None, None),
+                    "alignment": alignment,
+                    "distance": None,
+                    "variance": None,
+                    "from_segment_end": from_orn,
+                    "to_segment_end": to_orn,
+                    **(opts or {}),
+                },
+            )
+            for from_node, from_orn, to_node, to_orn, alignment, key, opts in zip(
+                from_nodes, from_orns, to_nodes, to_orns, alignments, keys, opt_fields
+            )
+        )
+        self._edge_index.update(zip(keys, zip(from_nodes, to_nodes)))
+        GRAPH_LOGGER.debug("add_edges_from(): %d edges added", count)
+
+    def _insert_edges(self, edges: Iterable[tuple[str, str, str, dict[str, Any]]]) -> None:
+        """Insert ``(from_node, to_node, key, attributes)`` edges in the networkx graph.
+
+        This is `MultiGraph.add_edges_from` writing straight into the
+        adjacency dictionaries, without a `MultiGraph.add_edge` call (and
+        its cache invalidation) for every edge.
+        """
+        graph = self._graph
+        adj = graph._adj
+        for from_node, to_node, key, attrs in edges:
+            for end in (from_node, to_node):
+                if end not in adj:
+                    adj[end] = graph.adjlist_inner_dict_factory()
+                    graph._node[end] = graph.node_attr_dict_factory()
+            keydict = adj[from_node].get(to_node)
+            if keydict is None:
+                # Self loops share the same dictionary too
+                keydict = adj[from_node][to_node] = adj[to_node][from_node] = graph.edge_key_dict_factory()
+            datadict = keydict.get(key)
+            if datadict is None:
+                datadict = keydict[key] = graph.edge_attr_dict_factory()
+            datadict.update(attrs)
+        nx._clear_cache(graph)
+        self._touch()
+
     def remove_edge(self, identifier: str | tuple) -> None:
         """Remove an edge or all edges identified by an id
         or by a tuple with end node, respectively.
@@ -239,26 +500,26 @@ class GFAElementsMixin(BaseGFA):
                     self.remove_edges(identifier[0], identifier[1])
                 else:
                     self._graph.remove_edge(identifier[0], identifier[1], identifier[2])
+                    self._edge_index.pop(identifier[2], None)
+                    self._touch()
             else:
                 from_node, to_node = self._get_edge_end_nodes(identifier)
                 self._graph.remove_edge(from_node, to_node, identifier)
+                self._edge_index.pop(identifier, None)
+                self._touch()
         except nx.NetworkXError as nxe:
             raise ge.InvalidEdgeError(nxe) from nxe
 
     def remove_edges(self, from_node: str, to_node: str) -> None:
         """Remove all the direct edges between the two nodes given.
 
-        Call iteratively remove_edge (remove a not specified edge
-        from `from_node` and `to_node`) for n-times where n is
-        the number of edges between the given nodes,
-        removing all the edges indeed.
-
         :param from_node: The source node id.
         :param to_node: The target node id.
         """
-        num_edges = len(self.edges(identifier=(from_node, to_node)))
-        for _ in range(0, num_edges):
-            self._graph.remove_edge(from_node, to_node)
+        for key in list(self._graph.get_edge_data(from_node, to_node, default={})):
+            self._graph.remove_edge(from_node, to_node, key)
+            self._edge_index.pop(key, None)
+        self._touch()
 
     def edges(self, identifier: str | tuple | None = None, adj_dict: bool = False, **kwargs) -> Any:
         """Return all the edges in the graph.
@@ -318,6 +579,7 @@ class GFAElementsMixin(BaseGFA):
             raise GFAError("An element with the same id already exists.")
 
         self._subgraphs[key] = copy.copy(subgraph)  # Shallow copy is sufficient
+        self._touch()
 
     def remove_subgraph(self, sub_id: str) -> None:
         """Remove a subgraph from the graph.
@@ -329,6 +591,7 @@ class GFAElementsMixin(BaseGFA):
             del self._subgraphs[sub_id]
         except KeyError as err:
             raise GFAError(f"The given id {sub_id} doesn't identify any subgraph.") from err
+        self._touch()
 
     def subgraphs(self, identifier: str | None = None) -> Any:
         """An interface to access to the subgraphs inside
@@ -359,6 +622,9 @@ class GFAElementsMixin(BaseGFA):
         - 'overlaps': optional list of overlaps between segments
         - any optional fields
 
+        The segments are stored as integer segment ids and orientation
+        bits, reading them back gives the list again.
+
         :param path_data: Dictionary containing path information
         :param safe: If set, check if the path id already exists
         :raises GFAError: If the path data is invalid or already exists.
@@ -395,11 +661,41 @@ class GFAElementsMixin(BaseGFA):
             logger.debug("add_path(): Path %s already exists", key)
             raise GFAError("A path with the same id already exists.")
 
-        # Store the path data
         logger.debug("add_path(): Storing path %s with %s segments", key, len(path_data.get("segments", [])))
-        self._paths[key] = copy.copy(path_data)  # Shallow copy is sufficient
+        self._store_path(key, path_data)
         logger.debug("add_path(): Path %s added successfully", key)
 
+    def add_paths_from(self, paths: Iterable[dict[str, Any]], trusted: bool = False) -> None:
+        """Add paths given as dictionaries, see `add_path`.
+
+        The paths are checked before anything is added, unless `trusted`
+        is set.
+
+        :param paths: The path dictionaries.
+        :param trusted: If set, skip the validation, for values already
+            checked by a parser.
+        :raises GFAError: If a path dictionary is invalid.
+        """
+        paths = list(paths)
+        if not trusted and not all(isinstance(path_data, dict) and "path_name" in path_data for path_data in paths):
+            raise GFAError("Invalid path data format.")
+        for path_data in paths:
+            key = path_data["path_name"]
+            if key == "*":
+                key = f"virtual_{self._get_virtual_id()}"
+            self._store_path(key, path_data)
+        GRAPH_LOGGER.debug("add_paths_from(): %d paths added", len(paths))
+
+    def _store_path(self, key: str, path_data: dict[str, Any]) -> None:
+        """Store the path data, with the segments encoded as integer ids."""
+        stored = LazyAttrDict(path_data)
+        segments = encode_path_segments(stored.get("segments"), self._segment_id, self._segment_names)
+        if segments is not None:
+            dict.__setitem__(stored, "segments", segments)
+        self._paths[key] = stored
+        if self._traversals is not None:
+            self._traversals.add((Element.PATH, key), None if segments is None else segments.ids)
+
     def remove_path(self, path_id: str) -> None:
         """Remove the path identified by the given id.
 
@@ -410,6 +706,8 @@ class GFAElementsMixin(BaseGFA):
             del self._paths[path_id]
         except KeyError as err:
             raise GFAError("The given id doesn't identify any path.") from err
+        if self._traversals is not None:
+            self._traversals.discard((Element.PATH, path_id))
 
     def paths(self, identifier: str | None = None) -> Any:
         """An interface to access to the paths inside
@@ -443,6 +741,9 @@ class GFAElementsMixin(BaseGFA):
         - 'walk': the walk string
         - any optional fields
 
+        The steps are stored as integer segment ids and orientation bits,
+        reading them back gives the walk string again.
+
         :param walk_data: Dictionary containing walk information
         :param safe: If set, check if the walk id already exists
         :raises GFAError: If the walk data is invalid or already exists.
@@ -480,11 +781,38 @@ class GFAElementsMixin(BaseGFA):
             logger.debug("add_walk(): Walk %s already exists", key)
             raise GFAError("A walk with the same id already exists.")
 
-        # Store the walk data
         logger.debug("add_walk(): Storing walk %s", key)
-        self._walks[key] = copy.copy(walk_data)  # Shallow copy is sufficient
+        self._store_walk(key, walk_data)
         logger.debug(f"add_walk(): Walk {key} added successfully")
 
+    def add_walks_from(self, walks: Iterable[dict[str, Any]], trusted: bool = False) -> None:
+        """Add walks given as dictionaries, see `add_walk`.
+
+        The walks are checked before anything is added, unless `trusted`
+        is set.
+
+        :param walks: The walk dictionaries.
+        :param trusted: If set, skip the validation, for values already
+            checked by a parser.
+        :raises GFAError: If a walk dictionary is invalid.
+        """
+        walks = list(walks)
+        if not trusted and not all(isinstance(walk_data, dict) and "sample_id" in walk_data for walk_data in walks):
+            raise GFAError("Invalid walk data format.")
+        for walk_data in walks:
+            self._store_walk(f"{walk_data['sample_id']}_{walk_data['hapindex']}_{walk_data['seq_id']}", walk_data)
+        GRAPH_LOGGER.debug("add_walks_from(): %d walks added", len(walks))
+
+    def _store_walk(self, key: str, walk_data: dict[str, Any]) -> None:
+        """Store the walk data, with the steps encoded as integer ids."""
+        stored = LazyAttrDict(walk_data)
+        steps = encode_walk(stored.get("walk"), self._segment_id, self._segment_names)
+        if steps is not None:
+            dict.__setitem__(stored, "walk", steps)
+        self._walks[key] = stored
+        if self._traversals is not None:
+            self._traversals.add((Element.WALK, key), None if steps is None else steps.ids)
+
     def remove_walk(self, walk_id: str) -> None:
         """Remove the walk identified by the given id.
 
@@ -495,6 +823,8 @@ class GFAElementsMixin(BaseGFA):
             del self._walks[walk_id]
         except KeyError as err:
             raise GFAError("The given id doesn't identify any walk.") from err
+        if self._traversals is not None:
+            self._traversals.discard((Element.WALK, walk_id))
 
     def walks(self, identifier: str | None = None) -> Any:
         """An interface to access to the walks inside
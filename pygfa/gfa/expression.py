@@ -0,0 +1,252 @@
+"""
+Vectorised query expressions.
+
+`GFAQueryMixin.query` selects the nodes or the edges of a graph with an
+expression over their columns, evaluated with NumPy operations on whole
+columns instead of a Python call per element::
+
+    gfa.query("slen > 1000 & gc > 0.6 & degree >= 3")
+
+Expressions use the Python syntax for column names, numbers, strings
+and booleans, comparisons (chained ones too), ``in`` and ``not in`` a
+list or tuple of constants, the arithmetic operators ``+ - * /`` and
+the boolean operators ``&``, ``|`` and ``~`` (or ``and``, ``or`` and
+``not``). As in `pandas.DataFrame.query`, ``&`` and ``|`` bind less
+tightly than the comparisons, so that no parentheses are needed around
+them.
+
+A column is a masked array holding a value for every element, masked
+for the elements without one: a comparison is false for them (``!=``
+included), and so is a comparison between values that cannot be
+ordered (e.g. a string and a number).
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import numbers
+import operator
+import tokenize
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+from pygfa.exceptions import InvalidSearchParameters
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+_ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+# Pandas-like precedence: the bitwise operators become boolean ones
+_BOOLEAN_TOKENS = {"&": "and", "|": "or", "~": "not"}
+
+
+def masked_column(values: Iterable[Any]) -> np.ma.MaskedArray:
+    """Return values as a column, masked where they are None.
+
+    :param values: The value of every element, None for none.
+    :returns: A masked array of ``bool``, ``int64`` or ``float64`` if
+        the values allow it, of ``object`` otherwise.
+    """
+    values = list(values)
+    mask = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+    present = [value for value in values if value is not None]
+    types = {type(value) for value in present}
+    dtype: Any = object
+    if types == {bool}:
+        dtype = bool
+    elif types and all(issubclass(value_type, numbers.Real) and value_type is not bool for value_type in types):
+        dtype = np.float64 if any(issubclass(value_type, float) for value_type in types) else np.int64
+    if dtype is not object:
+        if mask.any():
+            values = [0 if value is None else value for value in values]
+        try:
+            return np.ma.MaskedArray(np.array(values, dtype=dtype), mask=mask)
+        except OverflowError:
+            pass
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return np.ma.MaskedArray(column, mask=mask)
+
+
+def _rewrite(text: str) -> str:
+    """Replace the bitwise operators of an expression with the boolean ones."""
+    tokens = []
+    for token in tokenize.generate_tokens(io.StringIO(text).readline):
+        if token.type == tokenize.OP and token.string in _BOOLEAN_TOKENS:
+            token = token._replace(type=tokenize.NAME, string=_BOOLEAN_TOKENS[token.string])
+        tokens.append((token.type, token.string))
+    return tokenize.untokenize(tokens)
+
+
+class QueryExpression:
+    """A query expression, parsed once and evaluated on columns.
+
+    :param text: The expression, see the module documentation.
+    :raises InvalidSearchParameters: If the expression is not valid.
+    """
+
+    __slots__ = ("text", "columns", "_tree")
+
+    def __init__(self, text: str):
+        self.text = text
+        try:
+            self._tree = ast.parse(_rewrite(text).strip(), mode="eval").body
+        except (SyntaxError, tokenize.TokenError) as err:
+            raise InvalidSearchParameters(f"Invalid query expression {text!r}: {err}") from err
+        names: list[str] = []
+        self._check(self._tree, names)
+        self.columns = tuple(dict.fromkeys(names))
+
+    def _check(self, node: ast.AST, names: list[str]) -> None:
+        """Reject the syntax a query cannot use, collect the column names."""
+        if isinstance(node, ast.Name):
+            names.append(node.id)
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str)):
+                raise InvalidSearchParameters(f"Unsupported constant in query expression: {node.value!r}")
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._check(value, names)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+            self._check(node.operand, names)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            self._check(node.left, names)
+            self._check(node.right, names)
+        elif isinstance(node, ast.Compare):
+            self._check(node.left, names)
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if not isinstance(comparator, (ast.List, ast.Tuple, ast.Set)):
+                        raise InvalidSearchParameters("'in' takes a list of constants in query expressions.")
+                    for item in comparator.elts:
+                        if not isinstance(item, ast.Constant):
+                            raise InvalidSearchParameters("'in' takes a list of constants in query expressions.")
+                        self._check(item, names)
+                elif type(op) in _COMPARISONS:
+                    self._check(comparator, names)
+                else:
+                    raise InvalidSearchParameters(f"Unsupported operator in query expression {self.text!r}.")
+        else:
+            raise InvalidSearchParameters(f"Unsupported syntax in query expression {self.text!r}: {ast.dump(node)}")
+
+    def evaluate(self, columns: Mapping[str, np.ma.MaskedArray], count: int) -> np.ndarray:
+        """Return the elements the expression is true for.
+
+        :param columns: A column of `count` values for every name of
+            `columns`.
+        :param count: The number of elements.
+        :returns: A boolean array.
+        :raises InvalidSearchParameters: If the expression is not a
+            condition or applies an operator to values not supporting it.
+        """
+        try:
+            result = self._evaluate(self._tree, columns)
+        except TypeError as err:
+            raise InvalidSearchParameters(f"Invalid operands in query expression {self.text!r}: {err}") from err
+        if np.ndim(result) == 0 and isinstance(result, (bool, np.bool_)):
+            return np.full(count, bool(result))
+        if np.ndim(result) == 0 or result.dtype != bool:
+            raise InvalidSearchParameters(f"The query expression {self.text!r} is not a condition.")
+        return np.ma.filled(result, False)
+
+    def _condition(self, value: Any) -> Any:
+        """Return a boolean operand as a plain boolean array, false where masked."""
+        if np.ndim(value) == 0:
+            if not isinstance(value, (bool, np.bool_)):
+                raise InvalidSearchParameters(f"The query expression {self.text!r} combines non boolean values.")
+            return bool(value)
+        if value.dtype != bool:
+            raise InvalidSearchParameters(f"The query expression {self.text!r} combines non boolean values.")
+        return np.ma.filled(value, False)
+
+    def _evaluate(self, node: ast.AST, columns: Mapping[str, np.ma.MaskedArray]) -> Any:
+        if isinstance(node, ast.Name):
+            return columns[node.id]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.BoolOp):
+            values = [self._condition(self._evaluate(value, columns)) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = values[0]
+            for value in values[1:]:
+                result = combine(result, value)
+            return result
+        if isinstance(node, ast.UnaryOp):
+            operand = self._evaluate(node.operand, columns)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(self._condition(operand))
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            left = self._evaluate(node.left, columns)
+            right = self._evaluate(node.right, columns)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return _ARITHMETIC[type(node.op)](left, right)
+        # Comparisons, a < b < c being a < b and b < c
+        left = self._evaluate(node.left, columns)
+        result: Any = True
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                matches: Any = False
+                for item in comparator.elts:
+                    matches = np.logical_or(matches, _compare(operator.eq, left, item.value))
+                right = left
+                if isinstance(op, ast.NotIn):
+                    matches = np.logical_and(_present(left), np.logical_not(matches))
+            else:
+                right = self._evaluate(comparator, columns)
+                matches = _compare(_COMPARISONS[type(op)], left, right)
+            result = np.logical_and(result, matches)
+            left = right
+        return result
+
+
+def _present(value: Any) -> Any:
+    """Return where an operand has a value."""
+    if isinstance(value, np.ma.MaskedArray):
+        return ~np.ma.getmaskarray(value)
+    return True
+
+
+def _compare(compare: Any, left: Any, right: Any) -> Any:
+    """Compare two operands elementwise, false where either is masked."""
+    try:
+        result = compare(left, right)
+    except TypeError:
+        result = None
+    if np.ndim(result) == 0 and (np.ndim(left) != 0 or np.ndim(right) != 0):
+        # Values NumPy cannot compare, compared one by one
+        result = _compare_elements(compare, left, right)
+    if isinstance(result, np.ma.MaskedArray):
+        return result.filled(False)
+    return result
+
+
+def _compare_elements(compare: Any, left: Any, right: Any) -> np.ndarray:
+    count = len(left) if np.ndim(left) else len(right)
+    present = np.logical_and(_present(left), _present(right))
+    present = np.broadcast_to(present, (count,))
+    lefts = np.ma.getdata(left) if np.ndim(left) else [left] * count
+    rights = np.ma.getdata(right) if np.ndim(right) else [right] * count
+    result = np.zeros(count, dtype=bool)
+    for i in np.flatnonzero(present).tolist():
+        try:
+            result[i] = bool(compare(lefts[i], rights[i]))
+        except TypeError:
+            pass
+    return result
+
+
+__all__ = ["masked_column", "QueryExpression"]
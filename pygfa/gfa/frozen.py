@@ -0,0 +1,707 @@
+"""
+Array-backed, read-only graph storage.
+
+`CSRGraph` keeps the segments and the links of a GFA graph in NumPy
+arrays instead of networkx dictionaries: nodes get dense integer ids,
+the adjacency is stored in compressed sparse row (CSR) form, the edge
+orientations in two bitsets, sequences and alignments in contiguous
+byte buffers addressed by offset arrays, and optional fields in typed
+columns (see `pygfa.gfa.tags`). Attribute dictionaries are only built
+when they are read.
+
+The class implements the part of the `networkx.MultiGraph` interface
+used by `BaseGFA` and by the networkx algorithms (adjacency views,
+`nodes`, `edges`, `neighbors`, `get_edge_data`, ...), in the same
+iteration order as the graph it was built from, so that a GFA graph can
+use it as its `_graph` (see `BaseGFA.freeze`). Every method that would
+modify the graph raises `FrozenGraphError`.
+"""
+
+from __future__ import annotations
+
+import pickle
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+import networkx as nx
+import numpy as np
+
+from pygfa.exceptions import FrozenGraphError
+from pygfa.gfa.expression import masked_column
+from pygfa.gfa.tags import TagRegistry
+
+# Attributes stored in columns, in the order add_node/add_edge set them
+NODE_FIELDS = ("nid", "sequence", "slen")
+EDGE_FIELDS = (
+    "eid",
+    "from_node",
+    "from_orn",
+    "to_node",
+    "to_orn",
+    "from_positions",
+    "to_positions",
+    "alignment",
+    "distance",
+    "variance",
+    "from_segment_end",
+    "to_segment_end",
+)
+_NO_POSITIONS = (None, None)
+
+
+class StringColumn:
+    """ASCII strings stored in one buffer, addressed by an offsets array.
+
+    :param values: The strings to store.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, values: list[str]):
+        encoded = [value.encode("ascii") for value in values]
+        self.data = b"".join(encoded)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=self.offsets[1:])
+
+    @classmethod
+    def from_buffers(cls, data: bytes | memoryview, offsets: np.ndarray) -> StringColumn:
+        """Return a column over an existing buffer and offsets array."""
+        column = cls.__new__(cls)
+        column.data = data
+        column.offsets = offsets
+        return column
+
+    def __getitem__(self, i: int) -> str:
+        # data is a memoryview in graphs loaded from a snapshot
+        return str(self.data[self.offsets[i] : self.offsets[i + 1]], "ascii")
+
+    def __reduce_ex__(self, protocol: int):
+        # With protocol 5 the buffer can be written out of band
+        data = pickle.PickleBuffer(self.data) if protocol >= 5 else bytes(self.data)
+        return (StringColumn.from_buffers, (data, self.offsets))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.nbytes
+
+
+def _encode_names(names: list[Any]) -> tuple[int, bytes] | list[Any]:
+    """Join string names in one buffer, which is much faster to unpickle than a list.
+
+    :returns: The number of names and the buffer, or `names` itself if
+        they cannot be joined (not strings, or holding a newline).
+    """
+    if all(type(name) is str and "\n" not in name for name in names):
+        return (len(names), "\n".join(names).encode("utf-8"))
+    return names
+
+
+def _decode_names(encoded: tuple[int, bytes] | list[Any]) -> list[Any]:
+    if isinstance(encoded, list):
+        return encoded
+    count, data = encoded
+    return str(data, "utf-8").split("\n") if count else []
+
+
+def _get_bit(bits: np.ndarray, i: int) -> bool:
+    """Return bit `i` of a bitset packed by `numpy.packbits`."""
+    return bool(bits[i >> 3] & (0x80 >> (i & 7)))
+
+
+def _is_ascii(value: Any) -> bool:
+    return isinstance(value, str) and value.isascii()
+
+
+def _has_node_layout(name: Any, data: list[tuple[str, Any]]) -> bool:
+    """Tell if a node has the attributes set by `add_node`, in order."""
+    return (
+        tuple(key for key, _ in data[:3]) == NODE_FIELDS
+        and data[0][1] == name
+        and _is_ascii(data[1][1])
+        and (data[2][1] is None or (type(data[2][1]) is int and data[2][1] >= 0))
+    )
+
+
+def _has_edge_layout(u: Any, v: Any, key: Any, data: list[tuple[str, Any]]) -> bool:
+    """Tell if an edge has the attributes set by `add_edge`, in order."""
+    if tuple(name for name, _ in data[:12]) != EDGE_FIELDS:
+        return False
+    attrs = dict(data[:12])
+    return (
+        attrs["eid"] == key
+        and {attrs["from_node"], attrs["to_node"]} == {u, v}
+        and attrs["from_orn"] in ("+", "-")
+        and attrs["to_orn"] in ("+", "-")
+        and attrs["from_segment_end"] == attrs["from_orn"]
+        and attrs["to_segment_end"] == attrs["to_orn"]
+        and attrs["from_positions"] == _NO_POSITIONS
+        and attrs["to_positions"] == _NO_POSITIONS
+        and attrs["distance"] is None
+        and attrs["variance"] is None
+        and _is_ascii(attrs["alignment"])
+    )
+
+
+class CSRGraph:
+    """A read-only multigraph stored in NumPy arrays.
+
+    Nodes and edges following the attribute layout of `add_node` and
+    `add_edge` (every segment and link of a GFA file) are stored in
+    columns; any other node or edge keeps its attribute dictionary as is.
+
+    :param graph: The networkx MultiGraph to copy.
+    """
+
+    __networkx_backend__ = "networkx"
+
+    def __init__(self, graph: nx.MultiGraph):
+        self.graph: dict[str, Any] = dict(graph.graph)
+
+        self._node_names: list[Any] = list(graph)
+        self._node_index: dict[Any, int] = {name: i for i, name in enumerate(self._node_names)}
+        sequences: list[str] = []
+        slen = np.zeros(len(self._node_names), dtype=np.int64)
+        node_opt: list[dict[str, Any] | None] = [None] * len(self._node_names)
+        self._node_raw: dict[int, dict[str, Any]] = {}
+        for i, (name, attrs) in enumerate(graph.nodes(data=True)):
+            data = list(attrs.items())
+            if _has_node_layout(name, data):
+                sequences.append(data[1][1])
+                slen[i] = -1 if data[2][1] is None else data[2][1]
+                if len(data) > 3:
+                    node_opt[i] = dict(data[3:])
+            else:
+                sequences.append("")
+                self._node_raw[i] = dict(data)
+        self._sequences = StringColumn(sequences)
+        self._slen = slen
+        self._node_tags = TagRegistry.from_rows(node_opt)
+
+        # Edge ids follow the networkx edge order, the attribute dict of an
+        # undirected edge is the same object in both adjacency entries
+        edge_of: dict[int, int] = {}
+        self._edge_keys: list[Any] = []
+        n_edges = graph.number_of_edges()
+        self._edge_from = np.zeros(n_edges, dtype=np.int32)
+        self._edge_to = np.zeros(n_edges, dtype=np.int32)
+        from_reverse = np.zeros(n_edges, dtype=bool)
+        to_reverse = np.zeros(n_edges, dtype=bool)
+        alignments: list[str] = []
+        edge_opt: list[dict[str, Any] | None] = [None] * n_edges
+        self._edge_raw: dict[int, dict[str, Any]] = {}
+        for e, (u, v, key, attrs) in enumerate(graph.edges(keys=True, data=True)):
+            edge_of[id(attrs)] = e
+            self._edge_keys.append(key)
+            data = list(attrs.items())
+            if _has_edge_layout(u, v, key, data):
+                self._edge_from[e] = self._node_index[attrs["from_node"]]
+                self._edge_to[e] = self._node_index[attrs["to_node"]]
+                from_reverse[e] = attrs["from_orn"] == "-"
+                to_reverse[e] = attrs["to_orn"] == "-"
+                alignments.append(attrs["alignment"])
+                if len(data) > 12:
+                    edge_opt[e] = dict(data[12:])
+            else:
+                self._edge_from[e] = self._node_index[u]
+                self._edge_to[e] = self._node_index[v]
+                alignments.append("")
+                self._edge_raw[e] = dict(data)
+        self._from_reverse = np.packbits(from_reverse)
+        self._to_reverse = np.packbits(to_reverse)
+        self._alignments = StringColumn(alignments)
+        self._edge_tags = TagRegistry.from_rows(edge_opt)
+
+        # Both directions of every edge, in networkx adjacency order
+        indptr = np.zeros(len(self._node_names) + 1, dtype=np.int64)
+        indices: list[int] = []
+        edge_ids: list[int] = []
+        for i, name in enumerate(self._node_names):
+            for nbr, keydict in graph._adj[name].items():
+                j = self._node_index[nbr]
+                for attrs in keydict.values():
+                    indices.append(j)
+                    edge_ids.append(edge_of[id(attrs)])
+            indptr[i + 1] = len(indices)
+        self._indptr = indptr
+        self._indices = np.array(indices, dtype=np.int32)
+        self._edge_ids = np.array(edge_ids, dtype=np.int32)
+
+    # =========================================================================
+    # Columns access
+    # =========================================================================
+
+    def _row(self, i: int) -> tuple[list[int], list[int]]:
+        """Return the neighbor ids and the edge ids of node `i`."""
+        start, end = self._indptr[i], self._indptr[i + 1]
+        return self._indices[start:end].tolist(), self._edge_ids[start:end].tolist()
+
+    def _node_data(self, i: int) -> dict[str, Any]:
+        raw = self._node_raw.get(i)
+        if raw is not None:
+            return dict(raw)
+        slen = int(self._slen[i])
+        data = {"nid": self._node_names[i], "sequence": self._sequences[i], "slen": None if slen < 0 else slen}
+        data.update(self._node_tags.row(i))
+        return data
+
+    def _edge_data(self, e: int) -> dict[str, Any]:
+        raw = self._edge_raw.get(e)
+        if raw is not None:
+            return dict(raw)
+        from_orn = "-" if _get_bit(self._from_reverse, e) else "+"
+        to_orn = "-" if _get_bit(self._to_reverse, e) else "+"
+        data = {
+            "eid": self._edge_keys[e],
+            "from_node": self._node_names[self._edge_from[e]],
+            "from_orn": from_orn,
+            "to_node": self._node_names[self._edge_to[e]],
+            "to_orn": to_orn,
+            "from_positions": _NO_POSITIONS,
+            "to_positions": _NO_POSITIONS,
+            "alignment": self._alignments[e],
+            "distance": None,
+            "variance": None,
+            "from_segment_end": from_orn,
+            "to_segment_end": to_orn,
+        }
+        data.update(self._edge_tags.row(e))
+        return data
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the NumPy columns, in bytes."""
+        arrays = (
+            self._slen,
+            self._edge_from,
+            self._edge_to,
+            self._from_reverse,
+            self._to_reverse,
+            self._indptr,
+            self._indices,
+            self._edge_ids,
+        )
+        columns = (self._sequences, self._alignments, self._node_tags, self._edge_tags)
+        return sum(array.nbytes for array in arrays) + sum(column.nbytes for column in columns)
+
+    def node_tag_array(self, tag: str) -> np.ma.MaskedArray:
+        """Return the values of an optional field for every node, in node order.
+
+        :param tag: The tag of the field.
+        :returns: A masked array, see `TagRegistry.array`.
+        """
+        return self._node_tags.array(tag, extra=self._node_raw.items())
+
+    def edge_tag_array(self, tag: str) -> np.ma.MaskedArray:
+        """Return the values of an optional field for every edge, in edge order.
+
+        :param tag: The tag of the field.
+        :returns: A masked array, see `TagRegistry.array`.
+        """
+        return self._edge_tags.array(tag, extra=self._edge_raw.items())
+
+    def slen_array(self) -> np.ma.MaskedArray:
+        """Return the ``slen`` attribute of every node, in node order.
+
+        :returns: A masked ``int64`` array, masked for the nodes without
+            the attribute, or an ``object`` one if some are not integers.
+        """
+        # Unknown lengths (None) are stored as -1
+        if not self._node_raw:
+            return np.ma.MaskedArray(self._slen, mask=self._slen < 0)
+        values: list[Any] = [None if value < 0 else value for value in self._slen.tolist()]
+        for i, data in self._node_raw.items():
+            values[i] = data.get("slen")
+        return masked_column(values)
+
+    def degree_array(self) -> np.ndarray:
+        """Return the degree of every node, in node order.
+
+        As in networkx, a self loop counts twice.
+        """
+        loops = self._edge_from[self._edge_from == self._edge_to]
+        return np.diff(self._indptr) + np.bincount(loops, minlength=len(self._node_names))
+
+    def handle_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the oriented ends of every edge, in edge order.
+
+        :returns: The handles (``node * 2``, plus 1 if reverse, see
+            `pygfa.gfa.handles`) the edges leave and enter, -1 for the
+            edges without orientations.
+        """
+        count = len(self._edge_keys)
+        from_handles = self._edge_from.astype(np.int64) * 2 + np.unpackbits(self._from_reverse, count=count)
+        to_handles = self._edge_to.astype(np.int64) * 2 + np.unpackbits(self._to_reverse, count=count)
+        for e, data in self._edge_raw.items():
+            from_orn, to_orn = data.get("from_orn"), data.get("to_orn")
+            ends = (data.get("from_node"), data.get("to_node"))
+            if {from_orn, to_orn} <= {"+", "-"} and all(end in self._node_index for end in ends):
+                from_handles[e] = self._node_index[data["from_node"]] * 2 + (from_orn == "-")
+                to_handles[e] = self._node_index[data["to_node"]] * 2 + (to_orn == "-")
+            else:
+                from_handles[e] = to_handles[e] = -1
+        return from_handles, to_handles
+
+    def sequence_arrays(self) -> tuple[np.ma.MaskedArray, np.ma.MaskedArray]:
+        """Return the sequence length and the G/C count of every node.
+
+        :returns: Two masked ``int64`` arrays in node order, masked for
+            the nodes without a sequence (``*``).
+        """
+        data = np.frombuffer(self._sequences.data, dtype=np.uint8)
+        starts = self._sequences.offsets[:-1]
+        lengths = np.diff(self._sequences.offsets)
+        # Lowercase bases have the 0x20 bit set
+        is_gc = (data | 0x20 == ord("c")) | (data | 0x20 == ord("g"))
+        gc = np.zeros(len(lengths), dtype=np.int64)
+        nonempty = lengths > 0
+        if nonempty.any():
+            gc[nonempty] = np.add.reduceat(is_gc, starts[nonempty], dtype=np.int64)
+        missing = ~nonempty
+        missing[nonempty] = (lengths[nonempty] == 1) & (data[starts[nonempty]] == ord("*"))
+        if self._node_raw:
+            lengths = lengths.copy()
+            for i, node_data in self._node_raw.items():
+                sequence = node_data.get("sequence")
+                missing[i] = not isinstance(sequence, str) or sequence == "*"
+                if not missing[i]:
+                    lengths[i] = len(sequence)
+                    gc[i] = sum(map(sequence.count, "CGcg"))
+        return np.ma.MaskedArray(lengths, mask=missing), np.ma.MaskedArray(gc, mask=missing)
+
+    # =========================================================================
+    # networkx.MultiGraph interface
+    # =========================================================================
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._node_names)
+
+    def __len__(self) -> int:
+        return len(self._node_names)
+
+    def __contains__(self, n: Any) -> bool:
+        try:
+            return n in self._node_index
+        except TypeError:
+            return False
+
+    def __getitem__(self, n: Any) -> NeighborView:
+        return self.adj[n]
+
+    @property
+    def adj(self) -> AdjacencyView:
+        return AdjacencyView(self)
+
+    _adj = adj
+
+    @property
+    def nodes(self) -> NodeView:
+        return NodeView(self)
+
+    @property
+    def edges(self) -> EdgeView:
+        return EdgeView(self)
+
+    def is_directed(self) -> bool:
+        return False
+
+    def is_multigraph(self) -> bool:
+        return True
+
+    def has_node(self, n: Any) -> bool:
+        return n in self
+
+    def has_edge(self, u: Any, v: Any, key: Any = None) -> bool:
+        try:
+            keys = self.adj[u][v]
+        except KeyError:
+            return False
+        return key is None or key in keys
+
+    def get_edge_data(self, u: Any, v: Any, key: Any = None, default: Any = None) -> Any:
+        """Return the attributes of the edge `key`, or of all the edges, between `u` and `v`."""
+        try:
+            keys = self.adj[u][v]
+            if key is None:
+                return dict(keys.items())
+            return keys[key]
+        except KeyError:
+            return default
+
+    def neighbors(self, n: Any) -> Iterator[Any]:
+        try:
+            return iter(self.adj[n])
+        except KeyError as err:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.") from err
+
+    def number_of_nodes(self) -> int:
+        return len(self._node_names)
+
+    def number_of_edges(self) -> int:
+        return len(self._edge_keys)
+
+    def nbunch_iter(self, nbunch: Any = None) -> Iterator[Any]:
+        """Return an iterator over the nodes of `nbunch` that are in the graph."""
+        if nbunch is None:
+            return iter(self._node_names)
+        if nbunch in self:
+            return iter([nbunch])
+        try:
+            return (n for n in list(nbunch) if n in self)
+        except TypeError as err:
+            raise nx.NetworkXError(f"nbunch is not a node or a sequence of nodes: {nbunch}") from err
+
+    def _iter_edges(self, nbunch: Any, data: Any, keys: bool, default: Any) -> Iterator[tuple]:
+        # Same order as networkx: each edge is reported once, from the
+        # first of its end nodes in node order
+        seen: set[int] = set()
+        for n in self.nbunch_iter(nbunch):
+            i = self._node_index[n]
+            for j, e in zip(*self._row(i)):
+                if j in seen:
+                    continue
+                edge: tuple = (n, self._node_names[j])
+                if keys:
+                    edge += (self._edge_keys[e],)
+                if data is True:
+                    edge += (self._edge_data(e),)
+                elif data is not False:
+                    edge += (self._edge_data(e).get(data, default),)
+                yield edge
+            seen.add(i)
+
+    def subgraph(self, nodes: Any) -> nx.MultiGraph:
+        """Return the subgraph induced by `nodes`, as a networkx MultiGraph."""
+        selected = {self._node_index[n] for n in self.nbunch_iter(nodes)}
+        subgraph = nx.MultiGraph()
+        subgraph.graph.update(self.graph)
+        for i in sorted(selected):
+            subgraph.add_node(self._node_names[i], **self._node_data(i))
+        for u, v, key, data in self._iter_edges([self._node_names[i] for i in sorted(selected)], True, True, None):
+            if self._node_index[v] in selected:
+                subgraph.add_edge(u, v, key=key, **data)
+        return subgraph
+
+    def to_multigraph(self) -> nx.MultiGraph:
+        """Return a mutable networkx copy of the graph."""
+        return self.subgraph(self._node_names)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Names and keys are pickled as joined strings and the node index
+        # is rebuilt, which keeps loading a snapshot fast
+        state = dict(self.__dict__)
+        del state["_node_index"]
+        state.pop("_snapshot_buffer", None)
+        state["_node_names"] = _encode_names(self._node_names)
+        state["_edge_keys"] = _encode_names(self._edge_keys)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._node_names = _decode_names(state["_node_names"])
+        self._edge_keys = _decode_names(state["_edge_keys"])
+        self._node_index = dict(zip(self._node_names, range(len(self._node_names))))
+
+    def copy(self) -> CSRGraph:
+        # The graph is immutable, copies can share it
+        return self
+
+    def __deepcopy__(self, memo: dict) -> CSRGraph:
+        return self
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise FrozenGraphError("The graph is frozen, nodes and edges cannot be added or removed.")
+
+    add_node = add_nodes_from = remove_node = remove_nodes_from = _read_only
+    add_edge = add_edges_from = add_weighted_edges_from = _read_only
+    remove_edge = remove_edges_from = update = clear = clear_edges = _read_only
+
+
+class EdgeEndsView(Mapping):
+    """Read-only mapping from an edge key to the end nodes of the edge.
+
+    The `_edge_index` of a frozen graph loaded from a snapshot: the ends
+    are read from the edge columns, ``(from_node, to_node)`` for links and
+    the networkx ``(u, v)`` order for the other edges, and the key lookup
+    table is only built on the first access.
+    """
+
+    __slots__ = ("_graph", "_edge_of")
+
+    def __init__(self, graph: CSRGraph):
+        self._graph = graph
+        self._edge_of: dict[Any, int] | None = None
+
+    def __getitem__(self, key: Any) -> tuple[Any, Any]:
+        if self._edge_of is None:
+            keys = self._graph._edge_keys
+            self._edge_of = dict(zip(keys, range(len(keys))))
+        e = self._edge_of[key]
+        names = self._graph._node_names
+        return (names[self._graph._edge_from[e]], names[self._graph._edge_to[e]])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph._edge_keys)
+
+    def __len__(self) -> int:
+        return len(self._graph._edge_keys)
+
+
+class NodeView:
+    """The `CSRGraph.nodes` view, callable like the networkx one."""
+
+    __slots__ = ("_graph", "_data", "_default")
+
+    def __init__(self, graph: CSRGraph, data: Any = False, default: Any = None):
+        self._graph = graph
+        self._data = data
+        self._default = default
+
+    def __call__(self, data: Any = False, default: Any = None) -> NodeView:
+        return NodeView(self._graph, data, default)
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __contains__(self, n: Any) -> bool:
+        return n in self._graph
+
+    def __getitem__(self, n: Any) -> Any:
+        data = self._graph._node_data(self._graph._node_index[n])
+        if self._data is False or self._data is True:
+            return data
+        return data.get(self._data, self._default)
+
+    def __iter__(self) -> Iterator[Any]:
+        graph = self._graph
+        if self._data is False:
+            return iter(graph._node_names)
+        if self._data is True:
+            return ((name, graph._node_data(i)) for i, name in enumerate(graph._node_names))
+        return ((name, graph._node_data(i).get(self._data, self._default)) for i, name in enumerate(graph._node_names))
+
+    def __repr__(self) -> str:
+        return f"NodeView({tuple(self)!r})"
+
+
+class EdgeView:
+    """The `CSRGraph.edges` view, callable like the networkx one."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: CSRGraph):
+        self._graph = graph
+
+    def __call__(self, nbunch: Any = None, data: Any = False, keys: bool = False, default: Any = None) -> list:
+        return list(self._graph._iter_edges(nbunch, data, keys, default))
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self._graph._iter_edges(None, False, False, None)
+
+    def __contains__(self, edge: tuple) -> bool:
+        return self._graph.has_edge(*edge)
+
+    def __getitem__(self, edge: tuple) -> dict[str, Any]:
+        u, v, key = edge
+        return self._graph.adj[u][v][key]
+
+
+class AdjacencyView(Mapping):
+    """Read-only mapping from a node to its `NeighborView`."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: CSRGraph):
+        self._graph = graph
+
+    def __getitem__(self, n: Any) -> NeighborView:
+        return NeighborView(self._graph, self._graph._node_index[n])
+
+    def __contains__(self, n: Any) -> bool:
+        return n in self._graph
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph._node_names)
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+
+class NeighborView(Mapping):
+    """Read-only mapping from a neighbor to the `EdgeKeyView` of the edges to it."""
+
+    __slots__ = ("_graph", "_i")
+
+    def __init__(self, graph: CSRGraph, i: int):
+        self._graph = graph
+        self._i = i
+
+    def _neighbor_ids(self) -> Iterator[int]:
+        # The edges to a neighbor are contiguous in a row
+        previous = None
+        for j in self._graph._row(self._i)[0]:
+            if j != previous:
+                yield j
+                previous = j
+
+    def __getitem__(self, nbr: Any) -> EdgeKeyView:
+        j = self._graph._node_index[nbr]
+        edges = [e for k, e in zip(*self._graph._row(self._i)) if k == j]
+        if not edges:
+            raise KeyError(nbr)
+        return EdgeKeyView(self._graph, edges)
+
+    def __contains__(self, nbr: Any) -> bool:
+        try:
+            j = self._graph._node_index[nbr]
+        except KeyError, TypeError:
+            return False
+        return j in self._graph._row(self._i)[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        names = self._graph._node_names
+        return (names[j] for j in self._neighbor_ids())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._neighbor_ids())
+
+
+class EdgeKeyView(Mapping):
+    """Read-only mapping from an edge key to the edge attributes."""
+
+    __slots__ = ("_graph", "_edges")
+
+    def __init__(self, graph: CSRGraph, edges: list[int]):
+        self._graph = graph
+        self._edges = edges
+
+    def __getitem__(self, key: Any) -> dict[str, Any]:
+        for e in self._edges:
+            if self._graph._edge_keys[e] == key:
+                return self._graph._edge_data(e)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self._graph._edge_keys[e] for e in self._edges)
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+
+__all__ = [
+    "CSRGraph",
+    "StringColumn",
+    "NodeView",
+    "EdgeView",
+    "EdgeEndsView",
+    "AdjacencyView",
+    "NeighborView",
+    "EdgeKeyView",
+    "NODE_FIELDS",
+    "EDGE_FIELDS",
+]
@@ -0,0 +1,108 @@
+"""
+Oriented adjacency of the segments.
+
+The graph stores the links as undirected edges between segments, their
+orientations being edge attributes. A `HandleIndex` keeps the
+bidirected adjacency at the level of the oriented segments, or
+*handles*: the handle of a segment read forward is ``node * 2``, read
+in reverse ``node * 2 + 1``, ``node`` being the number of the segment
+in the index. A link ``L a + b -`` lets a traversal go from the handle
+of ``a+`` to the one of ``b-``, and from ``b+`` to ``a-`` too: the
+successors of a handle are the handles a traversal can continue with,
+its predecessors the successors of the flipped handle, flipped
+(``handle ^ 1``).
+
+The successors of all the handles are stored in CSR form: an offsets
+array indexed by handle, and the successor handles and the edge numbers
+of the links leading to them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+ORIENTATIONS = ("+", "-")
+
+
+class HandleIndex:
+    """The successors of every oriented segment.
+
+    :param names: The segment names, by node number.
+    :param edge_keys: The edge keys, by edge number.
+    :param from_handles: The handle every edge leaves, -1 for the
+        edges without orientations.
+    :param to_handles: The handle every edge enters, -1 for the edges
+        without orientations.
+    """
+
+    __slots__ = ("names", "numbers", "edge_keys", "indptr", "targets", "edges")
+
+    def __init__(self, names: list[Any], edge_keys: Sequence[Any], from_handles: np.ndarray, to_handles: np.ndarray):
+        self.names = names
+        self.numbers = {name: number for number, name in enumerate(names)}
+        self.edge_keys = edge_keys
+        from_handles = np.asarray(from_handles, dtype=np.int64)
+        to_handles = np.asarray(to_handles, dtype=np.int64)
+        oriented = (from_handles >= 0) & (to_handles >= 0)
+        edges = np.flatnonzero(oriented)
+        sources, targets = from_handles[oriented], to_handles[oriented]
+        # Both traversals of every link, once for the links that are their
+        # own reverse (a+ to a-, a- to a+)
+        other = sources != (targets ^ 1)
+        sources, targets, edges = (
+            np.concatenate([sources, targets[other] ^ 1]),
+            np.concatenate([targets, sources[other] ^ 1]),
+            np.concatenate([edges, edges[other]]),
+        )
+        order = np.argsort(sources, kind="stable")
+        self.indptr = np.zeros(2 * len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=2 * len(names)), out=self.indptr[1:])
+        self.targets = targets[order].astype(np.int32 if len(names) < 1 << 30 else np.int64)
+        self.edges = edges[order].astype(np.int32 if len(edge_keys) < 1 << 31 else np.int64)
+
+    def __len__(self) -> int:
+        """The number of handles."""
+        return 2 * len(self.names)
+
+    def __contains__(self, handle: Any) -> bool:
+        return isinstance(handle, (int, np.integer)) and 0 <= handle < 2 * len(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the CSR arrays, in bytes."""
+        return self.indptr.nbytes + self.targets.nbytes + self.edges.nbytes
+
+    def handle(self, name: Any, orientation: str = "+") -> int:
+        """Return the handle of an oriented segment.
+
+        :raises KeyError: If the segment is not indexed.
+        """
+        return self.numbers[name] * 2 + ORIENTATIONS.index(orientation)
+
+    def oriented_segment(self, handle: int) -> tuple[Any, str]:
+        """Return the ``(name, orientation)`` of a handle."""
+        return self.names[handle >> 1], ORIENTATIONS[handle & 1]
+
+    def successors(self, handle: int) -> np.ndarray:
+        """Return the handles following a handle."""
+        return self.targets[self.indptr[handle] : self.indptr[handle + 1]]
+
+    def predecessors(self, handle: int) -> np.ndarray:
+        """Return the handles preceding a handle."""
+        return self.successors(handle ^ 1) ^ 1
+
+    def out_edges(self, handle: int, keys: bool = False) -> Iterator[tuple]:
+        """Yield the ``(handle, successor)`` pairs of a handle, with the
+        key of the link as third item if `keys` is set."""
+        start, end = self.indptr[handle], self.indptr[handle + 1]
+        targets = self.targets[start:end].tolist()
+        if not keys:
+            return ((handle, target) for target in targets)
+        edge_keys = self.edge_keys
+        return ((handle, target, edge_keys[edge]) for target, edge in zip(targets, self.edges[start:end].tolist()))
+
+
+__all__ = ["HandleIndex"]
@@ -0,0 +1,201 @@
+"""
+Secondary indexes on the attributes of graph elements.
+
+A `where` clause maps attribute names (node, edge or subgraph
+attributes and optional field tags alike) to predicates, all of which
+an element must satisfy to match::
+
+    gfa.search(where={"slen": (">", 10000), "SN": "chr1"})
+
+A predicate is either a value, matched by equality, or an
+``(operator, value)`` pair, the operator being one of `OPERATORS`
+(``"in"`` takes a collection of values). Elements without the
+attribute never match, and neither do values that cannot be compared
+with the one given (e.g. a string with ``(">", 10)``).
+
+An `AttributeIndex` holds the values of one attribute for every
+element, and builds on first use a hash index of them (for ``==``,
+``!=`` and ``in``) and sorted indexes of the numbers and of the strings
+(for ``<``, ``<=``, ``>`` and ``>=``). Matches are arrays of element
+positions, so that the predicates of a clause are intersected in
+NumPy. The graphs keep their indexes until they are changed, see
+`GFAQueryMixin.search`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import numbers
+import operator
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+from pygfa.exceptions import InvalidSearchParameters
+
+# Value of the elements without the attribute
+MISSING = object()
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": None,
+}
+_EMPTY = np.zeros(0, dtype=np.intp)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def parse_predicate(predicate: Any) -> tuple[str, Any]:
+    """Return the ``(operator, value)`` pair of a predicate.
+
+    :param predicate: A value or an ``(operator, value)`` pair.
+    :raises InvalidSearchParameters: If the value of ``in`` is not
+        a collection.
+    """
+    if isinstance(predicate, tuple) and len(predicate) == 2 and isinstance(predicate[0], str):
+        if predicate[0] in OPERATORS:
+            op, value = predicate
+            if op == "in" and (isinstance(value, (str, bytes)) or not isinstance(value, Iterable)):
+                raise InvalidSearchParameters(f"The value of 'in' must be a collection, not {value!r}.")
+            return op, value
+    return "==", predicate
+
+
+class AttributeIndex:
+    """The values of one attribute for a sequence of elements.
+
+    The indexes are built the first time a predicate needs them.
+
+    :param values: The value of every element, `MISSING` for the
+        elements without the attribute.
+    """
+
+    __slots__ = ("values", "_present", "_hashed", "_unhashable", "_sorted")
+
+    def __init__(self, values: list[Any]):
+        self.values = values
+        self._present: np.ndarray | None = None
+        self._hashed: dict[Any, list[int]] | None = None
+        self._unhashable: list[int] | None = None
+        self._sorted: dict[str, tuple[Any, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def present(self) -> np.ndarray:
+        """Return the positions of the elements having the attribute."""
+        if self._present is None:
+            self._present = np.fromiter(
+                (i for i, value in enumerate(self.values) if value is not MISSING), dtype=np.intp
+            )
+        return self._present
+
+    def match(self, op: str, value: Any) -> np.ndarray:
+        """Return the sorted positions of the elements matching a predicate.
+
+        :param op: One of `OPERATORS`.
+        :param value: The value to compare with.
+        """
+        if op == "==":
+            return self._equal(value)
+        if op == "!=":
+            return np.setdiff1d(self.present(), self._equal(value), assume_unique=True)
+        if op == "in":
+            matches = [self._equal(item) for item in value]
+            return np.unique(np.concatenate(matches)) if matches else _EMPTY
+        if _is_number(value) and value == value:
+            values, positions = self._sorted_index("number")
+            left, right = np.searchsorted(values, value, "left"), np.searchsorted(values, value, "right")
+        elif isinstance(value, str):
+            values, positions = self._sorted_index("string")
+            left, right = bisect.bisect_left(values, value), bisect.bisect_right(values, value)
+        else:
+            return self._scan(OPERATORS[op], value)
+        size = len(positions)
+        lo, hi = {"<": (0, left), "<=": (0, right), ">": (right, size), ">=": (left, size)}[op]
+        return np.sort(positions[lo:hi])
+
+    def _equal(self, value: Any) -> np.ndarray:
+        try:
+            hash(value)
+        except TypeError:
+            return self._scan(operator.eq, value)
+        if self._hashed is None:
+            self._build_hashed()
+        matches = self._hashed.get(value, [])
+        if self._unhashable:
+            matches = sorted(matches + [i for i in self._unhashable if self.values[i] == value])
+        return np.array(matches, dtype=np.intp)
+
+    def _build_hashed(self) -> None:
+        hashed: dict[Any, list[int]] = {}
+        unhashable: list[int] = []
+        for i, value in enumerate(self.values):
+            if value is MISSING:
+                continue
+            try:
+                hashed.setdefault(value, []).append(i)
+            except TypeError:
+                unhashable.append(i)
+        self._hashed = hashed
+        self._unhashable = unhashable
+
+    def _sorted_index(self, kind: str) -> tuple[Any, np.ndarray]:
+        """Return the sorted numbers (NaNs excluded) or strings, and their positions."""
+        index = self._sorted.get(kind)
+        if index is None:
+            if kind == "number":
+                positions = [i for i, value in enumerate(self.values) if _is_number(value) and value == value]
+                values = np.array([self.values[i] for i in positions])
+                order = np.argsort(values, kind="stable")
+                index = (values[order], np.array(positions, dtype=np.intp)[order])
+            else:
+                positions = sorted(
+                    (i for i, value in enumerate(self.values) if isinstance(value, str)),
+                    key=self.values.__getitem__,
+                )
+                index = ([self.values[i] for i in positions], np.array(positions, dtype=np.intp))
+            self._sorted[kind] = index
+        return index
+
+    def _scan(self, compare: Any, value: Any) -> np.ndarray:
+        """Compare every value, for values the indexes don't handle."""
+        matches = []
+        for i, element_value in enumerate(self.values):
+            if element_value is MISSING:
+                continue
+            try:
+                if compare(element_value, value):
+                    matches.append(i)
+            except TypeError:
+                pass
+        return np.array(matches, dtype=np.intp)
+
+
+def match_where(indexes: Mapping[str, AttributeIndex], where: Mapping[str, Any], count: int) -> np.ndarray:
+    """Return the sorted positions of the elements matching every predicate.
+
+    :param indexes: The index of every attribute of the clause.
+    :param where: The clause, see the module documentation.
+    :param count: The number of elements, all of them matching an
+        empty clause.
+    """
+    matches: np.ndarray | None = None
+    for attribute, predicate in where.items():
+        op, value = parse_predicate(predicate)
+        positions = indexes[attribute].match(op, value)
+        matches = positions if matches is None else np.intersect1d(matches, positions, assume_unique=True)
+        if len(matches) == 0:
+            break
+    return matches if matches is not None else np.arange(count, dtype=np.intp)
+
+
+__all__ = ["MISSING", "OPERATORS", "parse_predicate", "AttributeIndex", "match_where"]
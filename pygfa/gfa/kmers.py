@@ -0,0 +1,399 @@
+"""
+K-mer and minimizer index of the segment sequences.
+
+A `KmerIndex` maps the k-mers (or, with a window, the minimizers) of
+the graph to the places they start at: a segment, the orientation it is
+read in and the offset on the sequence read in that orientation. Both
+strands of every segment are indexed, so a query is looked up as it is,
+and so are the k-mers crossing a link, enumerated in both directions of
+the bidirected edge: the first segment read in its link orientation
+followed by the second one past the bases the overlap CIGAR spans on it
+(see `pygfa.gfa.coordinates.overlap_length`). K-mers spanning more than
+one link (through segments shorter than k - 1) are not indexed.
+
+K-mers are packed 2 bits per base in ``uint64`` values (so k <= 32),
+computed for all the positions of a sequence at once with one NumPy
+shift-or pass per base; the k-mers with other bases than ACGT are left
+out. The minimizers of a window of w consecutive k-mers are the k-mers
+with the smallest hash in the window (all of them in case of ties),
+which are also the minimizers of the query windows they are in, the
+k-mers of the links all being indexed.
+
+The index is made of sorted arrays: the k-mer values and the segment,
+the orientation and the offset of every occurrence. `KmerIndex.save`
+writes them in the snapshot format (see `pygfa.gfa.snapshot`), so that
+`KmerIndex.load` memory-maps them instead of reading them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from pygfa.exceptions import FileFormatError, InvalidSearchParameters
+from pygfa.gfa.coordinates import overlap_length
+from pygfa.gfa.snapshot import load_snapshot, save_snapshot
+
+DEFAULT_K = 31
+MAX_K = 32
+
+# 2-bit codes of the bases, 4 for anything else
+_CODES = np.full(256, 4, dtype=np.uint8)
+for _code, _bases in enumerate(("Aa", "Cc", "Gg", "Tt")):
+    for _base in _bases:
+        _CODES[ord(_base)] = _code
+_COMPLEMENT_CODES = np.array([3, 2, 1, 0, 4], dtype=np.uint8)
+_COMPLEMENT = str.maketrans("ACGTacgt", "TGCAtgca")
+_NO_KEY = np.iinfo(np.uint64).max
+
+
+class KmerHit(NamedTuple):
+    """A k-mer of a query found in the graph."""
+
+    #: The offset of the k-mer in the query.
+    query_offset: int
+    #: The segment the k-mer starts in.
+    segment: str
+    #: The orientation the segment is read in.
+    orientation: str
+    #: The offset of the k-mer on the segment read in this orientation.
+    offset: int
+
+
+def encode_bases(sequence: str) -> np.ndarray:
+    """Return the 2-bit codes of the bases of a sequence, 4 for non ACGT."""
+    return _CODES[np.frombuffer(sequence.encode("latin-1", "replace"), dtype=np.uint8)]
+
+
+def reverse_complement(sequence: str) -> str:
+    return sequence.translate(_COMPLEMENT)[::-1]
+
+
+def kmer_values(codes: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the k-mers at every position of a sequence.
+
+    :param codes: The base codes of the sequence, see `encode_bases`.
+    :param k: The k-mer length.
+    :returns: The 2-bit packed value of every k-mer, and whether it
+        has only ACGT bases.
+    """
+    count = len(codes) - k + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+    bits = (codes & 3).astype(np.uint64)
+    values = np.zeros(count, dtype=np.uint64)
+    for i in range(k):
+        values <<= np.uint64(2)
+        values |= bits[i : i + count]
+    invalid = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(codes > 3, out=invalid[1:])
+    return values, invalid[k:] == invalid[:count]
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Hash k-mer values (the 64-bit finaliser of MurmurHash3)."""
+    mixed = values ^ (values >> np.uint64(33))
+    mixed *= np.uint64(0xFF51AFD7ED558CCD)
+    mixed ^= mixed >> np.uint64(33)
+    mixed *= np.uint64(0xC4CEB9FE1A85EC53)
+    mixed ^= mixed >> np.uint64(33)
+    return mixed
+
+
+def graph_fingerprint(
+    names: Sequence[str], sequences: Sequence[str | None], links: Iterable[tuple[int, str, int, str, object]]
+) -> tuple:
+    """Return a digest of what a `KmerIndex` is built from.
+
+    :param names: The segment names.
+    :param sequences: The sequence of every segment.
+    :param links: The links, as given to `KmerIndex.build`.
+    :returns: A one item tuple, the BLAKE2b digest of the names, the
+        sequences and the link columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\t".join(map(str, names)).encode())
+    for sequence in sequences:
+        digest.update(b"\n")
+        if sequence is not None:
+            digest.update(sequence.encode())
+    for link in links:
+        digest.update(("\n" + "\t".join(map(str, link))).encode())
+    return (digest.hexdigest(),)
+
+
+def select_minimizers(values: np.ndarray, valid: np.ndarray, window: int) -> np.ndarray:
+    """Return the k-mers that are the minimizer of a window.
+
+    :param values: The k-mer values at every position.
+    :param valid: Whether the k-mers are to be considered.
+    :param window: The number of consecutive k-mers of a window, 1 to
+        select all the valid k-mers.
+    :returns: A boolean array.
+    """
+    if window <= 1 or len(values) == 0:
+        return valid
+    keys = np.where(valid, _mix(values), _NO_KEY)
+    window = min(window, len(keys))
+    minimums = sliding_window_view(keys, window).min(axis=1)
+    # A k-mer is the minimizer of a window if it is the largest of the
+    # minimums of the windows it is in
+    padding = np.zeros(window - 1, dtype=np.uint64)
+    largest = sliding_window_view(np.concatenate([padding, minimums, padding]), window).max(axis=1)
+    return valid & (keys == largest)
+
+
+class KmerIndex:
+    """The occurrences of the k-mers or minimizers of a graph.
+
+    Built by `build`, or by `GFA.kmer_index`.
+
+    :param k: The k-mer length.
+    :param window: The minimizer window, 1 if all the k-mers are indexed.
+    :param names: The segment names, by segment number.
+    :param values: The sorted k-mer values.
+    :param segments: The segment number of every occurrence.
+    :param offsets: Its offset on the segment read in its orientation.
+    :param reverse: Its orientation (True for "-").
+    :param fingerprint: A digest of the indexed graph, telling a saved
+        index is outdated, see `graph_fingerprint`.
+    """
+
+    __slots__ = ("k", "window", "names", "values", "segments", "offsets", "reverse", "fingerprint")
+
+    def __init__(
+        self,
+        k: int,
+        window: int,
+        names: list[str],
+        values: np.ndarray,
+        segments: np.ndarray,
+        offsets: np.ndarray,
+        reverse: np.ndarray,
+        fingerprint: tuple = (),
+    ):
+        self.k = k
+        self.window = window
+        self.names = names
+        self.values = values
+        self.segments = segments
+        self.offsets = offsets
+        self.reverse = reverse
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(
+        cls,
+        names: list[str],
+        sequences: Sequence[str | None],
+        links: Iterable[tuple[int, str, int, str, object]],
+        k: int = DEFAULT_K,
+        window: int = 1,
+        fingerprint: tuple = (),
+    ) -> KmerIndex:
+        """Index the k-mers of segments and links.
+
+        :param names: The segment names.
+        :param sequences: The sequence of every segment, None or "*" for
+            none.
+        :param links: ``(from, from_orn, to, to_orn, overlap)`` links
+            between segment numbers, with their overlap CIGAR.
+        :param k: The k-mer length, at most 32.
+        :param window: The minimizer window, 1 to index all the k-mers.
+        :param fingerprint: See `KmerIndex`.
+        :raises InvalidSearchParameters: If k or the window is not valid.
+        """
+        if not 0 < k <= MAX_K:
+            raise InvalidSearchParameters(f"The k-mer length must be between 1 and {MAX_K}, not {k}.")
+        if window < 1:
+            raise InvalidSearchParameters(f"The minimizer window must be at least 1, not {window}.")
+        sequences = ["" if sequence is None or sequence == "*" else sequence for sequence in sequences]
+        lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+        # Separators long enough for the windows not to mix two segments,
+        # at both ends too for the windows of the first and last segments
+        separator = "\n" * window
+        codes = encode_bases(separator + separator.join(sequences) + separator)
+        starts = np.cumsum(lengths + window) - lengths
+        columns = []
+        for reverse in (False, True):
+            values, valid = kmer_values(_COMPLEMENT_CODES[codes[::-1]] if reverse else codes, k)
+            positions = np.flatnonzero(select_minimizers(values, valid, window))
+            if reverse:
+                # The k-mers of the reverse strand end at len(codes) - position
+                ends = len(codes) - positions
+                segments = np.searchsorted(starts, ends - k, "right") - 1
+                offsets = starts[segments] + lengths[segments] - ends
+            else:
+                segments = np.searchsorted(starts, positions, "right") - 1
+                offsets = positions - starts[segments]
+            columns.append((values[positions], segments, offsets, np.full(len(positions), reverse)))
+        columns.append(_link_kmers(sequences, links, k))
+        values, segments, offsets, reverse = (np.concatenate(column) for column in zip(*columns))
+        order = np.argsort(values)
+        offset_type = np.int32 if len(offsets) == 0 or offsets.max() <= np.iinfo(np.int32).max else np.int64
+        return cls(
+            k,
+            window,
+            list(names),
+            values[order],
+            segments[order].astype(np.int32),
+            offsets[order].astype(offset_type),
+            reverse[order].astype(bool),
+            fingerprint,
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the arrays, in bytes."""
+        return self.values.nbytes + self.segments.nbytes + self.offsets.nbytes + self.reverse.nbytes
+
+    def __reduce__(self):
+        return (
+            KmerIndex,
+            (
+                self.k,
+                self.window,
+                self.names,
+                self.values,
+                self.segments,
+                self.offsets,
+                self.reverse,
+                self.fingerprint,
+            ),
+        )
+
+    def lookup(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the occurrences of many k-mers.
+
+        :param values: The k-mer values.
+        :returns: Two arrays with an entry per occurrence: the position
+            in `values` of the k-mer and the row of the occurrence in the
+            arrays of the index.
+        """
+        left = np.searchsorted(self.values, values, "left")
+        counts = np.searchsorted(self.values, values, "right") - left
+        positions = np.repeat(np.arange(len(values)), counts)
+        offsets = np.arange(len(positions)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return positions, np.repeat(left, counts) + offsets
+
+    def find(self, query: str) -> list[KmerHit]:
+        """Return the occurrences in the graph of the k-mers of a query.
+
+        With a minimizer window, only the minimizers of the query are
+        looked up.
+
+        :param query: The query sequence.
+        :returns: The hits, sorted by query offset, segment number,
+            orientation and offset, none if the query is shorter than k.
+        """
+        values, valid = kmer_values(encode_bases(query), self.k)
+        query_offsets = np.flatnonzero(select_minimizers(values, valid, self.window))
+        positions, rows = self.lookup(values[query_offsets])
+        query_offsets = query_offsets[positions]
+        segments, reverse, offsets = self.segments[rows], self.reverse[rows], self.offsets[rows]
+        order = np.lexsort((offsets, reverse, segments, query_offsets))
+        names = self.names
+        return [
+            KmerHit(query_offset, names[segment], "-" if is_reverse else "+", offset)
+            for query_offset, segment, is_reverse, offset in zip(
+                query_offsets[order].tolist(),
+                segments[order].tolist(),
+                reverse[order].tolist(),
+                offsets[order].tolist(),
+            )
+        ]
+
+    def save(self, path: str) -> None:
+        """Save the index, see `load`.
+
+        :param path: The index file, e.g. next to the graph file.
+        """
+        save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> KmerIndex:
+        """Load an index written by `save`.
+
+        Like graph snapshots, index files are pickles: only load the
+        ones you wrote.
+
+        :param path: The index file.
+        :param mmap: If set, the arrays are read-only views of the
+            memory-mapped file.
+        :raises FileFormatError: If the file doesn't hold an index.
+        """
+        index = load_snapshot(path, use_mmap=mmap)
+        if not isinstance(index, cls):
+            raise FileFormatError(f"Not a k-mer index: {path}")
+        return index
+
+
+def _link_kmers(
+    sequences: Sequence[str], links: Iterable[tuple[int, str, int, str, object]], k: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the k-mers crossing the links, in both directions.
+
+    :returns: The value, the segment number, the offset and the
+        orientation of every k-mer, as in `KmerIndex.build`.
+    """
+    junctions: list[str] = []
+    sources: list[tuple[int, bool, int]] = []
+    flip = {"+": "-", "-": "+"}
+    # The bases the overlaps span on both segments, most links sharing a few CIGARs
+    spans: dict[object, tuple[int, int]] = {}
+    for from_segment, from_orn, to_segment, to_orn, overlap in links:
+        key = overlap if isinstance(overlap, str) else None
+        if key not in spans:
+            spans[key] = (overlap_length(key), overlap_length(key, second=True))
+        first_span, second_span = spans[key]
+        directions = (
+            (from_segment, from_orn, to_segment, to_orn, second_span),
+            (to_segment, flip[to_orn], from_segment, flip[from_orn], first_span),
+        )
+        for first, first_orn, second, second_orn, skip in directions:
+            first_sequence, second_sequence = sequences[first], sequences[second]
+            if not first_sequence or len(second_sequence) <= skip:
+                continue
+            # The last k - 1 bases of the first segment, then the bases
+            # of the second one following the overlap
+            if first_orn == "+":
+                tail = first_sequence[-(k - 1) :] if k > 1 else ""
+            else:
+                tail = reverse_complement(first_sequence[: k - 1])
+            if second_orn == "+":
+                head = second_sequence[skip : skip + k - 1]
+            else:
+                length = len(second_sequence)
+                head = reverse_complement(second_sequence[max(length - skip - k + 1, 0) : length - skip])
+            junctions.append(tail + head)
+            sources.append((first, first_orn == "-", len(first_sequence) - len(tail)))
+    if not junctions:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0, dtype=np.uint64), empty, empty, np.zeros(0, dtype=bool)
+    lengths = np.fromiter(map(len, junctions), dtype=np.int64, count=len(junctions))
+    starts = np.cumsum(lengths + 1) - (lengths + 1)
+    values, valid = kmer_values(encode_bases("\n".join(junctions)), k)
+    positions = np.flatnonzero(valid)
+    numbers = np.searchsorted(starts, positions, "right") - 1
+    segments, reverse, bases = (np.array(column) for column in zip(*sources))
+    return values[positions], segments[numbers], bases[numbers] + positions - starts[numbers], reverse[numbers]
+
+
+__all__ = [
+    "DEFAULT_K",
+    "MAX_K",
+    "KmerHit",
+    "KmerIndex",
+    "encode_bases",
+    "graph_fingerprint",
+    "kmer_values",
+    "reverse_complement",
+    "select_minimizers",
+]
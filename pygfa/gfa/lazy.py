@@ -0,0 +1,184 @@
+"""
+Lazily resolved graph attributes.
+
+Some attribute values are expensive to keep in memory (segment sequences
+of large pangenome graphs, for instance) and can be fetched again on
+demand. Such values are stored as `Deferred` placeholders inside a
+`LazyAttrDict`, the attribute dictionary used by the networkx graph,
+which resolves them transparently whenever the attribute is read.
+"""
+
+from __future__ import annotations
+
+import mmap
+from functools import lru_cache
+from typing import Any, Iterator
+
+DEFAULT_SEQUENCE_CACHE_SIZE = 4096
+
+
+class Deferred:
+    """A placeholder for an attribute value computed on access."""
+
+    __slots__ = ()
+
+    def resolve(self) -> Any:
+        """Return the actual attribute value."""
+        raise NotImplementedError
+
+
+def resolve(value: Any) -> Any:
+    """Return `value`, resolved if it is a `Deferred` placeholder."""
+    if isinstance(value, Deferred):
+        return value.resolve()
+    return value
+
+
+class LazyAttrDict(dict):
+    """An attribute dictionary resolving `Deferred` values when they are read.
+
+    Placeholders are kept in the dictionary, a value is resolved every time
+    it is read, so that memory use doesn't grow as the graph is traversed.
+    Copies keep the placeholders too.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: Any) -> Any:
+        return resolve(dict.__getitem__(self, key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return resolve(dict.get(self, key, default))
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        return resolve(dict.pop(self, key, *args))
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        return resolve(dict.setdefault(self, key, default))
+
+    def __iter__(self) -> Iterator[Any]:
+        # Overriding __iter__ stops dict(), dict.update() and ** unpacking
+        # from copying the raw placeholders: they go through __getitem__.
+        return dict.__iter__(self)
+
+    def items(self):
+        return [(key, resolve(value)) for key, value in dict.items(self)]
+
+    def values(self):
+        return [resolve(value) for value in dict.values(self)]
+
+    def copy(self) -> LazyAttrDict:
+        new = LazyAttrDict()
+        for key, value in dict.items(self):
+            dict.__setitem__(new, key, value)
+        return new
+
+    __copy__ = copy
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, dict):
+            return NotImplemented
+        return dict(self.items()) == (dict(other.items()) if isinstance(other, LazyAttrDict) else other)
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        # Placeholders are pickled and deep-copied as they are
+        return (LazyAttrDict, (), None, None, iter(dict.items(self)))
+
+
+class MmapSequenceSource:
+    """Segment sequences read on demand from a memory-mapped text GFA file.
+
+    Decoded sequences are kept in an LRU cache of `cache_size` entries.
+
+    :param filepath: Path to an uncompressed GFA file.
+    :param cache_size: Number of decoded sequences kept in memory.
+    """
+
+    def __init__(self, filepath: str, cache_size: int = DEFAULT_SEQUENCE_CACHE_SIZE):
+        self.filepath = filepath
+        self.cache_size = cache_size
+        with open(filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.fetch = lru_cache(maxsize=cache_size)(self._read)
+
+    def _read(self, offset: int, length: int) -> str:
+        return self._mmap[offset : offset + length].decode("ascii")
+
+    def sequence(self, offset: int, length: int) -> DeferredSequence:
+        """Return a placeholder for the sequence stored at `offset`.
+
+        :param offset: Byte offset of the sequence in the file.
+        :param length: Length of the sequence in bytes.
+        """
+        return DeferredSequence(self, offset, length)
+
+    def close(self) -> None:
+        """Release the memory map, sequences can no longer be read."""
+        self.fetch.cache_clear()
+        self._mmap.close()
+
+    def __reduce__(self):
+        # The file is mapped again when a pickled graph is loaded
+        return (MmapSequenceSource, (self.filepath, self.cache_size))
+
+    def __deepcopy__(self, memo: dict) -> MmapSequenceSource:
+        # The mapping is read-only, copies of a graph can share it
+        return self
+
+
+class DeferredSequence(Deferred):
+    """A segment sequence stored in a `MmapSequenceSource`."""
+
+    __slots__ = ("source", "offset", "length")
+
+    def __init__(self, source: MmapSequenceSource, offset: int, length: int):
+        self.source = source
+        self.offset = offset
+        self.length = length
+
+    def resolve(self) -> str:
+        return self.source.fetch(self.offset, self.length)
+
+    def __reduce__(self):
+        return (DeferredSequence, (self.source, self.offset, self.length))
+
+    def __repr__(self) -> str:
+        return f"DeferredSequence({self.source.filepath!r}, offset={self.offset}, length={self.length})"
+
+
+class BytesSequence(Deferred):
+    """A segment sequence kept as the `bytes` read from the file."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def resolve(self) -> str:
+        return self.data.decode("ascii")
+
+    def __reduce__(self):
+        return (BytesSequence, (self.data,))
+
+    def __repr__(self) -> str:
+        return f"BytesSequence(length={len(self.data)})"
+
+
+__all__ = [
+    "Deferred",
+    "resolve",
+    "LazyAttrDict",
+    "MmapSequenceSource",
+    "DeferredSequence",
+    "BytesSequence",
+    "DEFAULT_SEQUENCE_CACHE_SIZE",
+]
@@ -7,32 +7,97 @@ and converting GFA graphs to and from various formats.
 
 from __future__ import annotations
 
+import hashlib
+import itertools
 import logging
 import os
 import re
-from typing import Any
+from typing import Any, Iterable
 
 import lark
 
+from pygfa.exceptions import FileFormatError
 from pygfa.gfa.base import BaseGFA
+from pygfa.gfa.chunks import RAW_BATCH, ChunkBatches, parse_file_chunks
+from pygfa.gfa.lazy import BytesSequence, LazyAttrDict, MmapSequenceSource
+from pygfa.gfa.records import (
+    ContainmentRecord,
+    LinkRecord,
+    PathRecord,
+    Record,
+    SegmentRecord,
+    WalkRecord,
+    _coerce_opt_value,
+    iter_line_spans,
+    parse_record,
+    parse_segment_span,
+)
 from pygfa.graph_element import edge as ge
 from pygfa.graph_element import node
-from pygfa.utils.file_opener import open_gfa_file
+from pygfa.utils.bgzf import write_bgzf
+from pygfa.utils.file_opener import is_compressed, open_gfa_file
 
 GRAPH_LOGGER = logging.getLogger(__name__)
 
+# Start rule of the grammar for each record type, chosen from the first
+# character of a line.
+LINE_START_RULES = {
+    "H": "header_line",
+    "S": "segment_line",
+    "L": "link_line",
+    "C": "containment_line",
+    "P": "path_line",
+    "W": "walk_line",
+    "J": "jump_line",
+}
 
-def _coerce_opt_value(value_type: str, value: str) -> Any:
-    """Return a typed value for an optional field based on its GFA type tag.
+# Graph storages accepted by from_bgfa(backend=...)
+GRAPH_BACKENDS = ("networkx", "csr")
 
-    Integer (``i``) and float (``f``) fields are converted so that they are
-    re-serialized with the same type tag. Other types are kept as strings.
+# Maximum number of parsed records of the same type added at once
+RECORD_BATCH_SIZE = 65536
+
+
+def _grammar_cache_path(grammar: str) -> str | bool:
+    """Return the file caching the compiled parser of `grammar`.
+
+    The cache directory is `$PYGFA_CACHE_DIR`, or `pygfa` inside
+    `$XDG_CACHE_HOME` (default `~/.cache`). The file name contains the
+    grammar hash, so an edited grammar never loads stale parse tables.
+
+    :param grammar: The grammar text.
+    :returns: The cache file path, or False if the cache directory
+        cannot be created.
+    """
+    cache_dir = os.environ.get("PYGFA_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pygfa"
+    )
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        GRAPH_LOGGER.debug(f"Cannot create the grammar cache directory {cache_dir}")
+        return False
+    digest = hashlib.sha256(grammar.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"gfa-lark-{lark.__version__}-{digest}.cache")
+
+
+def _segment_length(sequence: str | bytes, opt_fields: dict[str, Any] | None) -> int | None:
+    """Return the `slen` of a segment: the length of its sequence, or its
+    ``LN`` tag for a `*` sequence, None if the length is unknown."""
+    if sequence not in ("*", b"*"):
+        return len(sequence)
+    length = (opt_fields or {}).get("LN")
+    return length if type(length) is int else None
+
+
+def _segment_node(name: str, sequence: str, opt_fields: dict[str, Any], load_sequences: bool) -> node.Node:
+    """Return the node of a segment line.
+
+    :param load_sequences: If not set, the sequence is replaced by `*`,
+        only its length is kept in `slen`.
     """
-    if value_type == "i":
-        return int(value)
-    if value_type == "f":
-        return float(value)
-    return value
+    length = _segment_length(sequence, opt_fields)
+    return node.Node(name, sequence if load_sequences else "*", length, opt_fields=opt_fields)
 
 
 class GFAParserMixin(BaseGFA):
@@ -45,67 +110,55 @@ class GFAParserMixin(BaseGFA):
     _parser = None
     _grammar = None
 
-    def from_string(self, string: str) -> None:
+    @classmethod
+    def _get_parser(cls) -> lark.Lark:
+        """Return the LALR parser for the GFA grammar, creating it on first use.
+
+        The compiled parser is stored in an on-disk cache keyed by the
+        grammar hash, see `_grammar_cache_path`, so that new processes
+        don't have to build the parse tables again.
+        """
+        if cls._parser is None:
+            grammar_file = os.path.join(os.path.dirname(__file__), "..", "graph_element", "parser", "gfa.lark")
+            GRAPH_LOGGER.debug(f"Loading grammar from: {grammar_file}")
+            with open(grammar_file) as f:
+                cls._grammar = f.read()
+            GRAPH_LOGGER.debug(f"Grammar loaded, size: {len(cls._grammar)} characters")
+
+            # Create the parser
+            cls._parser = lark.Lark(
+                cls._grammar,
+                parser="lalr",
+                lexer="contextual",
+                start=["start", *LINE_START_RULES.values()],
+                cache=_grammar_cache_path(cls._grammar),
+            )
+            GRAPH_LOGGER.debug("Lark parser created")
+        return cls._parser
+
+    def from_string(self, string: str, strict: bool = False) -> None:
         """Add a GFA string to the graph once it has been
         converted.
 
         :param string: A string containing GFA format lines.
+        :param strict: If set, parse every line with the Lark grammar
+            instead of the tab-splitting fast parser.
         """
         logger = logging.getLogger(__name__)
         lines = re.split("\n", string)
 
-        # Load the grammar from the gfa.lark file (cached)
-        if self.__class__._grammar is None:
-            grammar_file = os.path.join(os.path.dirname(__file__), "..", "graph_element", "parser", "gfa.lark")
-            with open(grammar_file) as f:
-                self.__class__._grammar = f.read()
+        def numbered_lines():
+            for i, line_ in enumerate(lines):
+                line_ = line_.strip()
+                if len(line_) < 1:
+                    logger.debug(f"Skipping empty line {i + 1}")
+                    continue
+                if line_.startswith("#"):
+                    logger.debug(f"Skipping comment line {i + 1}")
+                    continue
+                yield i + 1, line_
 
-            # Create the parser
-            self.__class__._parser = lark.Lark(self.__class__._grammar, start="start")
-            logger.debug("Created parser for GFA parsing")
-
-        parser = self.__class__._parser
-
-        for i, line_ in enumerate(lines):
-            line_ = line_.strip()
-            if len(line_) < 1:
-                logger.debug(f"Skipping empty line {i + 1}")
-                continue
-            if line_.startswith("#"):
-                logger.debug(f"Skipping comment line {i + 1}")
-                continue
-
-            logger.debug(f"Processing line {i + 1}: {line_[:50]}{'...' if len(line_) > 50 else ''}")
-
-            try:
-                # Parse the line
-                tree = parser.parse(line_ + "\n")
-                logger.debug(f"Successfully parsed line {i + 1}")
-
-                # Process the parsed tree based on line type
-                for subtree in tree.children:
-                    for child in subtree.children:
-                        if child.data == "header_line":
-                            # Handle header line
-                            pass
-                        elif child.data == "segment_line":
-                            self._process_segment_line(child)
-                        elif child.data == "link_line":
-                            self._process_link_line(child, i, logger)
-                        elif child.data == "containment_line":
-                            self._process_containment_line(child, i, logger)
-                        elif child.data == "path_line":
-                            self._process_path_line(child)
-                        elif child.data == "walk_line":
-                            self._process_walk_line(child)
-                        elif child.data == "jump_line":
-                            logger.debug(f"Processing jump line at line {i + 1}")
-                            pass
-
-            except lark.exceptions.LarkError as e:
-                # Skip lines that don't parse correctly
-                logger.warning(f"Failed to parse line {i + 1}: {line_[:50]}{'...' if len(line_) > 50 else ''} - {e}")
-                continue
+        self._add_lines(numbered_lines(), logger, strict=strict)
 
         # Log graph dump
         logger.debug("Graph content after from_string():")
@@ -124,10 +177,305 @@ class GFAParserMixin(BaseGFA):
                 f"walk_length={len(walk_data.get('walk', ''))}"
             )
 
-    def _process_segment_line(self, child) -> None:
+    def _add_line(self, line: str, line_num: int, logger, strict: bool = False, load_sequences: bool = True) -> None:
+        """Parse a single stripped GFA line and add its element to the graph.
+
+        The tab-splitting fast parser is tried first, lines it rejects are
+        handed over to the Lark grammar.
+
+        :param line: The GFA line, without comments and line terminator.
+        :param line_num: The line number for logging.
+        :param logger: The logger instance.
+        :param strict: If set, always use the Lark grammar.
+        :param load_sequences: If not set, segments are stored without
+            their sequence, see `_segment_node`.
+        """
+        if not strict:
+            record = parse_record(line)
+            if record is not None:
+                self._add_record(record, load_sequences=load_sequences)
+                return
+        self._add_lark_line(line, line_num, logger, load_sequences=load_sequences)
+
+    def _add_lines(
+        self, lines: Iterable[tuple[int, str]], logger, strict: bool = False, load_sequences: bool = True
+    ) -> None:
+        """Parse stripped GFA lines and add their elements to the graph, in order.
+
+        Runs of lines of the same record type accepted by the fast parser
+        (up to `RECORD_BATCH_SIZE` lines) are added in bulk by
+        `_add_records`, other lines go through the Lark grammar.
+
+        :param lines: ``(line number, line)`` pairs, without comments and
+            empty lines.
+        :param logger: The logger instance.
+        :param strict: If set, parse every line with the Lark grammar.
+        :param load_sequences: If not set, segments are stored without
+            their sequence, see `_segment_node`.
+        """
+        pending: list[Record] = []
+        for line_num, line in lines:
+            record = None if strict else parse_record(line)
+            if pending and (
+                record is None or type(record) is not type(pending[0]) or len(pending) >= RECORD_BATCH_SIZE
+            ):
+                self._add_records(pending, load_sequences=load_sequences)
+                pending = []
+            if record is None:
+                self._add_lark_line(line, line_num, logger, load_sequences=load_sequences)
+            else:
+                pending.append(record)
+        if pending:
+            self._add_records(pending, load_sequences=load_sequences)
+
+    def _add_lark_line(self, line: str, line_num: int, logger, load_sequences: bool = True) -> None:
+        """Parse a GFA line with the Lark grammar and add its element to the graph.
+
+        Lines that cannot be parsed are logged and skipped.
+
+        :param line: The GFA line, without comments and line terminator.
+        :param line_num: The line number for logging.
+        :param logger: The logger instance.
+        :param load_sequences: If not set, segments are stored without
+            their sequence.
+        """
+        start = LINE_START_RULES.get(line[:1])
+        try:
+            if start is None:
+                # Unknown record type: let the full grammar report the error
+                tree = self._get_parser().parse(line + "\n", start="start")
+            else:
+                tree = self._get_parser().parse(line, start=start)
+            logger.debug(f"Line {line_num}: Successfully parsed")
+        except lark.exceptions.LarkError as e:
+            # Skip lines that don't parse correctly
+            logger.warning(f"Failed to parse line {line_num}: {line[:50]}{'...' if len(line) > 50 else ''} - {e}")
+            return
+
+        # Process the parsed tree based on line type
+        if start is None:
+            line_trees = [child for subtree in tree.children for child in subtree.children]
+        else:
+            line_trees = [tree]
+        for child in line_trees:
+            if child.data == "header_line":
+                pass
+            elif child.data == "segment_line":
+                self._process_segment_line(child, load_sequences=load_sequences)
+            elif child.data == "link_line":
+                self._process_link_line(child, line_num, logger)
+            elif child.data == "containment_line":
+                self._process_containment_line(child, line_num, logger)
+            elif child.data == "path_line":
+                self._process_path_line(child)
+            elif child.data == "walk_line":
+                self._process_walk_line(child)
+            elif child.data == "jump_line":
+                logger.debug(f"Processing jump line at line {line_num}")
+
+    def _add_record(self, record: Record, load_sequences: bool = True) -> None:
+        """Add a record produced by the fast parser to the graph.
+
+        Header records carry no graph element and are ignored, as the
+        Lark path does.
+
+        :param record: A record returned by `records.parse_record`.
+        :param load_sequences: If not set, segments are stored without
+            their sequence.
+        """
+        if isinstance(record, SegmentRecord):
+            self.add_node(_segment_node(record.name, record.sequence, record.opt_fields, load_sequences))
+        elif isinstance(record, (LinkRecord, ContainmentRecord)):
+            self.add_edge(
+                ge.Edge(
+                    record.opt_fields.get("ID"),  # eid
+                    record.from_node,
+                    record.from_orn,
+                    record.to_node,
+                    record.to_orn,
+                    (None, None),  # from_positions
+                    (None, None),  # to_positions
+                    record.alignment,
+                    None,  # distance
+                    None,  # variance
+                    opt_fields=record.opt_fields,
+                )
+            )
+        elif isinstance(record, PathRecord):
+            path_data: dict[str, Any] = {"path_name": record.path_name, "segments": record.segments}
+            if record.overlaps is not None:
+                path_data["overlaps"] = record.overlaps
+            path_data.update(record.opt_fields)
+            self.add_path(path_data)
+        elif isinstance(record, WalkRecord):
+            walk_data: dict[str, Any] = {
+                "sample_id": record.sample_id,
+                "hapindex": record.hapindex,
+                "seq_id": record.seq_id,
+                "seq_start": record.seq_start,
+                "seq_end": record.seq_end,
+                "walk": record.walk,
+            }
+            walk_data.update(record.opt_fields)
+            self.add_walk(walk_data)
+
+    def _add_records(self, records: list[Record], load_sequences: bool = True) -> None:
+        """Add a run of fast parser records of the same type to the graph.
+
+        The records were validated by the fast parser, they are inserted
+        by the bulk methods in trusted mode. The result is the one of
+        calling `_add_record` on each record.
+
+        :param records: Records returned by `records.parse_record`, all of
+            the same type.
+        :param load_sequences: If not set, segments are stored without
+            their sequence.
+        """
+        first = records[0]
+        if isinstance(first, SegmentRecord):
+            self.add_nodes_from(
+                [record.name for record in records],
+                [record.sequence if load_sequences else "*" for record in records],
+                lengths=[_segment_length(record.sequence, record.opt_fields) for record in records],
+                opt_fields=[record.opt_fields for record in records],
+                trusted=True,
+            )
+        elif isinstance(first, (LinkRecord, ContainmentRecord)):
+            self.add_edges_from(
+                [record.from_node for record in records],
+                [record.from_orn for record in records],
+                [record.to_node for record in records],
+                [record.to_orn for record in records],
+                alignments=[record.alignment for record in records],
+                edge_ids=[record.opt_fields.get("ID") for record in records],
+                opt_fields=[record.opt_fields for record in records],
+                trusted=True,
+            )
+        elif isinstance(first, PathRecord):
+            self.add_paths_from(
+                (
+                    {
+                        "path_name": record.path_name,
+                        "segments": record.segments,
+                        **({} if record.overlaps is None else {"overlaps": record.overlaps}),
+                        **record.opt_fields,
+                    }
+                    for record in records
+                ),
+                trusted=True,
+            )
+        elif isinstance(first, WalkRecord):
+            self.add_walks_from(
+                (
+                    {
+                        "sample_id": record.sample_id,
+                        "hapindex": record.hapindex,
+                        "seq_id": record.seq_id,
+                        "seq_start": record.seq_start,
+                        "seq_end": record.seq_end,
+                        "walk": record.walk,
+                        **record.opt_fields,
+                    }
+                    for record in records
+                ),
+                trusted=True,
+            )
+
+    def _load_lazy_sequences(self, filepath: str, strict: bool, include: frozenset[str] | None, logger) -> None:
+        """Load a plain GFA file, replacing segment sequences by file offsets.
+
+        Lines are added without their sequence, then the `sequence`
+        attribute of the segment is set to a `DeferredSequence` that the
+        node attribute dictionaries (`LazyAttrDict`) resolve on access.
+
+        :param filepath: Path to an uncompressed GFA file.
+        :param strict: If set, parse every line with the Lark grammar.
+        :param include: Record type letters to load (default: all).
+        :param logger: The logger instance.
+        """
+        self._graph.node_attr_dict_factory = LazyAttrDict
+        source = MmapSequenceSource(filepath)
+        offset = 0
+        with open(filepath, "rb") as f:
+            for line_count, raw_line in enumerate(f, start=1):
+                line_start = offset
+                offset += len(raw_line)
+                line = raw_line.decode().strip()
+                if not line or line.startswith("#"):
+                    continue
+                if include is not None and line[0] not in include:
+                    continue
+                self._add_line(line, line_count, logger, strict=strict, load_sequences=False)
+                if line[0] != "S":
+                    continue
+                # S <tab> name <tab> sequence [<tab> optional fields]
+                stripped = raw_line.lstrip()
+                fields = stripped.split(b"\t", 3)
+                if len(fields) < 3:
+                    continue
+                name = fields[1].decode()
+                sequence = fields[2].rstrip()
+                if sequence == b"*" or not self._graph.has_node(name):
+                    continue
+                seq_offset = line_start + len(raw_line) - len(stripped) + len(fields[0]) + len(fields[1]) + 2
+                self._graph.nodes[name]["sequence"] = source.sequence(seq_offset, len(sequence))
+
+    def _load_zero_copy(self, filepath: str, include: frozenset[str] | None, load_sequences: bool, logger) -> None:
+        """Load a GFA file with the bytes-level reader of `pygfa.gfa.records`.
+
+        Segment sequences are stored as `BytesSequence` placeholders that
+        the node attribute dictionaries (`LazyAttrDict`) decode on access.
+
+        :param filepath: Path to the GFA file.
+        :param include: Record type letters to load (default: all).
+        :param load_sequences: If not set, segments are stored without
+            their sequence.
+        :param logger: The logger instance.
+        """
+        self._graph.node_attr_dict_factory = LazyAttrDict
+        with open_gfa_file(filepath, "rb") as f:
+            for line_count, (buffer, start, end) in enumerate(iter_line_spans(f), start=1):
+                if start == end or buffer[start] == ord("#"):
+                    continue
+                record_type = chr(buffer[start])
+                if include is not None and record_type not in include:
+                    continue
+                if record_type == "S":
+                    record = parse_segment_span(buffer, start, end)
+                    if record is not None:
+                        length = _segment_length(record.sequence, record.opt_fields)
+                        self.add_node(node.Node(record.name, "*", length, opt_fields=record.opt_fields))
+                        if load_sequences and record.sequence != b"*":
+                            self._graph.nodes[record.name]["sequence"] = BytesSequence(record.sequence)
+                        continue
+                line = buffer[start:end].decode()
+                self._add_line(line, line_count, logger, load_sequences=load_sequences)
+
+    def _add_chunk(self, chunk: ChunkBatches, line_offset: int, logger, load_sequences: bool = True) -> None:
+        """Add the records of a parsed file chunk to the graph, in file order.
+
+        :param chunk: The batches returned by `chunks.parse_chunk`.
+        :param line_offset: Number of lines preceding the chunk in the file.
+        :param logger: The logger instance.
+        :param load_sequences: If not set, segments are stored without
+            their sequence.
+        """
+        batches = {key: iter(batch) for key, batch in chunk.batches.items()}
+        # Runs of lines of the same type are added in bulk
+        for key, run in itertools.groupby(chunk.order):
+            items = list(itertools.islice(batches[key], sum(1 for _ in run)))
+            if key == RAW_BATCH:
+                for line_num, line in items:
+                    self._add_lark_line(line, line_offset + line_num, logger, load_sequences=load_sequences)
+            else:
+                self._add_records(items, load_sequences=load_sequences)
+
+    def _process_segment_line(self, child, load_sequences: bool = True) -> None:
         """Process a parsed segment line and add it to the graph.
 
         :param child: The parsed segment line from lark.
+        :param load_sequences: If not set, the segment is stored without
+            its sequence.
         """
         segment_data: dict[str, Any] = {}
         for seg_child in child.children:
@@ -143,11 +491,11 @@ class GFAParserMixin(BaseGFA):
 
         if "segment_name" in segment_data and "sequence" in segment_data:
             self.add_node(
-                node.Node(
+                _segment_node(
                     segment_data["segment_name"],
                     segment_data["sequence"],
-                    len(segment_data["sequence"]),
-                    opt_fields={k: v for k, v in segment_data.items() if k not in ["segment_name", "sequence"]},
+                    {k: v for k, v in segment_data.items() if k not in ["segment_name", "sequence"]},
+                    load_sequences,
                 )
             )
 
@@ -327,10 +675,10 @@ class GFAParserMixin(BaseGFA):
                 segments = []
                 for seg_child in walk_child.children:
                     inner = seg_child.children[0]
-                    if inner.data == "oriented_segment_sign":
+                    if inner.data == "walk_step_sign":
                         seg_name = inner.children[0].value
                         orn = inner.children[1].value
-                    else:  # oriented_segment_char
+                    else:  # walk_step_char
                         orn = "+" if inner.children[0].value == ">" else "-"
                         seg_name = inner.children[1].value
                     segments.append(f"{seg_name}{orn}")
@@ -345,69 +693,95 @@ class GFAParserMixin(BaseGFA):
             self.add_walk(walk_data)
 
     @classmethod
-    def from_gfa(cls, filepath):
+    def from_gfa(
+        cls,
+        filepath,
+        strict: bool = False,
+        workers: int | None = None,
+        include: Iterable[str] | None = None,
+        load_sequences: bool = True,
+        lazy_sequences: bool = False,
+        zero_copy: bool = False,
+        packed_sequences: bool = False,
+    ):
         """Parse the given file and return a GFA object.
 
-        Since GFA is a line-oriented format, we can parse each line separately.
-        This allows to avoid keeping the entire parse tree in memory.
+        Since GFA is a line-oriented format, each line is parsed
+        separately, without keeping the entire parse tree in memory.
+        Lines are split on tabs and validated by the fast parser in
+        `pygfa.gfa.records`; lines it rejects fall back to the Lark grammar.
+
+        With `workers` greater than 1, a plain (uncompressed) file is split
+        into byte ranges parsed by a pool of worker processes (see
+        `pygfa.gfa.chunks`) and the records are added in file order, so
+        the result is the graph the serial loader builds. Compressed files,
+        `strict` parsing and lazy loading are always serial.
+
+        With `lazy_sequences`, the segment sequences of a plain GFA file
+        are not kept in memory: each node holds the offset and length of
+        its sequence, read from a memory map of the file (behind an LRU
+        cache) whenever the `sequence` attribute is accessed. The file must
+        not change while the graph is in use.
 
         :param filepath: Path to the GFA file.
+        :param strict: If set, parse every line with the Lark grammar.
+        :param workers: Number of worker processes used to parse the file.
+        :param include: Record type letters to load, e.g. `{"S", "L"}`
+            (default: all record types). Lines are filtered on their first
+            character before being parsed.
+        :param load_sequences: If not set, segments are stored with `*`
+            as sequence, `slen` still holds the sequence length. The
+            `slen` of a `*` segment is its ``LN`` tag, None without it.
+        :param lazy_sequences: If set, read segment sequences from the file
+            on demand.
+        :param zero_copy: If set, read the file in binary mode, parse the
+            segment lines in place and keep their sequences as `bytes`,
+            decoded only when the `sequence` attribute is read.
+        :param packed_sequences: If set, move the segment sequences into a
+            2-bit packed `SequenceStore` once the file is loaded, see
+            `pack_sequences`.
         :returns: A new GFA graph object.
+        :raises FileFormatError: If `lazy_sequences` is requested for a
+            compressed file.
         """
         logger = logging.getLogger(__name__)
         logger.debug(f"GFA.from_gfa(): Starting to parse file: {filepath}")
 
-        g = cls()
+        if packed_sequences:
+            g = cls.from_gfa(filepath, strict, workers, include, load_sequences, lazy_sequences, zero_copy)
+            if load_sequences:
+                g.pack_sequences()
+            return g
 
-        # Load the grammar from the gfa.lark file (cached)
-        if cls._grammar is None:
-            grammar_file = os.path.join(os.path.dirname(__file__), "..", "graph_element", "parser", "gfa.lark")
-            logger.debug(f"Loading grammar from: {grammar_file}")
-            with open(grammar_file) as f:
-                cls._grammar = f.read()
-            logger.debug(f"Grammar loaded, size: {len(cls._grammar)} characters")
-
-            # Create the parser
-            cls._parser = lark.Lark(cls._grammar, start="start")
-            logger.debug("Lark parser created")
-
-        parser = cls._parser
+        g = cls()
+        include = None if include is None else frozenset(include)
+
+        if lazy_sequences and load_sequences:
+            if is_compressed(filepath):
+                raise FileFormatError(f"Lazy sequences require an uncompressed GFA file: {filepath}")
+            g._load_lazy_sequences(filepath, strict, include, logger)
+            return g
+
+        if zero_copy and not strict:
+            g._load_zero_copy(filepath, include, load_sequences, logger)
+            return g
+
+        if workers is not None and workers > 1 and not strict and not is_compressed(filepath):
+            logger.debug(f"GFA.from_gfa(): Parsing with {workers} worker processes")
+            line_offset = 0
+            for chunk in parse_file_chunks(filepath, workers, include=include):
+                g._add_chunk(chunk, line_offset, logger, load_sequences=load_sequences)
+                line_offset += chunk.line_count
+            return g
 
         # Read and parse the file line by line
-        line_count = 0
         with open_gfa_file(filepath) as f:
-            for line in f:
-                line = line.strip()
-                line_count += 1
-                if not line or line.startswith("#"):
-                    continue
-
-                try:
-                    # Parse the line using from_string logic
-                    tree = parser.parse(line + "\n")
-                    logger.debug(f"Line {line_count}: Successfully parsed")
-
-                    # Process the parsed tree based on line type
-                    for subtree in tree.children:
-                        for child in subtree.children:
-                            if child.data == "header_line":
-                                pass
-                            elif child.data == "segment_line":
-                                g._process_segment_line(child)
-                            elif child.data == "link_line":
-                                g._process_link_line(child, line_count, logger)
-                            elif child.data == "containment_line":
-                                g._process_containment_line(child, line_count, logger)
-                            elif child.data == "path_line":
-                                g._process_path_line(child)
-                            elif child.data == "walk_line":
-                                g._process_walk_line(child)
-
-                except lark.exceptions.LarkError as e:
-                    logger.warning(
-                        f"Failed to parse line {line_count}: {line[:50]}{'...' if len(line) > 50 else ''} - {e}"
-                    )
-                    continue
+            lines = (
+                (line_count, line)
+                for line_count, line in enumerate((raw_line.strip() for raw_line in f), start=1)
+                if line and not line.startswith("#") and (include is None or line[0] in include)
+            )
+            g._add_lines(lines, logger, strict=strict, load_sequences=load_sequences)
 
         return g
 
@@ -440,6 +814,8 @@ class GFAParserMixin(BaseGFA):
         verbose: bool = False,
         debug: bool = False,
         logfile: str = None,
+        backend: str = "networkx",
+        trusted: bool = False,
     ) -> "GFA":  # noqa: F821
         """Read a BGFA file and return the corresponding GFA graph.
 
@@ -447,11 +823,21 @@ class GFAParserMixin(BaseGFA):
         :param verbose: If True, log detailed information
         :param debug: If True, log debug information
         :param logfile: Path to log file (if None and verbose=True, uses a temporary file)
+        :param backend: Graph storage, "networkx" for a mutable graph or
+            "csr" for a read-only array-backed graph (see `freeze`)
+        :param trusted: If set, the decoded nodes, edges, paths and walks
+            are not validated again, for files written by `to_bgfa`
         :return: GFA graph object
+        :raises ValueError: If the backend is unknown
         """
         from pygfa.bgfa import read_bgfa
 
-        return read_bgfa(file_path, verbose=verbose, debug=debug, logfile=logfile)
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(f"Unknown graph backend {backend!r}, expected one of {', '.join(GRAPH_BACKENDS)}")
+        graph = read_bgfa(file_path, verbose=verbose, debug=debug, logfile=logfile, trusted=trusted)
+        if backend == "csr":
+            return graph.freeze()
+        return graph
 
     def pprint(self):
         """Pretty print the entire GFA graph, including all attributes."""
@@ -544,7 +930,7 @@ class GFAParserMixin(BaseGFA):
             **kwargs,
         )
 
-    def to_gfa(self):
+    def to_gfa(self, file: str | None = None):
         """Output a GFA string associated to this GFA graph.
 
         The elements appear in this order:
@@ -555,7 +941,11 @@ class GFAParserMixin(BaseGFA):
         5. Walks (sorted by SampleID, then SeqId)
         6. Containments (sorted by Container, then Contained)
 
+        :param file: If given, also write the GFA to this path. A `.gz`
+            path is written as BGZF, with a `.gzi` index, see
+            `pygfa.utils.bgzf`.
         :returns: A string containing the GFA representation
+        :raises FileFormatError: If `file` has another compression suffix.
         """
         logger = logging.getLogger(__name__)
         logger.debug("to_gfa(): Starting GFA serialization")
@@ -706,4 +1096,13 @@ class GFAParserMixin(BaseGFA):
 
         result = "\n".join(lines)
         logger.debug(f"to_gfa(): GFA serialization complete, {len(result)} characters")
+        if file is not None:
+            if file.endswith(".gz"):
+                write_bgzf(file, (result + "\n").encode())
+            elif is_compressed(file):
+                raise FileFormatError(f"Only plain and BGZF (.gz) GFA output is supported: {file}")
+            else:
+                with open(file, "w") as f:
+                    f.write(result + "\n")
+            logger.debug(f"to_gfa(): GFA written to {file}")
         return result
@@ -8,18 +8,51 @@ nodes, edges, and subgraphs in a GFA graph.
 from __future__ import annotations
 
 import logging
-from typing import Callable
+import os
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
+import numpy as np
 from networkx import MultiGraph
 from networkx.classes.function import all_neighbors as nx_all_neighbors
 
-from pygfa.exceptions import GFAError
+from pygfa.exceptions import GFAError, InvalidElementError, InvalidSearchParameters
 from pygfa.gfa.base import BaseGFA, Element
+from pygfa.gfa.coordinates import CoordinateIndex
+from pygfa.gfa.expression import QueryExpression, masked_column
+from pygfa.gfa.frozen import EDGE_FIELDS, NODE_FIELDS
+from pygfa.gfa.handles import HandleIndex
+from pygfa.gfa.index import MISSING, AttributeIndex, match_where
+from pygfa.gfa.kmers import DEFAULT_K, KmerHit, KmerIndex, graph_fingerprint
+from pygfa.gfa.steps import OrientedSteps
+from pygfa.gfa.tags import TagRegistry
+from pygfa.gfa.traversals import TraversalIndex
 from pygfa.graph_element import subgraph as sg
 
 GRAPH_LOGGER = logging.getLogger(__name__)
 
 
+def _select(comparator: Callable[[dict], bool] | None, elements: Iterable[tuple[str, dict]]) -> list[str]:
+    """Return the keys of the ``(key, data)`` elements matching a comparator.
+
+    :raises InvalidSearchParameters: If there is no comparator.
+    """
+    if comparator is None:
+        raise InvalidSearchParameters("A comparator or a where clause is required.")
+    retval: list[str] = []
+    for key, data in elements:
+        try:
+            if comparator(data):
+                retval.append(key)
+        except KeyError:
+            pass
+    return retval
+
+
+def _degree(neighbors: Mapping[str, Mapping], node: str) -> int:
+    """Return the degree of a node from its adjacency, as networkx."""
+    return sum(map(len, neighbors.values())) + len(neighbors.get(node, ()))
+
+
 class GFAQueryMixin(BaseGFA):
     """Mixin class providing query and search operations.
 
@@ -42,102 +75,667 @@ class GFAQueryMixin(BaseGFA):
             raise GFAError("The source node is not in the graph.")
         return list(nx_all_neighbors(self._graph, nid))
 
-    def search(self, comparator: Callable[[dict], bool], limit_type: int | None = None) -> list[str]:
+    def handle_index(self) -> HandleIndex:
+        """Return the oriented adjacency of the segments.
+
+        The index (see `pygfa.gfa.handles`) is built on first use and
+        kept until the graph changes. Its handles number the oriented
+        segments: ``node * 2`` for a segment read forward, plus 1 in
+        reverse.
+
+        :returns: A `HandleIndex`.
+        """
+
+        def build() -> HandleIndex:
+            handle_arrays = getattr(self._graph, "handle_arrays", None)
+            if handle_arrays is not None:
+                from_handles, to_handles = handle_arrays()
+                return HandleIndex(self._graph._node_names, self._graph._edge_keys, from_handles, to_handles)
+            names = self._element_keys(Element.NODE)
+            numbers = {name: number for number, name in enumerate(names)}
+            edge_keys = []
+            from_handles = []
+            to_handles = []
+            for _u, _v, key, data in self._graph.edges(keys=True, data=True):
+                edge_keys.append(key)
+                from_orn, to_orn = data.get("from_orn"), data.get("to_orn")
+                if {from_orn, to_orn} <= {"+", "-"}:
+                    from_handles.append(numbers[data["from_node"]] * 2 + (from_orn == "-"))
+                    to_handles.append(numbers[data["to_node"]] * 2 + (to_orn == "-"))
+                else:
+                    from_handles.append(-1)
+                    to_handles.append(-1)
+            return HandleIndex(names, edge_keys, np.array(from_handles), np.array(to_handles))
+
+        return self._cached((Element.EDGE, None, "handles"), build)
+
+    def handle(self, nid: str, orientation: str = "+") -> int:
+        """Return the handle of an oriented segment, see `handle_index`.
+
+        :param nid: The id of the segment.
+        :param orientation: "+" or "-".
+        :raises GFAError: If the node doesn't exist.
+        """
+        try:
+            return self.handle_index().handle(nid, orientation)
+        except (KeyError, ValueError) as err:
+            raise GFAError(f"No oriented segment {nid}{orientation} in the graph.") from err
+
+    def handle_name(self, handle: int) -> tuple[str, str]:
+        """Return the ``(node id, orientation)`` of a handle."""
+        return self.handle_index().oriented_segment(handle)
+
+    def successors(self, handle: int) -> list[int]:
+        """Return the handles a traversal can continue with after a handle.
+
+        :param handle: The handle of an oriented segment, see `handle`.
+        :returns: A handle for every link leaving the oriented segment.
+        """
+        return self.handle_index().successors(handle).tolist()
+
+    def predecessors(self, handle: int) -> list[int]:
+        """Return the handles a traversal can reach a handle from.
+
+        :param handle: The handle of an oriented segment, see `handle`.
+        :returns: A handle for every link entering the oriented segment.
+        """
+        return self.handle_index().predecessors(handle).tolist()
+
+    def handle_edges(self, handle: int, keys: bool = False) -> Iterator[tuple]:
+        """Yield the links leaving an oriented segment.
+
+        This is the default edge selector of the algorithms in
+        `pygfa.algorithms`, which then traverse handles.
+
+        :param handle: The handle of an oriented segment, see `handle`.
+        :param keys: If set, yield the edge keys too.
+        :returns: ``(handle, successor)`` or ``(handle, successor, key)``
+            tuples.
+        """
+        return self.handle_index().out_edges(handle, keys)
+
+    def handle_lengths(self) -> np.ndarray:
+        """Return the length of every segment of `handle_index`, by node
+        number: the length of a handle is ``lengths[handle >> 1]``.
+
+        The lengths are the ``LN`` tags, or else the sequence lengths, 0
+        for the segments without sequence.
+        """
+
+        def build() -> np.ndarray:
+            names = self.handle_index().names
+            nodes = self._element_keys(Element.NODE)
+            if list(nodes) == list(names):
+                return self._node_lengths()
+            position = {name: i for i, name in enumerate(nodes)}
+            return self._node_lengths()[np.fromiter((position[name] for name in names), np.int64, len(names))]
+
+        return self._cached((Element.NODE, "slen", "handles"), build)
+
+    def search(
+        self,
+        comparator: Callable[[dict], bool] | None = None,
+        limit_type: int | None = None,
+        where: Mapping[str, Any] | None = None,
+    ) -> list[str]:
         """Perform a query applying the comparator on each graph element.
 
+        The query can be given as a `where` clause instead of (or with)
+        the comparator, e.g. ``where={"slen": (">", 10000), "SN": "chr1"}``
+        (see `pygfa.gfa.index`): it is answered by indexes on the
+        attributes, built the first time they are needed and kept until
+        elements are added or removed. The comparator is then applied to
+        the elements matching the clause only. The indexes don't see the
+        changes made to the attribute dictionaries in place, e.g.
+        ``gfa.nodes(identifier="1")["RC"] = 50``: call
+        `invalidate_indexes` after them.
+
         :param comparator: A function that takes a dictionary of element data
             and returns True if the element matches the search criteria.
         :param limit_type: If set, limit the search to only nodes, edges,
             or subgraphs. Use Element.NODE, Element.EDGE, or Element.SUBGRAPH.
+        :param where: The predicates, by attribute, the elements have to
+            satisfy.
         :returns: List of element ids that match the comparator.
+        :raises InvalidSearchParameters: If neither a comparator nor
+            a where clause is given.
         """
         if limit_type == Element.NODE:
-            return self.search_on_nodes(comparator)
+            return self.search_on_nodes(comparator, where)
         elif limit_type == Element.EDGE:
-            return self.search_on_edges(comparator)
+            return self.search_on_edges(comparator, where)
         elif limit_type == Element.SUBGRAPH:
-            return self.search_on_subgraph(comparator)
+            return self.search_on_subgraph(comparator, where)
 
         retval: list[str] = []
-        retval.extend(self.search_on_nodes(comparator))
-        retval.extend(self.search_on_edges(comparator))
-        retval.extend(self.search_on_subgraph(comparator))
+        retval.extend(self.search_on_nodes(comparator, where))
+        retval.extend(self.search_on_edges(comparator, where))
+        retval.extend(self.search_on_subgraph(comparator, where))
         return retval
 
-    def search_on_nodes(self, comparator: Callable[[dict], bool]) -> list[str]:
+    def search_on_nodes(
+        self, comparator: Callable[[dict], bool] | None = None, where: Mapping[str, Any] | None = None
+    ) -> list[str]:
         """Search for nodes matching the comparator.
 
         :param comparator: A function that takes a dictionary of node data
             and returns True if the node matches the search criteria.
+        :param where: The predicates the nodes have to satisfy, see `search`.
         :returns: List of node ids that match the comparator.
         """
-        retval: list[str] = []
-        for key, data in self.nodes_iter(data=True):
-            try:
-                if comparator(data):
-                    retval.append(key)
-            except KeyError:
-                pass
-        return retval
+        if where is None:
+            return _select(comparator, self.nodes_iter(data=True))
+        keys = self._search_where(Element.NODE, where)
+        if comparator is None:
+            return keys
+        node_data = self._graph.nodes
+        return _select(comparator, ((key, node_data[key]) for key in keys))
 
-    def search_on_edges(self, comparator: Callable[[dict], bool]) -> list[str]:
+    def search_on_edges(
+        self, comparator: Callable[[dict], bool] | None = None, where: Mapping[str, Any] | None = None
+    ) -> list[str]:
         """Search for edges matching the comparator.
 
         :param comparator: A function that takes a dictionary of edge data
             and returns True if the edge matches the search criteria.
+        :param where: The predicates the edges have to satisfy, see `search`.
         :returns: List of edge ids (keys) that match the comparator.
         """
-        retval: list[str] = []
-        for _u, _v, key, data in self.edges_iter(data=True, keys=True):
-            try:
-                if comparator(data):
-                    retval.append(key)
-            except KeyError:
-                pass
-        return retval
+        if where is None:
+            return _select(comparator, ((key, data) for _u, _v, key, data in self.edges_iter(data=True, keys=True)))
+        keys = self._search_where(Element.EDGE, where)
+        if comparator is None:
+            return keys
+        return _select(comparator, ((key, self._search_edge_by_key(key)) for key in keys))
 
-    def search_on_subgraph(self, comparator: Callable[[dict], bool]) -> list[str]:
+    def search_on_subgraph(
+        self, comparator: Callable[[dict], bool] | None = None, where: Mapping[str, Any] | None = None
+    ) -> list[str]:
         """Search for subgraphs matching the comparator.
 
         :param comparator: A function that takes a dictionary of subgraph data
             and returns True if the subgraph matches the search criteria.
+        :param where: The predicates the subgraphs have to satisfy, see
+            `search`.
         :returns: List of subgraph ids that match the comparator.
         """
-        retval: list[str] = []
-        for key, data in self._subgraphs.items():
-            data_dict = data.as_dict()
-            try:
-                if comparator(data_dict):
-                    retval.append(key)
-            except KeyError:
-                pass
-        return retval
+        if where is None:
+            keys = list(self._subgraphs)
+        else:
+            keys = self._search_where(Element.SUBGRAPH, where)
+            if comparator is None:
+                return keys
+        return _select(comparator, ((key, self._subgraphs[key].as_dict()) for key in keys))
 
-    def get_subgraph(self, sub_key: str) -> "GFAQueryMixin":
-        """Return a GFA subgraph from the parent graph.
+    def invalidate_indexes(self) -> None:
+        """Drop the search indexes, the query columns and the other
+        indexes built by the graph, they are rebuilt on their next use.
+
+        Adding or removing elements drops them already, this is needed
+        after changing attribute dictionaries in place only.
+        """
+        self._touch()
+
+    def _search_where(self, element_type: int, where: Mapping[str, Any]) -> list[str]:
+        """Return the keys of the elements of a type matching a where clause."""
+        keys = self._element_keys(element_type)
+        indexes = {attribute: self._search_index(element_type, attribute) for attribute in where}
+        return [keys[i] for i in match_where(indexes, where, len(keys)).tolist()]
+
+    def _cached(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """Return a search index or a query column, built if needed.
+
+        They are dropped when the graph changes (see `_touch`).
+
+        :param key: The element type and the attribute of the index.
+        :param build: A function building the index.
+        """
+        if self._indexes_version != self._version:
+            self._indexes.clear()
+            self._indexes_version = self._version
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = build()
+            GRAPH_LOGGER.debug("_cached(): %r built", key)
+        return index
+
+    def _element_keys(self, element_type: int) -> list[str]:
+        """Return the keys of the elements of a type, in graph order.
+
+        :param element_type: Element.NODE, Element.EDGE or Element.SUBGRAPH.
+        """
+
+        def build() -> list[str]:
+            if element_type == Element.NODE:
+                return list(self._graph.nodes())
+            if element_type == Element.EDGE:
+                return [key for _u, _v, key in self._graph.edges(keys=True)]
+            return list(self._subgraphs)
+
+        return self._cached((element_type, None), build)
+
+    def _search_index(self, element_type: int, attribute: str) -> AttributeIndex:
+        """Return the index of an attribute of the elements of a type.
+
+        :param element_type: Element.NODE, Element.EDGE or Element.SUBGRAPH.
+        :param attribute: The attribute.
+        """
+
+        def build() -> AttributeIndex:
+            if element_type == Element.NODE:
+                return AttributeIndex([value for _, value in self._graph.nodes(data=attribute, default=MISSING)])
+            if element_type == Element.EDGE:
+                edges = self._graph.edges(keys=True, data=attribute, default=MISSING)
+                return AttributeIndex([value for _u, _v, _key, value in edges])
+            return AttributeIndex([data.as_dict().get(attribute, MISSING) for data in self._subgraphs.values()])
+
+        return self._cached((element_type, attribute), build)
+
+    def query(self, expression: str, limit_type: int = Element.NODE) -> list[str]:
+        """Return the nodes or the edges an expression is true for.
+
+        The expression is evaluated with NumPy operations on whole
+        columns (see `pygfa.gfa.expression`), e.g.
+        ``gfa.query("slen > 1000 & gc > 0.6 & degree >= 3")``. A column
+        holds an attribute or an optional field of every element, nodes
+        have the derived columns
+
+        * ``length``: the length of the sequence,
+        * ``gc``: the fraction of G and C bases in the sequence,
+        * ``degree``: the number of edges of the node, self loops
+          counting twice,
+
+        too. The columns are built the first time they are used and kept
+        until elements are added or removed: after changing attribute
+        dictionaries in place, call `invalidate_indexes`.
+
+        :param expression: The expression.
+        :param limit_type: Element.NODE (default) or Element.EDGE.
+        :returns: The ids of the matching elements, in graph order.
+        :raises InvalidSearchParameters: If the expression is not valid
+            or if limit_type is neither Element.NODE nor Element.EDGE.
+        """
+        if limit_type not in (Element.NODE, Element.EDGE):
+            raise InvalidSearchParameters("A query selects nodes (Element.NODE) or edges (Element.EDGE).")
+        compiled = QueryExpression(expression)
+        keys = self._element_keys(limit_type)
+        columns = {name: self._query_column(limit_type, name) for name in compiled.columns}
+        matches = compiled.evaluate(columns, len(keys))
+        return [keys[i] for i in np.flatnonzero(matches).tolist()]
 
-        Return a new GFA graph structure with the nodes,
-        edges and subgraphs specified in the elements attributes
-        of the subgraph object pointed by the id.
+    def _query_column(self, element_type: int, name: str) -> np.ma.MaskedArray:
+        """Return a column of the nodes or the edges, see `query`."""
 
-        The returned GFA is *independent* from the original object.
+        def build() -> np.ma.MaskedArray:
+            graph = self._graph
+            if element_type == Element.EDGE:
+                tag_array = getattr(graph, "edge_tag_array", None)
+                if tag_array is not None and name not in EDGE_FIELDS:
+                    return tag_array(name)
+                return masked_column(value for _u, _v, value in graph.edges(data=name, default=None))
+            if name == "degree":
+                degree_array = getattr(graph, "degree_array", None)
+                if degree_array is not None:
+                    return np.ma.MaskedArray(degree_array())
+                # The networkx dictionaries are much faster to walk than the views
+                if isinstance(graph, MultiGraph):
+                    adjacency = graph._adj.items()
+                else:
+                    adjacency = ((n, graph.adj[n]) for n in graph)
+                return np.ma.MaskedArray(np.fromiter((_degree(nbrs, n) for n, nbrs in adjacency), dtype=np.int64))
+            if name in ("length", "gc"):
+                lengths, gc = self._sequence_columns()
+                return lengths if name == "length" else gc / lengths
+            if name == "slen" and hasattr(graph, "slen_array"):
+                return graph.slen_array()
+            tag_array = getattr(graph, "node_tag_array", None)
+            if tag_array is not None and name not in NODE_FIELDS:
+                return tag_array(name)
+            return masked_column(value for _, value in graph.nodes(data=name, default=None))
+
+        return self._cached((element_type, name, "column"), build)
+
+    def _sequence_columns(self) -> tuple[np.ma.MaskedArray, np.ma.MaskedArray]:
+        """Return the sequence length and the G/C count of every node,
+        masked for the nodes without a sequence."""
+
+        def build() -> tuple[np.ma.MaskedArray, np.ma.MaskedArray]:
+            sequence_arrays = getattr(self._graph, "sequence_arrays", None)
+            if sequence_arrays is not None:
+                return sequence_arrays()
+            lengths: list[int] = []
+            gc: list[int] = []
+            missing: list[bool] = []
+            for _, sequence in self._graph.nodes(data="sequence", default=None):
+                known = isinstance(sequence, str) and sequence != "*"
+                lengths.append(len(sequence) if known else 0)
+                gc.append(sum(map(sequence.count, "CGcg")) if known else 0)
+                missing.append(not known)
+            # int64 even when every sequence is missing
+            mask = np.array(missing, dtype=bool)
+            return (
+                np.ma.MaskedArray(np.array(lengths, dtype=np.int64), mask=mask),
+                np.ma.MaskedArray(np.array(gc, dtype=np.int64), mask=mask.copy()),
+            )
+
+        return self._cached((Element.NODE, "sequence", "stats"), build)
+
+    def node_tag_array(self, tag: str) -> np.ma.MaskedArray:
+        """Return the values of an optional field for every node.
+
+        Frozen graphs store the optional fields by tag (see
+        `pygfa.gfa.tags`) and return the column as is, other graphs
+        collect the values from the node attributes.
+
+        :param tag: The tag of the field, e.g. "RC".
+        :returns: A masked array in node order, masked for the nodes
+            without the tag: ``int64`` for ``i`` fields, ``float64``
+            for ``f`` fields, ``object`` for strings or mixed types.
+        """
+        tag_array = getattr(self._graph, "node_tag_array", None)
+        if tag_array is not None:
+            return tag_array(tag)
+        rows = ({tag: data[tag]} if tag in data else None for _, data in self._graph.nodes(data=True))
+        return TagRegistry.from_rows(rows).array(tag)
+
+    def edge_tag_array(self, tag: str) -> np.ma.MaskedArray:
+        """Return the values of an optional field for every edge.
+
+        :param tag: The tag of the field, e.g. "ID".
+        :returns: A masked array in edge order, as `node_tag_array`.
+        """
+        tag_array = getattr(self._graph, "edge_tag_array", None)
+        if tag_array is not None:
+            return tag_array(tag)
+        rows = ({tag: data[tag]} if tag in data else None for _, _, data in self._graph.edges(data=True))
+        return TagRegistry.from_rows(rows).array(tag)
+
+    def traversal_index(self) -> TraversalIndex:
+        """Return the index of the paths and walks visiting each segment.
+
+        The index is built on first use, then kept up to date by
+        `add_path`, `add_walk`, `remove_path` and `remove_walk`. Its keys
+        are ``(Element.PATH, path_id)`` and ``(Element.WALK, walk_id)``
+        pairs, its segment ids those of the segment names in the paths
+        and walks. Paths and walks whose steps are not stored as segment
+        ids (see `pygfa.gfa.steps`) are not indexed.
+
+        :returns: A `TraversalIndex`.
+        """
+        if self._traversals is None:
+            self._traversals = TraversalIndex(self._traversal_steps())
+        return self._traversals
+
+    def _traversal_steps(self) -> Iterator[tuple[tuple[int, str], np.ndarray]]:
+        """Yield the key and the segment ids of every path and walk."""
+        kinds = ((Element.PATH, self._paths, "segments"), (Element.WALK, self._walks, "walk"))
+        for element_type, traversals, field in kinds:
+            for key, data in traversals.items():
+                # The stored value, not the list or string it resolves to
+                steps = dict.get(data, field)
+                if isinstance(steps, OrientedSteps):
+                    yield (element_type, key), steps.ids
+
+    def visits(self, segment: str) -> list[tuple[str, int]]:
+        """Return the paths and walks visiting a segment, see `visits_many`.
+
+        :param segment: The segment name.
+        :returns: The ``(path_or_walk_id, step_index)`` visits.
+        """
+        return self.visits_many([segment])[segment]
+
+    def visits_many(self, segments: Iterable[str]) -> dict[str, list[tuple[str, int]]]:
+        """Return the paths and walks visiting each of many segments.
+
+        The lookups use the `traversal_index` of the graph.
+
+        :param segments: The segment names.
+        :returns: The ``(path_or_walk_id, step_index)`` visits of every
+            segment, sorted by traversal number (see
+            `TraversalIndex.keys`) then step.
+        """
+        segments = list(segments)
+        segment_map = self._segment_map
+        visits = self.traversal_index().visits([segment_map.get(name, -1) for name in segments])
+        return {name: [(key[1], step) for key, step in found] for name, found in zip(segments, visits)}
+
+    def _segment_lengths(self) -> np.ndarray:
+        """Return the length of every segment by segment id: its ``LN``
+        tag, or else its ``slen``, 0 for the segments without sequence."""
+
+        def build() -> np.ndarray:
+            segment_map = self._segment_map
+            nodes = self._element_keys(Element.NODE)
+            ids = np.fromiter((segment_map.get(name, -1) for name in nodes), dtype=np.int64, count=len(nodes))
+            column = self._node_lengths()
+            lengths = np.zeros(len(self._segment_names), dtype=np.int64)
+            known = ids >= 0
+            lengths[ids[known]] = column[known]
+            return lengths
+
+        return self._cached((Element.NODE, "slen", "segments"), build)
+
+    def _node_lengths(self) -> np.ndarray:
+        """Return the length of every node, in node order: its ``LN`` tag,
+        or else its ``slen``, or else the length of its sequence, 0 if
+        unknown."""
+
+        def build() -> np.ndarray:
+            # The parsers leave slen to None when the length is unknown,
+            # some graphs (e.g. read from BGFA) have no slen at all
+            column = np.zeros(len(self._element_keys(Element.NODE)), dtype=np.int64)
+            for values in (
+                self._sequence_columns()[0],
+                self._query_column(Element.NODE, "slen"),
+                self._query_column(Element.NODE, "LN"),
+            ):
+                if values.dtype == object:
+                    values = masked_column(value if type(value) is int else None for value in values.filled(None))
+                column = np.where(np.ma.getmaskarray(values), column, np.ma.getdata(values))
+            return column
+
+        return self._cached((Element.NODE, "slen", "nodes"), build)
+
+    def coordinate_index(self, traversal: str) -> CoordinateIndex:
+        """Return the coordinates of the steps of a path or a walk.
+
+        The index is built on first use and kept until the path or the
+        walk, or the segments, change. See `pygfa.gfa.coordinates` for
+        the coordinate system: the segments without a length (no
+        sequence nor ``LN`` tag) count as empty.
+
+        :param traversal: The id of a path or a walk.
+        :returns: A `CoordinateIndex`.
+        :raises GFAError: If the id doesn't identify any path or walk
+            whose steps are known segments.
+        """
+        if traversal in self._paths:
+            element_type, data, field = Element.PATH, self._paths[traversal], "segments"
+        elif traversal in self._walks:
+            element_type, data, field = Element.WALK, self._walks[traversal], "walk"
+        else:
+            raise GFAError(f"The given id doesn't identify any path or walk: {traversal!r}.")
+        steps = dict.get(data, field)
+        if not isinstance(steps, OrientedSteps):
+            raise GFAError(f"The steps of {traversal!r} are not oriented segments.")
+
+        def build() -> CoordinateIndex:
+            lengths = self._segment_lengths()
+            # Segments may have been named by paths or walks added since
+            missing = len(self._segment_names) - len(lengths)
+            if missing > 0:
+                lengths = np.concatenate([lengths, np.zeros(missing, dtype=np.int64)])
+            if element_type == Element.PATH:
+                return CoordinateIndex(steps.ids, steps.orientations(), lengths, overlaps=data.get("overlaps"))
+            return CoordinateIndex(steps.ids, steps.orientations(), lengths, origin=data.get("seq_start") or 0)
+
+        key = (element_type, traversal, "coordinates")
+        index = self._cached(key, build)
+        if index.ids is not steps.ids:
+            # The path or the walk was replaced since
+            index = self._indexes[key] = build()
+        return index
+
+    def locate(self, traversal: str, positions: Iterable[int]) -> list[tuple[str, str, int] | None]:
+        """Return the segments at some positions of a path or a walk.
+
+        :param traversal: The id of a path or a walk.
+        :param positions: The positions, see `coordinate_index`.
+        :returns: For every position, None if it is out of the path or
+            the walk, else the segment name, its orientation and the
+            offset of the position on its (forward strand) sequence.
+        :raises GFAError: If the id doesn't identify any path or walk.
+        """
+        index = self.coordinate_index(traversal)
+        steps, offsets = index.locate(positions)
+        offsets = index.segment_offsets(steps, offsets)
+        names = self._segment_names
+        located: list[tuple[str, str, int] | None] = []
+        for step, offset in zip(steps.tolist(), offsets.tolist()):
+            if step < 0:
+                located.append(None)
+            else:
+                located.append((names[index.ids[step]], "-" if index.reverse[step] else "+", offset))
+        return located
+
+    def region(self, name: str, start: int, end: int) -> "GFAQueryMixin":
+        """Return the subgraph of the segments covering an interval of a
+        path, a walk, or a sequence.
+
+        `name` is the id of a path or a walk, or else the ``seq_id`` of
+        walks: the segments of all of them covering the interval are
+        selected then.
+
+        :param name: The id of a path or a walk, or a walk ``seq_id``.
+        :param start: The first position of the interval.
+        :param end: The position after the last one.
+        :returns: A read-only `GFAView` of the segments (see
+            `subgraph_view`).
+        :raises GFAError: If no path or walk has this name.
+        """
+        if name in self._paths or name in self._walks:
+            traversals = [name]
+        else:
+            traversals = [key for key, data in self._walks.items() if data.get("seq_id") == name]
+            if not traversals:
+                raise GFAError(f"No path or walk is named {name!r}.")
+        ids = []
+        for traversal in traversals:
+            index = self.coordinate_index(traversal)
+            first, stop = index.step_range(start, end)
+            ids.append(index.ids[first:stop])
+        names = self._segment_names
+        return self.subgraph_view(names[seg_id] for seg_id in np.unique(np.concatenate(ids)).tolist())
+
+    def kmer_index(self, k: int = DEFAULT_K, window: int = 1, path: str | None = None) -> KmerIndex:
+        """Return the index of the k-mers or minimizers of the segments.
+
+        The index (see `pygfa.gfa.kmers`) covers both strands of the
+        segments and the k-mers crossing the links. It is built on first
+        use and kept until the graph changes.
+
+        :param k: The k-mer length, at most 32.
+        :param window: The minimizer window, 1 to index all the k-mers.
+        :param path: An index file, e.g. next to the BGFA file of the
+            graph: the index is memory-mapped from it if it was saved for
+            the same k, window and graph, else built and saved to it.
+        :returns: A `KmerIndex`.
+        :raises InvalidSearchParameters: If k or the window is not valid.
+        """
+
+        def build() -> KmerIndex:
+            names = self._element_keys(Element.NODE)
+            numbers = {name: number for number, name in enumerate(names)}
+            links = []
+            for _u, _v, data in self._graph.edges(data=True):
+                # Jumps have no overlap to cross
+                if data.get("distance") is None and {data.get("from_orn"), data.get("to_orn")} <= {"+", "-"}:
+                    from_node, to_node = numbers[data["from_node"]], numbers[data["to_node"]]
+                    links.append((from_node, data["from_orn"], to_node, data["to_orn"], data.get("alignment")))
+            sequences = [sequence for _, sequence in self._graph.nodes(data="sequence", default=None)]
+            fingerprint = graph_fingerprint(names, sequences, links)
+            if path is not None and os.path.exists(path):
+                index = KmerIndex.load(path)
+                if (index.k, index.window, index.fingerprint) == (k, window, fingerprint):
+                    return index
+                GRAPH_LOGGER.info("Outdated k-mer index %s, rebuilding it", path)
+            index = KmerIndex.build(names, sequences, links, k, window, fingerprint)
+            if path is not None:
+                index.save(path)
+            return index
+
+        return self._cached((Element.NODE, "sequence", ("kmers", k, window, path)), build)
+
+    def find_sequence(self, query: str, k: int = DEFAULT_K, window: int = 1) -> list[KmerHit]:
+        """Return where the k-mers of a sequence occur in the graph.
+
+        The k-mers are looked up in the `kmer_index` of the graph, with
+        the same k and window.
+
+        :param query: The sequence.
+        :param k: The k-mer length.
+        :param window: The minimizer window, 1 to look up all the k-mers.
+        :returns: The `KmerHit` of every k-mer occurrence: the offset of
+            the k-mer in the query, and the segment, its orientation and
+            the offset on it (read in this orientation) the k-mer starts
+            at. The hits are sorted by query offset.
+        """
+        return self.kmer_index(k, window).find(query)
+
+    def get_subgraph(self, sub_key: str, copy: bool = True) -> "GFAQueryMixin":
+        """Return a GFA subgraph from the parent graph.
+
+        Return a GFA graph structure with the nodes, edges, subgraphs,
+        paths and walks specified in the elements attributes of the
+        subgraph object pointed by the id. The end nodes of the edges
+        are included too.
 
         :param sub_key: The id of a subgraph present in the GFA graph.
-        :returns: A new GFA graph containing the subgraph elements.
+        :param copy: If set, the returned GFA is *independent* from the
+            original object, otherwise it is a read-only `GFAView` of it,
+            sharing its data.
+        :returns: A GFA graph containing the subgraph elements.
         :raises InvalidSubgraphError: If the subgraph id doesn't exist.
+        :raises InvalidElementError: If an element of the subgraph
+            is not in the graph.
         """
         if sub_key not in self._subgraphs:
             raise sg.InvalidSubgraphError("There is no subgraph pointed by this key.")
-        subgraph = self._subgraphs[sub_key]
         # Import here to avoid circular imports
-        from pygfa.gfa import GFA
+        from pygfa.gfa.view import GFAView
 
-        sub_gfa = GFA()
-        for id_ in subgraph.elements.keys():
-            # creating a new GFA graph and the add method,
-            # the virtual id are recomputed
-            sub_gfa.add_graph_element(self.as_graph_element(id_))
-        return sub_gfa
+        selected: dict[str, list[str]] = {"nodes": [], "edges": [], "subgraphs": [], "paths": [], "walks": []}
+        for id_ in self._subgraphs[sub_key].elements.keys():
+            if self._graph.has_node(id_):
+                selected["nodes"].append(id_)
+            elif id_ in self._subgraphs:
+                selected["subgraphs"].append(id_)
+            elif id_ in self._paths:
+                selected["paths"].append(id_)
+            elif id_ in self._walks:
+                selected["walks"].append(id_)
+            elif self._get_edge_end_nodes(id_) != (None, None):
+                selected["edges"].append(id_)
+            else:
+                raise InvalidElementError(f"No graph element has the given key: {id_}")
+        view = GFAView(self, **selected)
+        return view.materialize() if copy else view
+
+    def subgraph_view(self, nbunch: Iterable[str]) -> "GFAQueryMixin":
+        """Return a read-only view of the subgraph induced by some nodes.
+
+        The `GFAView` shows the given nodes, all the edges between them
+        and the paths and walks going through them only, without copying
+        anything: it supports the read methods of `GFA` (including
+        `to_gfa` and `to_bgfa`), `materialize()` returns an independent
+        copy.
+
+        :param nbunch: The nodes.
+        :returns: A `GFAView` of the graph.
+        """
+        from pygfa.gfa.view import GFAView
+
+        return GFAView.induced(self, nbunch)
 
     def subgraph(self, nbunch: list[str], copy: bool = True) -> MultiGraph:
         """Given a bunch of nodes return a graph with
@@ -151,6 +749,9 @@ class GFAQueryMixin(BaseGFA):
         Given a collection of nodes return a subgraph with the nodes
         given and all the edges between each pair of nodes.
 
+        See `subgraph_view` for a GFA view of the subgraph that
+        doesn't copy anything.
+
         :param nbunch: The nodes.
         :param copy: If set to True return a copy of the subgraph.
         :returns: A networkx MultiGraph subgraph.
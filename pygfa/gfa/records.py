@@ -0,0 +1,401 @@
+"""
+Lightweight GFA records and the tab-splitting fast parser.
+
+Text GFA is line oriented and every record type has a fixed field layout,
+so most lines can be parsed by splitting on tabs and checking each field
+against the precompiled regexes of :mod:`field_validator`. The functions
+in this module do exactly that and return small named tuples instead of
+a Lark parse tree.
+
+A line the fast parser cannot handle (unknown record type, malformed
+field, ...) yields ``None``: callers are expected to fall back to the
+Lark grammar, which reports the error.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import IO, Any, Iterator, NamedTuple
+
+from pygfa.graph_element.parser import field_validator as fv
+
+_NAME_RE = re.compile(fv.DATASTRING_VALIDATION_REGEXP[fv.GFA1_NAME])
+_SEQUENCE_RE = re.compile(fv.DATASTRING_VALIDATION_REGEXP[fv.GFA1_SEQUENCE])
+_CIGAR_RE = re.compile(fv.DATASTRING_VALIDATION_REGEXP[fv.GFA1_CIGAR])
+_INT_RE = re.compile(fv.DATASTRING_VALIDATION_REGEXP[fv.TYPE_i])
+_OPT_FIELD_RE = re.compile(r"([A-Za-z][A-Za-z0-9]):([AifZJHB]):(.*)")
+_OPT_VALUE_RES = {
+    value_type: re.compile(fv.DATASTRING_VALIDATION_REGEXP[value_type])
+    for value_type in (fv.TYPE_A, fv.TYPE_i, fv.TYPE_f, fv.TYPE_Z, fv.JSON, fv.HEX_BYTE_ARRAY, fv.DEC_ARRAY)
+}
+# Walk steps use either the `>s1<s2` or the `s1+s2-` notation.
+_WALK_CHAR_RE = re.compile(r"(?:[><][^<>\s]+)+")
+_WALK_CHAR_STEP_RE = re.compile(r"([><])([^<>\s]+)")
+_WALK_SIGN_RE = re.compile(r"(?:[^+\-\s]+[+-])+")
+
+
+def _unanchored(pattern: str) -> bytes:
+    # `^` and `$` only match at the real ends of the buffer, not at the
+    # pos/endpos bounds used to match a field in place
+    return re.sub(r"(?<!\[)\^|\$", "", pattern).encode()
+
+
+# Byte-level counterparts, matched in place with pos/endpos
+_NAME_BYTES_RE = re.compile(_unanchored(_NAME_RE.pattern))
+_SEQUENCE_BYTES_RE = re.compile(_unanchored(_SEQUENCE_RE.pattern))
+_WHITESPACE_BYTES = frozenset(b" \t\r\f\v")
+
+ORIENTATIONS = ("+", "-")
+
+# Size of the reads of `iter_line_spans`
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class HeaderRecord(NamedTuple):
+    """An ``H`` line."""
+
+    opt_fields: dict[str, Any]
+
+
+class SegmentRecord(NamedTuple):
+    """An ``S`` line, the sequence is `bytes` when read by `parse_segment_span`."""
+
+    name: str
+    sequence: str | bytes
+    opt_fields: dict[str, Any]
+
+
+class LinkRecord(NamedTuple):
+    """An ``L`` line."""
+
+    from_node: str
+    from_orn: str
+    to_node: str
+    to_orn: str
+    alignment: str
+    opt_fields: dict[str, Any]
+
+
+class ContainmentRecord(NamedTuple):
+    """A ``C`` line."""
+
+    from_node: str
+    from_orn: str
+    to_node: str
+    to_orn: str
+    pos: int
+    alignment: str
+    opt_fields: dict[str, Any]
+
+
+class PathRecord(NamedTuple):
+    """A ``P`` line, segments are kept in the ``s1+`` notation."""
+
+    path_name: str
+    segments: list[str]
+    overlaps: list[str] | None
+    opt_fields: dict[str, Any]
+
+
+class WalkRecord(NamedTuple):
+    """A ``W`` line, the walk is kept as a concatenated ``s1+s2-`` string."""
+
+    sample_id: str
+    hapindex: int
+    seq_id: str
+    seq_start: int | None
+    seq_end: int | None
+    walk: str
+    opt_fields: dict[str, Any]
+
+
+Record = HeaderRecord | SegmentRecord | LinkRecord | ContainmentRecord | PathRecord | WalkRecord
+
+
+def _coerce_opt_value(value_type: str, value: str) -> Any:
+    """Return a typed value for an optional field based on its GFA type tag.
+
+    Integer (``i``) and float (``f``) fields are converted so that they are
+    re-serialized with the same type tag. Other types are kept as strings.
+    """
+    if value_type == "i":
+        return int(value)
+    if value_type == "f":
+        return float(value)
+    return value
+
+
+def parse_opt_fields(fields: list[str]) -> dict[str, Any] | None:
+    """Parse ``TAG:TYPE:VALUE`` fields into a dictionary of typed values.
+
+    :param fields: The optional fields of a line, already split on tabs.
+    :returns: The optional fields, or None if one of them is malformed.
+    """
+    opt_fields: dict[str, Any] = {}
+    for field in fields:
+        match = _OPT_FIELD_RE.fullmatch(field)
+        if match is None:
+            return None
+        tag, value_type, value = match.groups()
+        if _OPT_VALUE_RES[value_type].fullmatch(value) is None:
+            return None
+        opt_fields[tag] = _coerce_opt_value(value_type, value)
+    return opt_fields
+
+
+def _is_oriented_name(name: str, orn: str) -> bool:
+    return orn in ORIENTATIONS and _NAME_RE.fullmatch(name) is not None
+
+
+def _parse_header(fields: list[str]) -> HeaderRecord | None:
+    opt_fields = parse_opt_fields(fields[1:])
+    if opt_fields is None:
+        return None
+    return HeaderRecord(opt_fields)
+
+
+def _parse_segment(fields: list[str]) -> SegmentRecord | None:
+    if len(fields) < 3:
+        return None
+    name, sequence = fields[1], fields[2]
+    if _NAME_RE.fullmatch(name) is None or _SEQUENCE_RE.fullmatch(sequence) is None:
+        return None
+    opt_fields = parse_opt_fields(fields[3:])
+    if opt_fields is None:
+        return None
+    return SegmentRecord(name, sequence, opt_fields)
+
+
+def _parse_link(fields: list[str]) -> LinkRecord | None:
+    if len(fields) < 6:
+        return None
+    _, from_node, from_orn, to_node, to_orn, alignment = fields[:6]
+    if not (_is_oriented_name(from_node, from_orn) and _is_oriented_name(to_node, to_orn)):
+        return None
+    if _CIGAR_RE.fullmatch(alignment) is None:
+        return None
+    opt_fields = parse_opt_fields(fields[6:])
+    if opt_fields is None:
+        return None
+    return LinkRecord(from_node, from_orn, to_node, to_orn, alignment, opt_fields)
+
+
+def _parse_containment(fields: list[str]) -> ContainmentRecord | None:
+    if len(fields) < 7:
+        return None
+    _, from_node, from_orn, to_node, to_orn, pos, alignment = fields[:7]
+    if not (_is_oriented_name(from_node, from_orn) and _is_oriented_name(to_node, to_orn)):
+        return None
+    if _INT_RE.fullmatch(pos) is None or _CIGAR_RE.fullmatch(alignment) is None:
+        return None
+    opt_fields = parse_opt_fields(fields[7:])
+    if opt_fields is None:
+        return None
+    return ContainmentRecord(from_node, from_orn, to_node, to_orn, int(pos), alignment, opt_fields)
+
+
+def _parse_path(fields: list[str]) -> PathRecord | None:
+    if len(fields) < 3:
+        return None
+    path_name = fields[1]
+    if _NAME_RE.fullmatch(path_name) is None:
+        return None
+    segments = fields[2].split(",")
+    for segment in segments:
+        if not _is_oriented_name(segment[:-1], segment[-1:]):
+            return None
+    overlaps = None
+    rest = fields[3:]
+    if rest and _OPT_FIELD_RE.fullmatch(rest[0]) is None:
+        overlaps = rest[0].split(",")
+        for overlap in overlaps:
+            if _CIGAR_RE.fullmatch(overlap) is None:
+                return None
+        rest = rest[1:]
+    opt_fields = parse_opt_fields(rest)
+    if opt_fields is None:
+        return None
+    return PathRecord(path_name, segments, overlaps, opt_fields)
+
+
+def _parse_position(value: str) -> int | None:
+    return None if value == "*" else int(value)
+
+
+def parse_walk_steps(walk: str) -> list[tuple[str, str]] | None:
+    """Split a walk string into ``(segment, orientation)`` steps.
+
+    Both the ``>s1<s2`` notation of the specification and the ``s1+s2-``
+    notation used internally are accepted.
+
+    :param walk: The walk string.
+    :returns: The list of steps, or None if the string is malformed.
+    """
+    if walk[:1] in ("<", ">"):
+        if _WALK_CHAR_RE.fullmatch(walk) is None:
+            return None
+        return [(name, "+" if char == ">" else "-") for char, name in _WALK_CHAR_STEP_RE.findall(walk)]
+    if _WALK_SIGN_RE.fullmatch(walk) is None:
+        return None
+    steps = []
+    start = 0
+    for i, char in enumerate(walk):
+        if char in ORIENTATIONS:
+            steps.append((walk[start:i], char))
+            start = i + 1
+    return steps
+
+
+def _parse_walk(fields: list[str]) -> WalkRecord | None:
+    if len(fields) < 7:
+        return None
+    _, sample_id, hapindex, seq_id, seq_start, seq_end, walk = fields[:7]
+    if _NAME_RE.fullmatch(sample_id) is None or _NAME_RE.fullmatch(seq_id) is None:
+        return None
+    if _INT_RE.fullmatch(hapindex) is None:
+        return None
+    for position in (seq_start, seq_end):
+        if position != "*" and _INT_RE.fullmatch(position) is None:
+            return None
+    steps = parse_walk_steps(walk)
+    if steps is None:
+        return None
+    opt_fields = parse_opt_fields(fields[7:])
+    if opt_fields is None:
+        return None
+    return WalkRecord(
+        sample_id,
+        int(hapindex),
+        seq_id,
+        _parse_position(seq_start),
+        _parse_position(seq_end),
+        "".join(f"{name}{orn}" for name, orn in steps),
+        opt_fields,
+    )
+
+
+def iter_line_spans(f: IO[bytes], buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[tuple[bytes, int, int]]:
+    """Split a binary stream into lines without copying them.
+
+    The stream is read in large buffers and each line is returned as a
+    ``(buffer, start, end)`` span, without its newline and surrounding
+    whitespace. Only lines spanning two reads are copied.
+
+    :param f: A file opened in binary mode.
+    :param buffer_size: The size of each read.
+    :returns: An iterator over the line spans, empty lines included.
+    """
+    pending: list[bytes] = []
+    while chunk := f.read(buffer_size):
+        start = 0
+        newline = chunk.find(b"\n")
+        if newline < 0:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(chunk[:newline])
+            line = b"".join(pending)
+            pending = []
+            yield _strip_span(line, 0, len(line))
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        while newline >= 0:
+            yield _strip_span(chunk, start, newline)
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        if start < len(chunk):
+            pending.append(chunk[start:])
+    if pending:
+        line = b"".join(pending)
+        yield _strip_span(line, 0, len(line))
+
+
+def _strip_span(buffer: bytes, start: int, end: int) -> tuple[bytes, int, int]:
+    while start < end and buffer[start] in _WHITESPACE_BYTES:
+        start += 1
+    while end > start and buffer[end - 1] in _WHITESPACE_BYTES:
+        end -= 1
+    return buffer, start, end
+
+
+def parse_segment_span(buffer: bytes, start: int, end: int) -> SegmentRecord | None:
+    """Parse an ``S`` line stored in `buffer[start:end]`.
+
+    Fields are located and validated in place, only the name and the
+    optional fields are decoded. The sequence of the returned record is
+    a `bytes` object, the only copy made of it.
+
+    :param buffer: The buffer holding the line.
+    :param start: Offset of the ``S`` of the line.
+    :param end: Offset past the last character of the line.
+    :returns: The parsed record, or None if the fast parser cannot
+        handle the line.
+    """
+    if end - start < 2 or buffer[start + 1] != 0x09:
+        return None
+    name_start = start + 2
+    name_end = buffer.find(b"\t", name_start, end)
+    if name_end < 0 or _NAME_BYTES_RE.fullmatch(buffer, name_start, name_end) is None:
+        return None
+    sequence_end = buffer.find(b"\t", name_end + 1, end)
+    if sequence_end < 0:
+        sequence_end = end
+    if _SEQUENCE_BYTES_RE.fullmatch(buffer, name_end + 1, sequence_end) is None:
+        return None
+    opt_fields: dict[str, Any] | None = {}
+    if sequence_end < end:
+        opt_fields = parse_opt_fields(buffer[sequence_end + 1 : end].decode().split("\t"))
+        if opt_fields is None:
+            return None
+    return SegmentRecord(
+        buffer[name_start:name_end].decode(),
+        buffer[name_end + 1 : sequence_end],
+        opt_fields,
+    )
+
+
+_RECORD_PARSERS = {
+    "H": _parse_header,
+    "S": _parse_segment,
+    "L": _parse_link,
+    "C": _parse_containment,
+    "P": _parse_path,
+    "W": _parse_walk,
+}
+
+# The record types handled by the fast parser
+RECORD_TYPES = frozenset(_RECORD_PARSERS)
+
+
+def parse_record(line: str) -> Record | None:
+    """Parse a single GFA line, without its line terminator.
+
+    :param line: A stripped, non-comment GFA line.
+    :returns: The parsed record, or None if the fast parser cannot
+        handle the line.
+    """
+    parser = _RECORD_PARSERS.get(line[:1])
+    if parser is None:
+        return None
+    fields = line.split("\t")
+    # The record type is a whole field: "Sx\t..." is left to Lark
+    if len(fields[0]) != 1:
+        return None
+    return parser(fields)
+
+
+__all__ = [
+    "HeaderRecord",
+    "SegmentRecord",
+    "LinkRecord",
+    "ContainmentRecord",
+    "PathRecord",
+    "WalkRecord",
+    "Record",
+    "RECORD_TYPES",
+    "parse_opt_fields",
+    "parse_walk_steps",
+    "parse_record",
+    "iter_line_spans",
+    "parse_segment_span",
+]
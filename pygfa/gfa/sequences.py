@@ -0,0 +1,251 @@
+"""
+2-bit packed storage of segment sequences.
+
+A `SequenceStore` keeps the sequences of all the segments of a graph
+concatenated in a single NumPy buffer, four bases per byte, with the
+same 2-bit codes as the BGFA wire format of
+`pygfa.encoding.dna_encoding.compress_string_2bit_dna` (A=00, C=01,
+G=10, T=11, most significant bits first). Everything the codes cannot
+represent is recorded on the side, so that sequences are restored
+exactly:
+
+- exceptions: the positions and the original bytes of everything that is
+  not one of ``ACGTacgt`` (``N`` runs, IUPAC codes, ``U``, ...);
+- a lowercase mask, stored as runs of soft-masked positions.
+
+Nodes hold `PackedSequence` placeholders that the node attribute
+dictionaries (`LazyAttrDict`) decode on access.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+
+from pygfa.encoding.integer_list_encoding import compress_integer_list_varint
+from pygfa.gfa.lazy import Deferred
+
+_BASES = b"ACGT"
+
+# 2-bit code of every byte, U is stored as T by the BGFA wire format
+_ENCODE = np.zeros(256, dtype=np.uint8)
+for _code, _bases in enumerate((b"Aa", b"Cc", b"Gg", b"TtUu")):
+    for _byte in _bases:
+        _ENCODE[_byte] = _code
+
+# The four bases packed in every byte value, as ASCII
+_DECODE = np.array(
+    [[_BASES[(byte >> shift) & 0b11] for shift in (6, 4, 2, 0)] for byte in range(256)],
+    dtype=np.uint8,
+)
+
+_IS_BASE = np.zeros(256, dtype=bool)
+_IS_BASE[list(b"ACGTacgt")] = True
+
+_IS_LOWER = np.zeros(256, dtype=bool)
+_IS_LOWER[ord("a") : ord("z") + 1] = True
+
+# Bytes kept as they are by the wire format, others are written as N
+_WIRE_STANDARD = np.zeros(256, dtype=bool)
+_WIRE_STANDARD[list(b"ACGTUacgtu")] = True
+_WIRE_AMBIGUITY = np.zeros(256, dtype=bool)
+_WIRE_AMBIGUITY[list(b"NRYKMSWBDHVnrykmswbdhv-*")] = True
+
+
+def _pack(codes: np.ndarray) -> np.ndarray:
+    """Pack 2-bit codes four per byte, padding the last byte with zeros."""
+    pad = -len(codes) % 4
+    if pad:
+        codes = np.concatenate([codes, np.zeros(pad, dtype=np.uint8)])
+    quads = codes.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+class SequenceStore:
+    """Sequences concatenated in a 2-bit packed buffer.
+
+    Sequence `i` spans the bases ``offsets[i]:offsets[i + 1]`` of the
+    buffer. A store is immutable, it is built at once by `from_sequences`.
+
+    :param packed: The packed 2-bit codes.
+    :param offsets: The start of each sequence, followed by the total
+        number of bases.
+    :param exception_positions: The sorted positions of the bases that
+        are not one of ``ACGTacgt``.
+    :param exception_bytes: The original byte of each exception.
+    :param lower_starts: The start of each run of lowercase bases.
+    :param lower_ends: The end (exclusive) of each run of lowercase bases.
+    """
+
+    def __init__(
+        self,
+        packed: np.ndarray,
+        offsets: np.ndarray,
+        exception_positions: np.ndarray,
+        exception_bytes: np.ndarray,
+        lower_starts: np.ndarray,
+        lower_ends: np.ndarray,
+    ):
+        self.packed = packed
+        self.offsets = offsets
+        self.exception_positions = exception_positions
+        self.exception_bytes = exception_bytes
+        self.lower_starts = lower_starts
+        self.lower_ends = lower_ends
+
+    @classmethod
+    def from_sequences(cls, sequences: Iterable[str | bytes]) -> SequenceStore:
+        """Pack the given ASCII sequences, in order.
+
+        :param sequences: The sequences to store.
+        :returns: A new store, sequence `i` being the `i`-th one given.
+        """
+        encoded = [seq.encode("ascii") if isinstance(seq, str) else bytes(seq) for seq in sequences]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        exception_positions = np.flatnonzero(~_IS_BASE[data])
+        lower = np.diff(_IS_LOWER[data].astype(np.int8), prepend=0, append=0)
+        return cls(
+            _pack(_ENCODE[data]),
+            offsets,
+            exception_positions,
+            data[exception_positions],
+            np.flatnonzero(lower == 1),
+            np.flatnonzero(lower == -1),
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def total_length(self) -> int:
+        """The number of bases of all the sequences."""
+        return int(self.offsets[-1])
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the arrays of the store."""
+        return sum(
+            array.nbytes
+            for array in (
+                self.packed,
+                self.offsets,
+                self.exception_positions,
+                self.exception_bytes,
+                self.lower_starts,
+                self.lower_ends,
+            )
+        )
+
+    def length(self, index: int) -> int:
+        """Return the length of sequence `index`."""
+        return int(self.offsets[index + 1] - self.offsets[index])
+
+    def lengths(self, start: int, stop: int) -> np.ndarray:
+        """Return the lengths of the sequences `start` to `stop` (exclusive)."""
+        return np.diff(self.offsets[start : stop + 1])
+
+    def _codes(self, begin: int, end: int) -> np.ndarray:
+        """Return the 2-bit codes of the bases `begin:end`."""
+        packed = self.packed[begin // 4 : (end + 3) // 4]
+        codes = np.empty((len(packed), 4), dtype=np.uint8)
+        for i, shift in enumerate((6, 4, 2, 0)):
+            codes[:, i] = (packed >> shift) & 0b11
+        skip = begin % 4
+        return codes.ravel()[skip : skip + end - begin]
+
+    def _exceptions(self, begin: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the positions (relative to `begin`) and bytes of the exceptions in `begin:end`."""
+        lo, hi = np.searchsorted(self.exception_positions, (begin, end))
+        return self.exception_positions[lo:hi] - begin, self.exception_bytes[lo:hi]
+
+    def sequence(self, index: int) -> str:
+        """Decode sequence `index`."""
+        begin, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        packed = self.packed[begin // 4 : (end + 3) // 4]
+        skip = begin % 4
+        data = _DECODE[packed].ravel()[skip : skip + end - begin]
+
+        positions, values = self._exceptions(begin, end)
+        data[positions] = values
+        first = np.searchsorted(self.lower_ends, begin, side="right")
+        last = np.searchsorted(self.lower_starts, end, side="left")
+        for run_start, run_end in zip(self.lower_starts[first:last].tolist(), self.lower_ends[first:last].tolist()):
+            data[max(run_start, begin) - begin : min(run_end, end) - begin] |= 0x20
+        return data.tobytes().decode("ascii")
+
+    def to_2bit_dna(self, start: int, stop: int) -> bytes:
+        """Encode the concatenation of sequences `start` to `stop` (exclusive) for BGFA.
+
+        The result is the one of `compress_string_2bit_dna` on the
+        concatenated sequences: the packed bases are copied from the store
+        (shifted if the first sequence doesn't start on a byte boundary),
+        only the exceptions are rewritten.
+
+        :param start: Index of the first sequence.
+        :param stop: Index after the last sequence.
+        :returns: The 2-bit DNA blob.
+        """
+        begin, end = int(self.offsets[start]), int(self.offsets[stop])
+        if begin == end:
+            return b"\x00"
+        if begin % 4 == 0:
+            packed = self.packed[begin // 4 : (end + 3) // 4].copy()
+            # Clear the bases of the next sequence sharing the last byte
+            tail = end % 4
+            if tail:
+                packed[-1] &= (0xFF << (8 - 2 * tail)) & 0xFF
+        else:
+            packed = _pack(self._codes(begin, end))
+
+        positions, values = self._exceptions(begin, end)
+        kept = ~_WIRE_STANDARD[values]
+        positions, values = positions[kept], values[kept]
+        if not len(positions):
+            return b"\x00" + packed.tobytes()
+        values = np.where(_WIRE_AMBIGUITY[values], values, ord("N")).astype(np.uint8)
+        return (
+            b"\x01"
+            + packed.tobytes()
+            + compress_integer_list_varint([len(positions)])
+            + compress_integer_list_varint(positions.tolist())
+            + values.tobytes()
+        )
+
+    def __deepcopy__(self, memo: dict) -> SequenceStore:
+        # Stores are never modified, copies of a graph can share them
+        return self
+
+    def __repr__(self) -> str:
+        return f"SequenceStore(sequences={len(self)}, bases={self.total_length})"
+
+
+class PackedSequence(Deferred):
+    """A segment sequence stored in a `SequenceStore`."""
+
+    __slots__ = ("store", "index")
+
+    def __init__(self, store: SequenceStore, index: int):
+        self.store = store
+        self.index = index
+
+    def resolve(self) -> str:
+        return self.store.sequence(self.index)
+
+    def __len__(self) -> int:
+        return self.store.length(self.index)
+
+    def __reduce__(self):
+        return (PackedSequence, (self.store, self.index))
+
+    def __repr__(self) -> str:
+        return f"PackedSequence(index={self.index}, length={len(self)})"
+
+
+__all__ = [
+    "SequenceStore",
+    "PackedSequence",
+]
@@ -0,0 +1,226 @@
+"""
+Array-backed snapshots of frozen graphs.
+
+A snapshot is a frozen graph (see `BaseGFA.freeze`) pickled with
+protocol 5, its NumPy arrays and byte columns (CSR adjacency, edge
+columns, sequence and alignment buffers, path and walk steps, 2-bit
+sequence stores) being written out of band next to the pickle instead of
+inside it. Loading a snapshot from a buffer only unpickles the Python
+part (node names, edge keys, optional fields, ...): the arrays are
+read-only views of the buffer, nothing is copied.
+
+Layout of a snapshot (all integers are little-endian ``uint64``)::
+
+    magic (8 bytes) | pickle length | buffer count
+    (offset, length) of every buffer
+    pickle
+    buffers, each aligned on 64 bytes
+
+`save_snapshot` and `load_snapshot` store snapshots in files, loaded by
+memory-mapping them. `to_shared_memory` and `attach_shared` publish and
+attach snapshots through `multiprocessing.shared_memory`, so that worker
+processes share one copy of a graph.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from multiprocessing import shared_memory
+from typing import Any, BinaryIO
+
+import numpy as np
+
+from pygfa.exceptions import FileFormatError, GFAError
+
+SNAPSHOT_MAGIC = b"PYGFASN1"
+_HEADER = struct.Struct("<8sQQ")
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class Snapshot:
+    """A frozen graph split in a pickle and its out-of-band buffers.
+
+    :param graph: A frozen graph, or another object made of arrays
+        (e.g. a `pygfa.gfa.kmers.KmerIndex`).
+    :raises GFAError: If the graph is not frozen.
+    """
+
+    def __init__(self, graph: Any):
+        if not getattr(graph, "is_frozen", True):
+            raise GFAError("Only frozen graphs can be snapshotted, call freeze() first.")
+        self.buffers: list[memoryview] = []
+        self.pickle = pickle.dumps(graph, protocol=5, buffer_callback=lambda buffer: self.buffers.append(buffer.raw()))
+        self.offsets: list[int] = []
+        offset = _align(_HEADER.size + 16 * len(self.buffers) + len(self.pickle))
+        for buffer in self.buffers:
+            self.offsets.append(offset)
+            offset = _align(offset + buffer.nbytes)
+        self.nbytes = offset
+
+    def _prefix(self) -> bytes:
+        """Return the header, the buffer table and the pickle."""
+        table = np.array([(offset, buffer.nbytes) for offset, buffer in zip(self.offsets, self.buffers)], dtype="<u8")
+        return _HEADER.pack(SNAPSHOT_MAGIC, len(self.pickle), len(self.buffers)) + table.tobytes() + self.pickle
+
+    def write(self, target: memoryview) -> None:
+        """Write the snapshot at the start of `target`, at least `nbytes` long."""
+        prefix = self._prefix()
+        target[: len(prefix)] = prefix
+        for offset, buffer in zip(self.offsets, self.buffers):
+            target[offset : offset + buffer.nbytes] = buffer
+
+    def dump(self, file: BinaryIO) -> None:
+        """Write the snapshot to a binary file, from its current position."""
+        position = file.write(self._prefix())
+        for offset, buffer in zip(self.offsets, self.buffers):
+            file.write(bytes(offset - position))
+            position = offset + file.write(buffer)
+        file.write(bytes(self.nbytes - position))
+
+
+def load_snapshot_buffer(source: memoryview) -> Any:
+    """Load the graph of a snapshot, its arrays being views of `source`.
+
+    :param source: A buffer holding a snapshot, written by `Snapshot.write`.
+    :returns: The frozen graph.
+    :raises FileFormatError: If the buffer doesn't hold a snapshot, or
+        is shorter than the snapshot it starts with.
+    """
+    source = source.toreadonly()
+    if source.nbytes < _HEADER.size:
+        raise FileFormatError("Not a pygfa snapshot: buffer too short.")
+    magic, pickle_length, count = _HEADER.unpack(source[: _HEADER.size])
+    if magic != SNAPSHOT_MAGIC:
+        raise FileFormatError(f"Not a pygfa snapshot: bad magic {bytes(magic)!r}.")
+    start = _HEADER.size
+    if start + 16 * count + pickle_length > source.nbytes:
+        raise FileFormatError("Truncated pygfa snapshot: buffer table or pickle past the end.")
+    table = np.frombuffer(source, dtype="<u8", count=2 * count, offset=start).reshape(-1, 2).tolist()
+    start += 16 * count
+    if any(offset + length > source.nbytes for offset, length in table):
+        raise FileFormatError("Truncated pygfa snapshot: buffer past the end.")
+    buffers = [source[offset : offset + length] for offset, length in table]
+    return pickle.loads(source[start : start + pickle_length], buffers=buffers)
+
+
+def save_snapshot(graph: Any, path: str) -> None:
+    """Write a snapshot of a frozen graph to a file.
+
+    The file is written next to `path` and then renamed, so that a
+    process mapping the previous snapshot is not affected.
+
+    :param graph: A frozen graph, see `Snapshot`.
+    :param path: The snapshot file.
+    """
+    snapshot = Snapshot(graph)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            snapshot.dump(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(path: str, use_mmap: bool = True) -> Any:
+    """Load a snapshot written by `save_snapshot`.
+
+    Snapshots are pickles: only load the ones you wrote, with the same
+    version of pygfa.
+
+    :param path: The snapshot file.
+    :param use_mmap: If set, the arrays of the graph are read-only views
+        of the memory-mapped file, read from disk as they are accessed.
+        Otherwise the file is read at once.
+    :returns: The frozen graph.
+    :raises FileFormatError: If the file is not a snapshot.
+    """
+    with open(path, "rb") as f:
+        if not use_mmap:
+            return load_snapshot_buffer(memoryview(f.read()))
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            # Empty files cannot be mapped
+            raise FileFormatError(f"Not a pygfa snapshot: {path}") from err
+    # The arrays keep the mapping alive, it is never closed explicitly
+    return load_snapshot_buffer(memoryview(mapping))
+
+
+class _AttachedBlock(shared_memory.SharedMemory):
+    """A shared memory block unmapped with the last array viewing it.
+
+    The graph holding the block can be collected before its arrays, the
+    block is then closed while they still use the mapping.
+    """
+
+    def close(self) -> None:
+        try:
+            super().close()
+        except BufferError:
+            # The mapping stays alive as long as a view of it does, only
+            # the file descriptor is closed now
+            self._mmap = None
+            super().close()
+
+
+def to_shared_memory(graph: Any, name: str | None = None) -> shared_memory.SharedMemory:
+    """Publish a snapshot of a frozen graph in a new shared memory block.
+
+    :param graph: A frozen graph.
+    :param name: The name of the block (default: a random name).
+    :returns: The block, its ``name`` is the one to give to
+        `attach_shared`. The caller owns it: it has to ``close()`` and
+        ``unlink()`` it once the workers are done.
+    """
+    snapshot = Snapshot(graph)
+    block = shared_memory.SharedMemory(name=name, create=True, size=snapshot.nbytes)
+    try:
+        snapshot.write(block.buf)
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    return block
+
+
+def attach_shared(name: str) -> Any:
+    """Attach the graph published in a shared memory block.
+
+    The block stays mapped as long as the graph is alive. It is not
+    tracked for cleanup by the attaching process (on Python < 3.13 the
+    resource tracker of `multiprocessing` still registers it, which is
+    harmless for pool workers sharing the tracker of their parent).
+
+    :param name: The name of the block returned by `to_shared_memory`.
+    :returns: The frozen graph, read-only and safe to share between
+        threads.
+    """
+    try:
+        block = _AttachedBlock(name=name, track=False)
+    except TypeError:
+        block = _AttachedBlock(name=name)
+    graph = load_snapshot_buffer(block.buf)
+    # The arrays are views of the block, it must outlive them
+    graph._graph._snapshot_buffer = block
+    return graph
+
+
+__all__ = [
+    "SNAPSHOT_MAGIC",
+    "Snapshot",
+    "load_snapshot_buffer",
+    "save_snapshot",
+    "load_snapshot",
+    "to_shared_memory",
+    "attach_shared",
+]
@@ -0,0 +1,157 @@
+"""
+Integer-encoded path and walk steps.
+
+A path or a walk is a list of oriented segments. Instead of one Python
+string per step (``"s1+"``), or one string for the whole walk, the steps
+are stored as an ``int32`` array of segment ids, assigned by the
+``_segment_map`` of the graph, and a packed bitset of the reverse-strand
+orientations.
+
+The step containers are `Deferred` values of the `LazyAttrDict` holding
+the path or walk attributes: reading ``path["segments"]`` or
+``walk["walk"]`` still returns the list or the string that was stored.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+from pygfa.gfa.lazy import Deferred
+from pygfa.gfa.records import parse_walk_steps
+
+ORIENTATIONS = ("+", "-")
+
+
+class OrientedSteps(Deferred):
+    """Oriented segments stored as segment ids and reverse-strand bits.
+
+    :param names: The segment names of the graph, indexed by segment id.
+        The list is shared with the graph, which only ever appends to it.
+    :param ids: The segment id of each step.
+    :param reverse: The orientation bits (1 for "-"), packed by
+        `numpy.packbits`.
+    """
+
+    __slots__ = ("names", "ids", "reverse")
+
+    def __init__(self, names: list[str], ids: np.ndarray, reverse: np.ndarray):
+        self.names = names
+        self.ids = ids
+        self.reverse = reverse
+
+    @classmethod
+    def encode(
+        cls, steps: list[tuple[str, str]], segment_id: Callable[[str], int], names: list[str], **kwargs
+    ) -> OrientedSteps:
+        """Encode ``(segment, orientation)`` steps.
+
+        :param steps: The steps to encode.
+        :param segment_id: Returns the id of a segment name, assigning
+            a new one to unknown names.
+        :param names: The segment names of the graph, indexed by id.
+        :param kwargs: Additional arguments of the subclass.
+        """
+        ids = np.fromiter((segment_id(name) for name, _ in steps), dtype=np.int32, count=len(steps))
+        reverse = np.packbits(np.fromiter((orn == "-" for _, orn in steps), dtype=bool, count=len(steps)))
+        return cls(names, ids, reverse, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def orientations(self) -> np.ndarray:
+        """Return the orientation bits of the steps (True for "-")."""
+        return np.unpackbits(self.reverse, count=len(self.ids)).astype(bool)
+
+    def steps(self) -> list[tuple[str, str]]:
+        """Return the ``(segment, orientation)`` steps."""
+        names = self.names
+        return [
+            (names[seg_id], ORIENTATIONS[rev]) for seg_id, rev in zip(self.ids.tolist(), self.orientations().tolist())
+        ]
+
+    def __reduce__(self):
+        return (type(self), (self.names, self.ids, self.reverse))
+
+
+class PathSegments(OrientedSteps):
+    """The segments of a path, resolved to a ``["s1+", "s2-"]`` list."""
+
+    __slots__ = ()
+
+    def resolve(self) -> list[str]:
+        return [f"{name}{orn}" for name, orn in self.steps()]
+
+    def __repr__(self) -> str:
+        return f"PathSegments(length={len(self)})"
+
+
+class WalkSteps(OrientedSteps):
+    """The steps of a walk, resolved to the walk string.
+
+    :param char_form: If set, the walk string uses the ``>s1<s2``
+        notation instead of the ``s1+s2-`` one.
+    """
+
+    __slots__ = ("char_form",)
+
+    def __init__(self, names: list[str], ids: np.ndarray, reverse: np.ndarray, char_form: bool = False):
+        super().__init__(names, ids, reverse)
+        self.char_form = char_form
+
+    def resolve(self) -> str:
+        if self.char_form:
+            return "".join(f"{'<' if orn == '-' else '>'}{name}" for name, orn in self.steps())
+        return "".join(f"{name}{orn}" for name, orn in self.steps())
+
+    def __reduce__(self):
+        return (WalkSteps, (self.names, self.ids, self.reverse, self.char_form))
+
+    def __repr__(self) -> str:
+        return f"WalkSteps(length={len(self)})"
+
+
+def encode_path_segments(segments: object, segment_id: Callable[[str], int], names: list[str]) -> PathSegments | None:
+    """Encode the segment list of a path.
+
+    :param segments: The ``["s1+", "s2-"]`` list of the path.
+    :param segment_id: Returns the id of a segment name.
+    :param names: The segment names of the graph, indexed by id.
+    :returns: The encoded segments, or None if `segments` is not a list
+        of oriented segment names (it is then stored as it is).
+    """
+    if not isinstance(segments, list):
+        return None
+    steps = []
+    for segment in segments:
+        if not isinstance(segment, str) or len(segment) < 2 or segment[-1] not in ORIENTATIONS:
+            return None
+        steps.append((segment[:-1], segment[-1]))
+    return PathSegments.encode(steps, segment_id, names)
+
+
+def encode_walk(walk: object, segment_id: Callable[[str], int], names: list[str]) -> WalkSteps | None:
+    """Encode the string of a walk.
+
+    :param walk: The walk string, in either notation.
+    :param segment_id: Returns the id of a segment name.
+    :param names: The segment names of the graph, indexed by id.
+    :returns: The encoded walk, or None if `walk` is not a well-formed
+        walk string (it is then stored as it is).
+    """
+    if not isinstance(walk, str):
+        return None
+    steps = parse_walk_steps(walk)
+    if not steps:
+        return None
+    return WalkSteps.encode(steps, segment_id, names, char_form=walk[0] in "<>")
+
+
+__all__ = [
+    "OrientedSteps",
+    "PathSegments",
+    "WalkSteps",
+    "encode_path_segments",
+    "encode_walk",
+]
@@ -0,0 +1,286 @@
+"""
+Columnar storage of optional fields.
+
+The optional fields (``TAG:TYPE:VALUE``) of a sequence of elements,
+segments or links, are stored by tag instead of one dictionary per
+element: a `TagColumn` holds the values of one tag for every element in
+a NumPy array (``int64`` for ``i`` fields, ``float64`` for ``f`` fields,
+``int32`` codes into a dictionary of distinct strings for ``Z`` fields)
+and a bitset of the elements having the tag.
+
+A `TagRegistry` keeps the columns of a sequence of elements, in the
+order the tags first appear. The fields of an element that don't fit
+the columns (a value of another type than the column, tags in another
+order than the columns, values that are neither ``int``, ``float`` nor
+``str``) are kept in a dictionary, so that every element gets back the
+fields it was built from, in the same order.
+
+Registries back the optional fields of frozen graphs (see `CSRGraph`)
+and the optional-fields block of BGFA files.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+
+TAG_TYPES = ("i", "f", "Z")
+_DTYPES = {"i": np.int64, "f": np.float64, "Z": np.int32}
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def tag_type(value: Any) -> str | None:
+    """Return the column type of an optional field value.
+
+    :param value: The value of an optional field.
+    :returns: ``"i"``, ``"f"`` or ``"Z"``, None for values stored
+        out of the columns.
+    """
+    value_type = type(value)
+    if value_type is int:
+        return "i" if _INT64_MIN <= value <= _INT64_MAX else None
+    if value_type is float:
+        return "f"
+    if value_type is str:
+        return "Z"
+    return None
+
+
+class TagColumn:
+    """The values of one optional field for a sequence of elements.
+
+    :param tag: The tag of the field.
+    :param type: The type of the values, one of `TAG_TYPES`.
+    :param values: The value of every element (``int64``, ``float64``,
+        or ``int32`` codes into `strings` for ``Z`` fields), undefined
+        for the elements without the tag.
+    :param present: The elements having the tag, a bitset packed by
+        `numpy.packbits`.
+    :param strings: The distinct values of a ``Z`` field.
+    """
+
+    __slots__ = ("tag", "type", "values", "present", "strings")
+
+    def __init__(self, tag: str, type: str, values: np.ndarray, present: np.ndarray, strings: list[str] | None = None):
+        self.tag = tag
+        self.type = type
+        self.values = values
+        self.present = present
+        self.strings = strings if strings is not None else []
+
+    @classmethod
+    def from_values(cls, tag: str, type: str, count: int, indices: list[int], values: list[Any]) -> TagColumn:
+        """Build a column from the values of some elements.
+
+        :param tag: The tag of the field.
+        :param type: The type of the values, one of `TAG_TYPES`.
+        :param count: The number of elements.
+        :param indices: The elements having the tag.
+        :param values: Their values, all of type `type`.
+        """
+        strings: list[str] = []
+        if type == "Z":
+            codes: dict[str, int] = {}
+            values = [codes.setdefault(value, len(codes)) for value in values]
+            strings = list(codes)
+        column = np.zeros(count, dtype=_DTYPES[type])
+        column[indices] = values
+        present = np.zeros(count, dtype=bool)
+        present[indices] = True
+        return cls(tag, type, column, np.packbits(present), strings)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, i: int) -> bool:
+        return bool(self.present[i >> 3] & (0x80 >> (i & 7)))
+
+    def __getitem__(self, i: int) -> Any:
+        """Return the value of element `i`, which must have the tag."""
+        if self.type == "Z":
+            return self.strings[self.values[i]]
+        return self.values[i].item()
+
+    def mask(self) -> np.ndarray:
+        """Return a boolean array telling which elements have the tag."""
+        return np.unpackbits(self.present, count=len(self.values)).view(bool)
+
+    def array(self) -> np.ndarray:
+        """Return the values of every element, strings for ``Z`` fields.
+
+        ``i`` and ``f`` values are a read-only view of the column.
+        """
+        if self.type != "Z":
+            values = self.values.view()
+            values.flags.writeable = False
+            return values
+        strings = np.empty(max(len(self.strings), 1), dtype=object)
+        strings[: len(self.strings)] = self.strings
+        return strings[self.values]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the NumPy arrays, in bytes."""
+        return self.values.nbytes + self.present.nbytes
+
+
+class TagRegistry:
+    """The optional fields of a sequence of elements, one column per tag.
+
+    :param count: The number of elements.
+    :param columns: The columns, by tag.
+    :param raw: The fields of the elements that don't fit the columns,
+        by element index.
+    """
+
+    __slots__ = ("count", "columns", "raw")
+
+    def __init__(
+        self,
+        count: int = 0,
+        columns: dict[str, TagColumn] | None = None,
+        raw: dict[int, dict[str, Any]] | None = None,
+    ):
+        self.count = count
+        self.columns = columns if columns is not None else {}
+        self.raw = raw if raw is not None else {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any] | None], count: int | None = None) -> TagRegistry:
+        """Store the optional fields of a sequence of elements.
+
+        :param rows: The optional fields of every element, None or an
+            empty mapping for the elements without any.
+        :param count: The number of elements (default: the number of
+            rows), elements past the rows have no fields.
+        """
+        types: dict[str, str] = {}
+        positions: dict[str, int] = {}
+        indices: dict[str, list[int]] = {}
+        values: dict[str, list[Any]] = {}
+        raw: dict[int, dict[str, Any]] = {}
+        # Value types of the tag tuples already stored in the columns,
+        # most elements share a few of them
+        layouts: dict[tuple[str, ...], tuple[str | None, ...]] = {}
+        n_rows = 0
+        for i, row in enumerate(rows):
+            n_rows = i + 1
+            if not row:
+                continue
+            keys = tuple(row)
+            layout = layouts.get(keys)
+            if layout is None:
+                if not cls._fits(row, types, positions):
+                    raw[i] = dict(row)
+                    continue
+                for tag, value in row.items():
+                    if tag not in types:
+                        types[tag] = tag_type(value)
+                        positions[tag] = len(positions)
+                        indices[tag] = []
+                        values[tag] = []
+                layouts[keys] = tuple(types[tag] for tag in keys)
+            elif tuple(map(tag_type, row.values())) != layout:
+                raw[i] = dict(row)
+                continue
+            for tag, value in row.items():
+                indices[tag].append(i)
+                values[tag].append(value)
+        count = n_rows if count is None else count
+        columns = {tag: TagColumn.from_values(tag, types[tag], count, indices[tag], values[tag]) for tag in types}
+        return cls(count, columns, raw)
+
+    @staticmethod
+    def _fits(row: Mapping[str, Any], types: dict[str, str], positions: dict[str, int]) -> bool:
+        """Tell if a row can be stored in the columns, new tags being appended."""
+        last = -1
+        new = len(positions)
+        for tag, value in row.items():
+            value_type = tag_type(value)
+            if value_type is None or not isinstance(tag, str):
+                return False
+            if tag in types:
+                if types[tag] != value_type or positions[tag] < last:
+                    return False
+                last = positions[tag]
+            else:
+                # New tags come after every existing column
+                last = new
+                new += 1
+        return True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def tags(self) -> list[str]:
+        """Return the tags of the elements, columns first."""
+        tags = dict.fromkeys(self.columns)
+        for row in self.raw.values():
+            tags.update(dict.fromkeys(row))
+        return list(tags)
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Return the optional fields of element `i`."""
+        raw = self.raw.get(i)
+        if raw is not None:
+            return dict(raw)
+        return {tag: column[i] for tag, column in self.columns.items() if i in column}
+
+    def rows(self) -> list[dict[str, Any] | None]:
+        """Return the optional fields of every element, None for the elements without any."""
+        rows: list[dict[str, Any] | None] = [None] * self.count
+        # Filled column by column, the tags of a row being in column order
+        for tag, column in self.columns.items():
+            indices = np.flatnonzero(column.mask())
+            for i, value in zip(indices.tolist(), column.array()[indices].tolist()):
+                row = rows[i]
+                if row is None:
+                    rows[i] = {tag: value}
+                else:
+                    row[tag] = value
+        for i, raw in self.raw.items():
+            rows[i] = dict(raw)
+        return rows
+
+    def array(self, tag: str, extra: Iterable[tuple[int, Mapping[str, Any]]] = ()) -> np.ma.MaskedArray:
+        """Return the values of a tag for every element.
+
+        :param tag: The tag.
+        :param extra: Other ``(index, fields)`` pairs holding the tag.
+        :returns: A masked array, masked for the elements without the
+            tag: ``int64`` or ``float64`` for ``i`` and ``f`` fields,
+            ``object`` for strings or values of mixed types.
+        """
+        column = self.columns.get(tag)
+        if column is not None:
+            values = column.array()
+            mask = ~column.mask()
+        else:
+            values = np.zeros(self.count, dtype=np.float64)
+            mask = np.ones(self.count, dtype=bool)
+        others = [(i, row[tag]) for i, row in self.raw.items() if tag in row]
+        others += [(i, row[tag]) for i, row in extra if tag in row]
+        if others:
+            types = {tag_type(value) for _, value in others}
+            if column is None and len(types) == 1 and types <= {"i", "f"}:
+                values = np.zeros(self.count, dtype=_DTYPES[types.pop()])
+            elif column is None or types != {column.type} or column.type == "Z":
+                values = values.astype(object)
+            else:
+                values = values.copy()
+            mask = mask.copy()
+            for i, value in others:
+                values[i] = value
+                mask[i] = False
+        return np.ma.MaskedArray(values, mask=mask)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the NumPy arrays, in bytes."""
+        return sum(column.nbytes for column in self.columns.values())
+
+
+__all__ = ["TAG_TYPES", "tag_type", "TagColumn", "TagRegistry"]
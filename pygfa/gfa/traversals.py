@@ -0,0 +1,185 @@
+"""
+Inverted index of the paths and walks visiting each segment.
+
+The steps of paths and walks are stored as arrays of segment ids (see
+`pygfa.gfa.steps`). A `TraversalIndex` inverts them: for every segment
+id, the postings of the traversals (paths or walks) visiting it, as
+``(traversal, step)`` pairs sorted by traversal then step, stored in
+CSR form: an offsets array indexed by segment id and two ``int32``
+columns, the traversal numbers and the step indices.
+
+Traversals added after the index was built are kept apart, with their
+step arrays, and removed ones are masked, until enough of them make
+the lookups rebuild the CSR arrays.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+# Pending traversals steps (or removed postings) above which the arrays
+# are rebuilt, as a fraction of the indexed steps
+_REBUILD_FRACTION = 4
+_MIN_REBUILD_STEPS = 1 << 16
+
+
+class TraversalIndex:
+    """The paths and walks visiting each segment, by segment id.
+
+    :param traversals: ``(key, segment_ids)`` pairs, in the order the
+        traversals are numbered.
+    """
+
+    __slots__ = ("keys", "_numbers", "_steps", "_indptr", "_traversal", "_step", "_pending", "_removed", "_changed")
+
+    def __init__(self, traversals: Iterable[tuple[Hashable, np.ndarray]] = ()):
+        # Key and segment ids of every traversal by number, None once removed
+        self.keys: list[Hashable | None] = []
+        self._steps: list[np.ndarray | None] = []
+        self._numbers: dict[Hashable, int] = {}
+        for key, ids in traversals:
+            self._numbers[key] = len(self.keys)
+            self.keys.append(key)
+            self._steps.append(ids)
+        self._build()
+
+    def _build(self) -> None:
+        """Index the steps of every traversal in the CSR arrays."""
+        numbers = [number for number, ids in enumerate(self._steps) if ids is not None]
+        arrays = [self._steps[number] for number in numbers]
+        lengths = np.fromiter(map(len, arrays), dtype=np.int64, count=len(arrays))
+        ids = np.concatenate(arrays).astype(np.int64, copy=False) if arrays else np.zeros(0, dtype=np.int64)
+        starts = np.cumsum(lengths) - lengths
+        traversal = np.repeat(np.array(numbers, dtype=np.int32), lengths)
+        step = (np.arange(len(ids), dtype=np.int64) - np.repeat(starts, lengths)).astype(np.int32)
+        # The postings of a segment stay in traversal then step order: sort
+        # the (id, position) pairs packed in a single integer if they fit,
+        # much faster than a stable argsort
+        size = len(ids)
+        if size and int(ids.max()) < np.iinfo(np.int64).max // size:
+            order = ids * size
+            order += np.arange(size, dtype=np.int64)
+            order.sort()
+            order %= size
+        else:
+            order = np.argsort(ids, kind="stable")
+        counts = np.bincount(ids, minlength=0) if len(ids) else np.zeros(0, dtype=np.int64)
+        self._indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._indptr[1:])
+        self._traversal = traversal[order]
+        self._step = step[order]
+        self._pending: list[int] = []
+        self._removed: set[int] = set()
+        self._changed = 0
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._numbers
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the CSR arrays, in bytes."""
+        return self._indptr.nbytes + self._traversal.nbytes + self._step.nbytes
+
+    def add(self, key: Hashable, ids: np.ndarray | None) -> None:
+        """Index a traversal, replacing any traversal with the same key.
+
+        :param key: The key of the traversal.
+        :param ids: Its segment ids, None for a traversal not to index.
+        """
+        self.discard(key)
+        if ids is None:
+            return
+        number = len(self.keys)
+        self._numbers[key] = number
+        self.keys.append(key)
+        self._steps.append(ids)
+        self._pending.append(number)
+        self._changed += len(ids)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a traversal from the index, if it is there."""
+        number = self._numbers.pop(key, None)
+        if number is None:
+            return
+        ids = self._steps[number]
+        self.keys[number] = None
+        self._steps[number] = None
+        if number in self._pending:
+            self._pending.remove(number)
+        else:
+            self._removed.add(number)
+        self._changed += len(ids)
+
+    def lookup(self, segment_ids: Iterable[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the visits of many segments at once.
+
+        :param segment_ids: The segment ids to look up, negative for
+            segments that no traversal visits.
+        :returns: Three arrays with an entry per visit: the position in
+            `segment_ids` of the segment visited, the number of the
+            traversal (see `keys`) and the index of the step. They are
+            sorted by position, traversal number and step.
+        """
+        if self._changed > max(len(self._step) // _REBUILD_FRACTION, _MIN_REBUILD_STEPS):
+            self._build()
+        query = np.asarray(list(segment_ids) if not isinstance(segment_ids, np.ndarray) else segment_ids)
+        query = query.astype(np.int64, copy=False).reshape(-1)
+        known = (query >= 0) & (query < len(self._indptr) - 1)
+        safe = np.where(known, query, 0)
+        starts = np.where(known, self._indptr[safe], 0)
+        counts = np.where(known, self._indptr[np.where(known, safe + 1, 0)], 0) - starts
+        positions = np.repeat(np.arange(len(query)), counts)
+        offsets = np.arange(len(positions)) - np.repeat(np.cumsum(counts) - counts, counts)
+        postings = np.repeat(starts, counts) + offsets
+        traversal = self._traversal[postings]
+        step = self._step[postings]
+        if self._removed:
+            keep = ~np.isin(traversal, np.fromiter(self._removed, dtype=np.int32))
+            positions, traversal, step = positions[keep], traversal[keep], step[keep]
+        if not self._pending:
+            return positions, traversal, step
+        parts = [(positions, traversal, step)]
+        order = np.argsort(query, kind="stable")
+        sorted_query = query[order]
+        for number in self._pending:
+            ids = self._steps[number]
+            hits = np.flatnonzero(np.isin(ids, query))
+            if len(hits) == 0:
+                continue
+            # Every position holding the segment of each hit
+            left = np.searchsorted(sorted_query, ids[hits], "left")
+            right = np.searchsorted(sorted_query, ids[hits], "right")
+            repeats = right - left
+            hit_offsets = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            parts.append(
+                (
+                    order[np.repeat(left, repeats) + hit_offsets],
+                    np.full(repeats.sum(), number, dtype=np.int32),
+                    np.repeat(hits, repeats).astype(np.int32),
+                )
+            )
+        positions, traversal, step = (np.concatenate(column) for column in zip(*parts))
+        order = np.lexsort((step, traversal, positions))
+        return positions[order], traversal[order], step[order]
+
+    def visits(self, segment_ids: Iterable[int]) -> list[list[tuple[Any, int]]]:
+        """Return the ``(key, step)`` visits of every segment.
+
+        :param segment_ids: The segment ids to look up, see `lookup`.
+        :returns: A list of visits for each segment id.
+        """
+        segment_ids = list(segment_ids)
+        positions, traversal, step = self.lookup(segment_ids)
+        bounds = np.searchsorted(positions, np.arange(len(segment_ids) + 1))
+        keys = self.keys
+        visits = list(zip([keys[number] for number in traversal.tolist()], step.tolist()))
+        return [visits[start:end] for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+
+
+__all__ = ["TraversalIndex"]
@@ -0,0 +1,521 @@
+"""
+Read-only views of a part of a GFA graph.
+
+A `GFAView` shows a subset of the nodes, edges, subgraphs, paths and
+walks of a parent graph without copying them: the nodes and edges are
+filtered on the fly by a `FilteredGraph` wrapping the storage of the
+parent (a networkx MultiGraph or a `CSRGraph`), which only keeps the
+sets of selected node ids and edge keys. Every read method of `GFA`
+(queries, searches, `to_gfa`, `to_bgfa`, the algorithms) works on a
+view, every method that would modify it raises `FrozenGraphError`.
+`GFAView.materialize` returns an independent, mutable copy.
+
+Views see the attribute dictionaries of the parent: changes made to the
+parent after a view has been created are visible through it, and the
+nodes removed from the parent are removed from its views.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import partial
+from typing import Any
+
+import networkx as nx
+import numpy as np
+
+from pygfa.exceptions import FrozenGraphError
+from pygfa.gfa import GFA
+from pygfa.gfa.lazy import Deferred
+from pygfa.gfa.records import parse_walk_steps
+from pygfa.gfa.steps import OrientedSteps
+
+_READ_ONLY_MESSAGE = "Graph views are read-only, use materialize() to get a mutable copy."
+
+
+class FilteredGraph:
+    """A read-only multigraph showing part of another one.
+
+    Implements the same `networkx.MultiGraph` interface as `CSRGraph`.
+
+    :param graph: The parent storage, a networkx MultiGraph or a `CSRGraph`.
+    :param nodes: The ids of the visible nodes.
+    :param edge_keys: The keys of the visible edges, None to see all
+        the edges between visible nodes (the induced subgraph).
+    :param version: Return the version of the parent graph, the visible
+        nodes removed from the parent are dropped when it changes. None
+        if the parent doesn't change.
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        nodes: Iterable[Any],
+        edge_keys: Iterable[Any] | None = None,
+        version: Callable[[], int] | None = None,
+    ):
+        self._parent = graph
+        self.graph = graph.graph
+        self._selected = frozenset(graph.nbunch_iter(nodes))
+        self._edge_keys = None if edge_keys is None else frozenset(edge_keys)
+        self._version = version
+        self._nodes_version = None if version is None else version()
+        self._visible = self._selected
+        self._order: list[Any] | None = None
+
+    @property
+    def _nodes(self) -> frozenset[Any]:
+        """The visible nodes, the selected ones still in the parent graph."""
+        if self._version is not None and self._nodes_version != self._version():
+            self._nodes_version = self._version()
+            self._visible = frozenset(n for n in self._selected if n in self._parent)
+            self._order = None
+        return self._visible
+
+    def _edge_ok(self, key: Any) -> bool:
+        return self._edge_keys is None or key in self._edge_keys
+
+    def _node_order(self) -> list[Any]:
+        """Return the visible nodes in the order of the parent graph."""
+        nodes = self._nodes
+        if self._order is None:
+            self._order = [n for n in self._parent if n in nodes]
+        return self._order
+
+    # =========================================================================
+    # networkx.MultiGraph interface
+    # =========================================================================
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._node_order())
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, n: Any) -> bool:
+        try:
+            return n in self._nodes
+        except TypeError:
+            return False
+
+    def __getitem__(self, n: Any) -> FilteredNeighbors:
+        return self.adj[n]
+
+    @property
+    def adj(self) -> FilteredAdjacency:
+        return FilteredAdjacency(self)
+
+    _adj = adj
+
+    @property
+    def nodes(self) -> FilteredNodeView:
+        return FilteredNodeView(self)
+
+    @property
+    def edges(self) -> FilteredEdgeView:
+        return FilteredEdgeView(self)
+
+    def is_directed(self) -> bool:
+        return False
+
+    def is_multigraph(self) -> bool:
+        return True
+
+    def has_node(self, n: Any) -> bool:
+        return n in self
+
+    def has_edge(self, u: Any, v: Any, key: Any = None) -> bool:
+        try:
+            keys = self.adj[u][v]
+        except KeyError:
+            return False
+        return key is None or key in keys
+
+    def get_edge_data(self, u: Any, v: Any, key: Any = None, default: Any = None) -> Any:
+        """Return the attributes of the edge `key`, or of all the edges, between `u` and `v`."""
+        try:
+            keys = self.adj[u][v]
+            if key is None:
+                return dict(keys.items())
+            return keys[key]
+        except KeyError:
+            return default
+
+    def neighbors(self, n: Any) -> Iterator[Any]:
+        try:
+            return iter(self.adj[n])
+        except KeyError as err:
+            raise nx.NetworkXError(f"The node {n} is not in the graph.") from err
+
+    def number_of_nodes(self) -> int:
+        return len(self._nodes)
+
+    def number_of_edges(self) -> int:
+        return sum(1 for _ in self._iter_edges(None, False, True, None))
+
+    def nbunch_iter(self, nbunch: Any = None) -> Iterator[Any]:
+        """Return an iterator over the nodes of `nbunch` that are in the graph."""
+        if nbunch is None:
+            return iter(self._node_order())
+        if nbunch in self:
+            return iter([nbunch])
+        try:
+            return (n for n in list(nbunch) if n in self)
+        except TypeError as err:
+            raise nx.NetworkXError(f"nbunch is not a node or a sequence of nodes: {nbunch}") from err
+
+    def _iter_edges(self, nbunch: Any, data: Any, keys: bool, default: Any) -> Iterator[tuple]:
+        # Same order as networkx: each edge is reported once, from the
+        # first of its end nodes in node order
+        seen: set[Any] = set()
+        for n in self.nbunch_iter(nbunch):
+            for nbr, keydict in self.adj[n].items():
+                if nbr in seen:
+                    continue
+                for key, attrs in keydict.items():
+                    edge: tuple = (n, nbr)
+                    if keys:
+                        edge += (key,)
+                    if data is True:
+                        edge += (attrs,)
+                    elif data is not False:
+                        edge += (attrs.get(data, default),)
+                    yield edge
+            seen.add(n)
+
+    def subgraph(self, nodes: Any) -> nx.MultiGraph:
+        """Return the subgraph induced by `nodes`, as a networkx MultiGraph."""
+        selected = set(self.nbunch_iter(nodes))
+        subgraph = nx.MultiGraph()
+        subgraph.graph.update(self.graph)
+        order = [n for n in self._node_order() if n in selected]
+        for n in order:
+            subgraph.add_node(n, **self._parent.nodes[n])
+        for u, v, key, data in self._iter_edges(order, True, True, None):
+            if v in selected:
+                subgraph.add_edge(u, v, key=key, **data)
+        return subgraph
+
+    def to_multigraph(self) -> nx.MultiGraph:
+        """Return a mutable networkx copy of the visible part of the graph."""
+        return self.subgraph(None)
+
+    def copy(self) -> FilteredGraph:
+        # The view is read-only, copies can share it
+        return self
+
+    def __deepcopy__(self, memo: dict) -> FilteredGraph:
+        return self
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise FrozenGraphError(_READ_ONLY_MESSAGE)
+
+    add_node = add_nodes_from = remove_node = remove_nodes_from = _read_only
+    add_edge = add_edges_from = add_weighted_edges_from = _read_only
+    remove_edge = remove_edges_from = update = clear = clear_edges = _read_only
+
+
+class FilteredNodeView:
+    """The `FilteredGraph.nodes` view, callable like the networkx one."""
+
+    __slots__ = ("_graph", "_data", "_default")
+
+    def __init__(self, graph: FilteredGraph, data: Any = False, default: Any = None):
+        self._graph = graph
+        self._data = data
+        self._default = default
+
+    def __call__(self, data: Any = False, default: Any = None) -> FilteredNodeView:
+        return FilteredNodeView(self._graph, data, default)
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __contains__(self, n: Any) -> bool:
+        return n in self._graph
+
+    def __getitem__(self, n: Any) -> Any:
+        if n not in self._graph:
+            raise KeyError(n)
+        data = self._graph._parent.nodes[n]
+        if self._data is False or self._data is True:
+            return data
+        return data.get(self._data, self._default)
+
+    def __iter__(self) -> Iterator[Any]:
+        nodes = self._graph._node_order()
+        if self._data is False:
+            return iter(nodes)
+        parent_nodes = self._graph._parent.nodes
+        if self._data is True:
+            return ((n, parent_nodes[n]) for n in nodes)
+        return ((n, parent_nodes[n].get(self._data, self._default)) for n in nodes)
+
+    def __repr__(self) -> str:
+        return f"FilteredNodeView({tuple(self)!r})"
+
+
+class FilteredEdgeView:
+    """The `FilteredGraph.edges` view, callable like the networkx one."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: FilteredGraph):
+        self._graph = graph
+
+    def __call__(self, nbunch: Any = None, data: Any = False, keys: bool = False, default: Any = None) -> list:
+        return list(self._graph._iter_edges(nbunch, data, keys, default))
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self._graph._iter_edges(None, False, False, None)
+
+    def __contains__(self, edge: tuple) -> bool:
+        return self._graph.has_edge(*edge)
+
+    def __getitem__(self, edge: tuple) -> dict[str, Any]:
+        u, v, key = edge
+        return self._graph.adj[u][v][key]
+
+
+class FilteredAdjacency(Mapping):
+    """Read-only mapping from a visible node to its `FilteredNeighbors`."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: FilteredGraph):
+        self._graph = graph
+
+    def __getitem__(self, n: Any) -> FilteredNeighbors:
+        if n not in self._graph:
+            raise KeyError(n)
+        return FilteredNeighbors(self._graph, self._graph._parent.adj[n])
+
+    def __contains__(self, n: Any) -> bool:
+        return n in self._graph
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph)
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+
+class FilteredNeighbors(Mapping):
+    """Read-only mapping from a visible neighbor to the `FilteredEdgeKeys` of the edges to it."""
+
+    __slots__ = ("_graph", "_neighbors")
+
+    def __init__(self, graph: FilteredGraph, neighbors: Mapping):
+        self._graph = graph
+        self._neighbors = neighbors
+
+    def __getitem__(self, nbr: Any) -> FilteredEdgeKeys:
+        if nbr not in self._graph:
+            raise KeyError(nbr)
+        keys = FilteredEdgeKeys(self._graph, self._neighbors[nbr])
+        if not keys:
+            raise KeyError(nbr)
+        return keys
+
+    def __iter__(self) -> Iterator[Any]:
+        for nbr, keydict in self._neighbors.items():
+            if nbr in self._graph and any(self._graph._edge_ok(key) for key in keydict):
+                yield nbr
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class FilteredEdgeKeys(Mapping):
+    """Read-only mapping from a visible edge key to the edge attributes."""
+
+    __slots__ = ("_graph", "_keys")
+
+    def __init__(self, graph: FilteredGraph, keys: Mapping):
+        self._graph = graph
+        self._keys = keys
+
+    def __getitem__(self, key: Any) -> dict[str, Any]:
+        if not self._graph._edge_ok(key):
+            raise KeyError(key)
+        return self._keys[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (key for key in self._keys if self._graph._edge_ok(key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class FilteredEdgeIndex(Mapping):
+    """The `_edge_index` of a view: the entries of the parent index for visible edges."""
+
+    __slots__ = ("_index", "_graph")
+
+    def __init__(self, index: Mapping, graph: FilteredGraph):
+        self._index = index
+        self._graph = graph
+
+    def __getitem__(self, key: Any) -> tuple[Any, Any]:
+        ends = self._index[key]
+        if not self._graph.has_edge(*ends, key):
+            raise KeyError(key)
+        return ends
+
+    def __iter__(self) -> Iterator[Any]:
+        return (key for _u, _v, key in self._graph._iter_edges(None, False, True, None))
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+
+def _steps_segments(value: Any) -> Any:
+    """Return the segment ids or names of stored path segments or walk steps."""
+    if isinstance(value, OrientedSteps):
+        return value.ids
+    if isinstance(value, Deferred):
+        value = value.resolve()
+    if isinstance(value, str):
+        return [name for name, _ in parse_walk_steps(value)]
+    return [segment[:-1] for segment in value or ()]
+
+
+def _within(value: Any, nodes: frozenset, segment_ids: np.ndarray) -> bool:
+    """Tell if the segments of a path or walk are all in `nodes`."""
+    segments = _steps_segments(value)
+    if isinstance(segments, np.ndarray):
+        return bool(np.isin(segments, segment_ids).all())
+    return all(name in nodes for name in segments)
+
+
+class GFAView(GFA):
+    """A read-only view of part of a GFA graph, see the module documentation.
+
+    :param parent: The graph to look at.
+    :param nodes: The ids of the visible nodes.
+    :param edges: The keys of the visible edges, their end nodes are
+        visible too. None to see all the edges between visible nodes.
+    :param subgraphs: The ids of the visible subgraphs.
+    :param paths: The ids of the visible paths.
+    :param walks: The ids of the visible walks.
+    """
+
+    def __init__(
+        self,
+        parent: GFA,
+        nodes: Iterable[str] = (),
+        edges: Iterable[str] | None = None,
+        subgraphs: Iterable[str] = (),
+        paths: Iterable[str] = (),
+        walks: Iterable[str] = (),
+    ):
+        nodes = set(nodes)
+        if edges is not None:
+            edges = [key for key in edges if parent._get_edge_end_nodes(key) != (None, None)]
+            for key in edges:
+                nodes.update(parent._get_edge_end_nodes(key))
+        self._parent = parent
+        self._graph = FilteredGraph(parent._graph, nodes, edges, version=partial(getattr, parent, "_version"))
+        self._edge_index = FilteredEdgeIndex(parent._edge_index, self._graph)
+        self._subgraphs = {key: parent._subgraphs[key] for key in subgraphs if key in parent._subgraphs}
+        self._paths = {key: parent._paths[key] for key in paths if key in parent._paths}
+        self._walks = {key: parent._walks[key] for key in walks if key in parent._walks}
+        self._segment_map = parent._segment_map
+        self._segment_names = parent._segment_names
+        self._header_info = parent._header_info
+        self._next_virtual_id = parent._next_virtual_id
+        self._indexes = {}
+        self._indexes_version = parent._version
+        self._traversals = None
+
+    @property
+    def _version(self) -> int:
+        # The view changes with its parent
+        return self._parent._version
+
+    def _touch(self) -> None:
+        self._parent._touch()
+
+    @classmethod
+    def induced(cls, parent: GFA, nbunch: Iterable[str]) -> GFAView:
+        """Return the view of the subgraph induced by some nodes.
+
+        The view shows the given nodes, all the edges between them and the
+        paths and walks going through them only.
+
+        :param parent: The graph to look at.
+        :param nbunch: The ids of the nodes.
+        """
+        nodes = frozenset(parent._graph.nbunch_iter(nbunch))
+        segment_ids = np.fromiter(
+            (parent._segment_map[name] for name in nodes if name in parent._segment_map), dtype=np.int32
+        )
+        paths = [key for key, data in parent._paths.items() if _within(dict.get(data, "segments"), nodes, segment_ids)]
+        walks = [key for key, data in parent._walks.items() if _within(dict.get(data, "walk"), nodes, segment_ids)]
+        return cls(parent, nodes, paths=paths, walks=walks)
+
+    def _new_graph(self) -> GFA:
+        return self._parent._new_graph()
+
+    def materialize(self) -> GFA:
+        """Return an independent, mutable copy of the visible part of the graph.
+
+        :returns: A graph of the class of the parent graph (networkx
+            backed, even if the parent is frozen).
+        """
+        graph = self._new_graph()
+        graph._graph = self._graph.to_multigraph()
+        graph._rebuild_edge_index()
+        graph._subgraphs = {key: copy.copy(subgraph) for key, subgraph in self._subgraphs.items()}
+        for key, data in self._paths.items():
+            graph._store_path(key, dict(data.items()))
+        for key, data in self._walks.items():
+            graph._store_walk(key, dict(data.items()))
+        graph._header_info = dict(self._header_info)
+        graph._next_virtual_id = self._next_virtual_id
+        return graph
+
+    def freeze(self) -> GFA:
+        """Return a frozen copy of the visible part of the graph.
+
+        :returns: A frozen graph of the class of the parent graph.
+        """
+        # CSRGraph pairs the adjacency entries of an edge by the identity
+        # of their attribute dict, which the views of a frozen parent
+        # don't preserve: freeze a materialized copy
+        return self.materialize().freeze()
+
+    def __deepcopy__(self, memo: dict) -> GFA:
+        # An independent copy is a materialized one
+        return self.materialize()
+
+    def __repr__(self) -> str:
+        return (
+            f"GFAView(nodes={self._graph.number_of_nodes()}, subgraphs={len(self._subgraphs)},"
+            f" paths={len(self._paths)}, walks={len(self._walks)})"
+        )
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise FrozenGraphError(_READ_ONLY_MESSAGE)
+
+    add_graph_element = add_node = add_nodes_from = remove_node = pack_sequences = _read_only
+    add_edge = add_edges_from = remove_edge = remove_edges = _read_only
+    add_subgraph = remove_subgraph = _read_only
+    add_path = add_paths_from = remove_path = add_walk = add_walks_from = remove_walk = _read_only
+    clear = compression = from_string = _read_only
+
+
+__all__ = [
+    "GFAView",
+    "FilteredGraph",
+    "FilteredNodeView",
+    "FilteredEdgeView",
+    "FilteredAdjacency",
+    "FilteredNeighbors",
+    "FilteredEdgeKeys",
+    "FilteredEdgeIndex",
+]
@@ -6,21 +6,93 @@ Provides unified load/save functions for GFA and BGFA formats.
 from __future__ import annotations
 
 import logging
+import pickle
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 
+from pygfa.exceptions import FileFormatError
 from pygfa.gfa import GFA
+from pygfa.gfa.records import RECORD_TYPES, Record, parse_record
+from pygfa.gfa.snapshot import SNAPSHOT_MAGIC
 from pygfa.encoding.enums import IntegerEncoding, StringEncoding
+from pygfa.utils.file_opener import open_gfa_file
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_SUFFIX = ".snapshot"
+KMER_INDEX_SUFFIX = ".kmers"
 
-def load(path: Union[str, Path], format: Optional[str] = None) -> GFA:
+
+def snapshot_path(path: Union[str, Path]) -> Path:
+    """Return the path of the snapshot cache of a GFA or BGFA file.
+
+    ``load(path, use_snapshot=True)`` uses the cache instead of parsing
+    the file when it is newer than the file. It is written by
+    ``graph.save_snapshot(snapshot_path(path))`` (or `save` with the
+    "snapshot" format).
+
+    Args:
+        path: Path to the GFA or BGFA file
+
+    Returns:
+        The path with the ".snapshot" suffix appended
+    """
+    path = Path(path)
+    return path.with_name(path.name + SNAPSHOT_SUFFIX)
+
+
+def kmer_index_path(path: Union[str, Path], k: int, window: int = 1) -> Path:
+    """Return the path of a k-mer index file of a GFA or BGFA file.
+
+    Give it to ``graph.kmer_index(k, window, path=...)`` to save the
+    index next to the graph file and memory-map it the next times.
+
+    Args:
+        path: Path to the GFA or BGFA file
+        k: The k-mer length of the index
+        window: The minimizer window of the index
+
+    Returns:
+        The path with a ".k<k>.w<window>.kmers" suffix appended
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.k{k}.w{window}{KMER_INDEX_SUFFIX}")
+
+
+def _load_snapshot_cache(path: Path) -> Optional[GFA]:
+    """Return the graph of the snapshot cache of `path`, if it is up to date."""
+    cache = snapshot_path(path)
+    try:
+        if cache.stat().st_mtime_ns < path.stat().st_mtime_ns:
+            logger.info(f"Ignoring snapshot cache older than the file: {cache}")
+            return None
+    except FileNotFoundError:
+        return None
+    try:
+        graph = GFA.load_snapshot(str(cache))
+    except (FileFormatError, ValueError, EOFError, pickle.UnpicklingError) as err:
+        logger.warning(f"Ignoring invalid snapshot cache {cache}: {err}")
+        return None
+    logger.info(f"Loaded snapshot cache: {cache}")
+    return graph
+
+
+def load(path: Union[str, Path], format: Optional[str] = None, use_snapshot: bool = False) -> GFA:
     """Load a GFA file (auto-detects format from extension).
 
+    With `use_snapshot`, if a snapshot cache of the file (see
+    `snapshot_path`) exists and is newer than the file, the graph is
+    loaded from the cache, memory-mapped, instead of being parsed. Such a
+    graph is frozen (read-only). An invalid cache is logged and ignored.
+
+    Snapshots are pickles, and unpickling runs code chosen by whoever
+    wrote the file: only load snapshots, or enable `use_snapshot` for
+    directories, whose files you wrote yourself.
+
     Args:
-        path: Path to GFA file (.gfa or .bgfa)
-        format: Optional format hint ('gfa' or 'bgfa')
+        path: Path to GFA file (.gfa, .bgfa or .snapshot)
+        format: Optional format hint ('gfa', 'bgfa' or 'snapshot')
+        use_snapshot: Use the snapshot cache of the file if it is up to date
 
     Returns:
         GFA graph object
@@ -39,15 +111,28 @@ def load(path: Union[str, Path], format: Optional[str] = None) -> GFA:
             format = "bgfa"
         elif path.suffix in (".gfa", ".gfal"):
             format = "gfa"
+        elif path.suffix == SNAPSHOT_SUFFIX:
+            format = "snapshot"
         else:
             # Try to detect from content
             with open(path, "rb") as f:
-                header = f.read(4)
-                if header == b"BGFA":
+                header = f.read(len(SNAPSHOT_MAGIC))
+                if header[:4] == b"BGFA":
                     format = "bgfa"
+                elif header == SNAPSHOT_MAGIC:
+                    format = "snapshot"
                 else:
                     format = "gfa"
 
+    if format == "snapshot":
+        logger.info(f"Loading snapshot: {path}")
+        return GFA.load_snapshot(str(path))
+
+    if use_snapshot:
+        graph = _load_snapshot_cache(path)
+        if graph is not None:
+            return graph
+
     logger.info(f"Loading {format.upper()} file: {path}")
 
     if format == "bgfa":
@@ -56,6 +141,51 @@ def load(path: Union[str, Path], format: Optional[str] = None) -> GFA:
         return GFA.from_gfa(str(path))
 
 
+def iter_records(
+    path: Union[str, Path], types: Optional[Iterable[str]] = None, strict: bool = False
+) -> Iterator[Record]:
+    """Iterate over the records of a text GFA file without building a graph.
+
+    The file is read one line at a time through `open_gfa_file`, so
+    compressed files are supported and memory use does not depend on the
+    file size. Lines are parsed by the fast parser of `pygfa.gfa.records`
+    and yielded as named tuples (`SegmentRecord`, `LinkRecord`, ...).
+    Lines of the other record types are skipped, malformed lines of a
+    supported type are logged and skipped, or raise if `strict` is set.
+
+    Args:
+        path: Path to a .gfa, .gfa.gz, .gfa.zst or .gfa.xz file
+        types: Record type letters to yield, e.g. "SLPW" (default: all
+            the types supported by the fast parser, "HSLCPW")
+        strict: If set, raise on malformed lines instead of skipping them
+
+    Yields:
+        One record per selected line, in file order
+
+    Raises:
+        FileFormatError: If `strict` is set and a line is malformed
+    """
+    wanted = None if types is None else frozenset(types)
+    with open_gfa_file(str(path)) as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if wanted is not None and line[0] not in wanted:
+                continue
+            record = parse_record(line)
+            if record is None:
+                shown = f"{line[:50]}{'...' if len(line) > 50 else ''}"
+                if line.split("\t", 1)[0] not in RECORD_TYPES:
+                    logger.debug(f"Skipping line {line_num} of an unsupported record type: {shown}")
+                elif strict:
+                    raise FileFormatError(f"Malformed line {line_num} in {path}: {shown}")
+                else:
+                    logger.warning(f"Skipping malformed line {line_num}: {shown}")
+                continue
+            yield record
+
+
 def save(
     graph: GFA,
     path: Union[str, Path],
@@ -70,7 +200,7 @@ def save(
     Args:
         graph: GFA graph to save
         path: Output file path
-        format: Optional format hint ('gfa' or 'bgfa')
+        format: Optional format hint ('gfa', 'bgfa' or 'snapshot')
         gfa_version: GFA specification version (1 or 2) for text format
         block_size: Block size for binary format
         integer_encoding: Integer encoding for binary format
@@ -82,12 +212,16 @@ def save(
     if format is None:
         if path.suffix == ".bgfa":
             format = "bgfa"
+        elif path.suffix == SNAPSHOT_SUFFIX:
+            format = "snapshot"
         else:
             format = "gfa"
 
     logger.info(f"Saving {format.upper()} file: {path}")
 
-    if format == "bgfa":
+    if format == "snapshot":
+        graph.save_snapshot(str(path))
+    elif format == "bgfa":
         int_name = integer_encoding.name.lower()
         str_name = string_encoding.name.lower()
         cigar_code = (
@@ -170,7 +304,12 @@ def save_binary(
 
 
 __all__ = [
+    "SNAPSHOT_SUFFIX",
+    "snapshot_path",
+    "KMER_INDEX_SUFFIX",
+    "kmer_index_path",
     "load",
+    "iter_records",
     "save",
     "load_text",
     "load_binary",
@@ -0,0 +1,401 @@
+"""BGZF (blocked gzip) reading and writing for text GFA files.
+
+BGZF files are regular multi-member gzip files, so any gzip reader can
+decompress them, but every member (block) holds at most 64 KiB of data
+and records its own compressed size. This allows:
+
+- inflating independent blocks in parallel worker threads (zlib releases
+  the GIL while decompressing);
+- random access through *virtual offsets*, ``compressed_offset << 16 |
+  offset_in_block``, with a ``.gzi`` index mapping each block to its
+  compressed and uncompressed offsets (the format written by
+  ``bgzip -i``).
+
+Files written by `GFA.to_gfa` follow the canonical record order (H, S, L,
+P, W), so `seek_section` can find the first line of a record type by
+binary search over the blocks, without inflating what comes before.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Iterator
+
+from pygfa.exceptions import FileFormatError
+
+# Record types in the order used by GFA.to_gfa
+SECTION_ORDER = "HSLPW"
+
+# Uncompressed bytes per block, as in htslib
+BLOCK_DATA_SIZE = 0xFF00
+_HEADER = struct.Struct("<4BI2BH2BHH")
+_HEADER_SIZE = _HEADER.size
+_FOOTER = struct.Struct("<II")
+# The empty block marking the end of a BGZF file
+EOF_BLOCK = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+
+def _default_threads() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+def _compress_block(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    bsize = _HEADER_SIZE + len(cdata) + _FOOTER.size
+    header = _HEADER.pack(31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2, bsize - 1)
+    return header + cdata + _FOOTER.pack(zlib.crc32(data), len(data))
+
+
+def inflate_block(block: bytes) -> bytes:
+    """Decompress a single BGZF block.
+
+    Args:
+        block: The whole block, header and footer included
+
+    Returns:
+        The uncompressed data
+
+    Raises:
+        FileFormatError: If the block is not a valid BGZF block
+    """
+    if len(block) < _HEADER_SIZE + _FOOTER.size or block[:4] != b"\x1f\x8b\x08\x04":
+        raise FileFormatError("Invalid BGZF block header")
+    data = zlib.decompress(block[_HEADER_SIZE : -_FOOTER.size], -15)
+    crc, size = _FOOTER.unpack(block[-_FOOTER.size :])
+    if size != len(data) or crc != zlib.crc32(data):
+        raise FileFormatError("BGZF block checksum mismatch")
+    return data
+
+
+def _block_size(header: bytes) -> int | None:
+    """Return the total size of the block starting with `header`, None if it isn't BGZF."""
+    if len(header) < _HEADER_SIZE:
+        return None
+    id1, id2, cm, flg, _mtime, _xfl, _os, xlen, si1, si2, slen, bsize = _HEADER.unpack(header[:_HEADER_SIZE])
+    if (id1, id2, cm, flg, xlen, si1, si2, slen) != (31, 139, 8, 4, 6, 66, 67, 2):
+        return None
+    return bsize + 1
+
+
+def is_bgzf(filepath: str) -> bool:
+    """Return True if the file starts with a BGZF block.
+
+    Args:
+        filepath: Path to the file
+    """
+    try:
+        with open(filepath, "rb") as f:
+            return _block_size(f.read(_HEADER_SIZE)) is not None
+    except OSError:
+        return False
+
+
+def write_bgzf(
+    filepath: str,
+    data: bytes,
+    index: bool = True,
+    level: int = 6,
+    threads: int | None = None,
+) -> None:
+    """Write `data` as a BGZF file, compressing the blocks in parallel.
+
+    Args:
+        filepath: Output file path
+        data: The uncompressed content
+        index: If set, also write the `filepath + ".gzi"` index
+        level: zlib compression level
+        threads: Number of compression threads (default: up to 8)
+    """
+    chunks = [data[i : i + BLOCK_DATA_SIZE] for i in range(0, len(data), BLOCK_DATA_SIZE)]
+    entries = []
+    coffset = uoffset = 0
+    with ThreadPoolExecutor(max_workers=threads or _default_threads()) as executor, open(filepath, "wb") as f:
+        for chunk, block in zip(chunks, executor.map(_compress_block, chunks, [level] * len(chunks))):
+            if coffset:
+                entries.append((coffset, uoffset))
+            f.write(block)
+            coffset += len(block)
+            uoffset += len(chunk)
+        f.write(EOF_BLOCK)
+    if index:
+        write_bgzf_index(filepath + ".gzi", entries)
+
+
+def write_bgzf_index(index_path: str, entries: list[tuple[int, int]]) -> None:
+    """Write a `.gzi` index.
+
+    Args:
+        index_path: Output path of the index
+        entries: `(compressed_offset, uncompressed_offset)` of every block
+            but the first one
+    """
+    with open(index_path, "wb") as f:
+        f.write(struct.pack("<Q", len(entries)))
+        for coffset, uoffset in entries:
+            f.write(struct.pack("<QQ", coffset, uoffset))
+
+
+def build_bgzf_index(filepath: str) -> list[tuple[int, int]]:
+    """Scan the block headers of a BGZF file, without inflating any data.
+
+    Args:
+        filepath: Path to a BGZF file
+
+    Returns:
+        `(compressed_offset, uncompressed_offset)` of every non-empty block,
+        the first one included
+
+    Raises:
+        FileFormatError: If the file is not BGZF
+    """
+    blocks = []
+    coffset = uoffset = 0
+    with open(filepath, "rb") as f:
+        while True:
+            header = f.read(_HEADER_SIZE)
+            if not header:
+                break
+            bsize = _block_size(header)
+            if bsize is None:
+                raise FileFormatError(f"Not a BGZF file: {filepath}")
+            f.seek(coffset + bsize - 4)
+            (isize,) = struct.unpack("<I", f.read(4))
+            if isize:
+                blocks.append((coffset, uoffset))
+            coffset += bsize
+            uoffset += isize
+    return blocks
+
+
+def read_bgzf_index(filepath: str) -> list[tuple[int, int]]:
+    """Return the blocks of a BGZF file, from its `.gzi` index if there is one.
+
+    Args:
+        filepath: Path to a BGZF file
+
+    Returns:
+        `(compressed_offset, uncompressed_offset)` of every block, the
+        first one included
+    """
+    index_path = filepath + ".gzi"
+    if not os.path.exists(index_path):
+        return build_bgzf_index(filepath)
+    with open(index_path, "rb") as f:
+        (count,) = struct.unpack("<Q", f.read(8))
+        entries = [struct.unpack("<QQ", f.read(16)) for _ in range(count)]
+    # The index has no entry for the first block, and may have one for the
+    # final empty block
+    blocks = [(0, 0)] + [tuple(entry) for entry in entries]
+    size = os.path.getsize(filepath)
+    return [block for block in blocks if block[0] < size - len(EOF_BLOCK) or block == (0, 0)]
+
+
+def make_virtual_offset(block_offset: int, within_block: int) -> int:
+    """Return the virtual offset of a position inside a block."""
+    return (block_offset << 16) | within_block
+
+
+def split_virtual_offset(virtual_offset: int) -> tuple[int, int]:
+    """Return the block offset and the offset inside the block."""
+    return virtual_offset >> 16, virtual_offset & 0xFFFF
+
+
+class BgzfReader(io.RawIOBase):
+    """A binary stream over the content of a BGZF file.
+
+    Blocks are read ahead and inflated by a pool of threads, the data is
+    returned in order.
+
+    Args:
+        filepath: Path to a BGZF file
+        start: Virtual offset of the first byte to return
+        threads: Number of inflating threads (default: up to 8)
+        blocks: The block list, see `read_bgzf_index`
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        start: int = 0,
+        threads: int | None = None,
+        blocks: list[tuple[int, int]] | None = None,
+    ):
+        super().__init__()
+        self._threads = threads or _default_threads()
+        self._blocks = blocks if blocks is not None else read_bgzf_index(filepath)
+        self._file = open(filepath, "rb")
+        self._executor = ThreadPoolExecutor(max_workers=self._threads)
+
+        block_offset, within_block = split_virtual_offset(start)
+        first = bisect_right([coffset for coffset, _ in self._blocks], block_offset) - 1
+        self._data = self._inflated_blocks(max(first, 0))
+        self._buffer = memoryview(b"")
+        if within_block:
+            self._buffer = memoryview(next(self._data, b""))[within_block:]
+
+    def _inflated_blocks(self, first: int) -> Iterator[bytes]:
+        size = os.path.getsize(self._file.name)
+        ends = [coffset for coffset, _ in self._blocks[1:]] + [size]
+        pending: deque = deque()
+        next_block = first
+        while True:
+            # Keep a few blocks per thread in flight
+            while next_block < len(self._blocks) and len(pending) < 4 * self._threads:
+                coffset = self._blocks[next_block][0]
+                self._file.seek(coffset)
+                raw = self._file.read(ends[next_block] - coffset)
+                pending.append(self._executor.submit(_inflate_blocks, raw))
+                next_block += 1
+            if not pending:
+                return
+            yield pending.popleft().result()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._buffer:
+            data = next(self._data, None)
+            if data is None:
+                return 0
+            self._buffer = memoryview(data)
+        n = min(len(buffer), len(self._buffer))
+        buffer[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._file.close()
+        super().close()
+
+
+def _inflate_blocks(raw: bytes) -> bytes:
+    """Inflate consecutive blocks, a block list entry may cover the EOF block too."""
+    parts = []
+    position = 0
+    while position < len(raw):
+        bsize = _block_size(raw[position : position + _HEADER_SIZE])
+        if bsize is None:
+            raise FileFormatError("Invalid BGZF block header")
+        parts.append(inflate_block(raw[position : position + bsize]))
+        position += bsize
+    return b"".join(parts)
+
+
+def open_bgzf(filepath: str, mode: str = "r", start: int = 0, threads: int | None = None) -> IO[Any]:
+    """Open a BGZF file for reading, with parallel inflate.
+
+    Args:
+        filepath: Path to a BGZF file
+        mode: 'r' for text, 'rb' for binary
+        start: Virtual offset to start reading from, see `seek_section`
+        threads: Number of inflating threads (default: up to 8)
+
+    Returns:
+        File handle
+    """
+    stream = io.BufferedReader(BgzfReader(filepath, start=start, threads=threads), buffer_size=BLOCK_DATA_SIZE)
+    if "b" in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def _section_rank(char: bytes) -> int:
+    return SECTION_ORDER.find(char.decode("ascii", "replace"))
+
+
+def seek_section(filepath: str, record_type: str) -> int | None:
+    """Return the virtual offset of the first line of a record type.
+
+    The file must follow the canonical record order of `GFA.to_gfa`
+    (H, S, L, P, W). The block holding the line is found by binary
+    search, so only a few blocks are inflated.
+
+    Args:
+        filepath: Path to a BGZF GFA file
+        record_type: One of "H", "S", "L", "P", "W"
+
+    Returns:
+        The virtual offset to pass to `open_bgzf`, or None if the file
+        holds no line of a type at or after `record_type` in the order
+
+    Raises:
+        ValueError: If `record_type` is not part of the canonical order
+    """
+    target = SECTION_ORDER.find(record_type)
+    if len(record_type) != 1 or target < 0:
+        raise ValueError(f"Unknown record type {record_type!r}, expected one of {SECTION_ORDER}")
+    blocks = read_bgzf_index(filepath)
+    size = os.path.getsize(filepath)
+    ends = [coffset for coffset, _ in blocks[1:]] + [size]
+
+    with open(filepath, "rb") as f:
+
+        def inflate(i: int) -> bytes:
+            f.seek(blocks[i][0])
+            return _inflate_blocks(f.read(ends[i] - blocks[i][0]))
+
+        def first_line_rank(i: int) -> int:
+            # Rank of the first line starting after a newline inside block
+            # i, or in the following blocks when a line spans block i
+            for j in range(i, len(blocks)):
+                data = inflate(j)
+                newline = data.find(b"\n")
+                if newline < 0:
+                    continue
+                if newline + 1 < len(data):
+                    return _section_rank(data[newline + 1 : newline + 2])
+                # The next line starts in the next block
+                following = inflate(j + 1) if j + 1 < len(blocks) else b""
+                return _section_rank(following[:1]) if following else len(SECTION_ORDER)
+            return len(SECTION_ORDER)
+
+        low, high = 0, len(blocks)
+        while low < high:
+            middle = (low + high) // 2
+            if first_line_rank(middle) >= target:
+                high = middle
+            else:
+                low = middle + 1
+
+        # The first line of the section starts after the block preceding `low`
+        for i in range(max(low - 1, 0), len(blocks)):
+            data = inflate(i)
+            if i == 0 and data and _section_rank(data[:1]) >= target:
+                return make_virtual_offset(blocks[i][0], 0)
+            position = data.find(b"\n")
+            while position >= 0:
+                if position + 1 < len(data):
+                    if _section_rank(data[position + 1 : position + 2]) >= target:
+                        return make_virtual_offset(blocks[i][0], position + 1)
+                elif i + 1 < len(blocks):
+                    following = inflate(i + 1)
+                    if following and _section_rank(following[:1]) >= target:
+                        return make_virtual_offset(blocks[i + 1][0], 0)
+                position = data.find(b"\n", position + 1)
+    return None
+
+
+__all__ = [
+    "SECTION_ORDER",
+    "BgzfReader",
+    "build_bgzf_index",
+    "inflate_block",
+    "is_bgzf",
+    "make_virtual_offset",
+    "open_bgzf",
+    "read_bgzf_index",
+    "seek_section",
+    "split_virtual_offset",
+    "write_bgzf",
+    "write_bgzf_index",
+]
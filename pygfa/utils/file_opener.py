@@ -4,6 +4,8 @@ import gzip
 import lzma
 from typing import IO, Any
 
+from pygfa.utils.bgzf import is_bgzf, open_bgzf
+
 try:
     import compression.zstd as z
 
@@ -12,13 +14,28 @@ except ImportError:
     _ZSTD_AVAILABLE = False
     z = None  # type: ignore
 
+COMPRESSED_SUFFIXES = (".gz", ".zst", ".zstd", ".xz")
+
+
+def is_compressed(filepath: str) -> bool:
+    """Return True if the file is compressed, judging by its extension.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        True for the extensions handled by `open_gfa_file` as compressed
+    """
+    return filepath.endswith(COMPRESSED_SUFFIXES)
+
 
 def open_gfa_file(filepath: str, mode: str = "r") -> IO[Any]:
     """Open GFA file with support for gzip, zstd, and xz compression.
 
     Supports the following file formats:
     - Plain text GFA files (*.gfa)
-    - Gzip-compressed files (*.gfa.gz)
+    - Gzip-compressed files (*.gfa.gz), BGZF files are inflated in
+      parallel threads
     - Zstd-compressed files (*.gfa.zst, *.gfa.zstd)
     - XZ/LZMA-compressed files (*.gfa.xz)
 
@@ -47,6 +64,8 @@ def open_gfa_file(filepath: str, mode: str = "r") -> IO[Any]:
         return lzma.open(filepath, "rt" if text_mode else "rb")
 
     elif filepath.endswith(".gz"):
+        if is_bgzf(filepath):
+            return open_bgzf(filepath, "r" if text_mode else "rb")
         return gzip.open(filepath, "rt" if text_mode else "rb")  # type: ignore
 
     else:
@@ -33,6 +33,16 @@ class TestCharacterizeDatasets(unittest.TestCase):
         self.assertIn("file", result)
         self.assertIn("error", result)
 
+    def test_malformed_gfa(self):
+        fd, path = tempfile.mkstemp(suffix=".gfa")
+        with os.fdopen(fd, "w") as f:
+            f.write("H\tVN:Z:1.0\nS\t1\tACGT\nL\t1\t+\t2\n")
+        try:
+            result = characterize_datasets.characterize(path)
+            self.assertIn("line 3", result["error"])
+        finally:
+            os.remove(path)
+
     def test_empty_gfa_file(self):
         fd, path = tempfile.mkstemp(suffix=".gfa")
         os.close(fd)
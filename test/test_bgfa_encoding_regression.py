@@ -291,7 +291,7 @@ class TestBGFARoundtripOptFields(unittest.TestCase):
         self.assertIn("FLAG:Z:True", output, "Bool opt field should round-trip as Z")
 
     def test_no_opt_fields_block_when_empty(self):
-        """A graph with no opt fields must not emit a section-6 block."""
+        """A graph with no opt fields must not emit an opt-fields block."""
         gfa_content = (
             "H\tVN:Z:1.0\n"
             "S\t1\tACCTT\n"
@@ -308,8 +308,8 @@ class TestBGFARoundtripOptFields(unittest.TestCase):
 
         result = validate_bgfa(tmp_bgfa)
         for block in result.get("blocks", []):
-            self.assertNotEqual(
-                block.get("section_type"), "opt_fields",
+            self.assertNotIn(
+                block.get("section_type"), ("opt_fields", "opt_columns"),
                 "No opt_fields block should be emitted when no element has opt fields",
             )
 
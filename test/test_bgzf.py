@@ -0,0 +1,87 @@
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import FileFormatError
+from pygfa.gfa import GFA
+from pygfa.utils import bgzf
+from pygfa.utils.file_opener import open_gfa_file
+
+
+def _canonical_gfa(n_segments: int) -> str:
+    """A GFA text in the to_gfa order, spanning several BGZF blocks."""
+    lines = ["H\tVN:Z:1.0"]
+    lines += [f"S\ts{i}\t{'ACGT' * (i % 50 + 1)}" for i in range(n_segments)]
+    # A segment longer than a block, so that a line spans several blocks
+    lines.append(f"S\tlong\t{'A' * (3 * bgzf.BLOCK_DATA_SIZE)}")
+    lines += [f"L\ts{i}\t+\ts{i + 1}\t-\t0M" for i in range(n_segments - 1)]
+    lines += [f"P\tp{i}\ts{i}+,s{i + 1}-" for i in range(n_segments // 10)]
+    return "\n".join(lines) + "\n"
+
+
+class TestBgzf(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("results/test", exist_ok=True)
+        self.tmpdir = tempfile.mkdtemp(dir="results/test")
+        self.path = os.path.join(self.tmpdir, "graph.gfa.gz")
+        self.text = _canonical_gfa(3000)
+        bgzf.write_bgzf(self.path, self.text.encode())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_readable_by_gzip(self):
+        self.assertTrue(bgzf.is_bgzf(self.path))
+        with gzip.open(self.path, "rt") as f:
+            self.assertEqual(f.read(), self.text)
+
+    def test_parallel_reader(self):
+        with bgzf.open_bgzf(self.path, threads=3) as f:
+            self.assertEqual(f.read(), self.text)
+        with open_gfa_file(self.path) as f:
+            self.assertEqual(f.readline(), "H\tVN:Z:1.0\n")
+
+    def test_index(self):
+        blocks = bgzf.read_bgzf_index(self.path)
+        self.assertGreater(len(blocks), 3)
+        self.assertEqual(blocks, bgzf.build_bgzf_index(self.path))
+        os.remove(self.path + ".gzi")
+        self.assertEqual(bgzf.read_bgzf_index(self.path), blocks)
+
+    def test_seek_section(self):
+        for record_type in "HSLP":
+            with self.subTest(record_type=record_type):
+                expected = 0 if record_type == "H" else self.text.index(f"\n{record_type}\t") + 1
+                start = bgzf.seek_section(self.path, record_type)
+                with bgzf.open_bgzf(self.path, start=start) as f:
+                    self.assertEqual(f.read(), self.text[expected:])
+        self.assertIsNone(bgzf.seek_section(self.path, "W"))
+        with self.assertRaises(ValueError):
+            bgzf.seek_section(self.path, "X")
+
+    def test_not_bgzf(self):
+        path = os.path.join(self.tmpdir, "plain.gfa.gz")
+        with gzip.open(path, "wt") as f:
+            f.write(self.text)
+        self.assertFalse(bgzf.is_bgzf(path))
+        with self.assertRaises(FileFormatError):
+            bgzf.build_bgzf_index(path)
+        with open_gfa_file(path) as f:
+            self.assertEqual(f.read(), self.text)
+
+    def test_to_gfa_writes_bgzf(self):
+        graph = GFA.from_gfa("data/example_3.gfa")
+        path = os.path.join(self.tmpdir, "example_3.gfa.gz")
+        text = graph.to_gfa(file=path)
+        self.assertTrue(bgzf.is_bgzf(path))
+        self.assertTrue(os.path.exists(path + ".gzi"))
+        self.assertEqual(GFA.from_gfa(path).to_gfa(), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import random
+import sys
+import unittest
+
+import networkx as nx
+
+sys.path.insert(0, "../")
+
+from pygfa.algorithms.simple_paths import all_bidirected_paths
+from pygfa.gfa import GFA
+
+# Two bubbles, the second one with an inverted branch, and a dead end
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT",
+        "S\t2\tA",
+        "S\t3\tCCC",
+        "S\t4\tGG",
+        "S\t5\tTT",
+        "S\t6\t*\tLN:i:10",
+        "S\t7\tACGTACGT",
+        "L\t1\t+\t2\t+\t0M",
+        "L\t1\t+\t3\t+\t0M",
+        "L\t2\t+\t4\t+\t0M",
+        "L\t3\t+\t4\t+\t0M",
+        "L\t4\t+\t5\t+\t0M",
+        "L\t4\t+\t6\t-\t0M",
+        "L\t5\t+\t7\t+\t0M",
+        "L\t6\t-\t7\t+\t0M",
+        "L\t3\t-\t5\t+\t0M",
+    ]
+)
+
+
+def reference_walks(graph, source, target, cutoff, max_length):
+    """The walks found by a plain recursive search."""
+    index, lengths = graph.handle_index(), graph.handle_lengths()
+    walks = []
+
+    def extend(walk, length):
+        for child in index.successors(walk[-1]).tolist():
+            child_length = length + lengths[child >> 1]
+            if len(walk) > cutoff or (max_length is not None and child_length > max_length):
+                continue
+            if any(child >> 1 == handle >> 1 for handle in walk):
+                continue
+            if child == target:
+                walks.append([*walk, child])
+            else:
+                extend([*walk, child], child_length)
+
+    extend([source], lengths[source >> 1])
+    return walks
+
+
+class TestBidirectedPaths(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def oriented(self, graph, walks):
+        return ["".join("".join(graph.handle_name(handle)) for handle in walk) for walk in walks]
+
+    def check_graph(self, graph):
+        source, target = graph.handle("1"), graph.handle("7")
+        walks = self.oriented(graph, all_bidirected_paths(graph, source, target))
+        self.assertEqual(walks, ["1+2+4+5+7+", "1+2+4+6-7+", "1+3+4+5+7+", "1+3+4+6-7+"])
+        # 3- to 5+ is a link, but 3 is left forward
+        self.assertNotIn("1+3+5+7+", walks)
+        self.assertEqual(list(all_bidirected_paths(graph, target, source)), [])
+        reverse = self.oriented(graph, all_bidirected_paths(graph, graph.handle("7", "-"), graph.handle("1", "-")))
+        self.assertEqual(len(reverse), 4)
+        self.assertIn("7-6+4-2-1-", reverse)
+        self.assertEqual(self.oriented(graph, all_bidirected_paths(graph, source, target, cutoff=3)), [])
+        self.assertEqual(len(list(all_bidirected_paths(graph, source, target, cutoff=4))), 4)
+        # 4 + 1 + 2 + 2 + 8 bp through 2+ and 5+, 10 bp for 6 and 3 for 3, 27 bp at most
+        self.assertEqual(
+            self.oriented(graph, all_bidirected_paths(graph, source, target, max_length=17)), ["1+2+4+5+7+"]
+        )
+        self.assertEqual(len(list(all_bidirected_paths(graph, source, target, max_length=26))), 3)
+        edges = list(all_bidirected_paths(graph, source, target, edges=True))
+        self.assertEqual(len(edges), 4)
+        self.assertEqual([(u, v) for u, v, _key in edges[0]][0], (source, graph.handle("2")))
+        for u, v, key in edges[0]:
+            self.assertEqual(graph.edges(identifier=key)["from_node"], graph.handle_name(u)[0])
+        self.assertEqual(
+            list(all_bidirected_paths(graph, source, target, workers=2)),
+            list(all_bidirected_paths(graph, source, target)),
+        )
+
+    def test_simple_walks_only(self):
+        """The target can't be a segment the walk already visited."""
+        graph = GFA()
+        graph.from_string("H\tVN:Z:1.0\nS\t1\tA\nS\t2\tC\nL\t1\t+\t2\t+\t0M\nL\t2\t+\t1\t-\t0M\n")
+        source = graph.handle("1")
+        for target in (source, graph.handle("1", "-")):
+            self.assertEqual(list(all_bidirected_paths(graph, source, target)), [])
+            self.assertEqual(list(all_bidirected_paths(graph, source, target, workers=2)), [])
+        self.assertEqual(len(list(all_bidirected_paths(graph, source, graph.handle("2")))), 1)
+
+    def test_networkx(self):
+        self.check_graph(self.graph)
+
+    def test_frozen(self):
+        self.check_graph(self.graph.freeze())
+
+    def test_invalid(self):
+        with self.assertRaises(nx.NetworkXError):
+            list(all_bidirected_paths(self.graph, 0, 14))
+
+    def test_random(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            count = rng.randint(3, 8)
+            lines = ["H\tVN:Z:1.0"] + [f"S\t{i}\t{'A' * rng.randint(1, 5)}" for i in range(count)]
+            for _ in range(rng.randint(count, 3 * count)):
+                a, b = rng.randrange(count), rng.randrange(count)
+                lines.append(f"L\t{a}\t{rng.choice('+-')}\t{b}\t{rng.choice('+-')}\t0M")
+            graph = GFA()
+            graph.from_string("\n".join(lines))
+            source, target = rng.randrange(2 * count), rng.randrange(2 * count)
+            for cutoff, max_length in ((count - 1, None), (3, None), (count - 1, 9)):
+                expected = reference_walks(graph, source, target, cutoff, max_length)
+                found = all_bidirected_paths(graph, source, target, cutoff=cutoff, max_length=max_length)
+                self.assertEqual(list(found), expected)
+        found = all_bidirected_paths(graph, source, target, cutoff=cutoff, max_length=max_length, workers=3)
+        self.assertEqual(list(found), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
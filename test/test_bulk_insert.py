@@ -0,0 +1,121 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import FrozenGraphError, GFAError
+from pygfa.gfa import GFA
+from pygfa.gfa.records import parse_record
+from pygfa.graph_element import edge as ge
+from pygfa.graph_element import node
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT\tRC:i:4",
+        "S\t2\t*\tLN:i:10",
+        "L\t1\t+\t2\t-\t2M",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "S\t3\tGGtt",
+        "C\t1\t+\t3\t-\t1\t2M",
+        "P\tp1\t1+,2-,3+\t2M,*",
+        "W\tsample\t0\tchr1\t0\t8\t>1<2>3",
+        "L\t3\t-\t1\t-\t1M",
+    ]
+)
+
+
+class TestBulkInsert(unittest.TestCase):
+    def test_nodes_from_columns(self):
+        single = GFA()
+        single.add_node(node.Node("a", "ACGT", 4, opt_fields={"RC": 3}))
+        single.add_node(node.Node("b", "*", None))
+        bulk = GFA()
+        bulk.add_nodes_from(["a", "b"], ["ACGT", "*"], lengths=[4, None], opt_fields=[{"RC": 3}, None])
+        self.assertEqual(list(bulk.nodes(data=True)), list(single.nodes(data=True)))
+
+    def test_edges_from_columns(self):
+        graph = GFA()
+        graph.add_nodes_from(["a", "b"], ["A", "C"])
+        graph.add_edges_from(
+            ["a", "b", "a"],
+            np.array([False, True, False]),
+            ["b", "b", "a"],
+            np.array([0, 0, 1], dtype=np.uint8),
+            alignments=["1M", "*", "*"],
+            edge_ids=[None, "e1", "*"],
+        )
+        self.assertEqual(graph.edges(identifier="virtual_0")["from_orn"], "+")
+        self.assertEqual(graph.edges(identifier="e1")["from_segment_end"], "-")
+        self.assertEqual(graph.edges(identifier="virtual_1")["to_orn"], "-")
+        self.assertEqual(graph._get_edge_end_nodes("e1"), ("b", "b"))
+        self.assertEqual(graph.edges(identifier="virtual_0")["alignment"], "1M")
+
+    def test_validation(self):
+        graph = GFA()
+        with self.assertRaises(node.InvalidNodeError):
+            graph.add_nodes_from(["a", "b"], ["ACGT", "AC GT"])
+        with self.assertRaises(node.InvalidNodeError):
+            graph.add_nodes_from(["a", "*"], ["ACGT", "A"])
+        with self.assertRaises(node.InvalidNodeError):
+            graph.add_nodes_from(["a"], ["ACGT", "A"])
+        with self.assertRaises(ge.InvalidEdgeError):
+            graph.add_edges_from(["a"], ["x"], ["b"], ["+"])
+        with self.assertRaises(ge.InvalidEdgeError):
+            graph.add_edges_from(["a", ""], ["+", "+"], ["b", "b"], ["+", "+"])
+        with self.assertRaises(GFAError):
+            graph.add_paths_from([{"path_name": "p", "segments": []}, {"segments": []}])
+        with self.assertRaises(GFAError):
+            graph.add_walks_from([{"walk": ">1"}])
+        # Invalid columns are rejected as a whole
+        self.assertEqual(len(graph), 0)
+        graph.add_nodes_from(["a"], ["AC GT"], trusted=True)
+        self.assertEqual(graph.nodes(identifier="a")["sequence"], "AC GT")
+
+    def test_frozen(self):
+        frozen = GFA.from_gfa("data/example_1.gfa").freeze()
+        with self.assertRaises(FrozenGraphError):
+            frozen.add_nodes_from(["new"], ["A"])
+        with self.assertRaises(FrozenGraphError):
+            frozen.add_edges_from(["1"], ["+"], ["2"], ["+"])
+        # Checked before the columns
+        with self.assertRaises(FrozenGraphError):
+            frozen.add_edges_from(["1"], ["x"], ["2", "3"], ["+"])
+
+    def test_text_loading_matches_single_inserts(self):
+        single = GFA()
+        for line in GFA_TEXT.split("\n"):
+            single._add_record(parse_record(line))
+        bulk = GFA()
+        bulk.from_string(GFA_TEXT)
+        self.assertEqual(list(bulk.nodes(data=True)), list(single.nodes(data=True)))
+        self.assertEqual(list(bulk.edges(data=True, keys=True)), list(single.edges(data=True, keys=True)))
+        self.assertEqual(bulk.paths(), single.paths())
+        self.assertEqual(bulk.walks(), single.walks())
+        self.assertEqual(bulk._edge_index, single._edge_index)
+
+    def test_trusted_bgfa_loading(self):
+        graph = GFA()
+        graph.from_string("\n".join(line for line in GFA_TEXT.split("\n") if not line.startswith(("C", "W"))))
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            path = os.path.join(tmpdir, "graph.bgfa")
+            graph.to_bgfa(path)
+            validated = GFA.from_bgfa(path)
+            trusted = GFA.from_bgfa(path, trusted=True)
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(list(trusted.nodes(data=True)), list(validated.nodes(data=True)))
+        self.assertEqual(list(trusted.edges(data=True, keys=True)), list(validated.edges(data=True, keys=True)))
+        self.assertEqual(trusted.paths(), validated.paths())
+        self.assertEqual(trusted.to_gfa(), validated.to_gfa())
+
+
+if __name__ == "__main__":
+    unittest.main()
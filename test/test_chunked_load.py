@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.gfa import GFA
+from pygfa.gfa import chunks
+
+
+def _graph_content(graph):
+    return (
+        list(graph._graph.nodes(data=True)),
+        list(graph._graph.edges(keys=True, data=True)),
+        list(graph._paths.items()),
+        list(graph._walks.items()),
+    )
+
+
+class TestChunkOffsets(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("results/test", exist_ok=True)
+        fd, self.path = tempfile.mkstemp(suffix=".gfa", dir="results/test")
+        with os.fdopen(fd, "w") as f:
+            for i in range(50):
+                f.write(f"S\t{i}\t{'A' * (i % 7 + 1)}\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_ranges_are_aligned_on_lines(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for n_chunks in (1, 2, 3, 7, 100):
+            with self.subTest(n_chunks=n_chunks):
+                offsets = chunks.chunk_offsets(self.path, n_chunks)
+                self.assertLessEqual(len(offsets), n_chunks)
+                self.assertEqual(offsets[0][0], 0)
+                self.assertEqual(offsets[-1][1], len(data))
+                for (_, end), (start, _) in zip(offsets, offsets[1:]):
+                    self.assertEqual(end, start)
+                    self.assertEqual(data[start - 1 : start], b"\n")
+
+    def test_parse_chunk(self):
+        start, end = chunks.chunk_offsets(self.path, 5)[1]
+        chunk = chunks.parse_chunk(self.path, start, end)
+        self.assertEqual(chunk.order, "S" * chunk.line_count)
+        self.assertEqual(len(chunk.batches["S"]), chunk.line_count)
+
+
+class TestParallelLoad(unittest.TestCase):
+    def test_same_graph_as_serial(self):
+        for gfa_file in (
+            "data/example_1.gfa",
+            "data/example_2.gfa",
+            "data/sample1.gfa",
+            "data/test_walks.gfa",
+        ):
+            with self.subTest(gfa_file=gfa_file):
+                serial = GFA.from_gfa(gfa_file)
+                parallel = GFA.from_gfa(gfa_file, workers=3)
+                self.assertEqual(_graph_content(parallel), _graph_content(serial))
+
+    def test_virtual_ids_and_fallback_lines(self):
+        """Edges without ID get the same virtual ids, rejected lines still go to Lark."""
+        os.makedirs("results/test", exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".gfa", dir="results/test")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("H\tVN:Z:1.0\n# comment\n\n")
+                for i in range(40):
+                    f.write(f"S\t{i}\tACGT\n")
+                    f.write(f"L\t{i}\t+\t{i + 1}\t-\t2M\n")
+                    if i % 10 == 0:
+                        f.write(f"J\t{i}\t>\t{i + 1}\t<\t10\t*\n")
+                        f.write(f"S\tbad{i}\tAC GT\n")
+                    if i % 13 == 0:
+                        f.write(f"P\tp{i}\t{i}+,{i + 1}-\t2M\n")
+            serial = GFA.from_gfa(path)
+            with self.assertLogs("pygfa.gfa.parser", level="WARNING") as logs:
+                parallel = GFA.from_gfa(path, workers=4)
+            self.assertEqual(_graph_content(parallel), _graph_content(serial))
+            self.assertIn("virtual_0", parallel)
+            # The line numbers are the absolute ones of the file
+            self.assertTrue(any("Failed to parse line 7:" in message for message in logs.output))
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import unittest
+
+import networkx as nx
+
+sys.path.insert(0, "../")
+
+from pygfa.gfa import GFA
+from pygfa.graph_element import node
+
+
+class TestEdgeIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA.from_gfa("data/example_1.gfa")
+
+    def assertIndexConsistent(self):
+        expected = {key: (u, v) for u, v, key in self.graph._graph.edges(keys=True)}
+        self.assertEqual(set(self.graph._edge_index), set(expected))
+        for key, (u, v) in self.graph._edge_index.items():
+            self.assertTrue(self.graph._graph.has_edge(u, v, key))
+
+    def test_lookup(self):
+        self.assertIndexConsistent()
+        self.assertIn("virtual_13", self.graph)
+        self.assertNotIn("virtual_999", self.graph)
+        self.assertEqual(self.graph._get_edge_end_nodes("virtual_13"), ("2", "5"))
+        self.assertEqual(self.graph.get("virtual_13")["to_orn"], "-")
+        self.assertIsNone(self.graph.get("virtual_999"))
+
+    def test_removals(self):
+        self.graph.remove_edge("virtual_0")
+        self.assertNotIn("virtual_0", self.graph)
+        self.graph.remove_edge(("24", "7", "virtual_18"))
+        self.graph.remove_edges("2", "5")
+        self.assertNotIn("virtual_12", self.graph)
+        self.assertNotIn("virtual_13", self.graph)
+        self.graph.remove_node("3")
+        for key in ("virtual_2", "virtual_20", "virtual_21", "virtual_22"):
+            self.assertNotIn(key, self.graph)
+        self.assertIndexConsistent()
+        self.graph.clear()
+        self.assertEqual(self.graph._edge_index, {})
+
+    def test_add_edge_safe(self):
+        self.graph.add_node(node.Node("new", "ACGT", 4))
+        self.graph.add_edge("L\tnew\t+\t1\t+\t2M\tID:Z:new_link", safe=True)
+        self.assertEqual(self.graph._get_edge_end_nodes("new_link"), ("new", "1"))
+        self.assertIndexConsistent()
+
+    def test_base_graph(self):
+        copy = GFA(self.graph._graph)
+        self.assertEqual(copy._edge_index, self.graph._edge_index)
+        # Edges removed behind the index are not reported
+        copy._graph.remove_edge("2", "5", "virtual_13")
+        self.assertNotIn("virtual_13", copy)
+        copy._graph.add_edge("1", "2", key="direct")
+        copy._rebuild_edge_index()
+        self.assertIn("direct", copy)
+
+    def test_frozen(self):
+        frozen = self.graph.freeze()
+        self.assertIn("virtual_13", frozen)
+        self.assertEqual(frozen.get("virtual_13"), self.graph.get("virtual_13"))
+        self.assertIsInstance(self.graph.subgraph(["2", "5"]), nx.MultiGraph)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import gzip
+import io
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import FileFormatError
+from pygfa.gfa import GFA
+from pygfa.gfa import parser as gfa_parser
+from pygfa.gfa import records
+from pygfa.io import iter_records
+
+
+def _graph_content(graph):
+    return (
+        list(graph._graph.nodes(data=True)),
+        list(graph._graph.edges(keys=True, data=True)),
+        list(graph._paths.items()),
+        list(graph._walks.items()),
+    )
+
+
+class TestParseRecord(unittest.TestCase):
+    def test_segment(self):
+        record = records.parse_record("S\ts1\tACGT\tLN:i:4\tXf:f:0.5\tZZ:Z:some text")
+        self.assertEqual(record, records.SegmentRecord("s1", "ACGT", {"LN": 4, "Xf": 0.5, "ZZ": "some text"}))
+
+    def test_link(self):
+        record = records.parse_record("L\t1\t+\t2\t-\t4M\tID:Z:e1")
+        self.assertEqual(record, records.LinkRecord("1", "+", "2", "-", "4M", {"ID": "e1"}))
+
+    def test_containment(self):
+        record = records.parse_record("C\t1\t+\t2\t-\t10\t3M")
+        self.assertEqual(record, records.ContainmentRecord("1", "+", "2", "-", 10, "3M", {}))
+
+    def test_path(self):
+        record = records.parse_record("P\tp1\t1+,2-\t4M\tXX:Z:y")
+        self.assertEqual(record, records.PathRecord("p1", ["1+", "2-"], ["4M"], {"XX": "y"}))
+        record = records.parse_record("P\tp1\t1+,2-\tXX:Z:y")
+        self.assertEqual(record, records.PathRecord("p1", ["1+", "2-"], None, {"XX": "y"}))
+
+    def test_walk(self):
+        record = records.parse_record("W\tHG1\t1\tchr1\t0\t*\t>s1<s2>s3")
+        self.assertEqual(record, records.WalkRecord("HG1", 1, "chr1", 0, None, "s1+s2-s3+", {}))
+        record = records.parse_record("W\tHG1\t1\tchr1\t0\t10\ts1+s2-")
+        self.assertEqual(record.walk, "s1+s2-")
+
+    def test_rejected_lines(self):
+        for line in (
+            "S\ts1",
+            "S\ts1\tAC GT",
+            "S\ts1\tACGT\tnot_a_tag",
+            "S\ts1\tACGT\tLN:i:four",
+            "L\t1\tx\t2\t+\t4M",
+            "L\t1\t+\t2\t+\t4Q",
+            "P\tp1\t1,2+",
+            "W\tHG1\tone\tchr1\t0\t10\t>s1",
+            "J\t1\t>\t2\t<\t10\t*",
+            "X\tunknown",
+            "Sx\t1\tACGT",
+            "L1\t1\t+\t2\t+\t4M",
+        ):
+            with self.subTest(line=line):
+                self.assertIsNone(records.parse_record(line))
+
+
+class TestFastParser(unittest.TestCase):
+    def test_same_graph_as_lark(self):
+        """The fast engine must build the same graph as the strict one."""
+        for gfa_file in (
+            "data/example_1.gfa",
+            "data/example_2.gfa",
+            "data/example_3.gfa",
+            "data/example_4.gfa",
+            "data/sample1.gfa",
+            "data/test_walks.gfa",
+        ):
+            with self.subTest(gfa_file=gfa_file):
+                fast = GFA.from_gfa(gfa_file)
+                strict = GFA.from_gfa(gfa_file, strict=True)
+                self.assertEqual(_graph_content(fast), _graph_content(strict))
+
+    def test_fallback_to_lark(self):
+        """Lines rejected by the fast parser are handed to the Lark grammar."""
+        graph = GFA()
+        with self.assertLogs("pygfa.gfa.parser", level="WARNING") as logs:
+            graph.from_string("S\t1\tACGT\nJ\t1\t>\t2\t<\t10\t1.0\nS\t2\tAC GT\nSx\t3\tACGT\n")
+        self.assertEqual(list(graph.nodes()), ["1"])
+        self.assertTrue(any("Failed to parse line 3" in message for message in logs.output))
+        self.assertTrue(any("Failed to parse line 4" in message for message in logs.output))
+
+    def test_strict_walk_orientation_chars(self):
+        """The LALR grammar doesn't take `<` and `>` as part of walk segment names."""
+        graph = GFA()
+        graph.from_string("W\tHG1\t1\tchr1\t*\t*\t>s1<s2>s3\n", strict=True)
+        walk = graph.walks("HG1_1_chr1")
+        self.assertEqual(walk["walk"], "s1+s2-s3+")
+        self.assertIsNone(walk["seq_start"])
+
+
+class TestProjection(unittest.TestCase):
+    def test_include_record_types(self):
+        full = GFA.from_gfa("data/example_3.gfa")
+        topology = GFA.from_gfa("data/example_3.gfa", include={"S", "L"})
+        self.assertEqual(list(topology.nodes(data=True)), list(full.nodes(data=True)))
+        self.assertEqual(
+            list(topology._graph.edges(keys=True, data=True)), list(full._graph.edges(keys=True, data=True))
+        )
+        self.assertEqual(len(topology.paths()), 0)
+        self.assertGreater(len(full.paths()), 0)
+
+    def test_without_sequences(self):
+        full = GFA.from_gfa("data/example_3.gfa")
+        for strict in (False, True):
+            with self.subTest(strict=strict):
+                lengths = GFA.from_gfa("data/example_3.gfa", strict=strict, load_sequences=False)
+                self.assertEqual(len(lengths.nodes()), 3)
+                for node_id, data in lengths.nodes(data=True):
+                    self.assertEqual(data["sequence"], "*")
+                    self.assertEqual(data["slen"], full.nodes(identifier=node_id)["slen"])
+
+    def test_parallel_projection(self):
+        serial = GFA.from_gfa("data/example_2.gfa", include="SL", load_sequences=False)
+        parallel = GFA.from_gfa("data/example_2.gfa", workers=2, include="SL", load_sequences=False)
+        self.assertEqual(_graph_content(parallel), _graph_content(serial))
+
+
+class TestZeroCopy(unittest.TestCase):
+    def test_line_spans(self):
+        data = b"S\ts1\tACGT\tLN:i:4\r\n  \nL\t1\t+\t2\t-\t*\n#c\nS\tlast\tGG"
+        expected = [b"S\ts1\tACGT\tLN:i:4", b"", b"L\t1\t+\t2\t-\t*", b"#c", b"S\tlast\tGG"]
+        for buffer_size in (3, 7, 1024):
+            with self.subTest(buffer_size=buffer_size):
+                spans = records.iter_line_spans(io.BytesIO(data), buffer_size)
+                self.assertEqual([buffer[start:end] for buffer, start, end in spans], expected)
+
+    def test_parse_segment_span(self):
+        buffer = b"xxS\ts1\tACGT\tLN:i:4yy"
+        self.assertEqual(
+            records.parse_segment_span(buffer, 2, len(buffer) - 2),
+            records.SegmentRecord("s1", b"ACGT", {"LN": 4}),
+        )
+        self.assertIsNone(records.parse_segment_span(b"S\ts1\tAC GT", 0, 11))
+
+    def test_same_graph_as_text_reader(self):
+        for gfa_file in ("data/example_1.gfa", "data/example_3.gfa", "data/sample1.gfa", "data/test_walks.gfa"):
+            with self.subTest(gfa_file=gfa_file):
+                text = GFA.from_gfa(gfa_file)
+                zero_copy = GFA.from_gfa(gfa_file, zero_copy=True)
+                self.assertEqual(_graph_content(zero_copy), _graph_content(text))
+        graph = GFA.from_gfa("data/example_3.gfa", zero_copy=True)
+        self.assertEqual(dict.__getitem__(graph._graph.nodes["11"], "sequence").data, b"ACCTT")
+        self.assertEqual(graph.nodes(identifier="11")["sequence"], "ACCTT")
+
+
+class TestGrammarCache(unittest.TestCase):
+    def test_cache_path_is_keyed_by_grammar(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with unittest.mock.patch.dict(os.environ, {"PYGFA_CACHE_DIR": cache_dir}):
+                first = gfa_parser._grammar_cache_path('start: A\nA: "a"')
+                second = gfa_parser._grammar_cache_path('start: B\nB: "b"')
+            self.assertEqual(os.path.dirname(first), cache_dir)
+            self.assertNotEqual(first, second)
+
+
+class TestIterRecords(unittest.TestCase):
+    def test_records_in_file_order(self):
+        kinds = [type(record).__name__ for record in iter_records("data/example_3.gfa")]
+        self.assertEqual(
+            kinds,
+            ["HeaderRecord"] + ["SegmentRecord"] * 3 + ["LinkRecord"] * 2 + ["PathRecord"],
+        )
+
+    def test_types_filter(self):
+        found = list(iter_records("data/example_3.gfa", types="SP"))
+        self.assertEqual([record.name for record in found[:3]], ["11", "12", "13"])
+        self.assertEqual(found[3], records.PathRecord("14", ["11+", "12-"], None, {}))
+
+    def test_compressed_file_and_rejected_lines(self):
+        os.makedirs("results/test", exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".gfa.gz", dir="results/test")
+        os.close(fd)
+        try:
+            with gzip.open(path, "wt") as f:
+                f.write("S\t1\tACGT\nS\t2\tAC GT\nJ\t1\t>\t2\t<\t10\t*\n")
+            with self.assertLogs("pygfa.io", level="DEBUG") as logs:
+                found = list(iter_records(path))
+            self.assertEqual(found, [records.SegmentRecord("1", "ACGT", {})])
+            # The malformed segment is a warning, the unsupported J line is not
+            self.assertEqual([record.levelname for record in logs.records], ["WARNING", "DEBUG"])
+            self.assertIn("line 2", logs.output[0])
+            with self.assertRaisesRegex(FileFormatError, "line 2"):
+                list(iter_records(path, strict=True))
+            self.assertEqual(len(list(iter_records(path, types="J", strict=True))), 0)
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa import operations
+from pygfa.algorithms.simple_paths import all_simple_paths
+from pygfa.algorithms.traversal import dfs_edges
+from pygfa.exceptions import FrozenGraphError
+from pygfa.gfa import GFA
+from pygfa.gfa.frozen import CSRGraph
+from pygfa.graph_element import node
+
+
+class TestFrozenGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA.from_gfa("data/example_1.gfa")
+        self.frozen = self.graph.freeze()
+
+    def test_backend(self):
+        self.assertTrue(self.frozen.is_frozen)
+        self.assertFalse(self.graph.is_frozen)
+        self.assertIsInstance(self.frozen._graph, CSRGraph)
+        self.assertIs(self.frozen.freeze(), self.frozen)
+
+    def test_same_content(self):
+        self.assertEqual(list(self.frozen.nodes(data=True)), list(self.graph.nodes(data=True)))
+        self.assertEqual(
+            list(self.frozen.edges(data=True, keys=True)),
+            list(self.graph.edges(data=True, keys=True)),
+        )
+        self.assertEqual(self.frozen.nodes(identifier="11"), self.graph.nodes(identifier="11"))
+        self.assertEqual(self.frozen.edges(identifier="virtual_13"), self.graph.edges(identifier="virtual_13"))
+        self.assertEqual(self.frozen.edges(identifier=("2", "5")), self.graph.edges(identifier=("2", "5")))
+        self.assertEqual(self.frozen.to_gfa(), self.graph.to_gfa())
+        self.assertEqual(len(self.frozen), len(self.graph))
+
+    def test_queries(self):
+        for nid in self.graph.nodes():
+            self.assertEqual(self.frozen.neighbors(nid), self.graph.neighbors(nid))
+        comparator = lambda data: data["from_orn"] == "-"  # noqa: E731
+        self.assertEqual(self.frozen.search(comparator), self.graph.search(comparator))
+        self.assertEqual(
+            sorted(key for _u, _v, key in self.frozen.subgraph(["2", "5", "8"]).edges(keys=True)),
+            sorted(key for _u, _v, key in self.graph.subgraph(["2", "5", "8"]).edges(keys=True)),
+        )
+
+    def test_algorithms(self):
+        self.assertEqual(
+            list(operations.nodes_connected_components(self.frozen)),
+            list(operations.nodes_connected_components(self.graph)),
+        )
+        self.assertEqual(
+            list(dfs_edges(self.frozen, self.frozen._graph.edges, "1", keys=True)),
+            list(dfs_edges(self.graph, self.graph._graph.edges, "1", keys=True)),
+        )
+        self.assertEqual(
+            list(all_simple_paths(self.frozen, "1", "5", self.frozen._graph.edges, edges=True)),
+            list(all_simple_paths(self.graph, "1", "5", self.graph._graph.edges, edges=True)),
+        )
+
+    def test_read_only(self):
+        with self.assertRaises(FrozenGraphError):
+            self.frozen.add_node(node.Node("new", "ACGT", 4))
+        with self.assertRaises(FrozenGraphError):
+            self.frozen.remove_node("1")
+        with self.assertRaises(FrozenGraphError):
+            self.frozen.remove_edge("virtual_0")
+        self.assertIn("1", self.frozen)
+
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.frozen))
+        self.assertTrue(restored.is_frozen)
+        self.assertEqual(restored.to_gfa(), self.graph.to_gfa())
+
+    def test_from_bgfa_backend(self):
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            path = os.path.join(tmpdir, "example_1.bgfa")
+            self.graph.to_bgfa(path, block_size=1024)
+            frozen = GFA.from_bgfa(path, backend="csr")
+            self.assertTrue(frozen.is_frozen)
+            self.assertEqual(frozen.to_gfa(), GFA.from_bgfa(path).to_gfa())
+            with self.assertRaises(ValueError):
+                GFA.from_bgfa(path, backend="igraph")
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
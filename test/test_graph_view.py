@@ -0,0 +1,111 @@
+import copy
+import sys
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import FrozenGraphError, InvalidElementError
+from pygfa.gfa import GFA, GFAView
+from pygfa.graph_element import node
+from pygfa.graph_element import subgraph as sg
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT\tRC:i:4",
+        "S\t2\t*\tLN:i:10",
+        "S\t3\tGGtt",
+        "S\t4\tTT",
+        "L\t1\t+\t2\t-\t2M",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "L\t3\t-\t1\t-\t1M",
+        "L\t3\t+\t4\t+\t0M",
+        "P\tp1\t1+,2-,3+\t2M,*",
+        "P\tp2\t3+,4+\t0M",
+        "W\tsample\t0\tchr1\t0\t8\t>1<2>3",
+    ]
+)
+
+
+class TestGraphView(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def check_view(self, parent):
+        view = parent.subgraph_view(["1", "2", "3"])
+        self.assertIsInstance(view, GFAView)
+        self.assertEqual(list(view.nodes()), ["1", "2", "3"])
+        self.assertEqual(len(view.edges()), 3)
+        self.assertEqual(sorted(view.neighbors("3")), ["1", "2"])
+        self.assertEqual(set(view._get_edge_end_nodes("named")), {"2", "3"})
+        self.assertEqual(view.nodes(identifier="3")["sequence"], "GGtt")
+        self.assertEqual(sorted(view.paths()), ["p1"])
+        self.assertEqual(len(view.walks()), 1)
+        self.assertIsNone(view.nodes(identifier="4"))
+
+        expected = GFA()
+        expected.from_string(GFA_TEXT)
+        expected.remove_node("4")
+        expected.remove_path("p2")
+        self.assertEqual(view.to_gfa(), expected.to_gfa())
+        self.assertEqual(view.freeze().to_gfa(), expected.to_gfa())
+
+    def test_view(self):
+        self.check_view(self.graph)
+
+    def test_frozen_view(self):
+        self.check_view(self.graph.freeze())
+
+    def test_view_follows_parent(self):
+        view = self.graph.subgraph_view(["1", "2"])
+        self.graph.remove_edge("named")
+        self.graph.remove_node("2")
+        self.assertEqual(list(view.nodes()), ["1"])
+        self.assertEqual(len(view.edges()), 0)
+
+    def test_view_used_before_parent_changes(self):
+        view = self.graph.subgraph_view(["1", "2"])
+        self.assertEqual(len(view.edges()), 1)
+        self.assertEqual(view.query("slen > 0"), ["1", "2"])
+        self.graph.remove_node("2")
+        self.assertEqual(list(view.nodes()), ["1"])
+        self.assertEqual(len(view._graph), 1)
+        self.assertEqual(len(view.edges()), 0)
+        self.assertEqual(view.query("slen > 0"), ["1"])
+        self.assertNotIn("S\t2", view.to_gfa())
+        self.assertIn("S\t1", view.to_gfa())
+
+    def test_read_only(self):
+        view = self.graph.subgraph_view(["1", "2"])
+        with self.assertRaises(FrozenGraphError):
+            view.add_node(node.Node("5", "A", 1))
+        with self.assertRaises(FrozenGraphError):
+            view.remove_node("1")
+        with self.assertRaises(FrozenGraphError):
+            view._graph.add_node("5")
+
+    def test_materialize(self):
+        view = self.graph.subgraph_view(["3", "4"])
+        copied = view.materialize()
+        self.assertNotIsInstance(copied, GFAView)
+        self.assertEqual(copied.to_gfa(), view.to_gfa())
+        copied.remove_node("4")
+        self.assertIsNotNone(self.graph.nodes(identifier="4"))
+        self.assertEqual(copy.deepcopy(view).to_gfa(), view.to_gfa())
+
+    def test_get_subgraph(self):
+        self.graph.add_subgraph(sg.Subgraph("sub", {"1": "+", "named": None, "p2": None}))
+        for copied in (True, False):
+            subgraph = self.graph.get_subgraph("sub", copy=copied)
+            self.assertEqual(isinstance(subgraph, GFAView), not copied)
+            self.assertEqual(sorted(subgraph.nodes()), ["1", "2", "3"])
+            self.assertEqual(len(subgraph.edges()), 1)
+            self.assertEqual(list(subgraph.paths()), ["p2"])
+        self.graph.add_subgraph(sg.Subgraph("missing", {"9": "+"}))
+        with self.assertRaises(InvalidElementError):
+            self.graph.get_subgraph("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import pickle
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.algorithms.simple_paths import all_simple_paths
+from pygfa.algorithms.traversal import dfs_edges
+from pygfa.exceptions import GFAError
+from pygfa.gfa import GFA
+from pygfa.gfa.handles import HandleIndex
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tA",
+        "S\t2\tC",
+        "S\t3\tG",
+        "S\t4\tT",
+        "L\t1\t+\t2\t+\t0M",
+        "L\t1\t+\t3\t-\t0M",
+        "L\t2\t+\t4\t+\t0M",
+        "L\t4\t-\t3\t-\t0M",
+        "L\t3\t+\t3\t-\t0M",
+    ]
+)
+
+
+class TestHandleIndex(unittest.TestCase):
+    def test_adjacency(self):
+        # a+ -> b-, b+ -> b- (its own reverse), an edge without orientations
+        index = HandleIndex(["a", "b"], ["e0", "e1", "e2"], np.array([0, 2, -1]), np.array([3, 3, -1]))
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.successors(0).tolist(), [3])
+        self.assertEqual(sorted(index.successors(2).tolist()), [1, 3])
+        self.assertEqual(sorted(index.predecessors(3).tolist()), [0, 2])
+        self.assertEqual(index.predecessors(1).tolist(), [2])
+        self.assertEqual(sorted(index.out_edges(2, keys=True)), [(2, 1, "e0"), (2, 3, "e1")])
+        self.assertEqual(index.handle("b", "-"), 3)
+        self.assertEqual(index.oriented_segment(1), ("a", "-"))
+        self.assertIn(3, index)
+        self.assertNotIn(4, index)
+        self.assertNotIn("a", index)
+
+
+class TestGraphHandles(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def oriented(self, graph, handles):
+        return ["".join(graph.handle_name(handle)) for handle in handles]
+
+    def check_handles(self, graph):
+        self.assertEqual(self.oriented(graph, graph.successors(graph.handle("1"))), ["2+", "3-"])
+        self.assertEqual(self.oriented(graph, graph.successors(graph.handle("3", "+"))), ["3-", "1-", "4+"])
+        self.assertEqual(self.oriented(graph, graph.predecessors(graph.handle("3", "-"))), ["3+", "1+", "4-"])
+        self.assertEqual(graph.successors(graph.handle("1", "-")), [])
+        source, target = graph.handle("1"), graph.handle("4")
+        paths = [self.oriented(graph, path) for path in all_simple_paths(graph, source, target)]
+        self.assertEqual(paths, [["1+", "2+", "4+"]])
+        self.assertEqual(list(all_simple_paths(graph, target, source)), [])
+        tree = list(dfs_edges(graph, source=source, keys=True))
+        self.assertEqual([(self.oriented(graph, edge[:2]), edge[2]) for edge in tree][0], (["1+", "2+"], "virtual_0"))
+        self.assertEqual(len(tree), 3)
+
+    def test_networkx(self):
+        self.check_handles(self.graph)
+
+    def test_frozen(self):
+        self.check_handles(self.graph.freeze())
+        self.check_handles(pickle.loads(pickle.dumps(self.graph.freeze())))
+
+    def test_view(self):
+        view = self.graph.subgraph_view(["1", "2", "3"])
+        self.assertEqual(self.oriented(view, view.successors(view.handle("1"))), ["2+", "3-"])
+        self.assertEqual(view.successors(view.handle("2")), [])
+
+    def test_invalidation(self):
+        self.assertEqual(self.graph.successors(self.graph.handle("4")), [])
+        self.graph.add_edge("L\t4\t+\t1\t-\t0M")
+        self.assertEqual(self.oriented(self.graph, self.graph.successors(self.graph.handle("4"))), ["1-"])
+
+    def test_invalid(self):
+        with self.assertRaises(GFAError):
+            self.graph.handle("5")
+        with self.assertRaises(GFAError):
+            self.graph.handle("1", "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import os
+import pickle
+import random
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa import io
+from pygfa.exceptions import FileFormatError, InvalidSearchParameters
+from pygfa.gfa import GFA
+from pygfa.gfa.kmers import (
+    KmerHit,
+    KmerIndex,
+    encode_bases,
+    kmer_values,
+    reverse_complement,
+    select_minimizers,
+)
+
+SEQUENCES = {
+    "1": "ACGTTGCAAGGCTTAC",
+    "2": "TTAGCCGATCGGATCA",
+    "3": "GATTACAGATTACA",
+    "4": "CCN",
+}
+# The first 3 bases of 2- are the last ones of 1+
+SEQUENCES["2"] = reverse_complement("TAC" + reverse_complement(SEQUENCES["2"])[3:])
+
+GFA_TEXT = "\n".join(
+    ["H\tVN:Z:1.0"]
+    + [f"S\t{name}\t{sequence}" for name, sequence in SEQUENCES.items()]
+    + ["S\t5\t*", "L\t1\t+\t2\t-\t3M", "L\t2\t-\t3\t+\t0M", "L\t3\t+\t5\t+\t0M"]
+)
+
+
+def oriented(segment, orientation):
+    sequence = SEQUENCES[segment]
+    return sequence if orientation == "+" else reverse_complement(sequence)
+
+
+class TestKmers(unittest.TestCase):
+    def test_kmer_values(self):
+        values, valid = kmer_values(encode_bases("ACGTNa"), 3)
+        self.assertEqual(values.tolist(), [0b000110, 0b011011, 0b101100, 0b110000])
+        self.assertEqual(valid.tolist(), [True, True, False, False])
+        self.assertEqual(len(kmer_values(encode_bases("AC"), 3)[0]), 0)
+
+    def test_select_minimizers(self):
+        values = np.array([5, 3, 9, 3, 7, 1, 8], dtype=np.uint64)
+        valid = np.ones(7, dtype=bool)
+        self.assertTrue(select_minimizers(values, valid, 1).all())
+        selected = select_minimizers(values, valid, 3)
+        # Every window of 3 has a selected k-mer, equal ones are all selected
+        for start in range(5):
+            self.assertTrue(selected[start : start + 3].any())
+        self.assertEqual(selected[1], selected[3])
+        self.assertFalse(select_minimizers(values, np.zeros(7, dtype=bool), 3).any())
+
+    def test_build(self):
+        index = KmerIndex.build(["a", "b"], ["ACGTA", None], [(0, "+", 1, "+", "0M")], k=3)
+        self.assertEqual(len(index), 6)
+        self.assertTrue(np.all(np.diff(index.values.astype(np.float64)) >= 0))
+        with self.assertRaises(InvalidSearchParameters):
+            KmerIndex.build([], [], [], k=33)
+        with self.assertRaises(InvalidSearchParameters):
+            KmerIndex.build([], [], [], window=0)
+
+
+class TestFindSequence(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def check_hits(self, graph, query, k, window=1):
+        """Check the hits of a query, returning the query offsets found."""
+        hits = graph.find_sequence(query, k=k, window=window)
+        for hit in hits:
+            kmer = query[hit.query_offset : hit.query_offset + k]
+            self.assertTrue(kmer.startswith(oriented(hit.segment, hit.orientation)[hit.offset : hit.offset + k]))
+        return {hit.query_offset for hit in hits}
+
+    def check_graph(self, graph):
+        spelled = oriented("1", "+") + oriented("2", "-")[3:] + oriented("3", "+")
+        for k in (3, 5, 8):
+            for query in (spelled[5:30], reverse_complement(spelled[5:30])):
+                self.assertEqual(self.check_hits(graph, query, k), set(range(len(query) - k + 1)))
+                for window in (2, 4):
+                    values, valid = kmer_values(encode_bases(query), k)
+                    minimizers = set(np.flatnonzero(select_minimizers(values, valid, window)).tolist())
+                    self.assertTrue(minimizers <= self.check_hits(graph, query, k, window))
+        self.assertEqual(graph.find_sequence("GCAAG", k=5), [KmerHit(0, "1", "+", 5)])
+        self.assertEqual(graph.find_sequence("CTTGC", k=5), [KmerHit(0, "1", "-", 6)])
+        self.assertEqual(graph.find_sequence("CCN", k=3), [])
+        self.assertEqual(graph.find_sequence("AC", k=3), [])
+
+    def test_networkx(self):
+        self.check_graph(self.graph)
+
+    def test_frozen(self):
+        frozen = self.graph.freeze()
+        self.check_graph(frozen)
+        self.check_graph(pickle.loads(pickle.dumps(frozen)))
+
+    def test_random(self):
+        rng = random.Random(3)
+        for _ in range(10):
+            sequences = ["".join(rng.choice("ACGT") for _ in range(rng.randint(5, 30))) for _ in range(4)]
+            links = [(rng.randrange(4), rng.choice("+-"), rng.randrange(4), rng.choice("+-"), "0M") for _ in range(4)]
+            index = KmerIndex.build(list("abcd"), sequences, links, k=5, window=3)
+            a, a_orn, b, b_orn, _ = links[0]
+            first = sequences[a] if a_orn == "+" else reverse_complement(sequences[a])
+            second = sequences[b] if b_orn == "+" else reverse_complement(sequences[b])
+            for query in (first + second, reverse_complement(first + second)):
+                values, valid = kmer_values(encode_bases(query), 5)
+                minimizers = set(np.flatnonzero(select_minimizers(values, valid, 3)).tolist())
+                self.assertTrue(minimizers <= {hit.query_offset for hit in index.find(query)})
+
+    def test_invalidation(self):
+        self.assertEqual(self.graph.find_sequence("GATTA", k=5)[0].segment, "3")
+        self.graph.add_node("S\t6\tGGGGGG")
+        self.assertEqual(self.graph.find_sequence("GGGGG", k=5), [KmerHit(0, "6", "+", 0), KmerHit(0, "6", "+", 1)])
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(io.kmer_index_path(os.path.join(tmp, "graph.bgfa"), 5))
+            self.assertTrue(path.endswith("graph.bgfa.k5.w1.kmers"))
+            index = self.graph.kmer_index(5, path=path)
+            self.assertTrue(os.path.exists(path))
+            loaded = KmerIndex.load(path)
+            self.assertFalse(loaded.values.flags.writeable)
+            self.assertEqual(loaded.values.tolist(), index.values.tolist())
+            self.assertEqual(loaded.find("GCAAG"), index.find("GCAAG"))
+            # Loaded by another graph, rebuilt if the graph changed
+            other = GFA()
+            other.from_string(GFA_TEXT)
+            self.assertEqual(other.kmer_index(5, path=path).values.tolist(), index.values.tolist())
+            other.add_node("S\t6\tGGGGGG")
+            self.assertEqual(len(other.kmer_index(5, path=path).find("GGGGG")), 2)
+            self.assertEqual(len(KmerIndex.load(path).find("GGGGG")), 2)
+            # Same counts and total length, other sequence or link
+            changed_sequence = GFA_TEXT.replace(SEQUENCES["3"], "GGGGGGGGGGGGGG")
+            changed_link = GFA_TEXT.replace("L\t2\t-\t3\t+\t0M", "L\t2\t-\t3\t-\t0M")
+            for text in (GFA_TEXT, changed_sequence, changed_link):
+                other, fresh = GFA(), GFA()
+                other.from_string(text)
+                fresh.from_string(text)
+                expected = fresh.kmer_index(5)
+                self.assertEqual(other.kmer_index(5, path=path).values.tolist(), expected.values.tolist())
+                self.assertEqual(KmerIndex.load(path).values.tolist(), expected.values.tolist())
+            # An index built without path is still saved when asked
+            other_path = os.path.join(tmp, "other.kmers")
+            self.graph.kmer_index(7)
+            self.graph.kmer_index(7, path=other_path)
+            self.assertTrue(os.path.exists(other_path))
+            self.graph.save_snapshot(os.path.join(tmp, "graph.snapshot"))
+            with self.assertRaises(FileFormatError):
+                KmerIndex.load(os.path.join(tmp, "graph.snapshot"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import gzip
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import FileFormatError
+from pygfa.gfa import GFA
+from pygfa.gfa.lazy import DeferredSequence, LazyAttrDict
+
+
+class TestLazySequences(unittest.TestCase):
+    def setUp(self):
+        self.eager = GFA.from_gfa("data/example_3.gfa")
+        self.lazy = GFA.from_gfa("data/example_3.gfa", lazy_sequences=True)
+
+    def test_sequences_are_deferred(self):
+        raw = dict.__getitem__(self.lazy._graph.nodes["11"], "sequence")
+        self.assertIsInstance(raw, DeferredSequence)
+        self.assertIsInstance(self.lazy._graph.nodes["11"], LazyAttrDict)
+        self.assertEqual(self.lazy.nodes(identifier="11")["sequence"], "ACCTT")
+
+    def test_same_content_as_eager(self):
+        self.assertEqual(list(self.lazy.nodes(data=True)), list(self.eager.nodes(data=True)))
+        self.assertEqual(self.lazy.to_gfa(), self.eager.to_gfa())
+        self.assertEqual(self.lazy.as_graph_element("12"), self.eager.as_graph_element("12"))
+
+    def test_lru_cache(self):
+        raw = dict.__getitem__(self.lazy._graph.nodes["13"], "sequence")
+        raw.source.fetch.cache_clear()
+        for _ in range(3):
+            self.assertEqual(self.lazy.nodes(identifier="13")["sequence"], "CTTGATT")
+        info = raw.source.fetch.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.lazy))
+        self.assertIsInstance(dict.__getitem__(restored._graph.nodes["11"], "sequence"), DeferredSequence)
+        self.assertEqual(list(restored.nodes(data=True)), list(self.eager.nodes(data=True)))
+
+    def test_compressed_file(self):
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            path = os.path.join(tmpdir, "example_3.gfa.gz")
+            with open("data/example_3.gfa", "rb") as src, gzip.open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            with self.assertRaises(FileFormatError):
+                GFA.from_gfa(path, lazy_sequences=True)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import GFAError
+from pygfa.gfa import GFA
+from pygfa.gfa.coordinates import CoordinateIndex, overlap_length
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.2",
+        "S\t1\tACGT",
+        "S\t2\tGG",
+        "S\t3\t*\tLN:i:5",
+        "S\t4\tAAA",
+        "S\t5\t*",
+        "L\t1\t+\t2\t-\t1M",
+        "L\t2\t-\t3\t+\t0M",
+        "L\t4\t+\t1\t+\t0M",
+        "P\tp1\t1+,2-,3+\t1M,*",
+        "P\tp2\t5+,4+\t*",
+        "W\ts\t1\tchr1\t5\t11\t>1<2",
+        "W\ts\t2\tchr1\t0\t7\t>4>1",
+    ]
+)
+
+
+class TestCoordinateIndex(unittest.TestCase):
+    def test_overlap_length(self):
+        self.assertEqual(overlap_length("10M"), 10)
+        self.assertEqual(overlap_length("3M2I1D2="), 6)
+        self.assertEqual(overlap_length("*"), 0)
+        self.assertEqual(overlap_length(None), 0)
+
+    def test_locate(self):
+        lengths = np.array([4, 2, 5, 0])
+        index = CoordinateIndex(np.array([0, 3, 1, 2]), np.array([False, False, True, False]), lengths, origin=10)
+        self.assertEqual(index.starts.tolist(), [10, 14, 14, 16])
+        self.assertEqual(index.end, 21)
+        steps, offsets = index.locate([9, 10, 13, 14, 15, 16, 20, 21])
+        self.assertEqual(steps.tolist(), [-1, 0, 0, 2, 2, 3, 3, -1])
+        self.assertEqual(offsets.tolist(), [-1, 0, 3, 0, 1, 0, 4, -1])
+        self.assertEqual(index.segment_offsets(steps, offsets).tolist(), [-1, 0, 3, 1, 0, 0, 4, -1])
+        self.assertEqual(index.step_range(12, 15), (0, 3))
+        self.assertEqual(index.step_range(21, 30), (4, 4))
+
+    def test_overlaps(self):
+        lengths = np.array([4, 2, 5])
+        index = CoordinateIndex(np.array([0, 1, 2]), np.zeros(3, dtype=bool), lengths, overlaps=["1M", "9M"])
+        # An overlap longer than a segment is cut to its length
+        self.assertEqual(index.starts.tolist(), [0, 3, 3])
+        self.assertEqual(index.ends.tolist(), [4, 5, 8])
+        ignored = CoordinateIndex(np.array([0, 1, 2]), np.zeros(3, dtype=bool), lengths, overlaps=["*"])
+        self.assertEqual(ignored.starts.tolist(), [0, 4, 6])
+
+    def test_empty(self):
+        index = CoordinateIndex(np.zeros(0, dtype=np.int32), np.zeros(0, dtype=bool), np.zeros(0))
+        self.assertEqual(index.end, 0)
+        self.assertEqual([array.tolist() for array in index.locate(0)], [[-1], [-1]])
+
+
+class TestGraphCoordinates(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+        self.walks = sorted(self.graph.walks())
+
+    def check_coordinates(self, graph):
+        self.assertEqual(graph.coordinate_index("p1").starts.tolist(), [0, 3, 5])
+        self.assertEqual(graph.coordinate_index("p1").end, 10)
+        located = graph.locate("p1", [0, 3, 4, 5, 9, 10])
+        self.assertEqual(located, [("1", "+", 0), ("2", "-", 1), ("2", "-", 0), ("3", "+", 0), ("3", "+", 4), None])
+        self.assertEqual(graph.locate("p2", [0, 2, 3]), [("4", "+", 0), ("4", "+", 2), None])
+        self.assertEqual(graph.locate(self.walks[0], [4, 5, 10]), [None, ("1", "+", 0), ("2", "-", 0)])
+        self.assertEqual(sorted(graph.region("p1", 4, 6).nodes()), ["2", "3"])
+        self.assertEqual(sorted(graph.region("chr1", 3, 6).nodes()), ["1"])
+        self.assertEqual(sorted(graph.region("chr1", 0, 10).nodes()), ["1", "2", "4"])
+        self.assertEqual(list(graph.region("p1", 10, 20).nodes()), [])
+
+    def test_networkx(self):
+        self.check_coordinates(self.graph)
+
+    def test_frozen(self):
+        frozen = self.graph.freeze()
+        self.check_coordinates(frozen)
+        self.check_coordinates(pickle.loads(pickle.dumps(frozen)))
+
+    def test_region_view(self):
+        view = self.graph.region("p1", 0, 4)
+        self.assertEqual(sorted(view.nodes()), ["1", "2"])
+        self.assertEqual(len(view.edges()), 1)
+        self.assertEqual(sorted(view.materialize().nodes()), ["1", "2"])
+
+    def test_updates(self):
+        self.assertEqual(self.graph.coordinate_index("p1").end, 10)
+        self.graph.remove_path("p1")
+        self.graph.add_path("P\tp1\t3+,1+\t*")
+        self.assertEqual(self.graph.locate("p1", [5]), [("1", "+", 0)])
+        self.graph.add_node("S\t6\tACGTACGT")
+        self.graph.add_path("P\tp3\t6-,4+\t*")
+        self.assertEqual(self.graph.locate("p3", [0, 8]), [("6", "-", 7), ("4", "+", 0)])
+
+    def test_without_sequences(self):
+        """1 bp segments keep their length when loaded without sequences."""
+        os.makedirs("results/test", exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".gfa", dir="results/test")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("H\tVN:Z:1.0\nS\t1\tA\nS\t2\tCG\nS\t3\t*\nP\tp1\t1+,3+,2+\t*\n")
+            for graph in (GFA.from_gfa(path, load_sequences=False), GFA.from_gfa(path, zero_copy=True)):
+                self.assertEqual(graph.nodes(identifier="3")["slen"], None)
+                self.assertEqual(graph.coordinate_index("p1").starts.tolist(), [0, 1, 1])
+                self.assertEqual(graph.locate("p1", [0, 1, 2]), [("1", "+", 0), ("2", "+", 0), ("2", "+", 1)])
+                self.assertEqual(graph.freeze().coordinate_index("p1").end, 3)
+        finally:
+            os.unlink(path)
+
+    def test_invalid(self):
+        with self.assertRaises(GFAError):
+            self.graph.coordinate_index("unknown")
+        with self.assertRaises(GFAError):
+            self.graph.region("chr2", 0, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.gfa import GFA
+from pygfa.gfa.steps import PathSegments, WalkSteps
+
+
+class TestPathStorage(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA.from_gfa("data/test_walks.gfa")
+
+    def test_paths_are_encoded(self):
+        raw = dict.__getitem__(self.graph.paths("x"), "segments")
+        self.assertIsInstance(raw, PathSegments)
+        self.assertEqual(raw.ids.dtype.name, "int32")
+        self.assertEqual(self.graph.paths("x")["segments"], ["1+", "2+", "3+"])
+        self.assertEqual([self.graph._segment_names[seg_id] for seg_id in raw.ids], ["1", "2", "3"])
+
+    def test_walks_are_encoded(self):
+        walk = self.graph.walks("sample2_1_seqB")
+        raw = dict.__getitem__(walk, "walk")
+        self.assertIsInstance(raw, WalkSteps)
+        self.assertEqual(raw.orientations().tolist(), [True, False, False])
+        self.assertEqual(walk["walk"], "1-2+3+")
+        self.assertEqual(raw.steps(), [("1", "-"), ("2", "+"), ("3", "+")])
+
+    def test_walk_notation_is_kept(self):
+        self.graph.add_walk("W\tsample3\t0\tseqC\t*\t*\t>2<1>new")
+        self.assertEqual(self.graph.walks("sample3_0_seqC")["walk"], ">2<1>new")
+        self.assertEqual(self.graph._segment_names[-1], "new")
+
+    def test_unencodable_values_are_kept(self):
+        self.graph.add_path({"path_name": "odd", "segments": ["1+", "2"]})
+        self.graph.add_walk({"sample_id": "s", "hapindex": 0, "seq_id": "c", "walk": ""})
+        self.assertEqual(dict.__getitem__(self.graph.paths("odd"), "segments"), ["1+", "2"])
+        self.assertEqual(self.graph.walks("s_0_c")["walk"], "")
+
+    def test_text_and_pickle_roundtrip(self):
+        text = self.graph.to_gfa()
+        self.assertEqual(text, GFA.from_gfa("data/test_walks.gfa", strict=True).to_gfa())
+        self.assertEqual(pickle.loads(pickle.dumps(self.graph)).to_gfa(), text)
+
+    def test_bgfa_roundtrip(self):
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            path = os.path.join(tmpdir, "test_walks.bgfa")
+            self.graph.to_bgfa(path, block_size=1024)
+            restored = GFA.from_bgfa(path)
+            self.assertEqual(restored.walks(), self.graph.walks())
+            self.assertEqual(restored.paths("x")["segments"], self.graph.paths("x")["segments"])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_clear_keeps_frozen_copy(self):
+        frozen = self.graph.freeze()
+        self.graph.clear()
+        self.assertEqual(self.graph._segment_names, [])
+        self.assertEqual(frozen.walks("sample1_0_seqA")["walk"], "1+2+3+")
+
+
+if __name__ == "__main__":
+    unittest.main()
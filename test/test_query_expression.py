@@ -0,0 +1,126 @@
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import InvalidSearchParameters
+from pygfa.gfa import GFA, Element
+from pygfa.gfa.expression import QueryExpression, masked_column
+from pygfa.graph_element import node
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGGt\tSN:Z:chr1\tRC:i:4",
+        "S\t2\t*\tLN:i:10\tSN:Z:chr2",
+        "S\t3\tGGTTA\tSN:Z:chr1\tRC:f:2.5",
+        "S\t4\tTT\tRC:Z:x",
+        "L\t1\t+\t2\t-\t2M\tKC:i:7",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "L\t3\t-\t1\t-\t1M",
+        "L\t4\t+\t4\t-\t1M",
+    ]
+)
+
+
+class TestQueryExpression(unittest.TestCase):
+    def test_masked_column(self):
+        column = masked_column([1, None, 3])
+        self.assertEqual(column.dtype, np.int64)
+        self.assertEqual(column.tolist(), [1, None, 3])
+        self.assertEqual(masked_column([1, 2.5]).dtype, np.float64)
+        self.assertEqual(masked_column([True, None]).dtype, bool)
+        self.assertEqual(masked_column(["a", 1, 2**70]).dtype, object)
+
+    def test_evaluate(self):
+        columns = {
+            "a": masked_column([1, 5, None, 10]),
+            "b": masked_column(["x", None, "y", 3]),
+        }
+        expression = QueryExpression("a > 2 & b == 'y' | a == 1")
+        self.assertEqual(expression.columns, ("a", "b"))
+        self.assertEqual(expression.evaluate(columns, 4).tolist(), [True, False, False, False])
+        cases = {
+            "2 <= a < 10": [False, True, False, False],
+            "a != 5": [True, False, False, True],
+            "~(a == 5)": [True, False, True, True],
+            "b > 'x'": [False, False, True, False],
+            "b in ('x', 3)": [True, False, False, True],
+            "a not in [1, 5]": [False, False, False, True],
+            "a * 2 - 1 >= 9 or not b == 'x'": [False, True, True, True],
+            "True": [True] * 4,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(QueryExpression(text).evaluate(columns, 4).tolist(), expected, text)
+
+    def test_invalid(self):
+        for text in ("a >", "f(a) > 1", "a.b > 1", "a in b", "a ** 2 > 1", "a is None"):
+            with self.assertRaises(InvalidSearchParameters, msg=text):
+                QueryExpression(text)
+        with self.assertRaises(InvalidSearchParameters):
+            QueryExpression("a + 1").evaluate({"a": masked_column([1])}, 1)
+
+
+class TestGraphQuery(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def check_query(self, graph):
+        self.assertEqual(graph.query("slen > 3 & gc > 0.5"), ["1"])
+        self.assertEqual(graph.query("length >= 5"), ["1", "3"])
+        self.assertEqual(graph.query("degree == 2"), ["1", "2", "3", "4"])
+        self.assertEqual(graph.query("SN == 'chr1' | RC == 'x'"), ["1", "3", "4"])
+        self.assertEqual(graph.query("RC > 3"), ["1"])
+        self.assertEqual(graph.query("LN > 5 and gc > 0"), [])
+        self.assertEqual(graph.query("XX == 1"), [])
+        expected = graph.search(lambda data: data.get("KC") == 7 or data["alignment"] == "1M", limit_type=Element.EDGE)
+        self.assertEqual(graph.query("KC == 7 | alignment == '1M'", limit_type=Element.EDGE), expected)
+        self.assertEqual(len(graph.query("from_node == to_node", limit_type=Element.EDGE)), 1)
+
+    def test_networkx(self):
+        self.check_query(self.graph)
+
+    def test_frozen(self):
+        self.check_query(self.graph.freeze())
+
+    def test_view(self):
+        view = self.graph.subgraph_view(["1", "3", "4"])
+        self.assertEqual(view.query("degree == 1"), ["1", "3"])
+        self.assertEqual(view.query("gc >= 0.4"), ["1", "3"])
+
+    def test_invalidation(self):
+        self.assertEqual(self.graph.query("gc > 0.5"), ["1"])
+        self.graph.add_node(node.Node("5", "GGGC", 4))
+        self.assertEqual(self.graph.query("gc > 0.5"), ["1", "5"])
+        self.assertEqual(self.graph.query("degree == 0"), ["5"])
+
+    def test_in_place_changes(self):
+        self.assertEqual(self.graph.query("RC > 5"), [])
+        self.assertEqual(self.graph.query("gc > 0"), ["1", "3"])
+        self.graph.nodes(identifier="1")["RC"] = 50
+        self.graph.nodes(identifier="3")["sequence"] = "AAAAA"
+        self.graph.invalidate_indexes()
+        self.assertEqual(self.graph.query("RC > 5"), ["1"])
+        self.assertEqual(self.graph.query("gc > 0"), ["1"])
+
+    def test_without_sequences(self):
+        graph = GFA()
+        graph.from_string("H\tVN:Z:1.0\nS\t1\t*\tLN:i:2000\nS\t2\t*\n")
+        for queried in (graph, graph.freeze()):
+            with self.subTest(frozen=queried.is_frozen):
+                self.assertEqual(queried.query("gc > 0.6"), [])
+                self.assertEqual(queried.query("LN > 1000 | length > 1"), ["1"])
+                self.assertEqual(queried._query_column(Element.NODE, "length").dtype, np.int64)
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidSearchParameters):
+            self.graph.query("slen > 1", limit_type=Element.SUBGRAPH)
+        with self.assertRaises(InvalidSearchParameters):
+            self.graph.query("slen")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.exceptions import InvalidSearchParameters
+from pygfa.gfa import GFA, Element
+from pygfa.gfa.index import MISSING, AttributeIndex
+from pygfa.graph_element import node
+from pygfa.graph_element import subgraph as sg
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT\tSN:Z:chr1\tRC:i:4",
+        "S\t2\t*\tLN:i:10\tSN:Z:chr2",
+        "S\t3\tGGTTA\tSN:Z:chr1\tRC:f:2.5",
+        "S\t4\tTT\tRC:Z:x",
+        "L\t1\t+\t2\t-\t2M\tKC:i:7",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "L\t3\t-\t1\t-\t1M",
+    ]
+)
+
+
+class TestAttributeIndex(unittest.TestCase):
+    def test_match(self):
+        index = AttributeIndex([3, MISSING, "b", 1.5, float("nan"), 3, "a", [1], True])
+        self.assertEqual(index.match("==", 3).tolist(), [0, 5])
+        self.assertEqual(index.match("==", [1]).tolist(), [7])
+        self.assertEqual(index.match("!=", 3).tolist(), [2, 3, 4, 6, 7, 8])
+        self.assertEqual(index.match("in", ["a", 1.5]).tolist(), [3, 6])
+        self.assertEqual(index.match(">", 1).tolist(), [0, 3, 5])
+        self.assertEqual(index.match("<=", 3).tolist(), [0, 3, 5])
+        self.assertEqual(index.match("<", "b").tolist(), [6])
+        self.assertEqual(index.match(">=", (1,)).tolist(), [])
+
+
+class TestSearchWhere(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def check_search(self, graph):
+        self.assertEqual(graph.search(where={"slen": (">", 3), "SN": "chr1"}), ["1", "3"])
+        self.assertEqual(graph.search(where={"RC": (">=", 3)}), ["1"])
+        self.assertEqual(graph.search(where={"RC": ("in", [4, "x"])}), ["1", "4"])
+        self.assertEqual(graph.search(where={"SN": ("!=", "chr1")}), ["2"])
+        self.assertEqual(graph.search(where={"KC": 7}, limit_type=Element.EDGE), ["virtual_0"])
+        self.assertEqual(graph.search(where={"XX": 1}), [])
+        # The comparator filters the elements matching the clause
+        comparator = lambda data: data["alignment"] == "1M"  # noqa: E731
+        self.assertEqual(graph.search(comparator, where={"from_node": "3"}), ["virtual_1"])
+        # Same results as the equivalent comparators
+        queries = [
+            ({"slen": ("<", 5)}, lambda data: data["slen"] is not None and data["slen"] < 5),
+            ({"SN": "chr1", "RC": ("!=", 4)}, lambda data: data["SN"] == "chr1" and data["RC"] != 4),
+        ]
+        for where, comparator in queries:
+            self.assertEqual(graph.search(where=where), graph.search(comparator))
+
+    def test_networkx(self):
+        self.check_search(self.graph)
+
+    def test_frozen(self):
+        self.check_search(self.graph.freeze())
+        self.check_search(pickle.loads(pickle.dumps(self.graph.freeze())))
+
+    def test_view(self):
+        view = self.graph.subgraph_view(["1", "3", "4"])
+        self.assertEqual(view.search(where={"SN": "chr1"}), ["1", "3"])
+        self.assertEqual(view.search(where={"to_node": "1"}), ["virtual_1"])
+        # The indexes of the view follow the changes of the parent
+        self.graph.add_edge("L\t4\t+\t1\t+\t0M")
+        self.assertEqual(view.search(where={"to_node": "1"}), ["virtual_1", "virtual_2"])
+
+    def test_subgraphs(self):
+        self.graph.add_subgraph(sg.Subgraph("sub", {"1": "+"}))
+        self.graph.add_subgraph(sg.Subgraph("other", {"2": "+"}))
+        self.assertEqual(self.graph.search(where={"sub_id": ("<", "sub")}, limit_type=Element.SUBGRAPH), ["other"])
+        self.graph.remove_subgraph("other")
+        self.assertEqual(self.graph.search(where={"sub_id": ("<=", "sub")}), ["sub"])
+
+    def test_invalidation(self):
+        where = {"SN": "chr1"}
+        self.assertEqual(self.graph.search(where=where), ["1", "3"])
+        self.assertIn((Element.NODE, "SN"), self.graph._indexes)
+        index = self.graph._search_index(Element.NODE, "SN")
+        self.graph.search(where=where)
+        self.assertIs(self.graph._search_index(Element.NODE, "SN"), index)
+
+        self.graph.add_node(node.Node("5", "AAAAAA", 6, {"SN": "chr1"}))
+        self.assertEqual(self.graph.search(where=where), ["1", "3", "5"])
+        self.graph.remove_node("1")
+        self.assertEqual(self.graph.search(where=where), ["3", "5"])
+        self.graph.remove_edge("named")
+        self.assertEqual(self.graph.search(where={"ID": "named"}), [])
+        self.graph.clear()
+        self.assertEqual(self.graph.search(where=where), [])
+
+    def test_in_place_changes(self):
+        where = {"RC": (">", 5)}
+        view = self.graph.subgraph_view(["1", "2"])
+        self.assertEqual(self.graph.search(where=where), [])
+        self.assertEqual(view.search(where=where), [])
+        self.graph.nodes(identifier="1")["RC"] = 50
+        self.graph.invalidate_indexes()
+        self.assertEqual(self.graph.search(where=where), ["1"])
+        self.assertEqual(view.search(where=where), ["1"])
+        view.nodes(identifier="2")["RC"] = 6
+        view.invalidate_indexes()
+        self.assertEqual(self.graph.search(where=where), ["1", "2"])
+
+    def test_invalid(self):
+        with self.assertRaises(InvalidSearchParameters):
+            self.graph.search()
+        with self.assertRaises(InvalidSearchParameters):
+            self.graph.search(where={"SN": ("in", "chr1")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import copy
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, "../")
+
+from pygfa.encoding.dna_encoding import compress_string_2bit_dna
+from pygfa.exceptions import FrozenGraphError
+from pygfa.gfa import GFA
+from pygfa.gfa.sequences import PackedSequence, SequenceStore
+from pygfa.graph_element import node
+
+
+class TestSequenceStore(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        alphabet = "ACGTACGTACGTacgtNnRyUu*-"
+        self.sequences = ["".join(rng.choice(alphabet) for _ in range(rng.randrange(1, 40))) for _ in range(200)]
+        self.store = SequenceStore.from_sequences(self.sequences)
+
+    def test_decode(self):
+        self.assertEqual(len(self.store), 200)
+        self.assertEqual(self.store.total_length, sum(len(seq) for seq in self.sequences))
+        self.assertEqual([self.store.sequence(i) for i in range(200)], self.sequences)
+        self.assertEqual(self.store.length(3), len(self.sequences[3]))
+        self.assertEqual(self.store.packed.nbytes, (self.store.total_length + 3) // 4)
+
+    def test_to_2bit_dna(self):
+        for start, stop in ((0, 200), (0, 1), (1, 2), (5, 77), (199, 200), (10, 10)):
+            self.assertEqual(
+                self.store.to_2bit_dna(start, stop),
+                compress_string_2bit_dna("".join(self.sequences[start:stop])),
+            )
+
+    def test_pickle(self):
+        restored = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(restored.sequence(42), self.sequences[42])
+
+
+class TestPackedGraph(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        lines = [f"S\ts{i}\t{''.join(rng.choice('ACGTacgtN') for _ in range(rng.randrange(1, 30)))}" for i in range(50)]
+        lines += [f"L\ts{i}\t+\ts{i + 1}\t-\t1M" for i in range(49)]
+        self.graph = GFA()
+        self.graph.from_string("\n".join(lines))
+        self.packed = copy.deepcopy(self.graph)
+        self.packed.pack_sequences()
+
+    def test_nodes_decode_on_access(self):
+        raw = dict.__getitem__(self.packed._graph.nodes["s1"], "sequence")
+        self.assertIsInstance(raw, PackedSequence)
+        self.assertEqual(list(self.packed.nodes(data=True)), list(self.graph.nodes(data=True)))
+        self.assertEqual(self.packed.to_gfa(), self.graph.to_gfa())
+
+    def test_from_gfa(self):
+        graph = GFA.from_gfa("data/example_2.gfa", packed_sequences=True)
+        self.assertIsInstance(dict.__getitem__(graph._graph.nodes["101"], "sequence"), PackedSequence)
+        self.assertEqual(graph.to_gfa(), GFA.from_gfa("data/example_2.gfa").to_gfa())
+
+    def test_pack_existing_graph(self):
+        self.graph.add_node(node.Node("soft", "acgtNNNNacgtRY", 14))
+        self.graph.add_node(node.Node("empty", "*", 0))
+        store = self.graph.pack_sequences()
+        self.assertEqual(self.graph.nodes(identifier="soft")["sequence"], "acgtNNNNacgtRY")
+        self.assertEqual(self.graph.nodes(identifier="empty")["sequence"], "*")
+        self.assertEqual(len(store), len(self.graph.nodes(with_sequence=True)) - 1)
+        # Nodes added later and updated sequences are stored as they are
+        self.graph.add_node(node.Node("late", "ACGT", 4))
+        self.graph._graph.nodes["soft"]["sequence"] = "TT"
+        self.assertEqual(self.graph.nodes(identifier="late")["sequence"], "ACGT")
+        self.assertEqual(self.graph.nodes(identifier="soft")["sequence"], "TT")
+
+    def test_copies(self):
+        self.assertEqual(copy.deepcopy(self.packed).to_gfa(), self.graph.to_gfa())
+        self.assertEqual(pickle.loads(pickle.dumps(self.packed)).to_gfa(), self.graph.to_gfa())
+        frozen = self.packed.freeze()
+        self.assertEqual(frozen.to_gfa(), self.graph.to_gfa())
+        with self.assertRaises(FrozenGraphError):
+            frozen.pack_sequences()
+
+    def test_bgfa_export(self):
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            plain_path = os.path.join(tmpdir, "plain.bgfa")
+            packed_path = os.path.join(tmpdir, "packed.bgfa")
+            self.graph.to_bgfa(plain_path, block_size=1024)
+            self.packed.to_bgfa(packed_path, block_size=1024)
+            with open(plain_path, "rb") as plain, open(packed_path, "rb") as packed:
+                self.assertEqual(plain.read(), packed.read())
+            self.assertEqual(GFA.from_bgfa(packed_path).to_gfa(), GFA.from_bgfa(plain_path).to_gfa())
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
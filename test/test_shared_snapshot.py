@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+
+sys.path.insert(0, "../")
+
+from pygfa import io
+from pygfa.exceptions import FileFormatError, FrozenGraphError, GFAError
+from pygfa.gfa import GFA
+from pygfa.gfa.snapshot import Snapshot
+from pygfa.graph_element import node
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT\tRC:i:4",
+        "S\t2\t*\tLN:i:10",
+        "S\t3\tGGtt",
+        "L\t1\t+\t2\t-\t2M",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "L\t3\t-\t1\t-\t1M",
+        "P\tp1\t1+,2-,3+\t2M,*",
+        "W\tsample\t0\tchr1\t0\t8\t>1<2>3",
+    ]
+)
+
+
+def _worker_summary(name):
+    graph = GFA.attach_shared(name)
+    return (
+        len(graph.nodes()),
+        sorted(graph.neighbors("1")),
+        graph.nodes(identifier="3")["sequence"],
+        graph.paths("p1")["segments"],
+    )
+
+
+class TestSharedSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+        self.block = self.graph.to_shared_memory()
+
+    def tearDown(self):
+        self.block.close()
+        self.block.unlink()
+
+    def test_attach(self):
+        shared = GFA.attach_shared(self.block.name)
+        self.assertTrue(shared.is_frozen)
+        self.assertEqual(list(shared.nodes(data=True)), list(self.graph.nodes(data=True)))
+        self.assertEqual(list(shared.edges(data=True, keys=True)), list(self.graph.edges(data=True, keys=True)))
+        self.assertEqual(shared.paths(), self.graph.paths())
+        self.assertEqual(shared.walks(), self.graph.walks())
+        self.assertEqual(shared.to_gfa(), self.graph.to_gfa())
+        self.assertEqual(set(shared._get_edge_end_nodes("named")), {"2", "3"})
+        self.assertEqual(dict(shared._edge_index), self.graph.freeze()._edge_index)
+
+    def test_read_only(self):
+        shared = GFA.attach_shared(self.block.name)
+        self.assertFalse(shared._graph._indices.flags.writeable)
+        self.assertIsInstance(shared._graph._sequences.data, memoryview)
+        with self.assertRaises(FrozenGraphError):
+            shared.add_node(node.Node("4", "A", 1))
+
+    def test_workers(self):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            self.skipTest("fork start method not available")
+        with multiprocessing.get_context("fork").Pool(2) as pool:
+            results = pool.map(_worker_summary, [self.block.name] * 4)
+        expected = (3, ["2", "3"], "GGtt", ["1+", "2-", "3+"])
+        self.assertEqual(results, [expected] * 4)
+
+    def test_invalid_block(self):
+        with self.assertRaises(GFAError):
+            Snapshot(self.graph)
+        block = shared_memory.SharedMemory(create=True, size=64)
+        try:
+            with self.assertRaises(FileFormatError):
+                GFA.attach_shared(block.name)
+        finally:
+            block.close()
+            block.unlink()
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+        os.makedirs("results/test", exist_ok=True)
+        self.tmpdir = tempfile.mkdtemp(dir="results/test")
+        self.gfa_path = os.path.join(self.tmpdir, "graph.gfa")
+        with open(self.gfa_path, "w") as f:
+            f.write(GFA_TEXT + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_save_load(self):
+        path = os.path.join(self.tmpdir, "graph.snapshot")
+        self.graph.save_snapshot(path)
+        for use_mmap in (True, False):
+            loaded = GFA.load_snapshot(path, mmap=use_mmap)
+            self.assertTrue(loaded.is_frozen)
+            self.assertFalse(loaded._graph._edge_from.flags.writeable)
+            self.assertEqual(list(loaded.nodes(data=True)), list(self.graph.nodes(data=True)))
+            self.assertEqual(loaded.walks(), self.graph.walks())
+            self.assertEqual(loaded.to_gfa(), self.graph.to_gfa())
+        self.assertEqual(io.load(path).to_gfa(), self.graph.to_gfa())
+
+    def test_load_uses_cache(self):
+        cache = io.snapshot_path(self.gfa_path)
+        self.assertFalse(io.load(self.gfa_path, use_snapshot=True).is_frozen)
+        io.save(self.graph, cache)
+        self.assertTrue(io.load(self.gfa_path, use_snapshot=True).is_frozen)
+        # Sidecar files are only unpickled on request
+        self.assertFalse(io.load(self.gfa_path).is_frozen)
+        # A cache older than the file is ignored
+        stat = os.stat(self.gfa_path)
+        os.utime(cache, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        self.assertFalse(io.load(self.gfa_path, use_snapshot=True).is_frozen)
+
+    def test_invalid_snapshot(self):
+        path = os.path.join(self.tmpdir, "empty.snapshot")
+        open(path, "wb").close()
+        with self.assertRaises(FileFormatError):
+            GFA.load_snapshot(path)
+        with self.assertRaises(FileFormatError):
+            GFA.load_snapshot(self.gfa_path, mmap=False)
+        # An invalid cache is ignored
+        cache = io.snapshot_path(self.gfa_path)
+        shutil.copy(self.gfa_path, cache)
+        self.assertEqual(io.load(self.gfa_path, use_snapshot=True).to_gfa(), self.graph.to_gfa())
+
+    def test_truncated_snapshot(self):
+        path = os.path.join(self.tmpdir, "graph.snapshot")
+        self.graph.save_snapshot(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        cache = io.snapshot_path(self.gfa_path)
+        # Buffers are padded to 64 bytes, the last 64 bytes hold some data
+        for size in (30, len(data) // 2, len(data) - 64):
+            with self.subTest(size=size):
+                with open(cache, "wb") as f:
+                    f.write(data[:size])
+                with self.assertRaises(FileFormatError):
+                    GFA.load_snapshot(str(cache))
+                with self.assertLogs("pygfa.io", level="WARNING"):
+                    graph = io.load(self.gfa_path, use_snapshot=True)
+                self.assertFalse(graph.is_frozen)
+                self.assertEqual(graph.to_gfa(), self.graph.to_gfa())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.bgfa import validate_bgfa
+from pygfa.gfa import GFA
+from pygfa.gfa.tags import TagRegistry
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.0",
+        "S\t1\tACGT\tRC:i:4\tSN:Z:chr1\tSO:i:0",
+        "S\t2\t*\tLN:i:10\tRC:i:-3",
+        "S\t3\tGGtt\tSN:Z:chr1\tSO:i:4",
+        "S\t4\tTT\tRC:f:2.5",
+        "S\t5\tA",
+        "L\t1\t+\t2\t-\t2M\tKC:i:7",
+        "L\t2\t+\t3\t+\t*\tID:Z:named",
+        "L\t3\t-\t1\t-\t1M",
+    ]
+)
+
+
+class TestTagRegistry(unittest.TestCase):
+    def test_rows(self):
+        rows = [
+            {"RC": 1, "XX": "a"},
+            None,
+            {"XX": "b", "RC": 2},
+            {"RC": "s"},
+            {"RC": True},
+            {"RC": 3, "XX": "a", "FF": 0.5},
+            {"RC": 2**70},
+        ]
+        registry = TagRegistry.from_rows(rows, 8)
+        self.assertEqual(len(registry), 8)
+        columns = [(tag, column.type) for tag, column in registry.columns.items()]
+        self.assertEqual(columns, [("RC", "i"), ("XX", "Z"), ("FF", "f")])
+        self.assertEqual(registry.columns["XX"].strings, ["a"])
+        # Rows not fitting the columns are kept as they are, in order
+        self.assertEqual(sorted(registry.raw), [2, 3, 4, 6])
+        self.assertEqual(registry.rows(), rows + [None])
+        for i, row in enumerate(rows):
+            self.assertEqual(list(registry.row(i).items()), list((row or {}).items()))
+
+    def test_array(self):
+        registry = TagRegistry.from_rows([{"RC": 1}, None, {"RC": 3}, {"RC": "x"}])
+        array = registry.array("RC")
+        self.assertEqual(array.dtype, object)
+        self.assertEqual(array.tolist(), [1, None, 3, "x"])
+        array = registry.array("RC", extra=[(3, {"RC": 4})])
+        self.assertEqual(array.dtype, object)
+        self.assertTrue(registry.array("XX").mask.all())
+        array = TagRegistry.from_rows([{"RC": 1}, None, {"RC": 3}]).array("RC")
+        self.assertEqual(array.dtype, np.int64)
+        self.assertEqual(array.sum(), 4)
+        self.assertFalse(array.data.flags.writeable)
+
+
+class TestTagArrays(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+
+    def check_arrays(self, graph):
+        rc = graph.node_tag_array("RC")
+        self.assertEqual(rc.dtype, object)
+        self.assertEqual(rc.tolist(), [4, -3, None, 2.5, None])
+        so = graph.node_tag_array("SO")
+        self.assertEqual(so.dtype, np.int64)
+        self.assertEqual(so.tolist(), [0, None, 4, None, None])
+        self.assertEqual(graph.node_tag_array("SN").tolist(), ["chr1", None, "chr1", None, None])
+        self.assertTrue(graph.node_tag_array("XX").mask.all())
+        self.assertEqual(graph.edge_tag_array("KC").compressed().tolist(), [7])
+        self.assertEqual(graph.edge_tag_array("ID").compressed().tolist(), ["named"])
+
+    def test_networkx(self):
+        self.check_arrays(self.graph)
+
+    def test_frozen(self):
+        frozen = self.graph.freeze()
+        self.assertIn("SN", frozen._graph._node_tags.columns)
+        self.assertEqual(frozen.to_gfa(), self.graph.to_gfa())
+        self.check_arrays(frozen)
+
+    def test_bgfa(self):
+        os.makedirs("results/test", exist_ok=True)
+        tmpdir = tempfile.mkdtemp(dir="results/test")
+        try:
+            path = os.path.join(tmpdir, "graph.bgfa")
+            self.graph.to_bgfa(path)
+            result = validate_bgfa(path)
+            self.assertTrue(result["valid"])
+            self.assertIn("opt_columns", [block["section_type"] for block in result["blocks"]])
+            for backend in ("networkx", "csr"):
+                loaded = GFA.from_bgfa(path, backend=backend)
+                for name, data in self.graph.nodes(data=True):
+                    loaded_data = loaded.nodes(identifier=name)
+                    self.assertEqual(list(loaded_data.items())[3:], list(data.items())[3:])
+                self.assertEqual(loaded.node_tag_array("RC").tolist(), [4, -3, None, 2.5, None])
+                self.assertEqual(loaded.edge_tag_array("KC").compressed().tolist(), [7])
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import pickle
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, "../")
+
+from pygfa.gfa import GFA, Element
+from pygfa.gfa.traversals import TraversalIndex
+
+GFA_TEXT = "\n".join(
+    [
+        "H\tVN:Z:1.2",
+        "S\t1\tACGT",
+        "S\t2\tGG",
+        "S\t3\tTTA",
+        "S\t4\tC",
+        "L\t1\t+\t2\t+\t0M",
+        "L\t2\t+\t3\t-\t0M",
+        "L\t3\t-\t1\t+\t0M",
+        "P\tp1\t1+,2+,3-\t*",
+        "P\tp2\t3+,1-,1+\t*",
+        "W\tsample\t1\tchr1\t0\t9\t>1>2<3>1",
+    ]
+)
+
+
+class TestTraversalIndex(unittest.TestCase):
+    def test_lookup(self):
+        index = TraversalIndex([("a", np.array([0, 1, 0])), ("b", np.array([2, 0]))])
+        positions, traversal, step = index.lookup([0, 5, -1, 2, 0])
+        self.assertEqual(positions.tolist(), [0, 0, 0, 3, 4, 4, 4])
+        self.assertEqual(traversal.tolist(), [0, 0, 1, 1, 0, 0, 1])
+        self.assertEqual(step.tolist(), [0, 2, 1, 0, 0, 2, 1])
+        self.assertEqual(index.visits([1, 3]), [[("a", 1)], []])
+
+    def test_maintenance(self):
+        index = TraversalIndex([("a", np.array([0, 1])), ("b", np.array([1, 2]))])
+        index.add("c", np.array([2, 1, 1]))
+        index.discard("a")
+        index.add("b", np.array([3]))
+        index.discard("missing")
+        self.assertEqual(len(index), 2)
+        self.assertNotIn("a", index)
+        expected = [[], [("c", 1), ("c", 2)], [("c", 0)], [("b", 0)]]
+        self.assertEqual(index.visits(range(4)), expected)
+        # Same visits once the arrays are rebuilt
+        index._build()
+        self.assertEqual(index.visits(range(4)), expected)
+
+    def test_empty(self):
+        index = TraversalIndex()
+        self.assertEqual(index.visits([0, -1]), [[], []])
+        self.assertEqual(index.nbytes, 8)
+
+
+class TestGraphVisits(unittest.TestCase):
+    def setUp(self):
+        self.graph = GFA()
+        self.graph.from_string(GFA_TEXT)
+        self.walk = next(iter(self.graph.walks()))
+
+    def check_visits(self, graph):
+        self.assertEqual(graph.visits("1"), [("p1", 0), ("p2", 1), ("p2", 2), (self.walk, 0), (self.walk, 3)])
+        self.assertEqual(graph.visits("4"), [])
+        self.assertEqual(graph.visits("unknown"), [])
+        visits = graph.visits_many(["3", "2"])
+        self.assertEqual(visits, {"3": [("p1", 2), ("p2", 0), (self.walk, 2)], "2": [("p1", 1), (self.walk, 1)]})
+        self.assertIn((Element.WALK, self.walk), graph.traversal_index())
+
+    def test_networkx(self):
+        self.check_visits(self.graph)
+
+    def test_frozen(self):
+        frozen = self.graph.freeze()
+        self.check_visits(frozen)
+        self.check_visits(pickle.loads(pickle.dumps(frozen)))
+
+    def test_updates(self):
+        index = self.graph.traversal_index()
+        self.graph.add_path("P\tp3\t4+,2-\t*")
+        self.graph.remove_path("p1")
+        self.graph.remove_walk(self.walk)
+        self.assertIs(self.graph.traversal_index(), index)
+        self.assertEqual(self.graph.visits("2"), [("p3", 1)])
+        self.assertEqual(self.graph.visits_many(["4", "1"]), {"4": [("p3", 0)], "1": [("p2", 1), ("p2", 2)]})
+        self.graph.clear()
+        self.assertEqual(self.graph.visits("1"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark BGFA loading, split between decoding and materialisation.
+
+Builds a synthetic graph (random segments joined by random links),
+writes it as BGFA, then loads it back and times separately the decoding
+of the blocks (`ReaderBGFA._decode_bgfa`) and the materialisation of the
+decoded columns into a graph, with three strategies:
+
+- ``per_element``: one `Node`/`Edge` per record added by `add_node` /
+  `add_edge`, the way the reader used to build graphs;
+- ``validated``: the bulk methods, validating the columns;
+- ``trusted``: the bulk methods without validation (``trusted=True``).
+
+Reports the best time of each phase as TSV.
+
+Usage:
+    pixi run python tools/benchmark_bgfa_load.py
+    pixi run python tools/benchmark_bgfa_load.py --segments 60000 --links 500000
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pygfa.bgfa import ReaderBGFA  # noqa: E402
+from pygfa.gfa import GFA  # noqa: E402
+from pygfa.graph_element.edge import Edge  # noqa: E402
+from pygfa.graph_element.node import Node  # noqa: E402
+
+
+def build_graph(n_segments: int, n_links: int, seed: int) -> GFA:
+    """Return a graph of random 20 bp segments joined by random links."""
+    rng = random.Random(seed)
+    lines = [f"S\ts{i}\t{''.join(rng.choice('ACGT') for _ in range(20))}" for i in range(n_segments)]
+    lines += [
+        f"L\ts{rng.randrange(n_segments)}\t{rng.choice('+-')}\ts{rng.randrange(n_segments)}\t{rng.choice('+-')}\t5M"
+        for _ in range(n_links)
+    ]
+    gfa = GFA()
+    gfa.from_string("\n".join(lines))
+    return gfa
+
+
+def materialise_per_element(decoded) -> GFA:
+    """Build the graph one `Node` and one `Edge` at a time."""
+    gfa = GFA()
+    segment_opts = decoded.segment_tags.rows()
+    for i, (name, sequence) in enumerate(zip(decoded.segment_names, decoded.sequences)):
+        opts = segment_opts[i] if i < len(segment_opts) else None
+        gfa.add_node(Node(name, sequence, opt_fields=opts or {}))
+    links = decoded.links
+    link_opts = decoded.link_tags.rows()
+    for i, (from_node, to_node, from_reverse, to_reverse, alignment) in enumerate(zip(*links)):
+        opts = (link_opts[i] if i < len(link_opts) else None) or {}
+        gfa.add_edge(
+            Edge(
+                None,
+                from_node,
+                "-" if from_reverse else "+",
+                to_node,
+                "-" if to_reverse else "+",
+                (None, None),
+                (None, None),
+                alignment,
+                opt_fields=opts,
+            )
+        )
+    return gfa
+
+
+def time_load(path: str, repeat: int) -> dict:
+    """Return the best decode and materialise times of each strategy."""
+    reader = ReaderBGFA()
+    with open(path, "rb") as f:
+        data = f.read()
+    strategies = {
+        "per_element": materialise_per_element,
+        "validated": lambda decoded: reader._materialise(decoded, trusted=False),
+        "trusted": lambda decoded: reader._materialise(decoded, trusted=True),
+    }
+    results = {}
+    for name, materialise in strategies.items():
+        decode_times = []
+        materialise_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decoded = reader._decode_bgfa(data)
+            decoded_at = time.perf_counter()
+            materialise(decoded)
+            decode_times.append(decoded_at - start)
+            materialise_times.append(time.perf_counter() - decoded_at)
+        results[name] = (min(decode_times), min(materialise_times))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the decode/materialise split of BGFA loading")
+    parser.add_argument("--segments", "-s", type=int, default=50_000, help="Number of segments (at most 65535)")
+    parser.add_argument("--links", "-l", type=int, default=200_000, help="Number of links")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Loads per strategy, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random graph")
+    args = parser.parse_args()
+
+    # Per-call debug logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    os.makedirs(os.path.join(project_root, "results", "benchmark"), exist_ok=True)
+    tmpdir = tempfile.mkdtemp(dir=os.path.join(project_root, "results", "benchmark"))
+    try:
+        path = os.path.join(tmpdir, "graph.bgfa")
+        build_graph(args.segments, args.links, args.seed).to_bgfa(path)
+        results = time_load(path, args.repeat)
+    finally:
+        shutil.rmtree(tmpdir)
+
+    print("segments\tlinks\tstrategy\tdecode_s\tmaterialise_s\tmaterialise_share")
+    for strategy, (decode, materialise) in results.items():
+        share = materialise / (decode + materialise) if decode + materialise > 0 else 0.0
+        print(f"{args.segments}\t{args.links}\t{strategy}\t{decode:.3f}\t{materialise:.3f}\t{share:.3f}")
+
+
+if __name__ == "__main__":
+    main()
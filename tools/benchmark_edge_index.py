@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark edge lookups by edge id.
+
+Builds a synthetic graph (a chain of segments, each joined to the next
+one by a link with an explicit id) and resolves random link ids through
+the public API: membership (`id in gfa`), `get()` and
+`as_graph_element()`. Ids missing from the graph are looked up too,
+since a miss used to scan every edge. Reports the lookups per second as TSV.
+
+Usage:
+    pixi run python tools/benchmark_edge_index.py
+    pixi run python tools/benchmark_edge_index.py --links 200000 --ids 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pygfa.gfa import GFA  # noqa: E402
+
+
+def build_graph(n_links: int) -> GFA:
+    """Return a chain of `n_links + 1` segments joined by links `e0`, `e1`, ..."""
+    lines = [f"S\ts{i}\tACGT" for i in range(n_links + 1)]
+    lines += [f"L\ts{i}\t+\ts{i + 1}\t+\t2M\tID:Z:e{i}" for i in range(n_links)]
+    gfa = GFA()
+    gfa.from_string("\n".join(lines))
+    return gfa
+
+
+def time_lookups(gfa: GFA, ids: list[str]) -> dict:
+    """Return the lookups per second of each lookup method."""
+    results = {}
+    for name, lookup in (
+        ("contains", gfa.__contains__),
+        ("get", gfa.get),
+        ("as_graph_element", lambda id_: gfa.as_graph_element(id_) if id_ in gfa else None),
+    ):
+        start = time.perf_counter()
+        for id_ in ids:
+            lookup(id_)
+        elapsed = time.perf_counter() - start
+        results[name] = len(ids) / elapsed if elapsed > 0 else 0.0
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure edge lookups by edge id")
+    parser.add_argument("--links", "-l", type=int, default=100_000, help="Number of links in the graph")
+    parser.add_argument("--ids", "-n", type=int, default=1_000_000, help="Number of ids to resolve")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random id sample")
+    args = parser.parse_args()
+
+    # Per-call debug logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    gfa = build_graph(args.links)
+    rng = random.Random(args.seed)
+    # One id out of three is not an edge of the graph
+    ids = [f"e{rng.randrange(args.links * 3 // 2)}" for _ in range(args.ids)]
+
+    results = time_lookups(gfa, ids)
+    print("links\tids\tmethod\tlookups_per_s")
+    for method, rate in results.items():
+        print(f"{args.links}\t{args.ids}\t{method}\t{rate:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark the text GFA parse engines.
+
+Loads each GFA file with the tab-splitting fast parser, with the
+bytes-level (zero-copy) reader and with the strict Lark grammar and
+reports the throughput of the engines as TSV.
+
+Usage:
+    pixi run python tools/benchmark_parser.py                # all files in data/
+    pixi run python tools/benchmark_parser.py file.gfa ...   # selected files
+    pixi run python tools/benchmark_parser.py --repeat 5 data/example_1.gfa
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pygfa.gfa import GFA  # noqa: E402
+from pygfa.utils.file_opener import open_gfa_file  # noqa: E402
+
+
+def count_records(gfa_path: str) -> int:
+    """Return the number of non-empty, non-comment lines of a GFA file."""
+    with open_gfa_file(gfa_path) as f:
+        return sum(1 for line in f if line.strip() and not line.startswith("#"))
+
+
+def time_engine(gfa_path: str, strict: bool, repeat: int, zero_copy: bool = False) -> float:
+    """Return the best wall-clock time, in seconds, of `repeat` loads."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        GFA.from_gfa(gfa_path, strict=strict, zero_copy=zero_copy)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(gfa_path: str, repeat: int = 3) -> dict:
+    """Benchmark both parse engines on a single GFA file."""
+    lines = count_records(gfa_path)
+    fast = time_engine(gfa_path, strict=False, repeat=repeat)
+    zero_copy = time_engine(gfa_path, strict=False, repeat=repeat, zero_copy=True)
+    strict = time_engine(gfa_path, strict=True, repeat=repeat)
+    return {
+        "file": gfa_path,
+        "lines": lines,
+        "fast_lines_per_s": lines / fast if fast > 0 else 0.0,
+        "zero_copy_lines_per_s": lines / zero_copy if zero_copy > 0 else 0.0,
+        "lark_lines_per_s": lines / strict if strict > 0 else 0.0,
+        "speedup": strict / fast if fast > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the fast and the Lark GFA parse engines")
+    parser.add_argument("files", nargs="*", help="GFA files to load (default: data/*.gfa)")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Loads per engine, best time is kept")
+    args = parser.parse_args()
+
+    # Per-line debug logging would dominate the measurement
+    logging.disable(logging.CRITICAL)
+
+    files = args.files or sorted(glob.glob(os.path.join(project_root, "data", "*.gfa")))
+    print("file\tlines\tfast_lines_per_s\tzero_copy_lines_per_s\tlark_lines_per_s\tspeedup")
+    for gfa_path in files:
+        result = benchmark(gfa_path, repeat=args.repeat)
+        print(
+            f"{os.path.basename(result['file'])}\t{result['lines']}\t{result['fast_lines_per_s']:.0f}\t"
+            f"{result['zero_copy_lines_per_s']:.0f}\t"
+            f"{result['lark_lines_per_s']:.0f}\t{result['speedup']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()